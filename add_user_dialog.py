@@ -5,6 +5,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, pyqtSignal, QSize
 from PyQt5.QtGui import QFont, QPixmap, QIcon
 from database import add_user, get_all_users
+from pixmap_cache import icon
 import os
 
 class AddUserDialog(QDialog):
@@ -78,7 +79,7 @@ class AddUserDialog(QDialog):
         
         # Back button
         back_btn = QPushButton()
-        back_btn.setIcon(QIcon("icons/arrow-left.svg"))
+        back_btn.setIcon(icon('back_arrow'))
         back_btn.setIconSize(QSize(24, 24))
         back_btn.setStyleSheet("background: transparent; border: none;")
         back_btn.clicked.connect(self.reject)
@@ -0,0 +1 @@
+# Benchmark scripts for Intelli-Libraria (run as: python -m benchmarks.<name>)
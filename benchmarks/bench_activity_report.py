@@ -0,0 +1,101 @@
+"""
+12-month user activity report: fan-out join vs daily aggregates.
+
+Builds databases with growing loan history and times the original
+``get_user_activity`` query (users LEFT JOIN transactions LEFT JOIN
+reservations with COUNT(DISTINCT ...)) against ``data.aggregates.user_activity``.
+Also reports the per-checkout cost the aggregate triggers add.
+
+Usage:
+    python -m benchmarks.bench_activity_report --histories 100000 500000 1000000
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, temp_db_path
+from data import aggregates
+from data.migrator import migrate
+
+FAN_OUT_SQL = """
+    SELECT 
+        u.id as user_id,
+        u.full_name as user_name,
+        u.email as user_email,
+        u.role as user_role,
+        COUNT(DISTINCT t.id) as total_borrowed,
+        COUNT(DISTINCT r.id) as total_reservations,
+        COUNT(DISTINCT CASE 
+            WHEN t.status = 'Returned' THEN t.id 
+        END) as books_returned,
+        COUNT(DISTINCT CASE 
+            WHEN t.status = 'Issued' AND t.due_date < date('now') 
+            THEN t.id 
+        END) as overdue_books,
+        MAX(t.issue_date) as last_activity
+    FROM users u
+    LEFT JOIN transactions t ON u.id = t.user_id
+    LEFT JOIN reservations r ON u.id = r.user_id
+    WHERE t.issue_date >= date('now', ? || ' days')
+       OR r.reservation_date >= date('now', ? || ' days')
+    GROUP BY u.id, u.full_name, u.email, u.role
+    ORDER BY last_activity DESC
+"""
+
+
+def best_of(func, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def checkout_cost(conn, n=2000):
+    started = time.perf_counter()
+    for i in range(n):
+        conn.execute(
+            "INSERT INTO transactions (user_id, book_id, issue_date, due_date, status) "
+            "VALUES (?, ?, date('now'), date('now', '+14 days'), 'Issued')",
+            (i % 100 + 1, i % 100 + 1)
+        )
+        conn.commit()
+    return (time.perf_counter() - started) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--histories', type=int, nargs='+', default=[100_000, 500_000])
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--users', type=int, default=20_000)
+    parser.add_argument('--books', type=int, default=20_000)
+    parser.add_argument('--days', type=int, default=365)
+    args = parser.parse_args()
+
+    print(f"{'loans':>10} {'fan-out':>12} {'aggregates':>12} {'rows':>7} "
+          f"{'checkout':>10} {'checkout+trg':>13}")
+    for loans in args.histories:
+        path = build_library_db(temp_db_path(), users=args.users, books=args.books,
+                                loans=loans, reservations=loans // 20, years=args.years)
+        conn = sqlite3.connect(path)
+        conn.execute('PRAGMA synchronous = NORMAL')
+        window = (f'-{args.days}', f'-{args.days}')
+        fan_out = best_of(lambda: conn.execute(FAN_OUT_SQL, window).fetchall(), repeat=1)
+        plain_checkout = checkout_cost(conn)
+
+        migrate(conn, target=7)
+        rows = len(aggregates.user_activity(conn, args.days))
+        aggregated = best_of(lambda: aggregates.user_activity(conn, args.days))
+        trigger_checkout = checkout_cost(conn)
+        conn.close()
+        print(f"{loans:>10} {fan_out * 1000:>10.1f}ms {aggregated * 1000:>10.1f}ms {rows:>7} "
+              f"{plain_checkout * 1e6:>8.0f}us {trigger_checkout * 1e6:>11.0f}us")
+
+
+if __name__ == '__main__':
+    main()
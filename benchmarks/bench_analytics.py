@@ -0,0 +1,91 @@
+"""
+Circulation statistics: per-report SQL vs the NumPy columnar extract.
+
+Times the ad-hoc SQL behind the popular-books report and the return-rate /
+loan-duration figures against ``data.analytics`` on a cold extract, a warm
+memory-mapped cache (new process, unchanged data) and an in-process hit.
+
+Usage:
+    python -m benchmarks.bench_analytics --loans 200000 1000000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, temp_db_path
+from data import analytics
+from data.readonly import ReadOnlyDatabase
+
+POPULAR_SQL = """
+    SELECT b.*, COUNT(t.id) as borrow_count
+    FROM books b
+    LEFT JOIN transactions t ON b.id = t.book_id
+    GROUP BY b.id
+    ORDER BY borrow_count DESC
+    LIMIT 10
+"""
+
+DURATION_SQL = """
+    SELECT COUNT(*) as total,
+           SUM(CASE WHEN return_date IS NOT NULL THEN 1 ELSE 0 END) as returned,
+           AVG(julianday(return_date) - julianday(issue_date)) as avg_days
+    FROM transactions
+"""
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+
+def all_statistics(arrays):
+    analytics.loan_duration_distribution(arrays)
+    analytics.title_turnover(arrays)
+    analytics.overdue_rate_by_cohort(arrays)
+    analytics.weekly_trends(arrays)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--loans', type=int, nargs='+', default=[200_000])
+    parser.add_argument('--years', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'loans':>9} {'sql':>10} {'extract':>10} {'mmap load':>10} "
+          f"{'cached':>10} {'stats':>10} {'cache MB':>9}")
+    for loans in args.loans:
+        path = build_library_db(temp_db_path(), users=20_000, books=20_000,
+                                loans=loans, reservations=0, years=args.years)
+        cache_dir = tempfile.mkdtemp(prefix='analytics-')
+        try:
+            readonly = ReadOnlyDatabase(path)
+            sql, _ = timed(lambda: (readonly.query(POPULAR_SQL), readonly.query(DURATION_SQL)))
+            readonly.close()
+
+            cold = analytics.CirculationAnalytics(path, cache_dir)
+            extract, arrays = timed(cold.arrays)
+            cold.close()
+
+            # A fresh instance finds the extract on disk and only maps it
+            warm = analytics.CirculationAnalytics(path, cache_dir)
+            load, arrays = timed(warm.arrays)
+            cached, _ = timed(warm.arrays)
+            stats, _ = timed(lambda: all_statistics(arrays))
+            warm.close()
+
+            size = sum(os.path.getsize(os.path.join(root, f))
+                       for root, _, files in os.walk(cache_dir) for f in files)
+            print(f"{loans:>9} {sql * 1000:>8.1f}ms {extract * 1000:>8.1f}ms {load * 1000:>8.1f}ms "
+                  f"{cached * 1000:>8.2f}ms {stats * 1000:>8.1f}ms {size / 2**20:>9.1f}")
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Hot-query latency with ten years of loan history, before and after archiving.
+
+Builds a library database with ``--years`` of history and times the desk
+and dashboard queries (verbatim from ``database.py``, the fine page and
+``data.aggregates``) against it. It then archives loans returned more than
+``--horizon-days`` ago with ``data.archive.archive_returned`` and times
+them again. ``report, 5 years ago`` is a ``loan_history`` range that has to
+read the attached archive; ``report, last 90 days`` is one that does not.
+
+Usage:
+    python -m benchmarks.bench_archive --loans 1000000 --years 10
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, format_ms, percentiles, temp_db_path
+from data import aggregates, archive
+from data.migrator import migrate
+
+HOT_QUERIES = {
+    'overdue count': """
+        SELECT COUNT(*) FROM transactions
+        WHERE status = 'Issued' AND due_date < date('now')
+    """,
+    'overdue books': """
+        SELECT t.id, b.title, u.full_name, t.due_date,
+               julianday('now') - julianday(t.due_date) as days_overdue
+        FROM transactions t
+        JOIN books b ON t.book_id = b.id
+        JOIN users u ON t.user_id = u.id
+        WHERE t.status = 'borrowed' AND t.due_date < date('now')
+        ORDER BY t.due_date ASC
+    """,
+    'fine page': """
+        SELECT t.id, t.user_id, COALESCE(b.title, 'Unknown Book'), t.issue_date, t.due_date,
+               CASE WHEN t.due_date IS NOT NULL AND (julianday('now') - julianday(t.due_date)) > 0
+                    THEN ROUND((julianday('now') - julianday(t.due_date)) * 0.50, 2) ELSE 0 END,
+               COALESCE(u.full_name, 'Unknown User')
+        FROM transactions t
+        LEFT JOIN books b ON t.book_id = b.id
+        LEFT JOIN users u ON t.user_id = u.id
+        WHERE t.issue_date IS NOT NULL
+        ORDER BY t.due_date DESC NULLS LAST
+    """,
+    'recent activity': """
+        SELECT t.id, b.title, b.author, u.full_name, t.issue_date, t.due_date, t.return_date, t.status
+        FROM transactions t
+        JOIN books b ON t.book_id = b.id
+        JOIN users u ON t.user_id = u.id
+        ORDER BY t.issue_date DESC
+        LIMIT 10
+    """,
+}
+
+
+def measure(path, repeat):
+    conn = sqlite3.connect(path)
+    today = date.today()
+    work = {label: (lambda sql=sql: conn.execute(sql).fetchall()) for label, sql in HOT_QUERIES.items()}
+    work['member activity'] = lambda: aggregates.user_activity(conn, 30)
+    work['report, last 90 days'] = lambda: archive.loan_history(conn, today - timedelta(days=90), today)
+    work['report, 5 years ago'] = lambda: archive.loan_history(
+        conn, today - timedelta(days=5 * 365 + 30), today - timedelta(days=5 * 365))
+    results = {}
+    try:
+        for label, func in work.items():
+            func()
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                func()
+                samples.append(time.perf_counter() - started)
+            results[label] = percentiles(samples)
+        return results
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--books', type=int, default=20000)
+    parser.add_argument('--loans', type=int, default=1_000_000)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--horizon-days', type=int, default=365)
+    parser.add_argument('--batch', type=int, default=archive.BATCH_SIZE)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    path = build_library_db(temp_db_path(), users=args.users, books=args.books,
+                            loans=args.loans, years=args.years)
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    conn.close()
+    print(f"database {os.path.getsize(path) / 1e6:.1f} MB, {args.loans} loans over {args.years} years")
+
+    before = measure(path, args.repeat)
+
+    conn = sqlite3.connect(path)
+    result = archive.archive_returned(conn, args.horizon_days, args.batch)
+    remaining = conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+    conn.close()
+    print(f"archived {result['moved']} loans in {result['batches']} batches, {result['seconds']:.1f}s "
+          f"({result['moved'] / result['seconds']:.0f} loans/s); {remaining} left in transactions")
+
+    after = measure(path, args.repeat)
+    for label in before:
+        print(f"{label:22s} before {format_ms(before[label])}")
+        print(f"{'':22s} after  {format_ms(after[label])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Online backup throughput and its effect on checkout latency.
+
+A desk thread checks out and returns books through the write queue (with
+``--think`` seconds between operations) while the database is backed up:
+
+* ``file copy``: the old way, copying the database file (not consistent
+  for a live WAL database; shown for its speed only);
+* ``backup, one step``: ``BackupService`` copying every page in one step;
+* ``backup, stepped``: ``BackupService`` with ``--pages`` pages per step
+  and ``--sleep`` seconds between steps.
+
+The service times include the integrity check, compression and checksums;
+the copy alone is shown separately.
+``idle`` is the desk latency with no backup running.
+
+Usage:
+    python -m benchmarks.bench_backup --loans 300000
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, format_ms, percentiles, temp_db_path
+from data.write_queue import WriteQueue
+from services import circulation
+from services.backup_service import BackupService
+
+
+def desk(queue, users, books, think, stop, latencies):
+    rng = random.Random(7)
+    while not stop.is_set():
+        user_id, book_id = rng.randint(1, users), rng.randint(1, books)
+        for func in (circulation.borrow_book, circulation.return_book):
+            started = time.perf_counter()
+            queue.call(func, user_id, book_id)
+            latencies.append(time.perf_counter() - started)
+            time.sleep(think)
+
+
+def during(queue, args, work):
+    """Run ``work()`` while the desk is busy; returns (seconds, latencies)."""
+    latencies, stop = [], threading.Event()
+    thread = threading.Thread(target=desk, args=(queue, args.users, args.books, args.think, stop, latencies))
+    thread.start()
+    time.sleep(0.2)
+    started = time.perf_counter()
+    work()
+    seconds = time.perf_counter() - started
+    stop.set()
+    thread.join()
+    return seconds, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--books', type=int, default=20000)
+    parser.add_argument('--loans', type=int, default=300_000)
+    parser.add_argument('--pages', type=int, default=1024)
+    parser.add_argument('--sleep', type=float, default=0.005)
+    parser.add_argument('--think', type=float, default=0.002)
+    args = parser.parse_args()
+
+    path = build_library_db(temp_db_path(), users=args.users, books=args.books, loans=args.loans)
+    size_mb = os.path.getsize(path) / 1e6
+    backup_dir = tempfile.mkdtemp(prefix='libraria-backups-')
+    queue = WriteQueue(path)
+    print(f"database {size_mb:.1f} MB")
+
+    _, idle = during(queue, args, lambda: time.sleep(2))
+    print(f"{'idle':18s} {'':26s} desk {format_ms(percentiles(idle))}")
+
+    scenarios = [
+        ('file copy', lambda: shutil.copyfile(path, os.path.join(backup_dir, 'copy.db'))),
+        ('backup, one step', BackupService(path, backup_dir, pages_per_step=-1, step_sleep=0).backup),
+        ('backup, stepped', BackupService(path, backup_dir, pages_per_step=args.pages,
+                                          step_sleep=args.sleep).backup),
+    ]
+    for label, work in scenarios:
+        seconds, latencies = during(queue, args, work)
+        print(f"{label:18s} {seconds * 1000:8.0f}ms {size_mb / seconds:8.1f} MB/s   "
+              f"desk {format_ms(percentiles(latencies))}")
+        if label != 'file copy':
+            copy_seconds = BackupService(path, backup_dir).snapshots()[-1].copy_seconds
+            print(f"{'  copy only':18s} {copy_seconds * 1000:8.0f}ms {size_mb / copy_seconds:8.1f} MB/s")
+    snapshot = BackupService(path, backup_dir).snapshots()[-1]
+    print(f"snapshot {snapshot.compressed_bytes / 1e6:.1f} MB "
+          f"({snapshot.compressed_bytes / snapshot.db_bytes:.0%} of the database)")
+    queue.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Branch-scoped inventory queries: a flat books table with a branch column
+(the layout ``BookRepository.get_books_by_branch`` queries) vs per-branch
+holdings (``data.branches``).
+
+Builds ``--branches`` branches holding ``--holdings`` (title, branch) rows
+in total, lends out a share of the copies and times, per branch,
+
+* the first page of the branch catalogue and a title search,
+* the branch counts (copies, on shelf, on loan),
+* the consolidated availability of a title and of the whole network,
+* a branch checkout + return.
+
+Usage:
+    python -m benchmarks.bench_branches --branches 20 --holdings 1000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, temp_db_path
+from data import branches
+from data.migrator import MIGRATIONS_DIR, migrate, split_statements
+from services import circulation
+
+
+BRANCHES_MIGRATION = os.path.join(MIGRATIONS_DIR, '011_branch_holdings.sql')
+BULK_LOAD_TRIGGERS = ('holdings_insert', 'holdings_delete')
+
+
+def build(path, branch_count, holdings, books, seed=7):
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA synchronous = OFF')
+    migrate(conn)
+    rng = random.Random(seed)
+    per_branch = holdings // branch_count
+    with conn:
+        # Bulk load without the per-row holding triggers, then derive the counters once
+        for name in BULK_LOAD_TRIGGERS:
+            conn.execute(f"DROP TRIGGER {name}")
+        conn.execute("UPDATE transactions SET return_date = issue_date WHERE return_date IS NULL")
+        conn.execute("DELETE FROM holdings")
+        ids = [1] + [branches.add_branch(conn, f'Branch {i:02d}', f'B{i:02d}')
+                     for i in range(2, branch_count + 1)]
+        for branch_id in ids:
+            conn.executemany(
+                "INSERT INTO holdings (branch_id, book_id, total, available) VALUES (?, ?, ?, ?)",
+                ((branch_id, book_id, total, total)
+                 for book_id, total in ((b, rng.randint(1, 4))
+                                        for b in rng.sample(range(1, books + 1), per_branch)))
+            )
+        conn.execute("UPDATE books SET stock = COALESCE((SELECT SUM(total) FROM holdings h "
+                     "WHERE h.book_id = books.id), 0)")
+        conn.execute("UPDATE books SET available = stock")
+        conn.execute("""
+            UPDATE branches SET
+                titles = (SELECT COUNT(*) FROM holdings h WHERE h.branch_id = branches.id),
+                copies = (SELECT SUM(total) FROM holdings h WHERE h.branch_id = branches.id),
+                available = (SELECT SUM(available) FROM holdings h WHERE h.branch_id = branches.id)
+        """)
+        with open(BRANCHES_MIGRATION, encoding='utf-8') as f:
+            for statement in split_statements(f.read()):
+                if any(f'EXISTS {name}\n' in statement for name in BULK_LOAD_TRIGGERS):
+                    conn.execute(statement)
+
+    # Lend out ~20% of the copies from their branches
+    sample = conn.execute("SELECT branch_id, book_id FROM holdings ORDER BY random() LIMIT ?",
+                          (holdings // 5,)).fetchall()
+    users = conn.execute("SELECT MAX(id) FROM users").fetchone()[0]
+    with conn:
+        conn.executemany(
+            "INSERT INTO transactions (user_id, book_id, branch_id, issue_date, due_date, status) "
+            "VALUES (?, ?, ?, date('now'), date('now', '+14 days'), 'Borrowed')",
+            ((rng.randint(1, users), book_id, branch_id) for branch_id, book_id in sample)
+        )
+        # The layout the repository methods assume: one row per title and branch
+        conn.execute("""
+            CREATE TABLE books_flat AS
+            SELECT b.id AS book_id, b.title, b.author, br.name AS branch,
+                   h.total AS quantity_total, h.available AS quantity_available
+            FROM holdings h JOIN books b ON b.id = h.book_id JOIN branches br ON br.id = h.branch_id
+        """)
+    conn.close()
+
+
+def timed(label, func, runs):
+    started = time.perf_counter()
+    for i in range(runs):
+        func(i)
+    print(f"  {label:34s} {(time.perf_counter() - started) / runs * 1000:9.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--branches', type=int, default=20)
+    parser.add_argument('--holdings', type=int, default=1_000_000)
+    parser.add_argument('--books', type=int, default=100_000)
+    parser.add_argument('--runs', type=int, default=50)
+    args = parser.parse_args()
+
+    path = build_library_db(temp_db_path(), users=20_000, books=args.books, loans=50_000, reservations=0)
+    started = time.perf_counter()
+    build(path, args.branches, args.holdings, args.books)
+    print(f"{args.holdings} holdings in {args.branches} branches, {args.books} titles "
+          f"(built in {time.perf_counter() - started:.1f}s)")
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    names = [row[0] for row in conn.execute("SELECT name FROM branches ORDER BY id")]
+    rng = random.Random(1)
+    book_ids = [rng.randint(1, args.books) for _ in range(args.runs)]
+
+    print("flat books table (branch column):")
+    timed('branch catalogue page', lambda i: conn.execute(
+        "SELECT * FROM books_flat WHERE LOWER(branch) = LOWER(?) ORDER BY title LIMIT 50",
+        (names[i % len(names)],)).fetchall(), args.runs)
+    timed('branch title search', lambda i: conn.execute(
+        "SELECT * FROM books_flat WHERE LOWER(branch) = LOWER(?) AND title LIKE ? ORDER BY title LIMIT 50",
+        (names[i % len(names)], '%river%')).fetchall(), args.runs)
+    timed('branch counts', lambda i: conn.execute(
+        "SELECT SUM(quantity_total), SUM(quantity_available) FROM books_flat WHERE branch = ?",
+        (names[i % len(names)],)).fetchone(), args.runs)
+    timed('title availability', lambda i: conn.execute(
+        "SELECT branch, quantity_available FROM books_flat WHERE book_id = ?",
+        (book_ids[i],)).fetchall(), args.runs)
+    timed('network counts', lambda i: conn.execute(
+        "SELECT SUM(quantity_total), SUM(quantity_available) FROM books_flat").fetchone(), args.runs)
+
+    print("branch holdings:")
+    branch_ids = list(range(1, args.branches + 1))
+    timed('branch catalogue page', lambda i: branches.search(conn, branch_ids[i % len(branch_ids)]), args.runs)
+    timed('branch title search', lambda i: branches.search(
+        conn, branch_ids[i % len(branch_ids)], 'river'), args.runs)
+    timed('branch counts', lambda i: branches.branch_counts(conn, branch_ids[i % len(branch_ids)]), args.runs)
+    timed('title availability', lambda i: branches.title_availability(conn, book_ids[i]), args.runs)
+    timed('network counts', lambda i: branches.network_counts(conn), args.runs)
+
+    conn.execute('PRAGMA synchronous = NORMAL')
+    holdings = conn.execute("SELECT branch_id, book_id FROM holdings WHERE available > 0 "
+                            "ORDER BY random() LIMIT ?", (args.runs,)).fetchall()
+
+    def checkout(i):
+        branch_id, book_id = holdings[i]
+        assert circulation.borrow_book(conn, 1, book_id, branch_id=branch_id)[0]
+        assert circulation.return_book(conn, 1, book_id)[0]
+    # The desk user must be active and below the loan limit
+    conn.execute("UPDATE users SET status = 'Active' WHERE id = 1")
+    conn.execute("UPDATE transactions SET return_date = date('now') WHERE user_id = 1 AND return_date IS NULL")
+    timed('branch checkout + return', checkout, args.runs)
+    assert branches.verify(conn) == []
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
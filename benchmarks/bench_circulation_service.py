@@ -0,0 +1,146 @@
+"""
+Several front desks: each desk on its own database connection vs the shared
+circulation service.
+
+Every desk runs the same mix of searches, loan look-ups, borrows and
+returns. In ``direct`` mode a desk opens a connection per call, as the
+desktop pages do today, so desks contend for the SQLite write lock; in
+``service`` mode all desks talk to one ``circulation_server`` process
+(started as a subprocess) that owns the database. Reports throughput,
+latency percentiles and the number of ``database is locked`` errors.
+
+Usage:
+    python -m benchmarks.bench_circulation_service --desks 16 --ops 300
+"""
+import argparse
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, format_ms, percentiles, temp_db_path
+from services import circulation
+from services.circulation_client import CirculationClient
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class DirectDesk:
+    """Connection per call, like ``database.borrow_book`` and the return page."""
+
+    def __init__(self, path, busy_timeout):
+        self.path = path
+        self.busy_timeout = busy_timeout
+
+    def __getattr__(self, name):
+        func = getattr(circulation, name)
+
+        def call(*args):
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            try:
+                return func(conn, *args)
+            finally:
+                conn.close()
+        return call
+
+    def close(self):
+        pass
+
+
+def desk_loop(desk, seed, ops, users, books, latencies, errors):
+    rng = random.Random(seed)
+    borrowed = []
+    for _ in range(ops):
+        roll = rng.random()
+        started = time.perf_counter()
+        try:
+            if roll < 0.4:
+                desk.search_books(rng.choice(['Great', 'River', 'Shadow', 'Time']), 20)
+            elif roll < 0.6:
+                desk.user_loans(rng.randint(1, users))
+            elif roll < 0.8 or not borrowed:
+                user_id, book_id = rng.randint(1, users), rng.randint(1, books)
+                if desk.borrow_book(user_id, book_id)[0]:
+                    borrowed.append((user_id, book_id))
+            else:
+                desk.return_book(*borrowed.pop(rng.randrange(len(borrowed))))
+        except sqlite3.OperationalError as e:
+            errors.append(str(e))
+        latencies.append(time.perf_counter() - started)
+
+
+def run(make_desk, desks, ops, users, books):
+    latencies, errors = [], []
+    clients = [make_desk() for _ in range(desks)]
+    threads = [
+        threading.Thread(target=desk_loop, args=(client, seed, ops, users, books, latencies, errors))
+        for seed, client in enumerate(clients)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    for client in clients:
+        client.close()
+    return elapsed, latencies, errors
+
+
+def start_service(path):
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'services.circulation_server', '--db', path, '--port', str(port)],
+        cwd=PROJECT_ROOT, stderr=subprocess.DEVNULL
+    )
+    client = CirculationClient(f"http://127.0.0.1:{port}")
+    deadline = time.time() + 30
+    while not client.health():
+        if time.time() > deadline or process.poll() is not None:
+            process.kill()
+            raise RuntimeError('circulation service did not start')
+        time.sleep(0.1)
+    client.close()
+    return process, port
+
+
+def report(label, elapsed, latencies, errors):
+    print(f"{label:8s} {len(latencies) / elapsed:8.0f} ops/s  {format_ms(percentiles(latencies))}"
+          f"  locked={sum('locked' in e for e in errors)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--desks', type=int, default=16)
+    parser.add_argument('--ops', type=int, default=300, help='Operations per desk')
+    parser.add_argument('--busy-timeout', type=float, default=0.5,
+                        help='Busy timeout (s) of direct connections')
+    args = parser.parse_args()
+
+    users, books = 5_000, 20_000
+    path = build_library_db(temp_db_path(), users=users, books=books, loans=200_000, reservations=0)
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.close()
+
+    report('direct', *run(lambda: DirectDesk(path, args.busy_timeout), args.desks, args.ops, users, books))
+
+    process, port = start_service(path)
+    try:
+        report('service', *run(lambda: CirculationClient(f"http://127.0.0.1:{port}"),
+                               args.desks, args.ops, users, books))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == '__main__':
+    main()
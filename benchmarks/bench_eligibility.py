@@ -0,0 +1,107 @@
+"""
+Checkout latency with ``data.eligibility`` (one compiled rules query)
+against the four sequential checks the borrow paths used to run.
+
+Timed, per request:
+
+* ``sequential``  - user, book, open-loan count and duplicate-loan queries
+* ``compiled``    - ``eligibility.check`` (rules cached; one statement)
+* ``bulk``        - ``eligibility.check_patrons`` for ``--patrons`` patrons at once, per patron
+* ``checkout``    - ``services.circulation.borrow_book`` end to end (check + insert + commit),
+                    with the loan returned again outside the timing
+
+Usage:
+    python -m benchmarks.bench_eligibility --loans 1000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, format_ms, percentiles, temp_db_path
+from data import eligibility
+from data.migrator import migrate
+from services import circulation
+
+
+def sequential_checks(conn, user_id, book_id):
+    """The checks as ``database.borrow_book`` ran them before the rules engine."""
+    user = conn.execute("SELECT id, status FROM users WHERE id = ?", (user_id,)).fetchone()
+    if not user or user[1] != 'Active':
+        return False
+    book = conn.execute("SELECT id, title, available FROM books WHERE id = ?", (book_id,)).fetchone()
+    if not book or book[2] <= 0:
+        return False
+    loans = conn.execute("SELECT COUNT(*) FROM transactions WHERE user_id = ? AND return_date IS NULL",
+                         (user_id,)).fetchone()[0]
+    if loans >= 5:
+        return False
+    return conn.execute("SELECT id FROM transactions WHERE user_id = ? AND book_id = ? AND return_date IS NULL",
+                        (user_id, book_id)).fetchone() is None
+
+
+def timed(func, requests):
+    samples = []
+    for request in requests:
+        started = time.perf_counter()
+        func(*request)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--books', type=int, default=50000)
+    parser.add_argument('--loans', type=int, default=1_000_000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--patrons', type=int, default=500)
+    args = parser.parse_args()
+
+    path = build_library_db(temp_db_path(), users=args.users, books=args.books, loans=args.loans)
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    # A role limit and a fine ceiling at the median balance (018 fined every
+    # late return of the synthetic history), so the compiled CASEs are not trivial
+    median = conn.execute(
+        "SELECT balance_cents FROM patron_balances ORDER BY balance_cents "
+        "LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM patron_balances)"
+    ).fetchone()[0]
+    eligibility.set_rule(conn, 'max_loans', 8, role='librarian')
+    eligibility.set_rule(conn, 'max_fine_balance', median)
+    conn.commit()
+
+    rng = random.Random(11)
+    requests = [(rng.randint(1, args.users), rng.randint(1, args.books)) for _ in range(args.requests)]
+    eligible = sum(eligibility.check(conn, *request).eligible for request in requests)
+    print(f"{len(requests)} requests, {eligible} eligible")
+
+    print(f"sequential {format_ms(percentiles(timed(lambda u, b: sequential_checks(conn, u, b), requests)))}")
+    print(f"compiled   {format_ms(percentiles(timed(lambda u, b: eligibility.check(conn, u, b), requests)))}")
+
+    book_ids = [rng.randint(1, args.books) for _ in range(20)]
+    bulk = []
+    for book_id in book_ids:
+        patrons = rng.sample(range(1, args.users + 1), args.patrons)
+        started = time.perf_counter()
+        eligibility.check_patrons(conn, patrons, book_id)
+        bulk.append((time.perf_counter() - started) / args.patrons)
+    print(f"bulk       {format_ms(percentiles(bulk))} per patron ({args.patrons} per statement)")
+
+    samples = []
+    for user_id, book_id in requests[:500]:
+        started = time.perf_counter()
+        success, _ = circulation.borrow_book(conn, user_id, book_id)
+        samples.append(time.perf_counter() - started)
+        if success:
+            circulation.return_book(conn, user_id, book_id)
+    print(f"checkout   {format_ms(percentiles(samples))}")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Entity lookups: connection-per-call vs the entity cache.
+
+Replays a skewed stream of book and user lookups by id (as the borrow
+flow and edit dialogs issue them), with a write from another connection
+every ``--write-every`` lookups, and reports the mean cost per lookup and
+the cache counters.
+
+Usage:
+    python -m benchmarks.bench_entity_cache --lookups 50000 --write-every 100
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, temp_db_path
+from data.entity_cache import EntityCache
+from data.migrator import migrate
+
+
+def load_row(path, table, row_id):
+    # Mirrors database.get_book_by_id: a fresh connection per lookup
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"SELECT * FROM {table} WHERE id = ?", (row_id,)).fetchone()
+    finally:
+        conn.close()
+
+
+def workload(n, users, books, seed=3):
+    rng = random.Random(seed)
+    for _ in range(n):
+        if rng.random() < 0.5:
+            yield 'user', 'users', min(users, int(rng.paretovariate(1.2)))
+        else:
+            yield 'book', 'books', min(books, int(rng.paretovariate(1.2)))
+
+
+def run(path, lookups, users, books, write_every, cache=None):
+    writer = sqlite3.connect(path)
+    rng = random.Random(11)
+    started = time.perf_counter()
+    for i, (entity, table, row_id) in enumerate(workload(lookups, users, books)):
+        if write_every and i % write_every == 0:
+            with writer:
+                writer.execute("UPDATE books SET available = available WHERE id = ?",
+                               (rng.randint(1, books),))
+        if cache is None:
+            load_row(path, table, row_id)
+        else:
+            cache.get(entity, 'id', row_id, lambda: load_row(path, table, row_id))
+    elapsed = time.perf_counter() - started
+    writer.close()
+    return elapsed / lookups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lookups', type=int, default=50_000)
+    parser.add_argument('--write-every', type=int, default=100)
+    parser.add_argument('--maxsize', type=int, default=2048)
+    args = parser.parse_args()
+
+    users, books = 20_000, 50_000
+    path = build_library_db(temp_db_path(), users=users, books=books, loans=10_000, reservations=0)
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    conn.close()
+
+    uncached = run(path, args.lookups, users, books, args.write_every)
+    cache = EntityCache(path, maxsize=args.maxsize)
+    cached = run(path, args.lookups, users, books, args.write_every, cache)
+    print(f"connection per call: {uncached * 1e6:8.1f}us/lookup")
+    print(f"entity cache:        {cached * 1e6:8.1f}us/lookup")
+    print(cache.stats())
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Fine ledger (``data.fines``, migration 018) against summing fines on demand.
+
+Migration 018 assesses the late returns of the synthetic history (about
+half of them), so the ledger starts with a realistic number of fines. Timed:
+
+* ``migrate``       - installing 018 (backfill of fines, balances, triggers)
+* ``top debtors``   - ``top_debtors`` vs ``GROUP BY`` over fines joined to loans
+* ``patron fines``  - ``patron_fines``/``patron_balance`` vs the same via transactions
+* ``post payments`` - ``post_payments`` batches vs one commit per payment
+
+The plans of the ledger reads are printed so covering-index use can be checked.
+
+Usage:
+    python -m benchmarks.bench_fine_ledger --loans 1000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, format_ms, percentiles, temp_db_path
+from data import fines
+from data.migrator import migrate
+
+ON_DEMAND_TOP = """
+    SELECT t.user_id, SUM(CASE WHEN f.paid THEN 0 ELSE f.amount END) AS owed
+    FROM fines f JOIN transactions t ON t.id = f.transaction_id
+    GROUP BY t.user_id HAVING owed > 0
+    ORDER BY owed DESC LIMIT 10
+"""
+ON_DEMAND_PATRON = """
+    SELECT f.id, f.transaction_id, f.amount, f.paid, f.created_at
+    FROM transactions t JOIN fines f ON f.transaction_id = t.id
+    WHERE t.user_id = ?
+    ORDER BY f.created_at, f.id
+"""
+
+
+def time_calls(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def plan(conn, sql, params=()):
+    return '; '.join(row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, params))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--books', type=int, default=50000)
+    parser.add_argument('--loans', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--batch', type=int, default=1000)
+    args = parser.parse_args()
+
+    path = build_library_db(temp_db_path(), users=args.users, books=args.books, loans=args.loans)
+    conn = sqlite3.connect(path)
+    # The application schema indexes fines by loan (002), so the on-demand side gets it too
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_fines_transaction ON fines(transaction_id)")
+    migrate(conn, target=17)
+    started = time.perf_counter()
+    migrate(conn, target=18)
+    count = conn.execute("SELECT COUNT(*) FROM fines").fetchone()[0]
+    print(f"migrate        {time.perf_counter() - started:.2f}s ({count} fines)")
+    migrate(conn)
+    rng = random.Random(7)
+
+    print(f"top debtors    ledger    {format_ms(percentiles(time_calls(lambda: fines.top_debtors(conn), args.repeat)))}")
+    print(f"               on demand {format_ms(percentiles(time_calls(lambda: conn.execute(ON_DEMAND_TOP).fetchall(), 3)))}")
+    print(f"  plan: {plan(conn, 'SELECT user_id, balance_cents FROM patron_balances WHERE balance_cents > 0 ORDER BY balance_cents DESC LIMIT 10')}")
+
+    patrons = [rng.randint(1, args.users) for _ in range(args.repeat * 10)]
+    ledger = iter(patrons)
+    on_demand = iter(patrons)
+    print("patron fines   ledger    " + format_ms(percentiles(time_calls(
+        lambda: (lambda user: (fines.patron_fines(conn, user), fines.patron_balance(conn, user)))(next(ledger)),
+        len(patrons)))))
+    print("               on demand " + format_ms(percentiles(time_calls(
+        lambda: conn.execute(ON_DEMAND_PATRON, (next(on_demand),)).fetchall(), len(patrons)))))
+    print(f"  plan: {plan(conn, 'SELECT id, transaction_id, amount, paid, created_at FROM fines WHERE user_id = ? ORDER BY created_at, id', (1,))}")
+
+    batch = [fines.Payment(rng.randint(1, args.users), rng.choice([0.5, 1.0, 2.5, 5.0]), 'cash', f'bench-{i}')
+             for i in range(args.batch)]
+    report = fines.post_payments(conn, batch)
+    print(f"post payments  batch     {report.posted} in {report.seconds:.3f}s "
+          f"({report.posted / report.seconds:,.0f}/s)")
+    again = fines.post_payments(conn, batch)
+    print(f"               repost    {again.duplicates} duplicates in {again.seconds:.3f}s")
+    singles = [fines.Payment(p.user_id, p.amount, p.method, f'single-{i}') for i, p in enumerate(batch)]
+    started = time.perf_counter()
+    for payment in singles:
+        fines.post_payments(conn, [payment])
+    seconds = time.perf_counter() - started
+    print(f"               one each  {len(singles)} in {seconds:.3f}s ({len(singles) / seconds:,.0f}/s)")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
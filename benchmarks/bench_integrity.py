@@ -0,0 +1,70 @@
+"""
+Time the integrity catalogue on a large library database.
+
+Builds a database with ``--loans`` transactions plus the availability and
+branch-holdings triggers, seeds a handful of known problems, then times
+``data.integrity.run_checks`` per check: serially, with ``--workers``
+connections, and with ``--workers`` and repair.
+
+Usage:
+    python -m benchmarks.bench_integrity --loans 5000000
+"""
+import argparse
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, temp_db_path
+from data import integrity
+from data.migrator import migrate
+
+PROBLEMS = (
+    "UPDATE transactions SET status = 'returned' WHERE id % 10007 = 0",
+    "UPDATE books SET available = available + 1 WHERE id % 97 = 0",
+    "UPDATE reservations SET status = lower(status) WHERE id % 13 = 0",
+    "INSERT INTO reservations (user_id, book_id, reservation_date, status) "
+    "SELECT user_id + 1000000, book_id, reservation_date, status FROM reservations WHERE id % 101 = 0",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=50000)
+    parser.add_argument('--books', type=int, default=100000)
+    parser.add_argument('--loans', type=int, default=5_000_000)
+    parser.add_argument('--reservations', type=int, default=200000)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument('--db', help='Reuse a database built by an earlier run')
+    args = parser.parse_args()
+
+    if args.db and os.path.exists(args.db):
+        path = args.db
+    else:
+        path = build_library_db(args.db or temp_db_path(), users=args.users, books=args.books,
+                                loans=args.loans, reservations=args.reservations, years=args.years)
+        conn = sqlite3.connect(path)
+        migrate(conn)
+        conn.close()
+
+    conn = sqlite3.connect(path)
+    for statement in PROBLEMS:
+        conn.execute(statement)
+    conn.commit()
+    loans = conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+    print(f"database {os.path.getsize(path) / 1e6:.1f} MB, {loans} loans")
+
+    for workers, repair in ((1, False), (args.workers, False), (args.workers, True))[args.workers == 1:]:
+        report = integrity.run_checks(conn, repair=repair, workers=workers)
+        print(f"\nrun_checks(workers={workers}, repair={repair}): {report['seconds']:.2f}s, ok={report['ok']}")
+        for result in report['checks']:
+            repaired = f"  repaired {result['repaired']}" if result.get('repaired') else ''
+            print(f"  {result['name']:30s} {result['status']:9s} {result['count']:8d} "
+                  f"{result['seconds'] * 1000:9.1f}ms{repaired}")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
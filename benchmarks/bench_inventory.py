@@ -0,0 +1,115 @@
+"""
+Availability counters: per-title recount vs the set-based reconciliation,
+and the cost the triggers add to a checkout.
+
+Builds a library with ``--loans`` transactions, knocks the counters of
+``--drift`` titles out of line and times
+
+* a per-title job (one COUNT query and UPDATE per title, as the old
+  fix scripts did it),
+* ``data.inventory.reconcile`` in check and repair mode,
+* ``--checkouts`` checkout/return pairs with the counters updated by hand
+  (the code before migration 010) and by the triggers.
+
+Usage:
+    python -m benchmarks.bench_inventory --loans 1000000 --books 50000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, temp_db_path
+from data.inventory import reconcile
+from data.migrator import migrate
+
+TRIGGERS = ('availability_loan_check', 'availability_loan_insert', 'availability_loan_update',
+            'availability_loan_delete', 'availability_stock_change')
+
+
+def add_drift(conn, books, titles, seed=5):
+    rng = random.Random(seed)
+    with conn:
+        conn.executemany("UPDATE books SET available = available + ? WHERE id = ?",
+                         ((rng.choice((-2, -1, 1, 3)), rng.randint(1, books)) for _ in range(titles)))
+
+
+def per_title_job(conn):
+    fixed = 0
+    with conn:
+        for book_id, stock, available in conn.execute("SELECT id, stock, available FROM books").fetchall():
+            on_loan = conn.execute(
+                "SELECT COUNT(*) FROM transactions WHERE book_id = ? AND return_date IS NULL", (book_id,)
+            ).fetchone()[0]
+            if available != stock - on_loan:
+                conn.execute("UPDATE books SET available = ? WHERE id = ?", (stock - on_loan, book_id))
+                fixed += 1
+    return fixed
+
+
+def checkouts(conn, n, books, by_hand, seed=9):
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    for _ in range(n):
+        book_id = rng.randint(1, books)
+        with conn:
+            if conn.execute("SELECT available FROM books WHERE id = ?", (book_id,)).fetchone()[0] <= 0:
+                continue
+            loan_id = conn.execute(
+                "INSERT INTO transactions (user_id, book_id, issue_date, due_date, status) "
+                "VALUES (1, ?, date('now'), date('now', '+14 days'), 'Borrowed')", (book_id,)
+            ).lastrowid
+            if by_hand:
+                conn.execute("UPDATE books SET available = available - 1 WHERE id = ?", (book_id,))
+        with conn:
+            conn.execute("UPDATE transactions SET return_date = date('now'), status = 'Returned' "
+                         "WHERE id = ?", (loan_id,))
+            if by_hand:
+                conn.execute("UPDATE books SET available = available + 1 WHERE id = ?", (book_id,))
+    return (time.perf_counter() - started) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--loans', type=int, default=1_000_000)
+    parser.add_argument('--books', type=int, default=50_000)
+    parser.add_argument('--drift', type=int, default=500, help='Titles with a wrong counter')
+    parser.add_argument('--checkouts', type=int, default=20_000)
+    args = parser.parse_args()
+
+    path = build_library_db(temp_db_path(), users=20_000, books=args.books, loans=args.loans,
+                            reservations=0, open_loan_ratio=0.1)
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA synchronous = NORMAL')
+    migrate(conn)
+    open_loans = conn.execute("SELECT COUNT(*) FROM transactions WHERE return_date IS NULL").fetchone()[0]
+    print(f"{args.loans} loans ({open_loans} open), {args.books} titles, {args.drift} drifted counters")
+
+    add_drift(conn, args.books, args.drift)
+    started = time.perf_counter()
+    fixed = per_title_job(conn)
+    print(f"per-title job:        {(time.perf_counter() - started) * 1000:9.1f}ms  ({fixed} fixed)")
+
+    add_drift(conn, args.books, args.drift)
+    report = reconcile(conn)
+    print(f"reconcile (check):    {report.seconds * 1000:9.1f}ms  ({len(report.drifted)} drifted)")
+    report = reconcile(conn, repair=True)
+    print(f"reconcile (repair):   {report.seconds * 1000:9.1f}ms  ({report.repaired} fixed)")
+    assert reconcile(conn).ok
+
+    with_triggers = checkouts(conn, args.checkouts, args.books, by_hand=False)
+    assert reconcile(conn).ok
+    for name in TRIGGERS:
+        conn.execute(f"DROP TRIGGER {name}")
+    by_hand = checkouts(conn, args.checkouts, args.books, by_hand=True)
+    print(f"checkout+return, counters by hand: {by_hand * 1e6:8.1f}us")
+    print(f"checkout+return, triggers:         {with_triggers * 1e6:8.1f}us")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Login window paint times while it is being resized: the background scaled
+from the full photo on every paint vs the cached one (``pixmap_cache``).
+
+Each variant builds ``LoginWindow`` with the real ``assets/login_bg.jpg``,
+then sweeps the window between ``--from`` and ``--to`` size in ``--steps``
+steps and back, painting synchronously after every resize. Reported: time
+to the first painted window, the resize+paint frame time, a repaint at a
+fixed size and the SVG icons rendered through the cache. Every variant runs
+in its own process, so nothing is shared between them.
+
+Needs PyQt5; runs headless with ``QT_QPA_PLATFORM=offscreen``.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_login_paint --steps 30
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import format_ms, percentiles
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def old_background_widget():
+    # login_window.BackgroundWidget before the pixmap cache
+    from PyQt5.QtCore import Qt, pyqtSignal
+    from PyQt5.QtGui import QPainter, QPixmap
+    from PyQt5.QtWidgets import QSizePolicy, QWidget
+
+    class BackgroundWidget(QWidget):
+        resized = pyqtSignal()
+
+        def __init__(self, pixmap_path, parent=None):
+            super().__init__(parent)
+            self.pixmap = QPixmap(pixmap_path)
+            self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+        def resizeEvent(self, event):
+            super().resizeEvent(event)
+            self.resized.emit()
+            self.update()
+
+        def paintEvent(self, event):
+            if not self.pixmap.isNull():
+                window_size = self.size()
+                scaled_pixmap = self.pixmap.scaled(window_size, Qt.KeepAspectRatioByExpanding,
+                                                   Qt.SmoothTransformation)
+                x = (scaled_pixmap.width() - window_size.width()) // 2
+                y = (scaled_pixmap.height() - window_size.height()) // 2
+                painter = QPainter(self)
+                painter.setRenderHint(QPainter.SmoothPixmapTransform)
+                painter.drawPixmap(0, 0, scaled_pixmap, x, y, window_size.width(), window_size.height())
+                painter.end()
+            super().paintEvent(event)
+
+    return BackgroundWidget
+
+
+def sizes(start, end, steps):
+    (w0, h0), (w1, h1) = start, end
+    forward = [(w0 + (w1 - w0) * i // steps, h0 + (h1 - h0) * i // steps) for i in range(steps + 1)]
+    return forward + forward[-2::-1]
+
+
+def run_variant(variant, start, end, steps, repaints):
+    from PyQt5.QtCore import QSize
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    import login_window
+    if variant == 'full':
+        login_window.BackgroundWidget = old_background_widget()
+
+    started = time.perf_counter()
+    window = login_window.LoginWindow(bg_image_path=os.path.join(BASE_DIR, 'assets', 'login_bg.jpg'))
+    window.resize(*start)
+    window.show()
+    app.processEvents()
+    window.repaint()
+    first = time.perf_counter() - started
+
+    frames = []
+    for width, height in sizes(start, end, steps):
+        started = time.perf_counter()
+        window.resize(width, height)
+        app.processEvents()
+        window.repaint()
+        frames.append(time.perf_counter() - started)
+
+    still = []
+    for _ in range(repaints):
+        started = time.perf_counter()
+        window.repaint()
+        still.append(time.perf_counter() - started)
+
+    icons = []
+    if variant == 'cached':
+        from pixmap_cache import icon
+        for _ in range(repaints):
+            started = time.perf_counter()
+            for name in ('alert', 'back_arrow', 'check_circle', 'delete', 'edit'):
+                icon(name).pixmap(QSize(24, 24))
+            icons.append(time.perf_counter() - started)
+    return {'first': first, 'frames': frames, 'still': still, 'icons': icons}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--from', dest='start', default='1200x800')
+    parser.add_argument('--to', dest='end', default='1920x1080')
+    parser.add_argument('--steps', type=int, default=30)
+    parser.add_argument('--repaints', type=int, default=20)
+    parser.add_argument('--variant', choices=('full', 'cached'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    start = tuple(int(v) for v in args.start.split('x'))
+    end = tuple(int(v) for v in args.end.split('x'))
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, start, end, args.steps, args.repaints)))
+        return
+
+    print(f"login window {args.start} <-> {args.end}, {args.steps} steps each way")
+    for variant in ('full', 'cached'):
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_login_paint', '--from', args.start, '--to', args.end,
+             '--steps', str(args.steps), '--repaints', str(args.repaints), '--variant', variant],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        label = 'scale per paint' if variant == 'full' else 'pixmap cache'
+        print(f"{label:16s} first paint {result['first'] * 1000:8.1f}ms")
+        print(f"{'':16s} resize+paint {format_ms(percentiles(result['frames']))}")
+        print(f"{'':16s} repaint      {format_ms(percentiles(result['still']))}")
+        if result['icons']:
+            print(f"{'':16s} 5 icons      {format_ms(percentiles(result['icons']))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Idle-time maintenance: what a budgeted run costs and what it gives back.
+
+Builds a library database and switches it to ``auto_vacuum = INCREMENTAL``
+(run 0, a full ``VACUUM``), deletes ``--purge`` of its loans (as an archive
+job would) while a reader keeps the WAL from being checkpointed, then calls
+``MaintenanceService.run()`` with ``--budget`` seconds until the freelist
+is empty. Each run prints the time spent per task and the file, WAL and
+freelist sizes after it.
+
+The desk queries are timed before the first run (no statistics) and after
+the last (``sqlite_stat1`` filled by ``ANALYZE``).
+
+Usage:
+    python -m benchmarks.bench_maintenance --loans 300000 --budget 0.05
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, format_ms, percentiles, temp_db_path
+from data.migrator import migrate_path
+from services.maintenance_service import MaintenanceService
+
+QUERIES = {
+    'overdue by member': "SELECT COUNT(*) FROM transactions WHERE user_id = ? AND status = 'Borrowed' "
+                         "AND due_date < date('now')",
+    'book history': "SELECT id, user_id, due_date FROM transactions WHERE book_id = ? "
+                    "AND due_date > date('now', '-90 days') ORDER BY due_date",
+}
+
+
+def time_queries(path, users, books, repeat=300):
+    conn = sqlite3.connect(path)
+    try:
+        results = {}
+        for label, sql in QUERIES.items():
+            key_range = users if 'user_id' in sql else books
+            samples = []
+            for i in range(repeat):
+                started = time.perf_counter()
+                conn.execute(sql, (i * 7919 % key_range + 1,)).fetchall()
+                samples.append(time.perf_counter() - started)
+            results[label] = percentiles(samples)
+        return results
+    finally:
+        conn.close()
+
+
+def sizes(path):
+    wal = path + '-wal'
+    return os.path.getsize(path) / 1e6, (os.path.getsize(wal) if os.path.exists(wal) else 0) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--books', type=int, default=20000)
+    parser.add_argument('--loans', type=int, default=300_000)
+    parser.add_argument('--purge', type=float, default=0.4, help='Fraction of loans to delete')
+    parser.add_argument('--budget', type=float, default=0.05)
+    args = parser.parse_args()
+
+    path = build_library_db(temp_db_path(), users=args.users, books=args.books, loans=args.loans)
+    # Up to the maintenance log only: the first run below makes 016's switch itself
+    migrate_path(path, target=15)
+    service = MaintenanceService(path, budget=args.budget, max_vacuum_bytes=1 << 40)
+    report = service.run(budget=60)
+    print(f"run  0 {report['seconds'] * 1000:5.0f}ms  file {sizes(path)[0]:6.1f} MB  "
+          f"fragmentation {report['before']['fragmentation']:.3f}  (switch to incremental)")
+    # Keep a connection open so closing the writer below does not checkpoint the WAL
+    reader = sqlite3.connect(path)
+    reader.execute("SELECT 1 FROM books LIMIT 1").fetchall()
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("DELETE FROM transactions WHERE id % 100 < ?", (int(args.purge * 100),))
+        conn.execute("DELETE FROM sqlite_stat1")
+    conn.close()
+
+    before = time_queries(path, args.users, args.books)
+    stats = service.stats()
+    print(f"start  file {sizes(path)[0]:6.1f} MB  wal {sizes(path)[1]:6.1f} MB  "
+          f"freelist {stats['freelist_pages']:6d}  fragmentation {stats['fragmentation']:.3f}")
+    for run in range(1, 50):
+        report = service.run()
+        tasks = '  '.join(
+            f"{name} {result['seconds'] * 1000:5.0f}ms" if isinstance(result, dict) else f"{name} {result}"
+            for name, result in report['tasks'].items()
+        )
+        file_mb, wal_mb = sizes(path)
+        print(f"run {run:2d} {report['seconds'] * 1000:5.0f}ms  file {file_mb:6.1f} MB  wal {wal_mb:6.1f} MB  "
+              f"freelist {report['after']['freelist_pages']:6d}  {tasks}")
+        if report['after']['freelist_pages'] == 0 and report['tasks']['checkpoint'] != 'skipped':
+            break
+    reader.close()
+
+    after = time_queries(path, args.users, args.books)
+    for label in QUERIES:
+        print(f"{label:18s} no stats {format_ms(before[label])}")
+        print(f"{'':18s} analyzed {format_ms(after[label])}")
+    print(f"fragmentation {service.stats()['fragmentation']:.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Notification engine throughput.
+
+Builds a library database, adds ``--notices`` overdue open loans, times the
+scan that queues a notice for each, then delivers the queue to a local
+aiosmtpd sink (a separate process) with pooled connections. A
+connection-per-message baseline is timed on a sample for comparison.
+
+Usage:
+    python -m benchmarks.bench_notifications --notices 100000 --connections 1 4 8
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, temp_db_path
+from data.migrator import migrate_path
+from services.mailer import AsyncSMTPClient, OutgoingMessage
+from services.notification_service import NotificationService
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def add_overdue_loans(path, count, users, books, seed=7):
+    rng = random.Random(seed)
+    today = date.today()
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO transactions (user_id, book_id, issue_date, due_date, status) "
+            "VALUES (?, ?, ?, ?, 'Borrowed')",
+            (
+                (rng.randint(1, users), rng.randint(1, books), issued.isoformat(),
+                 (issued + timedelta(days=14)).isoformat())
+                for issued in (today - timedelta(days=rng.randint(15, 20)) for _ in range(count))
+            )
+        )
+    conn.close()
+
+
+def start_smtp_sink(port):
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'aiosmtpd', '-n', '-l', f'127.0.0.1:{port}',
+         '-c', 'aiosmtpd.handlers.Sink'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError('aiosmtpd did not start')
+
+
+def requeue(path):
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("UPDATE notifications SET status = 'pending', attempts = 0, sent_at = NULL")
+    conn.close()
+
+
+async def connection_per_message(messages, port):
+    for message in messages:
+        client = AsyncSMTPClient('127.0.0.1', port)
+        await client.send(message)
+        await client.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--notices', type=int, default=100_000)
+    parser.add_argument('--connections', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--baseline-sample', type=int, default=2000)
+    args = parser.parse_args()
+
+    path = build_library_db(temp_db_path(), users=20_000, books=20_000, loans=100_000,
+                            reservations=10_000, years=1)
+    add_overdue_loans(path, args.notices, users=20_000, books=20_000)
+    migrate_path(path)
+    port = free_port()
+    server = start_smtp_sink(port)
+    try:
+        service = NotificationService(path, smtp_host='127.0.0.1', smtp_port=port,
+                                      batch_size=args.batch_size)
+        started = time.perf_counter()
+        queued = service.scan()
+        scan_time = time.perf_counter() - started
+        started = time.perf_counter()
+        rescan = service.scan()
+        rescan_time = time.perf_counter() - started
+        pending = service.pending_count()
+        print(f"scan: {queued} in {scan_time * 1000:.0f}ms; "
+              f"rescan (all duplicates): {sum(rescan.values())} new in {rescan_time * 1000:.0f}ms")
+
+        sample = [OutgoingMessage(i, service.sender, 'member@example.com', 'Overdue Notice', 'Body')
+                  for i in range(args.baseline_sample)]
+        started = time.perf_counter()
+        asyncio.run(connection_per_message(sample, port))
+        rate = len(sample) / (time.perf_counter() - started)
+        print(f"connection per message: {rate:>8.0f} msg/s")
+
+        for connections in args.connections:
+            requeue(path)
+            service.connections = connections
+            started = time.perf_counter()
+            result = service.deliver_pending()
+            elapsed = time.perf_counter() - started
+            print(f"pooled x{connections:<2}: {pending} notices in {elapsed:.1f}s "
+                  f"= {result['sent'] / elapsed:>8.0f} msg/s ({result['failed']} failed)")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Time to show each dashboard page, and to restyle widgets that change state.
+
+Builds the dashboard the way ``main.py`` does (Fusion style plus the
+application theme) on a synthetic database, then measures:
+
+* building the dashboard window with all its pages;
+* the first time each page is shown and painted (style sheets are
+  resolved when a widget is first polished, so this is where per-widget
+  ``setStyleSheet`` calls cost the most) and the p50 of showing it again;
+* re-rendering the notification list for a search keystroke;
+* moving the sidebar selection, and restyling a card with 40 labels by
+  ``setStyleSheet`` vs by the ``theme.set_variant`` property.
+
+The database is selected through ``INTELLI_LIBRARIA_DB`` so the real
+``intelli_libraria.db`` is never touched.
+
+Needs PyQt5; runs headless with ``QT_QPA_PLATFORM=offscreen``.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_page_render --rounds 20
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, format_ms, percentiles, temp_db_path
+from data.migrator import migrate_path
+from services.notification_service import NotificationService
+
+DANGER_CARD = "QFrame { background: #fee2e2; border: 1px solid #ef4444; border-radius: 10px; }"
+PRIMARY_CARD = "QFrame { background: #dbeafe; border: 1px solid #3b82f6; border-radius: 10px; }"
+
+
+def timed(func, rounds):
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--users', type=int, default=3000)
+    parser.add_argument('--books', type=int, default=3000)
+    args = parser.parse_args()
+
+    path = build_library_db(temp_db_path(), users=args.users, books=args.books, loans=5000,
+                            reservations=5000)
+    migrate_path(path)
+    # Queue due-date and overdue notices for the notification list
+    NotificationService(path).scan()
+    os.environ['INTELLI_LIBRARIA_DB'] = path
+    from PyQt5.QtCore import QEvent
+    from PyQt5.QtWidgets import QApplication, QFrame, QLabel, QVBoxLayout
+    from theme import apply_theme, set_variant
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    app.setStyle("Fusion")
+    apply_theme(app)
+
+    # The pages print progress; keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        import dashboard_window
+        started = time.perf_counter()
+        window = dashboard_window.DashboardWindow()
+        window.resize(1400, 900)
+        app.processEvents()
+        window.grab()
+        build_seconds = time.perf_counter() - started
+    print(f"{'build dashboard':24s} {build_seconds * 1000:8.1f}ms")
+
+    stack = window.pages_stack
+
+    def show(page):
+        stack.setCurrentWidget(page)
+        app.processEvents()
+        window.grab()
+
+    # Stack order: dashboard, user management, add user, then the other pages
+    pages = [stack.widget(0)] + [stack.widget(index) for index in range(1, stack.count()) if index != 2]
+    for button, page in zip(window.sidebar.buttons, pages):
+        elsewhere = stack.widget(2)
+
+        def show_again():
+            show(page)
+            stack.setCurrentWidget(elsewhere)
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            show(page)
+            first = time.perf_counter() - started
+            stack.setCurrentWidget(elsewhere)
+            again = timed(show_again, args.rounds)
+        print(f"{button.page_name:24s} first {first * 1000:7.1f}ms   again p50={again['p50'] * 1000:6.2f}ms")
+
+    notifications = window.notification_reminder_page
+    show(notifications)
+    print(f"{'notifications listed':24s} {len(notifications.notifications_data)}")
+
+    def keystroke():
+        notifications.search_query = 'o' if notifications.search_query != 'o' else ''
+        notifications.render_notifications_content()
+        app.processEvents()
+        # The replaced rows, as the event loop would delete them
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+        window.grab()
+    print(f"{'notification keystroke':24s} {format_ms(timed(keystroke, args.rounds))}")
+
+    buttons = window.sidebar.buttons
+    picks = iter(range(10 ** 9))
+
+    def select():
+        window.sidebar.select_button(buttons[next(picks) % len(buttons)])
+        app.processEvents()
+        window.sidebar.grab()
+    print(f"{'sidebar selection':24s} {format_ms(timed(select, args.rounds))}")
+
+    # A card with labels: a style sheet set on it is resolved for every child,
+    # a property change re-polishes the card alone
+    card = QFrame()
+    card.setObjectName("statCard")
+    layout = QVBoxLayout(card)
+    for row in range(40):
+        layout.addWidget(QLabel(f"Line {row}"))
+    card.show()
+    app.processEvents()
+    flips = iter(range(10 ** 9))
+
+    def restyle_by_sheet():
+        card.setStyleSheet(DANGER_CARD if next(flips) % 2 else PRIMARY_CARD)
+        card.grab()
+
+    def restyle_by_property():
+        set_variant(card, 'variant', 'danger' if next(flips) % 2 else 'primary')
+        card.grab()
+    print(f"{'restyle by setStyleSheet':24s} {format_ms(timed(restyle_by_sheet, args.rounds))}")
+    card.setStyleSheet('')
+    print(f"{'restyle by property':24s} {format_ms(timed(restyle_by_property, args.rounds))}")
+
+
+if __name__ == '__main__':
+    main()
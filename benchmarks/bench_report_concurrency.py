@@ -0,0 +1,139 @@
+"""
+Borrow latency while a heavy report runs.
+
+Runs checkouts in a loop while the user-activity report (the widest join in
+``database.get_user_activity``) runs repeatedly, and prints borrow latency
+percentiles for three setups:
+
+* ``idle``     - no report running (baseline)
+* ``inline``   - report runs on the same thread as the borrows, as the report
+                 page did before it moved to the report thread
+* ``readonly`` - report runs on the ``ReportExecutor`` read-only snapshot thread
+
+Usage:
+    python -m benchmarks.bench_report_concurrency --loans 200000 --borrows 300
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, format_ms, percentiles, temp_db_path
+from data.readonly import ReportExecutor
+
+USER_ACTIVITY_SQL = """
+    SELECT 
+        u.id as user_id,
+        u.full_name as user_name,
+        COUNT(DISTINCT t.id) as total_borrowed,
+        COUNT(DISTINCT r.id) as total_reservations,
+        MAX(t.issue_date) as last_activity
+    FROM users u
+    LEFT JOIN transactions t ON u.id = t.user_id
+    LEFT JOIN reservations r ON u.id = r.user_id
+    WHERE t.issue_date >= date('now', ? || ' days')
+       OR r.reservation_date >= date('now', ? || ' days')
+    GROUP BY u.id, u.full_name
+    ORDER BY last_activity DESC
+"""
+
+
+def borrow(db_path, user_id, book_id):
+    """Connect-per-call checkout, equivalent to ``database.borrow_book``'s writes."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT stock FROM books WHERE id = ?", (book_id,))
+        now = datetime.now()
+        cursor.execute(
+            """
+            INSERT INTO transactions (user_id, book_id, issue_date, due_date, status)
+            VALUES (?, ?, ?, ?, 'Borrowed')
+            """,
+            (user_id, book_id, now.strftime('%Y-%m-%d %H:%M:%S'),
+             (now + timedelta(days=14)).strftime('%Y-%m-%d %H:%M:%S'))
+        )
+        cursor.execute(
+            "UPDATE books SET stock = stock - 1, available = available - 1 WHERE id = ?",
+            (book_id,)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def run_report_inline(db_path, days):
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        return conn.execute(USER_ACTIVITY_SQL, (f'-{days}', f'-{days}')).fetchall()
+    finally:
+        conn.close()
+
+
+def run(db_path, mode, borrows, users, books, days, report_every):
+    rng = random.Random(7)
+    latencies = []
+    stop = threading.Event()
+    reports_done = [0]
+    executor = None
+
+    if mode == 'readonly':
+        executor = ReportExecutor(db_path)
+
+        def report_loop():
+            while not stop.is_set():
+                executor.submit_query(USER_ACTIVITY_SQL, (f'-{days}', f'-{days}')).result()
+                reports_done[0] += 1
+
+        worker = threading.Thread(target=report_loop, daemon=True)
+        worker.start()
+
+    for i in range(borrows):
+        if mode == 'inline' and i % report_every == 0:
+            # The checkout queued behind a report is what the desk experiences
+            started = time.perf_counter()
+            run_report_inline(db_path, days)
+            reports_done[0] += 1
+            borrow(db_path, rng.randint(1, users), rng.randint(1, books))
+            latencies.append(time.perf_counter() - started)
+            continue
+        started = time.perf_counter()
+        borrow(db_path, rng.randint(1, users), rng.randint(1, books))
+        latencies.append(time.perf_counter() - started)
+        time.sleep(0.001)
+
+    stop.set()
+    if executor is not None:
+        worker.join()
+        executor.shutdown()
+    wal = db_path + '-wal'
+    wal_kb = os.path.getsize(wal) / 1024 if os.path.exists(wal) else 0
+    return percentiles(latencies), reports_done[0], wal_kb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--books', type=int, default=10000)
+    parser.add_argument('--loans', type=int, default=200_000)
+    parser.add_argument('--borrows', type=int, default=300)
+    parser.add_argument('--days', type=int, default=365, help='report window in days')
+    parser.add_argument('--report-every', type=int, default=25,
+                        help='inline mode: run a report before every Nth borrow')
+    args = parser.parse_args()
+
+    for mode in ('idle', 'inline', 'readonly'):
+        db_path = build_library_db(temp_db_path(), users=args.users, books=args.books, loans=args.loans)
+        stats, reports, wal_kb = run(db_path, mode, args.borrows, args.users, args.books,
+                                     args.days, args.report_every)
+        print(f"{mode:9s} borrows={args.borrows} reports={reports:4d} wal={wal_kb:8.0f}KB  {format_ms(stats)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Report page latency with ``data.report_jobs``: cold run, cached reopen,
+reopen after a write, and how quickly a running report stops when cancelled.
+
+Each report in ``REPORTS`` is timed:
+
+* ``cold``    - first run on the report thread (chunked fetch into dicts)
+* ``cached``  - the same report again with no writes in between (answered in ``submit``)
+* ``changed`` - after a checkout commits on another connection (a cache miss)
+* ``cancel``  - from ``job.cancel()`` to the job finishing, cancelled mid-query
+
+Usage:
+    python -m benchmarks.bench_report_jobs --loans 1000000
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, format_ms, percentiles, temp_db_path
+from data.migrator import migrate
+from data.readonly import ReportExecutor
+from data.report_jobs import REPORTS, ReportJobs
+
+
+def timed(func):
+    started = time.perf_counter()
+    job = func()
+    return time.perf_counter() - started, job
+
+
+def checkout(path):
+    conn = sqlite3.connect(path)
+    with conn:
+        # Returned at once: the availability triggers refuse a loan once the copies are out
+        conn.execute("INSERT INTO transactions (user_id, book_id, issue_date, due_date, return_date, status) "
+                     "VALUES (1, 1, date('now'), date('now', '+14 days'), date('now'), 'Returned')")
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--books', type=int, default=50000)
+    parser.add_argument('--loans', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    path = build_library_db(temp_db_path(), users=args.users, books=args.books, loans=args.loans)
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    conn.close()
+
+    executor = ReportExecutor(path)
+    jobs = ReportJobs(executor=executor)
+    try:
+        for report in REPORTS:
+            samples = {'cold': [], 'cached': [], 'changed': [], 'cancel': []}
+            for _ in range(args.repeat):
+                jobs.cache.clear()
+                seconds, job = timed(lambda: jobs.submit(report).wait())
+                samples['cold'].append(seconds)
+                samples['cached'].append(timed(lambda: jobs.submit(report))[0])
+                checkout(path)
+                samples['changed'].append(timed(lambda: jobs.submit(report).wait())[0])
+
+                checkout(path)
+                job = jobs.submit(report)
+                time.sleep(min(seconds / 2, 0.5))
+                started = time.perf_counter()
+                job.cancel()
+                job.wait()
+                samples['cancel'].append(time.perf_counter() - started)
+            rows = len(jobs.submit(report).wait().result.rows)
+            print(f"{report} ({rows} rows, cache {jobs.cache.nbytes / 1e6:.1f} MB)")
+            for label, values in samples.items():
+                print(f"  {label:8s} {format_ms(percentiles(values))}")
+    finally:
+        jobs.close()
+        executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Reservations screen with a large list: the old per-keystroke rebuild vs the
+paged ``ReservationList`` filtered through a proxy model.
+
+The old path loads every reservation as a dictionary, and on each keystroke
+normalises all of them again and filters the tuples (it then rebuilt every
+table item and action widget; that Qt cost comes on top and is not
+measured here). The new path loads pages into a ``ReservationList`` and a
+keystroke costs one ``matching`` call plus one ``accepts`` per row, which is
+what ``ReservationFilterProxy.filterAcceptsRow`` does.
+
+Memory is the Python heap held by the loaded list (tracemalloc).
+
+Usage:
+    python -m benchmarks.bench_reservation_list --reservations 100000
+"""
+import argparse
+import gc
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, format_ms, percentiles, temp_db_path
+from data.migrator import migrate
+from data.reservation_list import ReservationList, fetch_reservations
+
+
+def old_filter(all_reservations, text):
+    # reservation_management_page.filter_reservations before the proxy model
+    search_text = text.lower().strip()
+    normalized = [
+        (r.get('reservation_id') or r.get('id'), r.get('book_title', ''),
+         r.get('user_name', ''), str(r.get('reservation_date', '')))
+        for r in all_reservations
+    ]
+    if not search_text:
+        return normalized
+    return [r for r in normalized
+            if search_text in str(r[1]).lower() or search_text in str(r[2]).lower()]
+
+
+def new_filter(reservations, text):
+    matched = reservations.matching(text)
+    return [row for row in range(len(reservations)) if reservations.accepts(row, matched)]
+
+
+def measured(load):
+    """Run ``load`` twice: timed, then traced; return (result, seconds, bytes held)."""
+    gc.collect()
+    started = time.perf_counter()
+    load()
+    seconds = time.perf_counter() - started
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, seconds, held
+
+
+def keystrokes(words):
+    text = ''
+    for word in words:
+        for ch in word:
+            text += ch
+            yield text
+        text += ' '
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reservations', type=int, default=100_000)
+    parser.add_argument('--users', type=int, default=20_000)
+    parser.add_argument('--books', type=int, default=20_000)
+    args = parser.parse_args()
+
+    path = build_library_db(temp_db_path(), users=args.users, books=args.books, loans=1000,
+                            reservations=args.reservations)
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    conn.execute("ANALYZE")
+    conn.commit()
+    print(f"{args.reservations} reservations, {args.users} members, {args.books} titles")
+
+    first_started = time.perf_counter()
+    ReservationList().load_page(lambda limit, after: fetch_reservations(conn, limit, after))
+    first_page = time.perf_counter() - first_started
+    everything, old_seconds, old_bytes = measured(lambda: fetch_reservations(conn))
+
+    def load_pages():
+        reservations = ReservationList()
+        while reservations.load_page(lambda limit, after: fetch_reservations(conn, limit, after)):
+            pass
+        return reservations
+    reservations, new_seconds, new_bytes = measured(load_pages)
+    assert len(reservations) == len(everything)
+    print(f"{'load all (dicts)':22s} {old_seconds * 1000:8.1f}ms  {old_bytes / 2**20:7.1f} MiB")
+    print(f"{'paged list':22s} {new_seconds * 1000:8.1f}ms  {new_bytes / 2**20:7.1f} MiB"
+          f"   first page {first_page * 1000:.1f}ms")
+
+    sample = everything[len(everything) // 2]
+    traces = {
+        'member name': sample['user_name'].split(),
+        'book title': sample['book_title'].split()[:2],
+    }
+    for label, words in traces.items():
+        old, new = [], []
+        for text in keystrokes(words):
+            started = time.perf_counter()
+            expected = old_filter(everything, text)
+            old.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            shown = new_filter(reservations, text)
+            new.append(time.perf_counter() - started)
+            assert len(shown) == len(expected)
+        print(f"{label} ({' '.join(words)!r}, {len(old)} keystrokes, {len(shown)} shown)")
+        print(f"  {'rebuild per keystroke':22s} {format_ms(percentiles(old))}")
+        print(f"  {'proxy re-filter':22s} {format_ms(percentiles(new))}")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
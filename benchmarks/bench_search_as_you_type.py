@@ -0,0 +1,157 @@
+"""
+Search-as-you-type: per-keystroke latency of the inventory search box.
+
+Replays keystroke traces against three ways of serving the box:
+
+* ``LIKE per keystroke``: the old page, a LIKE scan on the GUI thread for
+  every change (keystrokes typed while it runs wait for it),
+* ``trigram per keystroke``: ``database.search_books`` on every change,
+* ``controller``: ``data.incremental_search.SearchController`` (debounced
+  queries on a worker thread, narrowing cached results in memory).
+
+A keystroke's latency is the time until the table shows results for that
+keystroke or a later one. Traces are generated (typing a title's words
+with human inter-key gaps, the occasional slip and backspace) unless
+``--traces`` names a JSON file of recorded ones:
+``[[[seconds_since_start, "box text"], ...], ...]``.
+
+Usage:
+    python -m benchmarks.bench_search_as_you_type --books 200000 --traces-count 40
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_trigram_search import CONSONANTS, VOWELS, fill, like_books
+from benchmarks.common import build_library_db, format_ms, percentiles, temp_db_path
+from data.incremental_search import SearchController
+from data.migrator import migrate
+from data.trigram_search import search_books
+
+
+def generate_traces(conn, count, seed=5):
+    """Type the first words of random titles, with slips corrected by backspace."""
+    rng = random.Random(seed)
+    total = conn.execute("SELECT MAX(id) FROM books").fetchone()[0]
+    traces = []
+    for _ in range(count):
+        title = conn.execute("SELECT title FROM books WHERE id = ?", (rng.randint(1, total),)).fetchone()[0]
+        target = ' '.join(title.lower().split()[:2])
+        events, box, now = [], '', 0.0
+        for char in target:
+            if rng.random() < 0.05:
+                now += rng.lognormvariate(-2.1, 0.4)
+                events.append((round(now, 4), box + rng.choice(CONSONANTS + VOWELS)))
+                now += rng.lognormvariate(-1.6, 0.3)   # notice, reach for backspace
+                events.append((round(now, 4), box))
+            now += rng.lognormvariate(-2.1, 0.4)       # ~120ms between keys
+            box += char
+            events.append((round(now, 4), box))
+        traces.append(events)
+    return traces
+
+
+def replay_blocking(traces, search):
+    """Each keystroke runs ``search`` on the caller's (GUI) thread."""
+    latencies = []
+    for events in traces:
+        start = time.perf_counter()
+        for offset, text in events:
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            search(text)
+            latencies.append(time.perf_counter() - (start + offset))
+    return latencies
+
+
+def replay_controller(traces, db_path):
+    shown = []                                    # (time, keystroke index) per displayed result
+    lock = threading.Condition()
+    state = {'keys': {}}
+
+    def on_results(result):
+        with lock:
+            shown.append((time.perf_counter(), state['keys'][result.text]))
+            lock.notify_all()
+
+    controller = SearchController(on_results, 'books', db_path)
+    latencies = []
+    try:
+        for events in traces:
+            with lock:
+                shown.clear()
+            arrivals = []
+            start = time.perf_counter()
+            for index, (offset, text) in enumerate(events):
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                with lock:
+                    state['keys'][text] = index
+                arrivals.append(start + offset)
+                controller.text_changed(text)
+            with lock:
+                lock.wait_for(lambda: shown and shown[-1][1] == len(events) - 1, timeout=10)
+                displays = list(shown)
+            for index, arrived in enumerate(arrivals):
+                at = next((t for t, shown_index in displays if shown_index >= index), None)
+                if at is not None:
+                    latencies.append(at - arrived)
+            controller.cancel()
+        return latencies, dict(controller.stats)
+    finally:
+        controller.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books', type=int, default=200_000)
+    parser.add_argument('--traces', help='JSON file with recorded keystroke traces')
+    parser.add_argument('--traces-count', type=int, default=40, help='Generated traces')
+    parser.add_argument('--skip-like', action='store_true', help='Skip the (slow) LIKE replay')
+    args = parser.parse_args()
+
+    path = build_library_db(temp_db_path(), users=100, books=args.books, loans=1000, reservations=0)
+    conn = sqlite3.connect(path)
+    fill(conn, args.books, 100)
+    migrate(conn)
+    if args.traces:
+        with open(args.traces, 'r', encoding='utf-8') as f:
+            traces = json.load(f)
+    else:
+        traces = generate_traces(conn, args.traces_count)
+    keystrokes = sum(len(events) for events in traces)
+    print(f"{args.books} books, {len(traces)} traces, {keystrokes} keystrokes")
+
+    def per_keystroke(search):
+        def run(text):
+            search_conn = sqlite3.connect(path)     # the old helpers connect per call
+            try:
+                return search(search_conn, text)
+            finally:
+                search_conn.close()
+        return run
+
+    if not args.skip_like:
+        latencies = replay_blocking(traces, per_keystroke(like_books))
+        print(f"  {'LIKE per keystroke':24s} {format_ms(percentiles(latencies))}")
+    latencies = replay_blocking(traces, per_keystroke(lambda c, text: search_books(c, text, 200)))
+    print(f"  {'trigram per keystroke':24s} {format_ms(percentiles(latencies))}")
+    latencies, stats = replay_controller(traces, path)
+    print(f"  {'controller':24s} {format_ms(percentiles(latencies))}")
+    print(f"  controller: {stats['keystrokes']} keystrokes -> {stats['cache']} narrowed in memory, "
+          f"{stats['index']} index queries, {stats['fuzzy']} fuzzy queries, "
+          f"{stats['cancelled']} interrupted")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Action buttons in management tables: a widget per row (``setCellWidget``)
+vs the shared painting delegate (``table_delegates.ActionButtonsDelegate``).
+
+Each variant fills a ``QTableWidget`` with ``--rows`` rows and an Edit/Delete
+actions column, then scrolls through it a page at a time, repainting the
+viewport synchronously. Reported: time to fill, live widgets, resident
+memory after filling and the per-frame scroll time. Every variant runs in
+its own process so the memory figures do not mix.
+
+Needs PyQt5; runs headless with ``QT_QPA_PLATFORM=offscreen``.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_table_delegates --rows 10000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import format_ms, percentiles
+
+BUTTON_STYLE = """
+    QPushButton {
+        background: %s;
+        color: white;
+        border: none;
+        border-radius: 16px;
+        padding: 6px 12px;
+        min-width: 75px;
+        min-height: 32px;
+        font-size: 13px;
+        font-weight: 600;
+    }
+"""
+
+
+def rss_mib():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def fill_widgets(table, rows):
+    # What the pages did before the delegate (reservation_management_page)
+    from PyQt5.QtWidgets import QHBoxLayout, QPushButton, QWidget
+    for row in range(rows):
+        actions_widget = QWidget()
+        actions_widget.setStyleSheet("QWidget { background: transparent; border: none; }")
+        actions_layout = QHBoxLayout(actions_widget)
+        actions_layout.setContentsMargins(4, 0, 4, 0)
+        actions_layout.setSpacing(2)
+        edit_btn = QPushButton("Edit")
+        edit_btn.setStyleSheet(BUTTON_STYLE % '#1976d2')
+        edit_btn.clicked.connect(lambda checked, r=row: None)
+        delete_btn = QPushButton("Delete")
+        delete_btn.setStyleSheet(BUTTON_STYLE % '#d32f2f')
+        delete_btn.clicked.connect(lambda checked, r=row: None)
+        actions_layout.addWidget(edit_btn)
+        actions_layout.addWidget(delete_btn)
+        table.setCellWidget(row, 2, actions_widget)
+
+
+def fill_delegate(table, rows):
+    from PyQt5.QtCore import QSize
+    from table_delegates import ActionButton, ActionButtonsDelegate, action_item
+    delegate = ActionButtonsDelegate(table, buttons=(
+        ActionButton('edit', "Edit", '#1976d2', '#ffffff', '#1976d2'),
+        ActionButton('delete', "Delete", '#d32f2f', '#ffffff', '#d32f2f'),
+    ), button_size=QSize(75, 32), radius=16)
+    delegate.clicked.connect(lambda action, row_id: None)
+    table.setItemDelegateForColumn(2, delegate)
+    for row in range(rows):
+        table.setItem(row, 2, action_item(row))
+
+
+def run_variant(variant, rows, frames):
+    from PyQt5.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+    app = QApplication.instance() or QApplication(sys.argv)
+    table = QTableWidget(rows, 3)
+    table.resize(1000, 700)
+    table.verticalHeader().setDefaultSectionSize(70)
+    table.setColumnWidth(2, 240)
+    table.show()
+    app.processEvents()
+    baseline_widgets = len(QApplication.allWidgets())
+    baseline_rss = rss_mib()
+
+    started = time.perf_counter()
+    for row in range(rows):
+        table.setItem(row, 0, QTableWidgetItem(f"Book {row}"))
+        table.setItem(row, 1, QTableWidgetItem(f"Member {row % 500}"))
+    (fill_widgets if variant == 'widgets' else fill_delegate)(table, rows)
+    app.processEvents()
+    fill_seconds = time.perf_counter() - started
+
+    scrollbar = table.verticalScrollBar()
+    step = max(1, scrollbar.pageStep())
+    samples = []
+    for frame in range(frames):
+        value = (frame * step) % (scrollbar.maximum() + 1)
+        started = time.perf_counter()
+        scrollbar.setValue(value)
+        table.viewport().repaint()
+        app.processEvents()
+        samples.append(time.perf_counter() - started)
+    return {
+        'fill': fill_seconds,
+        'widgets': len(QApplication.allWidgets()) - baseline_widgets,
+        'rss': rss_mib() - baseline_rss,
+        'frames': samples,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--variant', choices=('widgets', 'delegate'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.rows, args.frames)))
+        return
+
+    print(f"{args.rows} rows, {args.frames} scroll frames")
+    for variant in ('widgets', 'delegate'):
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_table_delegates', '--rows', str(args.rows),
+             '--frames', str(args.frames), '--variant', variant],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        label = 'setCellWidget' if variant == 'widgets' else 'delegate'
+        print(f"{label:14s} fill {result['fill'] * 1000:8.1f}ms  live widgets {result['widgets']:6d}"
+              f"  RSS +{result['rss']:6.1f} MiB")
+        print(f"{'':14s} scroll frame {format_ms(percentiles(result['frames']))}")
+
+
+if __name__ == '__main__':
+    main()
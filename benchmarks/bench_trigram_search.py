@@ -0,0 +1,133 @@
+"""
+Typo-tolerant search: the LIKE scans of the inventory/user pages vs the
+trigram index (``data.trigram_search``).
+
+Fills ``--books`` titles and ``--users`` patrons with generated (varied)
+words and names, then searches for ``--queries`` of them, each with one or
+two typos (substitution, deletion, insertion or transposition) or typed
+correctly, and reports recall@10 (is the intended row in the first ten
+results) and latency percentiles.
+
+Usage:
+    python -m benchmarks.bench_trigram_search --books 500000 --users 200000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, format_ms, percentiles, temp_db_path
+from data.migrator import migrate
+from data.trigram_search import search_books, search_users
+
+CONSONANTS = 'bcdfghjklmnprstvwz'
+VOWELS = 'aeiou'
+
+
+def word(rng, syllables):
+    return ''.join(rng.choice(CONSONANTS) + rng.choice(VOWELS) + rng.choice(('', '', 'n', 'r', 'l'))
+                   for _ in range(syllables)).capitalize()
+
+
+def typo(rng, text, edits):
+    chars = list(text)
+    for _ in range(edits):
+        positions = [i for i, c in enumerate(chars[:-1]) if c.isalpha() and chars[i + 1].isalpha()]
+        i = rng.choice(positions)
+        kind = rng.choice(('substitute', 'delete', 'insert', 'transpose'))
+        if kind == 'substitute':
+            chars[i] = rng.choice(CONSONANTS + VOWELS)
+        elif kind == 'delete':
+            del chars[i]
+        elif kind == 'insert':
+            chars.insert(i, rng.choice(CONSONANTS + VOWELS))
+        else:
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return ''.join(chars)
+
+
+def fill(conn, books, users, seed=21):
+    rng = random.Random(seed)
+    vocabulary = [word(rng, rng.randint(2, 3)) for _ in range(20_000)]
+    first_names = [word(rng, rng.randint(2, 3)) for _ in range(3_000)]
+    last_names = [word(rng, rng.randint(2, 4)) for _ in range(30_000)]
+    with conn:
+        conn.executemany(
+            "UPDATE books SET title = ?, author = ? WHERE id = ?",
+            ((' '.join(rng.sample(vocabulary, rng.randint(2, 4))),
+              f'{rng.choice(first_names)} {rng.choice(last_names)}', i) for i in range(1, books + 1))
+        )
+        conn.executemany(
+            "UPDATE users SET full_name = ?, email = ? WHERE id = ?",
+            ((f'{first} {last}', f'{first.lower()}.{last.lower()}{i}@example.com', i)
+             for i, first, last in ((i, rng.choice(first_names), rng.choice(last_names))
+                                    for i in range(1, users + 1)))
+        )
+
+
+def like_books(conn, text):
+    pattern = f"%{text.lower()}%"
+    return [row[0] for row in conn.execute(
+        "SELECT id FROM books WHERE LOWER(title) LIKE ? OR LOWER(author) LIKE ? ORDER BY title LIMIT 10",
+        (pattern, pattern))]
+
+
+def like_users(conn, text):
+    pattern = f"%{text.lower()}%"
+    return [row[0] for row in conn.execute(
+        "SELECT id FROM users WHERE LOWER(full_name) LIKE ? OR LOWER(email) LIKE ? ORDER BY full_name LIMIT 10",
+        (pattern, pattern))]
+
+
+def run(label, search, queries):
+    hits, samples = 0, []
+    for target, text in queries:
+        started = time.perf_counter()
+        ids = search(text)
+        samples.append(time.perf_counter() - started)
+        hits += target in ids[:10]
+    print(f"  {label:30s} recall@10 {hits / len(queries):6.1%}  {format_ms(percentiles(samples))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books', type=int, default=500_000)
+    parser.add_argument('--users', type=int, default=200_000)
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--like-queries', type=int, default=30, help='Queries for the (slow) LIKE scan')
+    args = parser.parse_args()
+
+    path = build_library_db(temp_db_path(), users=args.users, books=args.books, loans=1000, reservations=0)
+    conn = sqlite3.connect(path)
+    fill(conn, args.books, args.users)
+    migrate(conn, target=11)
+    started = time.perf_counter()
+    migrate(conn, target=12)
+    print(f"{args.books} books, {args.users} patrons; trigram indexes built in "
+          f"{time.perf_counter() - started:.1f}s")
+    migrate(conn)
+
+    rng = random.Random(5)
+    for edits in (0, 1, 2):
+        book_queries, user_queries = [], []
+        for _ in range(args.queries):
+            book_id = rng.randint(1, args.books)
+            title, author = conn.execute("SELECT title, author FROM books WHERE id = ?", (book_id,)).fetchone()
+            book_queries.append((book_id, typo(rng, rng.choice((title, author + ' ' + title.split()[0])), edits)))
+            user_id = rng.randint(1, args.users)
+            name = conn.execute("SELECT full_name FROM users WHERE id = ?", (user_id,)).fetchone()[0]
+            user_queries.append((user_id, typo(rng, name, edits)))
+        print(f"{edits} typo(s), e.g. {book_queries[0][1]!r}, {user_queries[0][1]!r}:")
+        run('books, LIKE scan', lambda q: like_books(conn, q), book_queries[:args.like_queries])
+        run('books, trigram index', lambda q: [m.id for m in search_books(conn, q, 10)], book_queries)
+        run('patrons, LIKE scan', lambda q: like_users(conn, q), user_queries[:args.like_queries])
+        run('patrons, trigram index', lambda q: [m.id for m in search_users(conn, q, 10)], user_queries)
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
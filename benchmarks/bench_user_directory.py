@@ -0,0 +1,107 @@
+"""
+User management screen with a large membership: loading every user and
+filtering in Python (the old ``load_users``) vs the paged directory
+(``data.user_directory``).
+
+For each search/filter combination the old path fetches all users with
+``get_all_users``' query and filters the four fields in Python; the paged
+path fetches the first page and the match count. A page deep into the
+directory and the next page after the first are timed as well. (The old
+screen then built three cell widgets per row; that cost comes on top and
+is not measured here.)
+
+Usage:
+    python -m benchmarks.bench_user_directory --users 250000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, format_ms, percentiles, temp_db_path
+from data.migrator import migrate
+from data.user_directory import DirectoryQuery, count, fetch_page
+
+ALL_USERS = """
+    SELECT id, COALESCE(full_name, ''), COALESCE(email, ''), COALESCE(role, 'Member'),
+           COALESCE(status, 'Active'), COALESCE(phone, contact), COALESCE(address, '')
+    FROM users ORDER BY full_name
+"""
+
+
+def load_all_and_filter(conn, query):
+    term = query.search.lower()
+    rows = []
+    for user in conn.execute(ALL_USERS):
+        if query.role and user[3].lower() != query.role.lower():
+            continue
+        if query.status and user[4].lower() != query.status.lower():
+            continue
+        if term and not any(term in str(value).lower() for value in user[:4]):
+            continue
+        rows.append(user)
+    return rows
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=250_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    path = build_library_db(temp_db_path(), users=args.users, books=1000, loans=1000, reservations=0)
+    conn = sqlite3.connect(path)
+    rng = random.Random(3)
+    with conn:
+        # A few admins, as in a real membership
+        conn.executemany("UPDATE users SET role = 'Admin' WHERE id = ?",
+                         ((i,) for i in rng.sample(range(1, args.users + 1), max(1, args.users // 500))))
+    migrate(conn)
+    conn.execute("ANALYZE")
+    conn.commit()
+    some_name = conn.execute("SELECT full_name FROM users WHERE id = ?", (args.users // 2,)).fetchone()[0]
+    print(f"{args.users} members")
+
+    queries = [
+        ('everyone', DirectoryQuery()),
+        ('admins', DirectoryQuery(role='Admin')),
+        ('inactive', DirectoryQuery(status='Inactive')),
+        ('active members', DirectoryQuery(role='Member', status='Active')),
+        ('search 1 letter', DirectoryQuery(some_name[0])),
+        ('search first name', DirectoryQuery(some_name.split()[0])),
+        ('search full name', DirectoryQuery(some_name)),
+        ('search user code', DirectoryQuery(f'USR-{args.users // 3:06d}')),
+        ('search e-mail', DirectoryQuery(f'user{args.users // 4}@')),
+        ('search id', DirectoryQuery(str(args.users // 5))),
+        ('search misspelt', DirectoryQuery(some_name.replace(some_name[1:3], some_name[2:0:-1], 1))),
+        ('name + inactive', DirectoryQuery(some_name.split()[0], status='Inactive')),
+    ]
+    for label, query in queries:
+        old = timed(lambda: load_all_and_filter(conn, query), max(1, args.repeat // 2))
+        new = timed(lambda: (fetch_page(conn, query), count(conn, query)), args.repeat)
+        matches = count(conn, query)
+        print(f"{label:18s} {matches:7d} matches  load all + filter p50={old['p50'] * 1000:8.2f}ms"
+              f"   first page + count p50={new['p50'] * 1000:7.2f}ms")
+
+    first = fetch_page(conn, DirectoryQuery())
+    print(f"{'next page':18s} {format_ms(timed(lambda: fetch_page(conn, DirectoryQuery(), first.next_after), args.repeat))}")
+    deep = args.users * 4 // 5
+    print(f"{'page at 80%':18s} {format_ms(timed(lambda: fetch_page(conn, DirectoryQuery(), deep), args.repeat))}")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
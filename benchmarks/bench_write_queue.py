@@ -0,0 +1,113 @@
+"""
+Checkout throughput: connect-per-call vs the single-writer queue.
+
+``--producers`` threads each check out and return ``--checkouts`` books.
+``connect-per-call`` opens a connection per operation and commits it on
+its own, as ``database.borrow_book`` used to; ``queue (no batching)``
+sends every job through the writer thread but commits each one alone;
+``queue (group commit)`` lets the writer coalesce the jobs that queued up
+during the previous commit (plus ``--max-delay`` seconds of late arrivals)
+into one transaction.
+
+Usage:
+    python -m benchmarks.bench_write_queue --producers 32 --checkouts 100
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import build_library_db, format_ms, percentiles, temp_db_path
+from data.write_queue import WriteQueue
+from services import circulation
+
+
+def connect_per_call(path, synchronous):
+    def call(func, *args):
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute('PRAGMA busy_timeout = 30000')
+        conn.execute(f'PRAGMA synchronous = {synchronous}')
+        try:
+            return func(conn, *args)
+        finally:
+            conn.close()
+    return call, lambda: None
+
+
+def through_queue(path, max_batch, max_delay, synchronous):
+    queue = WriteQueue(path, max_batch=max_batch, max_delay=max_delay, synchronous=synchronous)
+    return queue.call, queue.close
+
+
+def run(call, producers, checkouts, users, books):
+    latencies, errors, borrowed = [], [], [0]
+    lock = threading.Lock()
+    barrier = threading.Barrier(producers)
+
+    def producer(seed):
+        rng = random.Random(seed)
+        # Disjoint users per producer so the 5-loan limit never interferes
+        user_ids = list(range(seed + 1, users + 1, producers))
+        barrier.wait()
+        for i in range(checkouts):
+            user_id, book_id = rng.choice(user_ids), rng.randint(1, books)
+            for func in (circulation.borrow_book, circulation.return_book):
+                started = time.perf_counter()
+                try:
+                    success, _ = call(func, user_id, book_id)
+                except sqlite3.OperationalError as e:
+                    with lock:
+                        errors.append(str(e))
+                    break
+                with lock:
+                    latencies.append(time.perf_counter() - started)
+                    if func is circulation.borrow_book:
+                        borrowed[0] += success
+                if not success:
+                    break
+
+    threads = [threading.Thread(target=producer, args=(seed,)) for seed in range(producers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, latencies, errors, borrowed[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--producers', type=int, default=32)
+    parser.add_argument('--checkouts', type=int, default=100, help='Checkouts per producer')
+    parser.add_argument('--max-delay', type=float, default=0.0)
+    parser.add_argument('--synchronous', default='FULL', choices=['OFF', 'NORMAL', 'FULL'])
+    args = parser.parse_args()
+
+    users, books = 10_000, 20_000
+    path = build_library_db(temp_db_path(), users=users, books=books, loans=100_000, reservations=0)
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('UPDATE books SET stock = stock + 100, available = available + 100')
+    conn.commit()
+    conn.close()
+
+    modes = [
+        ('connect-per-call', lambda: connect_per_call(path, args.synchronous)),
+        ('queue (no batching)', lambda: through_queue(path, 1, 0, args.synchronous)),
+        ('queue (group commit)', lambda: through_queue(path, 256, args.max_delay, args.synchronous)),
+    ]
+    for label, make in modes:
+        call, close = make()
+        elapsed, latencies, errors, borrowed = run(call, args.producers, args.checkouts, users, books)
+        close()
+        print(f"{label:22s} {borrowed / elapsed:8.0f} checkouts/s  {len(latencies) / elapsed:8.0f} writes/s"
+              f"  {format_ms(percentiles(latencies, (50, 95)))}  errors={len(errors)}")
+
+
+if __name__ == '__main__':
+    main()
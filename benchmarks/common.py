@@ -0,0 +1,209 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Builds synthetic library databases with the same schema as ``database.create_tables``
+so benchmarks never touch the real ``intelli_libraria.db``.
+"""
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+from datetime import date, timedelta
+from typing import Dict, Iterable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_code TEXT UNIQUE,
+    full_name TEXT,
+    email TEXT UNIQUE,
+    phone TEXT,
+    role TEXT DEFAULT 'Member',
+    status TEXT DEFAULT 'Active',
+    contact TEXT,
+    address TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    isbn TEXT NOT NULL,
+    edition TEXT,
+    stock INTEGER NOT NULL,
+    available INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS reservations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    book_id INTEGER NOT NULL,
+    reservation_date TEXT NOT NULL,
+    status TEXT DEFAULT 'Active',
+    FOREIGN KEY (user_id) REFERENCES users (id),
+    FOREIGN KEY (book_id) REFERENCES books (id)
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    book_id INTEGER NOT NULL,
+    issue_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    due_date TIMESTAMP NOT NULL,
+    return_date TIMESTAMP,
+    status TEXT DEFAULT 'borrowed',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id),
+    FOREIGN KEY (book_id) REFERENCES books (id)
+);
+CREATE TABLE IF NOT EXISTS fines (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    transaction_id INTEGER NOT NULL,
+    amount REAL NOT NULL CHECK(amount >= 0),
+    reason TEXT,
+    paid INTEGER DEFAULT 0 CHECK(paid IN (0,1)),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (transaction_id) REFERENCES transactions(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_user_status ON transactions(user_id, status);
+CREATE INDEX IF NOT EXISTS idx_transactions_book_status ON transactions(book_id, status);
+CREATE INDEX IF NOT EXISTS idx_transactions_due_date ON transactions(due_date);
+CREATE INDEX IF NOT EXISTS idx_reservations_book_status ON reservations(book_id, status);
+CREATE INDEX IF NOT EXISTS idx_reservations_user_id ON reservations(user_id);
+"""
+
+FIRST_NAMES = ['Ali', 'Sara', 'John', 'Emma', 'Omar', 'Ayesha', 'Liam', 'Noor', 'Maria', 'Hassan']
+LAST_NAMES = ['Khan', 'Smith', 'Brown', 'Wilson', 'Ahmed', 'Johnson', 'Malik', 'Taylor', 'Lee', 'Raza']
+WORDS = ['Great', 'Hidden', 'Journey', 'Secrets', 'Echoes', 'River', 'Empire', 'Garden', 'Silent',
+         'Mountain', 'Winter', 'Shadow', 'Ancient', 'Light', 'Ocean', 'Storm', 'Kingdom', 'Time']
+
+
+def temp_db_path(name: str = 'bench.db') -> str:
+    """Return a path for a scratch database in a fresh temporary directory."""
+    return os.path.join(tempfile.mkdtemp(prefix='libraria-bench-'), name)
+
+
+def build_library_db(
+    path: str,
+    users: int = 2000,
+    books: int = 5000,
+    loans: int = 100_000,
+    reservations: int = 5000,
+    years: int = 2,
+    open_loan_ratio: float = 0.05,
+    seed: int = 42
+) -> str:
+    """
+    Create and populate a synthetic library database.
+
+    Args:
+        path: Where to create the database (overwritten if it exists)
+        users: Number of members
+        books: Number of titles
+        loans: Number of transactions, spread evenly over ``years``
+        reservations: Number of reservations
+        years: How many years of history to generate, ending today
+        open_loan_ratio: Fraction of loans that are still out
+        seed: Random seed for reproducible data
+
+    Returns:
+        The database path
+    """
+    rng = random.Random(seed)
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.executescript(SCHEMA)
+
+    with conn:
+        conn.executemany(
+            "INSERT INTO users (user_code, full_name, email, role, status) VALUES (?, ?, ?, ?, ?)",
+            (
+                (f'USR-{i:06d}',
+                 f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                 f'user{i}@example.com',
+                 'Member',
+                 'Active' if rng.random() > 0.05 else 'Inactive')
+                for i in range(1, users + 1)
+            )
+        )
+        conn.executemany(
+            "INSERT INTO books (title, author, isbn, stock, available) VALUES (?, ?, ?, ?, ?)",
+            (
+                (' '.join(rng.sample(WORDS, 3)),
+                 f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                 f'978{i:010d}',
+                 stock, stock)
+                for i, stock in ((i, rng.randint(1, 8)) for i in range(1, books + 1))
+            )
+        )
+
+        today = date.today()
+        span = max(1, years * 365)
+
+        def loan_rows():
+            for _ in range(loans):
+                issued = today - timedelta(days=rng.randrange(span))
+                due = issued + timedelta(days=14)
+                if (today - issued).days < 30 and rng.random() < open_loan_ratio * 10:
+                    yield (rng.randint(1, users), rng.randint(1, books),
+                           issued.isoformat(), due.isoformat(), None, 'Borrowed')
+                else:
+                    returned = issued + timedelta(days=rng.randint(1, 30))
+                    yield (rng.randint(1, users), rng.randint(1, books),
+                           issued.isoformat(), due.isoformat(), returned.isoformat(), 'Returned')
+
+        conn.executemany(
+            """
+            INSERT INTO transactions (user_id, book_id, issue_date, due_date, return_date, status)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            loan_rows()
+        )
+        conn.executemany(
+            "INSERT INTO reservations (user_id, book_id, reservation_date, status) VALUES (?, ?, ?, ?)",
+            (
+                (rng.randint(1, users), rng.randint(1, books),
+                 (today - timedelta(days=rng.randrange(span))).isoformat(),
+                 rng.choice(['Active', 'Fulfilled', 'Cancelled']))
+                for _ in range(reservations)
+            )
+        )
+        # Keep the availability counters consistent with the open loans
+        conn.execute(
+            """
+            UPDATE books SET available = stock - (
+                SELECT COUNT(*) FROM transactions t
+                WHERE t.book_id = books.id AND t.return_date IS NULL
+            )
+            """
+        )
+        conn.execute("UPDATE books SET stock = stock - available + 1, available = 1 WHERE available < 1")
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    conn.close()
+    return path
+
+
+def percentiles(samples: Iterable[float], points=(50, 95, 99)) -> Dict[str, float]:
+    """Return the requested percentiles (plus max and mean) of ``samples``."""
+    data = sorted(samples)
+    if not data:
+        return {f'p{p}': 0.0 for p in points}
+    result = {}
+    for p in points:
+        k = min(len(data) - 1, max(0, int(round(p / 100.0 * (len(data) - 1)))))
+        result[f'p{p}'] = data[k]
+    result['max'] = data[-1]
+    result['mean'] = statistics.fmean(data)
+    return result
+
+
+def format_ms(stats: Dict[str, float]) -> str:
+    """Format a percentile dict (in seconds) as milliseconds."""
+    return '  '.join(f'{k}={v * 1000:.2f}ms' for k, v in stats.items())
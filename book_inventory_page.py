@@ -7,6 +7,8 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushBut
 from PyQt5.QtCore import Qt, pyqtSignal, QSize, QMargins, QRect, QPoint, QTimer
 from PyQt5.QtGui import QFont, QColor, QIntValidator, QPainter, QPalette, QPixmap, QFontDatabase
 import database
+from data.incremental_search import SearchController
+from table_delegates import ActionButton, ActionButtonsDelegate, action_item
 import sys
 import random
 import os
@@ -79,8 +81,13 @@ class BookCard(QFrame):
 
 
 class BookInventoryPage(QWidget):
+    search_ready = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
+        # Debounced search-as-you-type; results come back through search_ready
+        self._search = SearchController(self.search_ready.emit, 'books', database.DB_FILE)
+        self.search_ready.connect(self.show_search_results)
         self.setup_ui()
         # Load books after the widget is constructed (next event loop cycle)
         QTimer.singleShot(0, self.load_books)
@@ -297,6 +304,14 @@ class BookInventoryPage(QWidget):
             }
         """)
         
+        # Edit/Delete buttons are painted, not one widget per row
+        self.actions_delegate = ActionButtonsDelegate(self.books_table, buttons=(
+            ActionButton('edit', "Edit", '#3b82f6', '#ffffff', '#3b82f6'),
+            ActionButton('delete', "Delete", '#f44336', '#ffffff', '#f44336'),
+        ), button_size=QSize(64, 28), radius=4)
+        self.actions_delegate.clicked.connect(self.on_book_action)
+        self.books_table.setItemDelegateForColumn(6, self.actions_delegate)
+        
         tab_layout.addWidget(self.books_table)
         
         # Add tabs
@@ -420,51 +435,8 @@ class BookInventoryPage(QWidget):
                     self.books_table.setItem(row, 4, edition_item)
                     self.books_table.setItem(row, 5, stock_item)
                     
-                    # Add action buttons
-                    action_widget = QWidget()
-                    action_layout = QHBoxLayout(action_widget)
-                    action_layout.setContentsMargins(5, 2, 5, 2)
-                    action_layout.setSpacing(5)
-                    
-                    # Edit button
-                    edit_btn = QPushButton("Edit")
-                    edit_btn.setStyleSheet("""
-                        QPushButton {
-                            background-color: #3b82f6;
-                            color: white;
-                            border: none;
-                            padding: 4px 8px;
-                            border-radius: 4px;
-                            min-width: 60px;
-                        }
-                        QPushButton:hover {
-                            background-color: #2563eb;
-                        }
-                    """)
-                    edit_btn.clicked.connect(lambda _, bid=bid: self.edit_book(bid))
-                    
-                    # Delete button
-                    delete_btn = QPushButton("Delete")
-                    delete_btn.setStyleSheet("""
-                        QPushButton {
-                            background-color: #f44336;
-                            color: white;
-                            border: none;
-                            padding: 4px 8px;
-                            border-radius: 4px;
-                            min-width: 60px;
-                        }
-                        QPushButton:hover {
-                            background-color: #d32f2f;
-                        }
-                    """)
-                    delete_btn.clicked.connect(lambda _, bid=bid: self.delete_book(bid))
-                    
-                    action_layout.addWidget(edit_btn)
-                    action_layout.addWidget(delete_btn)
-                    action_widget.setLayout(action_layout)
-                    
-                    self.books_table.setCellWidget(row, 6, action_widget)
+                    # Edit/Delete are painted by the actions delegate
+                    self.books_table.setItem(row, 6, action_item(bid))
                     
                     # Center align all cells
                     for col in range(self.books_table.columnCount() - 1):
@@ -486,61 +458,18 @@ class BookInventoryPage(QWidget):
 
     def search_books(self, text):
         if not text.strip():
+            self._search.cancel()
             self.load_books()
             return
+        self._search.text_changed(text)
 
-        search_text = f"%{text.lower()}%"
-        try:
-            # First try searching with LIKE for partial matches
-            query = """
-                SELECT * FROM books 
-                WHERE LOWER(title) LIKE ? 
-                   OR LOWER(author) LIKE ?
-                ORDER BY title
-            """
-            books = database.execute_query(query, (search_text, search_text))
+    def show_search_results(self, result):
+        """Show the books found for ``result.text`` (best match first)."""
+        if result.text != self.search_input.text():
+            return  # the search box changed while this search ran
+        # An empty result just leaves the table empty
+        self.populate_books(result.rows)
 
-            if not books:  # If no results, try a more flexible search
-                query = """
-                    SELECT * FROM books 
-                    WHERE LOWER(title) LIKE ? 
-                       OR LOWER(author) LIKE ?
-                       OR LOWER(edition) LIKE ?
-                       OR LOWER(isbn) LIKE ?
-                    ORDER BY title
-                """
-                books = database.execute_query(query, 
-                    (search_text, search_text, search_text, search_text))
-            
-            if books:
-                self.populate_books(books)
-            else:
-                QMessageBox.information(self, "No Results", "No books found matching your search.")
-                self.load_books()
-                
-        except Exception as e:
-            print(f"Error searching books: {str(e)}")
-            # Try to get more detailed error information
-            try:
-                import traceback
-                error_details = traceback.format_exc()
-                print(f"Full error details: {error_details}")
-                
-                # Check if database is accessible
-                conn = database.create_connection()
-                if conn is None:
-                    QMessageBox.critical(self, "Database Error", "Could not connect to the database.")
-                else:
-                    conn.close()
-                    QMessageBox.critical(self, "Search Error", 
-                        f"An error occurred while searching: {str(e)}\n\nPlease try again.")
-            except Exception as inner_e:
-                print(f"Error getting error details: {inner_e}")
-                QMessageBox.critical(self, "Error", "An unknown error occurred.")
-            
-            self.load_books()  # Fallback to loading all books on error
-    
-    
     def load_books(self):
         """Load all books from the database and populate the table."""
         try:
@@ -555,6 +484,12 @@ class BookInventoryPage(QWidget):
             QMessageBox.critical(self, "Error", f"Failed to load books: {str(e)}")
             self.books_table.setRowCount(0)
     
+    def on_book_action(self, action, book_id):
+        if action == 'edit':
+            self.edit_book(book_id)
+        elif action == 'delete':
+            self.delete_book(book_id)
+
     def edit_book(self, book_id):
         """Handle edit book button click."""
         try:
@@ -653,51 +588,6 @@ class BookInventoryPage(QWidget):
                 print(f"Error deleting book: {e}")
                 QMessageBox.critical(self, "Error", "An error occurred while deleting the book.")
             
-            # Action buttons
-            btn_widget = QWidget()
-            btn_layout = QHBoxLayout(btn_widget)
-            btn_layout.setContentsMargins(5, 0, 5, 0)
-            
-            edit_btn = QPushButton("Edit")
-            edit_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #3b82f6;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 4px 8px;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background-color: #2563eb;
-                }
-            """)
-            edit_btn.clicked.connect(lambda _, bid=book_id: self.edit_book(bid))
-            
-            delete_btn = QPushButton("Delete")
-            delete_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #ef4444;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 4px 8px;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background-color: #dc2626;
-                }
-            """)
-            delete_btn.clicked.connect(lambda _, bid=book_id: self.delete_book(bid))
-            
-            btn_layout.addWidget(edit_btn)
-            btn_layout.addWidget(delete_btn)
-            btn_layout.addStretch()
-            
-            self.books_table.setCellWidget(row, 6, btn_widget)
-            
-            # Set row height
-            self.books_table.setRowHeight(row, 60)
         
         # Form container
         form_container = QWidget()
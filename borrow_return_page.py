@@ -1,4 +1,5 @@
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
                             QLineEdit, QFrame, QGridLayout, QTableWidget, QTableWidgetItem, 
                             QHeaderView, QSizePolicy, QTabWidget, QMessageBox, QVBoxLayout,
@@ -16,11 +17,27 @@ import numpy as np
 import database
 from library_backend import LibraryBackend
 
+# HTTP calls to the circulation service run here rather than on the GUI thread
+_service_calls = ThreadPoolExecutor(max_workers=2, thread_name_prefix='circulation-client')
+
+
+def _call_service(client, call, *args):
+    try:
+        return call(*args)
+    finally:
+        client.close()
+
+
 class BorrowBookScreen(QWidget):
+    # Emitted from the write-queue or service-call thread with the checkout's Future;
+    # handled on the GUI thread
+    borrow_done = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
+        self.borrow_done.connect(self._on_borrow_done, Qt.QueuedConnection)
         self.setWindowTitle("Borrow Book")
-        self.setStyleSheet("background-color: #ffffff;")
+        self.setObjectName("circulationScreen")
         self.setMinimumSize(400, 300)
 
         layout = QVBoxLayout(self)
@@ -107,94 +124,20 @@ class BorrowBookScreen(QWidget):
             user_id = int(user_id)
             book_id = int(book_id)
             
-            # Import the borrow_book function from database
-            from database import borrow_book
-            
-            # Call the borrow_book function
-            success, message = borrow_book(user_id, book_id)
-            
-            # Create message box
-            msg_box = QMessageBox(self)
-            
-            if success:
-                # Success case
-                msg_box.setWindowTitle("Borrowing Successful")
-                msg_box.setIcon(QMessageBox.Information)
-                
-                # Parse the success message
-                import re
-                match = re.search(r"Successfully borrowed '(.+?)'\. Due date: (.+)", message)
-                if match:
-                    book_title = match.group(1)
-                    due_date = match.group(2)
-                    message = (
-                        f"<h3>Book Successfully Borrowed</h3>"
-                        f"<p>The book <b>'{book_title}'</b> has been successfully issued.</p>"
-                        f"<p><b>Due Date:</b> {due_date}</p>"
-                        f"<p>Please return the book by the due date to avoid late fees.</p>"
-                    )
-                else:
-                    # Fallback if message format doesn't match
-                    message = f"<h3>Success</h3><p>{message}</p>"
-                
-                # Clear input fields on success
-                self.user_id_input.clear()
-                self.book_id_input.clear()
+            # Go through the shared circulation service when one is configured
+            from services.circulation_client import get_circulation_client
+            client = get_circulation_client()
+            if client is not None:
+                future = _service_calls.submit(_call_service, client, client.checkout, user_id, book_id)
             else:
-                # Error case
-                msg_box.setWindowTitle("Borrowing Failed")
-                msg_box.setIcon(QMessageBox.Warning)
-                
-                # Show specific error messages based on the error type
-                if "User not found" in message:
-                    message = "The user ID is invalid or the account is inactive."
-                elif "Book not found" in message:
-                    message = "The book ID is invalid or the book does not exist."
-                elif "not available" in message.lower():
-                    message = "This book is currently not available for borrowing."
-                elif "already borrowed" in message.lower():
-                    message = "This book has already been borrowed by the same user."
-                elif "maximum borrow limit" in message.lower():
-                    message = "User has reached the maximum borrowing limit (5 books)."
-                
-                message = f"<h3>Could Not Borrow Book</h3><p>{message}</p>"
-            
-            # Set message and show the dialog
-            msg_box.setText(message)
-            msg_box.setTextFormat(Qt.RichText)
-            
-            # Style the message box
-            msg_box.setStyleSheet("""
-                QMessageBox {
-                    background-color: #f8f9fa;
-                    min-width: 400px;
-                    font-family: Arial;
-                }
-                QLabel {
-                    color: #2c3e50;
-                    font-size: 14px;
-                }
-                QPushButton {
-                    background-color: #28a745;
-                    color: white;
-                    border: none;
-                    padding: 8px 16px;
-                    border-radius: 4px;
-                    font-weight: bold;
-                    min-width: 100px;
-                }
-                QPushButton:hover {
-                    background-color: #218838;
-                }
-            """)
-            
-            # Add OK button
-            ok_button = msg_box.addButton("OK", QMessageBox.AcceptRole)
-            ok_button.setCursor(Qt.PointingHandCursor)
-            
-            # Show the message box
-            msg_box.exec_()
-                
+                # Queued on the single writer
+                future = database.submit_borrow(user_id, book_id)
+            # The result comes back through borrow_done. The button is disabled only once
+            # the call is queued, since the queued slot re-enables it and nothing would
+            # if submitting raised.
+            future.add_done_callback(self.borrow_done.emit)
+            self.borrow_button.setEnabled(False)
+
         except ValueError:
             QMessageBox.warning(self, "Input Error", 
                              "Please enter valid numeric IDs for both User and Book")
@@ -205,6 +148,74 @@ class BorrowBookScreen(QWidget):
             import traceback
             traceback.print_exc()
 
+    def _on_borrow_done(self, future):
+        self.borrow_button.setEnabled(True)
+        try:
+            outcome = future.result()
+        except sqlite3.Error as e:
+            print(f"Error borrowing book: {e}")
+            outcome = {'success': False, 'message': f"Database error: {e}"}
+        except Exception as e:
+            QMessageBox.critical(self, "Error", 
+                              f"An unexpected error occurred: {str(e)}")
+            print(f"Error in borrow_book_action: {str(e)}")
+            return
+        self.show_borrow_result(outcome)
+
+    def show_borrow_result(self, outcome):
+        """Show the outcome of a checkout (``services.circulation.checkout``)."""
+        message = outcome['message']
+        
+        # Create message box
+        msg_box = QMessageBox(self)
+        
+        if outcome['success']:
+            # Success case
+            msg_box.setWindowTitle("Borrowing Successful")
+            msg_box.setIcon(QMessageBox.Information)
+            message = (
+                f"<h3>Book Successfully Borrowed</h3>"
+                f"<p>The book <b>'{outcome['title']}'</b> has been successfully issued.</p>"
+                f"<p><b>Due Date:</b> {outcome['due_date']}</p>"
+                f"<p>Please return the book by the due date to avoid late fees.</p>"
+            )
+            
+            # Clear input fields on success
+            self.user_id_input.clear()
+            self.book_id_input.clear()
+        else:
+            # Error case
+            msg_box.setWindowTitle("Borrowing Failed")
+            msg_box.setIcon(QMessageBox.Warning)
+            
+            # Show specific error messages based on the error type
+            if "User not found" in message:
+                message = "The user ID is invalid or the account is inactive."
+            elif "Book not found" in message:
+                message = "The book ID is invalid or the book does not exist."
+            elif "not available" in message.lower():
+                message = "This book is currently not available for borrowing."
+            elif "already borrowed" in message.lower():
+                message = "This book has already been borrowed by the same user."
+            elif "maximum borrow limit" in message.lower():
+                message = "User has reached the maximum borrowing limit (5 books)."
+            
+            message = f"<h3>Could Not Borrow Book</h3><p>{message}</p>"
+        
+        # Set message and show the dialog
+        msg_box.setText(message)
+        msg_box.setTextFormat(Qt.RichText)
+        
+        # Styled by the application theme (QMessageBox#resultDialog)
+        msg_box.setObjectName("resultDialog")
+        
+        # Add OK button
+        ok_button = msg_box.addButton("OK", QMessageBox.AcceptRole)
+        ok_button.setCursor(Qt.PointingHandCursor)
+        
+        # Show the message box
+        msg_box.exec_()
+
     def borrow_book_action_old(self):
         user_id = self.user_id_input.text().strip()
         book_id = self.book_id_input.text().strip()
@@ -239,7 +250,7 @@ class BorrowBookScreen(QWidget):
                                  f"No book found with ID: {book_id}")
                 return
                 
-            available = book.get('stock', 0)
+            available = book.get('available', 0)
             if available <= 0:
                 QMessageBox.warning(self, "Book Not Available", 
                                  f"The book '{book.get('title', '')}' is currently not available for borrowing.\n\n"
@@ -285,29 +296,8 @@ class BorrowBookScreen(QWidget):
                     msg_box.setText(message)
                     msg_box.setTextFormat(Qt.RichText)
                     
-                    # Style the message box
-                    msg_box.setStyleSheet("""
-                        QMessageBox {
-                            background-color: #f8f9fa;
-                            min-width: 400px;
-                        }
-                        QLabel {
-                            color: #2c3e50;
-                            font-size: 14px;
-                        }
-                        QPushButton {
-                            background-color: #28a745;
-                            color: white;
-                            border: none;
-                            padding: 8px 16px;
-                            border-radius: 4px;
-                            font-weight: bold;
-                            min-width: 100px;
-                        }
-                        QPushButton:hover {
-                            background-color: #218838;
-                        }
-                    """)
+                    # Styled by the application theme (QMessageBox#resultDialog)
+                    msg_box.setObjectName("resultDialog")
                     
                     # Add OK button
                     ok_button = msg_box.addButton("OK", QMessageBox.AcceptRole)
@@ -341,10 +331,15 @@ class BorrowBookScreen(QWidget):
             print(f"Error in borrow_book_action: {str(e)}")
 
 class ReturnBookScreen(QWidget):
+    # Emitted from the write-queue or service-call thread with the return's Future;
+    # handled on the GUI thread
+    return_done = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
+        self.return_done.connect(self._on_return_done, Qt.QueuedConnection)
         self.setWindowTitle("Return Book")
-        self.setStyleSheet("background-color: #ffffff;")
+        self.setObjectName("circulationScreen")
         self.setMinimumSize(400, 300)
 
         layout = QVBoxLayout(self)
@@ -427,109 +422,24 @@ class ReturnBookScreen(QWidget):
                              "Please enter both User ID and Book ID.")
             return
             
-        conn = None
         try:
             # Convert inputs to integers
             user_id = int(user_id)
             book_id = int(book_id)
             
-            # Get database connection with timeout and check_same_thread=False
-            conn = sqlite3.connect('intelli_libraria.db', timeout=30, check_same_thread=False)
-            conn.execute('PRAGMA busy_timeout = 30000')  # 30 seconds timeout
-            conn.execute('PRAGMA journal_mode=WAL')  # Enable Write-Ahead Logging
-            
-            with conn:
-                cursor = conn.cursor()
-                
-                # Check if there is an active (not yet returned) transaction for this user and book
-                cursor.execute("""
-                    SELECT t.id, b.title 
-                    FROM transactions t
-                    JOIN books b ON t.book_id = b.id
-                    WHERE t.user_id = ? 
-                    AND t.book_id = ? 
-                    AND t.return_date IS NULL
-                    LIMIT 1
-                """, (user_id, book_id))
-                
-                transaction = cursor.fetchone()
-                
-                if not transaction:
-                    QMessageBox.warning(
-                        self, 
-                        "No Active Borrowing Found",
-                        "No active borrowing record found for this user and book.\n\n"
-                        "Please check the User ID and Book ID and try again."
-                    )
-                    return
-                    
-                transaction_id, book_title = transaction
-                
-                # Update the transaction record
-                cursor.execute("""
-                    UPDATE transactions 
-                    SET return_date = DATE('now'),
-                        status = 'Returned',
-                        updated_at=CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (transaction_id,))
-                
-                # Update book availability
-                cursor.execute("""
-                    UPDATE books 
-                    SET stock = stock + 1,
-                        available = available + 1
-                    WHERE id = ?
-                """, (book_id,))
-                
-                # Commit is handled by the context manager
-            
-            # Show success message
-            success_msg = QMessageBox()
-            success_msg.setWindowTitle("Book Returned Successfully")
-            success_msg.setIcon(QMessageBox.Information)
-            success_msg.setTextFormat(Qt.RichText)
-            success_msg.setText(
-                f"<h3>Book Successfully Returned</h3>"
-                f"<p>The book <b>'{book_title}'</b> has been successfully returned.</p>"
-                f"<p>Thank you for returning the book on time!</p>"
-            )
-            
-            # Style the message box
-            success_msg.setStyleSheet("""
-                QMessageBox {
-                    background-color: #f8f9fa;
-                    min-width: 400px;
-                    font-family: Arial;
-                }
-                QLabel {
-                    color: #2c3e50;
-                    font-size: 14px;
-                }
-                QPushButton {
-                    background-color: #28a745;
-                    color: white;
-                    border: none;
-                    padding: 8px 16px;
-                    border-radius: 4px;
-                    font-weight: bold;
-                    min-width: 100px;
-                }
-                QPushButton:hover {
-                    background-color: #218838;
-                }
-            """)
-            
-            # Add OK button
-            ok_button = success_msg.addButton("OK", QMessageBox.AcceptRole)
-            ok_button.setCursor(Qt.PointingHandCursor)
-            
-            # Show the message box
-            success_msg.exec_()
-            
-            # Clear the input fields
-            self.user_id_input.clear()
-            self.book_id_input.clear()
+            # Go through the shared circulation service when one is configured
+            from services.circulation_client import get_circulation_client
+            client = get_circulation_client()
+            if client is not None:
+                future = _service_calls.submit(_call_service, client, client.checkin, user_id, book_id)
+            else:
+                # Queued on the single writer
+                future = database.submit_return(user_id, book_id)
+            # The result comes back through return_done. The button is disabled only once
+            # the call is queued, since the queued slot re-enables it and nothing would
+            # if submitting raised.
+            future.add_done_callback(self.return_done.emit)
+            self.return_button.setEnabled(False)
             
         except ValueError:
             QMessageBox.warning(
@@ -537,30 +447,71 @@ class ReturnBookScreen(QWidget):
                 "Invalid Input", 
                 "Please enter valid numeric IDs for both User ID and Book ID."
             )
+        except Exception as e:
+            QMessageBox.critical(
+                self, 
+                "Error", 
+                f"An unexpected error occurred.\n\nError: {str(e)}\n\nPlease try again."
+            )
+            print(f"Error in return_book_action: {str(e)}")
+
+    def _on_return_done(self, future):
+        self.return_button.setEnabled(True)
+        try:
+            result = future.result()
         except sqlite3.Error as e:
-            if conn:
-                conn.rollback()
             QMessageBox.critical(
                 self, 
                 "Database Error", 
                 f"An error occurred while processing the return.\n\nError: {str(e)}\n\nPlease try again."
             )
             print(f"Database error in return_book_action: {str(e)}")
+            return
         except Exception as e:
-            if conn:
-                conn.rollback()
             QMessageBox.critical(
                 self, 
                 "Error", 
                 f"An unexpected error occurred.\n\nError: {str(e)}\n\nPlease try again."
             )
             print(f"Error in return_book_action: {str(e)}")
-        finally:
-            if conn:
-                try:
-                    conn.close()
-                except:
-                    pass
+            return
+        self.show_return_result(result)
+
+    def show_return_result(self, result):
+        """Show the outcome of a return (``services.circulation.checkin``)."""
+        if not result['success']:
+            QMessageBox.warning(
+                self, 
+                "No Active Borrowing Found",
+                f"{result['message']}.\n\n"
+                "Please check the User ID and Book ID and try again."
+            )
+            return
+        
+        # Show success message
+        success_msg = QMessageBox()
+        success_msg.setWindowTitle("Book Returned Successfully")
+        success_msg.setIcon(QMessageBox.Information)
+        success_msg.setTextFormat(Qt.RichText)
+        success_msg.setText(
+            f"<h3>Book Successfully Returned</h3>"
+            f"<p>The book <b>'{result['title']}'</b> has been successfully returned.</p>"
+            f"<p>Thank you for returning the book on time!</p>"
+        )
+        
+        # Styled by the application theme (QMessageBox#resultDialog)
+        success_msg.setObjectName("resultDialog")
+        
+        # Add OK button
+        ok_button = success_msg.addButton("OK", QMessageBox.AcceptRole)
+        ok_button.setCursor(Qt.PointingHandCursor)
+        
+        # Show the message box
+        success_msg.exec_()
+        
+        # Clear the input fields
+        self.user_id_input.clear()
+        self.book_id_input.clear()
 
 class BorrowReturnPage(QWidget):
     def __init__(self):
@@ -791,11 +742,11 @@ class BorrowReturnPage(QWidget):
         book_fields = []
         try:
             rows = database.execute_query(
-                "SELECT title, author, COALESCE(isbn,'') AS isbn, COALESCE(stock,0) AS stock FROM books ORDER BY id DESC LIMIT 1"
+                "SELECT title, author, COALESCE(isbn,'') AS isbn, COALESCE(available,0) AS available FROM books ORDER BY id DESC LIMIT 1"
             )
             if rows:
                 r = rows[0]
-                status = "Available" if (r.get("stock", 0) or 0) > 0 else "Out of Stock"
+                status = "Available" if (r.get("available", 0) or 0) > 0 else "Out of Stock"
                 book_fields = [
                     ("Title:", r.get("title", "")),
                     ("Author:", r.get("author", "")),
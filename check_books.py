@@ -1,42 +0,0 @@
-import sqlite3
-
-def check_books():
-    try:
-        # Connect to the database
-        try:
-            from data.database import DB_PATH
-        except Exception:
-            import os as _os
-            DB_PATH = _os.path.join(_os.path.dirname(__file__), 'intelli_libraria.db')
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Get table info
-        print("\n=== Table Structure ===")
-        cursor.execute("PRAGMA table_info(books)")
-        columns = cursor.fetchall()
-        print("Columns in books table:")
-        for col in columns:
-            print(f"- {col[1]} ({col[2]})")
-        
-        # Get number of books
-        cursor.execute("SELECT COUNT(*) FROM books")
-        count = cursor.fetchone()[0]
-        print(f"\nNumber of books in database: {count}")
-        
-        # Get sample books if any exist
-        if count > 0:
-            print("\nSample books (first 5):")
-            cursor.execute("SELECT * FROM books LIMIT 5")
-            books = cursor.fetchall()
-            for book in books:
-                print(book)
-        
-    except Exception as e:
-        print(f"Error checking books: {e}")
-    finally:
-        if conn:
-            conn.close()
-
-if __name__ == "__main__":
-    check_books()
@@ -1,22 +1,46 @@
 import sys
+import threading
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout, QProgressBar
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
 from PyQt5.QtGui import QFont, QColor, QPalette
 
+from warmup import run_tasks, startup_tasks
+
+
+class WarmUp(QObject):
+    """Runs the warm-up graph on a background thread and reports on the GUI thread."""
+    task_done = pyqtSignal(object)   # warmup.TaskResult
+    finished = pyqtSignal(object)    # {name: TaskResult}
+
+    def __init__(self, tasks=None, parent=None):
+        super().__init__(parent)
+        self.tasks = list(tasks) if tasks is not None else startup_tasks()
+
+    def start(self):
+        threading.Thread(target=self._run, name='warmup-graph', daemon=True).start()
+
+    def _run(self):
+        # Signals emitted here are queued to the receivers' (GUI) thread
+        results = run_tasks(self.tasks, on_done=self.task_done.emit)
+        self.finished.emit(results)
+
+
 class ClassicSplashScreen(QWidget):
-    def __init__(self, on_finished_callback=None):
+    def __init__(self, on_finished_callback=None, tasks=None):
         super().__init__()
         self.setFixedSize(600, 300)
         self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
         self.setWindowTitle("Intelli Libraria Splash")
         self.on_finished_callback = on_finished_callback
+        self.results = {}
+        self.warmup = WarmUp(tasks, self)
         self.initUI()
-        self.progress = 0
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_progress)
-        self.timer.start(50)  # 5 seconds for 0-100 (100 steps * 50ms = 5000ms)
+        self.progress_bar.setMaximum(len(self.warmup.tasks))
+        self.warmup.task_done.connect(self.update_progress)
+        self.warmup.finished.connect(self.finish)
+        self.warmup.start()
 
     def initUI(self):
         # Set teal background
@@ -72,16 +96,11 @@ class ClassicSplashScreen(QWidget):
 
         layout.addLayout(bottom_layout)
 
-    def update_progress(self):
-        self.progress += 2
-        if self.progress > 100:
-            self.progress = 100
-        self.progress_bar.setValue(self.progress)
-        if self.progress >= 100:
-            self.timer.stop()
-            QTimer.singleShot(300, self.finish)
+    def update_progress(self, result):
+        self.progress_bar.setValue(self.progress_bar.value() + 1)
 
-    def finish(self):
+    def finish(self, results):
+        self.results = results
         self.close()
         if self.on_finished_callback:
             self.on_finished_callback()
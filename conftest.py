@@ -0,0 +1,217 @@
+"""
+Shared fixtures: a library database built the way the application gets one.
+
+``LEGACY_SCHEMA`` is the schema of the committed ``intelli_libraria.db``: the
+tables and triggers the old migration runner left, with ``schema_migrations``
+recording only 001 and 002. ``data.migrator.migrate()`` brings it up to
+``SCHEMA_VERSION``, so tests run against the migrated schema and its
+triggers rather than a hand-written subset. The migrated file is built once
+per session and copied for each test; ``legacy_db`` is the schema before
+migration, for tests of what the migrations do to existing rows.
+"""
+import shutil
+import sqlite3
+
+import pytest
+
+from data.migrator import migrate
+
+LEGACY_SCHEMA = """
+    PRAGMA journal_mode = WAL;
+    CREATE TABLE users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        full_name TEXT NOT NULL,
+        role TEXT DEFAULT 'member',
+        status TEXT DEFAULT 'active',
+        user_code TEXT, phone TEXT, contact TEXT, address TEXT, created_at TIMESTAMP, updated_at TIMESTAMP
+    );
+    CREATE TABLE books (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        author TEXT NOT NULL,
+        isbn TEXT NOT NULL,
+        edition TEXT,
+        stock INTEGER NOT NULL,
+        available INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE reservations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        book_id INTEGER NOT NULL,
+        reservation_date TEXT NOT NULL,
+        status TEXT DEFAULT 'Active' CHECK(status IN ('Active', 'Fulfilled', 'Cancelled')),
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (book_id) REFERENCES books (id)
+    );
+    CREATE TABLE transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        book_id INTEGER NOT NULL,
+        issue_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        due_date TIMESTAMP NOT NULL,
+        return_date TIMESTAMP,
+        status TEXT DEFAULT 'borrowed',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        available INTEGER DEFAULT 1,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (book_id) REFERENCES books (id)
+    );
+    CREATE TABLE schema_migrations (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE fines (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        transaction_id INTEGER NOT NULL,
+        amount REAL NOT NULL CHECK(amount >= 0),
+        reason TEXT,
+        paid INTEGER DEFAULT 0 CHECK(paid IN (0,1)),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (transaction_id) REFERENCES transactions(id) ON DELETE CASCADE
+    );
+    CREATE TABLE reminders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        description TEXT,
+        due_on DATETIME NOT NULL,
+        priority TEXT CHECK(priority IN ('Low','Normal','High')) DEFAULT 'Normal',
+        created_by INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (created_by) REFERENCES users(id)
+    );
+    CREATE TABLE feedback (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        message TEXT NOT NULL,
+        satisfaction_score INTEGER CHECK(satisfaction_score BETWEEN 1 AND 5),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    );
+    CREATE TRIGGER update_users_timestamp AFTER UPDATE ON users
+    BEGIN
+        UPDATE users SET updated_at = CURRENT_TIMESTAMP WHERE id = OLD.id;
+    END;
+    CREATE TRIGGER update_transactions_timestamp AFTER UPDATE ON transactions
+    BEGIN
+        UPDATE transactions SET updated_at = CURRENT_TIMESTAMP WHERE id = OLD.id;
+    END;
+    CREATE TRIGGER update_reservations_timestamp AFTER UPDATE ON reservations
+    BEGIN
+        UPDATE reservations SET updated_at = CURRENT_TIMESTAMP WHERE id = OLD.id;
+    END;
+    CREATE TRIGGER update_fines_timestamp AFTER UPDATE ON fines
+    BEGIN
+        UPDATE fines SET updated_at = CURRENT_TIMESTAMP WHERE id = OLD.id;
+    END;
+    CREATE TRIGGER update_reminders_timestamp AFTER UPDATE ON reminders
+    BEGIN
+        UPDATE reminders SET updated_at = CURRENT_TIMESTAMP WHERE id = OLD.id;
+    END;
+    CREATE TRIGGER check_unique_active_reservation BEFORE INSERT ON reservations
+    WHEN NEW.status = 'Active'
+    BEGIN
+        SELECT RAISE(ABORT, 'User already has an active reservation for this book')
+        FROM reservations
+        WHERE book_id = NEW.book_id AND user_id = NEW.user_id AND status = 'Active';
+    END;
+    CREATE INDEX idx_users_name_email ON users(full_name, email);
+    CREATE INDEX idx_books_title_author ON books(title, author);
+    CREATE INDEX idx_transactions_user_id ON transactions(user_id);
+    CREATE INDEX idx_transactions_book_id ON transactions(book_id);
+    CREATE INDEX idx_transactions_status ON transactions(status);
+    CREATE INDEX idx_transactions_user_status ON transactions(user_id, status);
+    CREATE INDEX idx_transactions_book_status ON transactions(book_id, status);
+    CREATE INDEX idx_transactions_due_date ON transactions(due_date);
+    CREATE INDEX idx_reservations_user_id ON reservations(user_id);
+    CREATE INDEX idx_reservations_book_id ON reservations(book_id);
+    CREATE INDEX idx_reservations_status ON reservations(status);
+    CREATE INDEX idx_reservations_book_status ON reservations(book_id, status);
+    CREATE INDEX idx_fines_paid ON fines(paid);
+    CREATE INDEX idx_fines_transaction ON fines(transaction_id);
+    CREATE INDEX idx_feedback_created_at ON feedback(created_at);
+    CREATE INDEX idx_reminders_due_priority ON reminders(due_on, priority);
+    INSERT INTO schema_migrations (id, name, applied_at) VALUES
+        (1, '001_init.sql', '2025-08-30 00:43:53'), (2, '002_indexes.sql', '2025-09-17 02:34:31');
+"""
+
+
+def build_library_db(path: str) -> str:
+    """Create the legacy schema at ``path`` and migrate it to ``SCHEMA_VERSION``."""
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(LEGACY_SCHEMA)
+        migrate(conn)
+    finally:
+        conn.close()
+    return path
+
+
+def _add_members(conn: sqlite3.Connection, members):
+    """Insert ``(id, full_name[, role[, status]])`` rows with the columns users requires."""
+    conn.executemany(
+        "INSERT INTO users (id, username, email, password_hash, full_name, role, status) "
+        "VALUES (?, ?, ?, 'x', ?, ?, ?)",
+        [(member[0], f'member{member[0]}', f'member{member[0]}@example.com', member[1],
+          *(tuple(member[2:]) + ('member', 'Active')[len(member) - 2:]))
+         for member in members]
+    )
+
+
+def _add_titles(conn: sqlite3.Connection, titles):
+    """Insert ``(id, title, stock[, author[, isbn]])`` rows with every copy on the shelf."""
+    conn.executemany(
+        "INSERT INTO books (id, title, author, isbn, stock, available) VALUES (?, ?, ?, ?, ?, ?)",
+        [(title[0], title[1], title[3] if len(title) > 3 else 'A. Author',
+          title[4] if len(title) > 4 else f'978{title[0]:010d}', title[2], title[2])
+         for title in titles]
+    )
+
+
+@pytest.fixture(scope='session')
+def _migrated_library(tmp_path_factory):
+    return build_library_db(str(tmp_path_factory.mktemp('template') / 'library.db'))
+
+
+@pytest.fixture
+def library_db(_migrated_library, tmp_path):
+    """Path of a fresh copy of the migrated library database."""
+    path = str(tmp_path / 'library.db')
+    shutil.copyfile(_migrated_library, path)
+    return path
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """Path of a database with ``LEGACY_SCHEMA`` only; seed it, then ``migrate`` it."""
+    path = str(tmp_path / 'library.db')
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(LEGACY_SCHEMA)
+    finally:
+        conn.close()
+    return path
+
+
+@pytest.fixture
+def library_conn(library_db):
+    """A connection to ``library_db``, closed after the test."""
+    conn = sqlite3.connect(library_db)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def add_members():
+    return _add_members
+
+
+@pytest.fixture
+def add_titles():
+    return _add_titles
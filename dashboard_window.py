@@ -15,6 +15,7 @@ from fine_management_page import FineManagementPage
 from notification_reminder_page import NotificationReminderPage
 from reservation_management_page import ReservationManagementPage
 from user_feedback_page import UserFeedbackPage
+from theme import set_variant
 
 class SidebarButton(QPushButton):
     def __init__(self, text, active=False, parent=None):
@@ -26,45 +27,8 @@ class SidebarButton(QPushButton):
         # Set fixed height for consistent button sizing
         self.setMinimumHeight(48)
         self.setMaximumHeight(48)
-        # Set up the base styles
-        self.update_styles()
-        
-    def update_styles(self):
-        base_style = """
-            QPushButton {
-                text-align: left;
-                padding: 10px 16px;
-                margin: 0;
-                font-size: 15px;
-                color: #1e293b;
-                border: none;
-                background: #f8fafc;
-                border-radius: 10px;
-                font-family: 'Segoe UI', -apple-system, sans-serif;
-                font-weight: 600;
-                letter-spacing: 0.3px;
-                min-width: 200px;
-                min-height: 40px;
-            }
-            QPushButton:hover {
-                background: #f1f5f9;
-                transform: translateY(-1px);
-            }
-            QPushButton:pressed {
-                transform: translateY(1px);
-            }
-            QPushButton:checked {
-                background: #4f46e5;
-                color: white;
-                font-weight: 700;
-                letter-spacing: 0.4px;
-                border-left: 3px solid #ffffff;
-            }
-            QPushButton:checked:hover {
-                background: #4338ca;
-            }
-        """
-        self.setStyleSheet(base_style)
+        # Styled by the application theme (QPushButton#sidebarButton)
+        self.setObjectName("sidebarButton")
 
 class StatCard(QFrame):
     def __init__(self, title, value, color=None):
@@ -78,39 +42,10 @@ class StatCard(QFrame):
         self.title = title
         self.value = value
         
-        # Set all cards to use the same color
-        color_map = {
-            'books': '#F0D2DA',
-            'users': '#F0D2DA',
-            'borrowed': '#F0D2DA',
-            'overdue': '#F0D2DA',
-            'default': '#F0D2DA'
-        }
-        
-        # Get the appropriate color based on the title
-        if 'book' in title.lower() and 'overdue' not in title.lower():
-            card_color = color_map['books']
-        elif 'member' in title.lower() or 'user' in title.lower():
-            card_color = color_map['users']
-        elif 'borrow' in title.lower():
-            card_color = color_map['borrowed']
-        elif 'overdue' in title.lower():
-            card_color = color_map['overdue']
-        else:
-            card_color = color or color_map['default']
-        
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: {card_color};
-                border-radius: 10px;
-                border: 1px solid #e5e7eb;
-                padding: 12px 10px;
-                margin: 0 4px;
-            }}
-            QLabel {{
-                border: none;
-            }}
-        """)
+        # Styled by the application theme (QFrame#statCard)
+        self.setObjectName("statCard")
+        if color:
+            self.setStyleSheet(f"QFrame#statCard {{ background-color: {color}; }}")
         
         # Main layout
         layout = QVBoxLayout(self)
@@ -124,26 +59,14 @@ class StatCard(QFrame):
         # Set font to Times New Roman and adjust size based on card type
         font_size = 14 if 'member' in title.lower() else 12  # Larger font for members
         title_label.setFont(QFont("Times New Roman", font_size, QFont.Bold))
-        
-        title_label.setStyleSheet("""
-            color: #111827; 
-            font-weight: 800; 
-            letter-spacing: 0.5px;
-            padding: 2px 0;
-            text-align: center;
-        """)
+        title_label.setObjectName("statTitle")
         title_label.setAlignment(Qt.AlignCenter | Qt.AlignTop)
 
         # Create and configure value label
         value_label = QLabel(str(value))
         value_font_size = 36 if 'member' in title.lower() else 32  # Larger font for members
         value_label.setFont(QFont("Times New Roman", value_font_size, QFont.Bold))
-        value_label.setStyleSheet("""
-            color: #111827; 
-            font-weight: 800;
-            padding: 2px 0;
-            text-align: center;
-        """)
+        value_label.setObjectName("statValue")
         value_label.setAlignment(Qt.AlignCenter | Qt.AlignVCenter)
         
         layout.addWidget(title_label)
@@ -154,12 +77,12 @@ class StatusBadge(QLabel):
         super().__init__(status)
         self.setAlignment(Qt.AlignCenter)
         self.setFixedHeight(28)
-        if status == "Borrowed":
-            self.setStyleSheet("background: #f3f4f6; color: #232b36; border-radius: 8px; font-weight: bold; padding: 2px 16px;")
-        elif status == "Available":
-            self.setStyleSheet("background: #e6f4ea; color: #388e3c; border-radius: 8px; font-weight: bold; padding: 2px 16px;")
-        elif status == "Overdue":
-            self.setStyleSheet("background: #fff4e5; color: #f57c00; border-radius: 8px; font-weight: bold; padding: 2px 16px;")
+        self.set_status(status)
+
+    def set_status(self, status):
+        """Show ``status``; the theme colours the badge by its ``badge`` property."""
+        self.setText(status)
+        set_variant(self, "badge", status.lower())
 
 class Sidebar(QWidget):
     logout_requested = pyqtSignal()
@@ -167,10 +90,9 @@ class Sidebar(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFixedWidth(260)
-        self.setStyleSheet("""
-            background: #f8fafc;
-            border-right: 1px solid #e2e8f0;
-        """)
+        # Styled by the application theme (QWidget#sidebar)
+        self.setObjectName("sidebar")
+        self.setAttribute(Qt.WA_StyledBackground, True)
         
         # Main layout with proper spacing
         layout = QVBoxLayout(self)
@@ -185,12 +107,7 @@ class Sidebar(QWidget):
         logo_label = QLabel("INTELLI LIBRARIA")
         logo_label.setAlignment(Qt.AlignCenter)
         logo_label.setFont(QFont("Segoe UI", 16, QFont.Black))  # Increased size and weight
-        logo_label.setStyleSheet("""
-            color: #1e293b;  /* Dark gray color for better contrast */
-            padding: 12px 0;
-            margin: 0;
-            letter-spacing: 0.5px;
-        """)
+        logo_label.setObjectName("sidebarLogo")
         
         title_layout.addWidget(logo_label)
         layout.addWidget(title_widget)
@@ -314,22 +231,17 @@ class Sidebar(QWidget):
 
 
 class DashboardWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, counters=None):
         super().__init__()
+        # Card counts already read (by the start-up warm-up), by card name
+        self.prefetched_counters = counters or {}
         self.setWindowTitle("Intelli Libraria - Dashboard")
         self.setWindowFlags(Qt.Window | Qt.WindowTitleHint | Qt.WindowSystemMenuHint | 
                           Qt.WindowMinimizeButtonHint | Qt.WindowMaximizeButtonHint | 
                           Qt.WindowCloseButtonHint)
         self.setMinimumSize(1200, 800)
         self.setFont(QFont("Arial", 10))
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f8f9fa;
-            }
-            QLabel, QPushButton, QLineEdit, QTableWidget {
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }
-        """)
+        self.setObjectName("dashboardWindow")
         self.initUI()
         self.showMaximized()  # Show maximized with title bar
     
@@ -415,6 +327,16 @@ class DashboardWindow(QMainWindow):
             print(f"No action found for page: {sender.page_name}")
             print(f"Available pages: {list(page_map.keys())}")
 
+    def card_count(self, name, query):
+        """A card's count: prefetched if available, else ``database.<query>()``."""
+        if name in self.prefetched_counters:
+            return self.prefetched_counters[name]
+        try:
+            import database
+            return getattr(database, query)()
+        except Exception:
+            return 0
+
     def create_dashboard_content(self):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
@@ -439,35 +361,22 @@ class DashboardWindow(QMainWindow):
         cards_layout.setSpacing(6)  
         
         # Total Books from database
-        try:
-            import database
-            total_books = database.get_books_count()
-        except Exception:
-            total_books = 0
+        total_books = self.card_count('books', 'get_books_count')
         self.total_books_card = StatCard("Total Books", total_books)
         cards_layout.addWidget(self.total_books_card, 1)
 
         # Live Members
-        try:
-            members_count = database.get_members_count()
-        except Exception:
-            members_count = 0
+        members_count = self.card_count('members', 'get_members_count')
         self.members_card = StatCard("Members", members_count)
         cards_layout.addWidget(self.members_card, 1)
 
         # Live Borrowed
-        try:
-            borrowed_count = database.get_borrowed_count()
-        except Exception:
-            borrowed_count = 0
+        borrowed_count = self.card_count('borrowed', 'get_borrowed_count')
         self.borrowed_card = StatCard("Books Borrowed", borrowed_count)
         cards_layout.addWidget(self.borrowed_card, 1)
 
         # Live Overdue
-        try:
-            overdue_count = database.get_overdue_count()
-        except Exception:
-            overdue_count = 0
+        overdue_count = self.card_count('overdue', 'get_overdue_count')
         self.overdue_card = StatCard("Overdue Books", overdue_count)
         cards_layout.addWidget(self.overdue_card, 1)
         
@@ -0,0 +1,153 @@
+"""
+Daily circulation aggregates for activity and utilization reports.
+
+The ``circulation_daily``, ``circulation_daily_book`` and ``circulation_daily_user``
+tables (migration 007) hold per-day counts of issues, returns, late returns and
+reservations. Triggers on ``transactions`` and ``reservations`` (last replaced
+by migration 025) keep them current as loans change, skipping dates SQLite
+cannot parse just as the rebuild does; ``catch_up`` re-derives a trailing
+window from the source tables (the nightly job) and ``rebuild`` re-derives
+everything.
+
+Reports read these tables instead of scanning the transaction history, so
+their cost depends on the length of the report window, not on the history.
+Days before the archive watermark (``data.archive``) are never rebuilt:
+their loans live in the archive database, which the view cannot see.
+"""
+import sqlite3
+from datetime import date, timedelta
+from typing import Dict, Optional, Union
+
+from data.archive import watermark
+from data.migrator import migrate
+
+AGGREGATE_TABLES = {
+    # table: (key columns, aggregated columns)
+    'circulation_daily': (('day',), ('issues', 'returns', 'overdues', 'reservations', 'loan_days')),
+    'circulation_daily_book': (('day', 'book_id'), ('issues', 'returns', 'overdues', 'reservations')),
+    'circulation_daily_user': (('day', 'user_id'), ('issues', 'returns', 'overdues', 'reservations')),
+}
+
+
+def rebuild(conn: sqlite3.Connection, since: Optional[Union[str, date]] = None) -> Dict[str, int]:
+    """
+    Re-derive the aggregates from the source tables.
+
+    Args:
+        conn: An open read-write connection
+        since: First day (inclusive) to rebuild; rebuilds all history if None
+            (in both cases no earlier than the archive watermark)
+
+    Returns:
+        Number of aggregate rows written per table
+    """
+    if isinstance(since, date):
+        since = since.isoformat()
+    archived_before = watermark(conn)
+    if archived_before is not None and (since is None or since < archived_before):
+        since = archived_before
+    day_filter = "day IS NOT NULL" if since is None else "day >= ?"
+    params = () if since is None else (since,)
+
+    written = {}
+    conn.execute('SAVEPOINT circulation_rebuild')
+    try:
+        for table, (keys, values) in AGGREGATE_TABLES.items():
+            conn.execute(f"DELETE FROM {table} WHERE {day_filter}", params)
+            key_list = ', '.join(keys)
+            sums = ', '.join(f'SUM({col})' for col in values)
+            cursor = conn.execute(
+                f"""
+                INSERT INTO {table} ({key_list}, {', '.join(values)})
+                SELECT {key_list}, {sums}
+                FROM circulation_events
+                WHERE {day_filter}
+                GROUP BY {key_list}
+                """,
+                params
+            )
+            written[table] = cursor.rowcount
+        conn.execute('RELEASE circulation_rebuild')
+    except Exception:
+        conn.execute('ROLLBACK TO circulation_rebuild')
+        conn.execute('RELEASE circulation_rebuild')
+        raise
+    return written
+
+
+def catch_up(conn: sqlite3.Connection, days: int = 2) -> Dict[str, int]:
+    """
+    Nightly catch-up: rebuild the trailing ``days`` days of aggregates.
+
+    Repairs any drift caused by writes made while the triggers were missing
+    (e.g. bulk imports that drop and recreate tables).
+    """
+    return rebuild(conn, date.today() - timedelta(days=days))
+
+
+USER_ACTIVITY_SQL = """
+    SELECT
+        u.id as user_id,
+        u.full_name as user_name,
+        u.email as user_email,
+        u.role as user_role,
+        a.total_borrowed,
+        a.total_reservations,
+        a.books_returned,
+        (SELECT COUNT(*) FROM transactions t
+         WHERE t.user_id = u.id AND t.status = 'Issued'
+           AND t.due_date < date('now')) as overdue_books,
+        a.last_activity
+    FROM (
+        SELECT user_id,
+               SUM(issues) as total_borrowed,
+               SUM(reservations) as total_reservations,
+               SUM(returns) as books_returned,
+               MAX(CASE WHEN issues > 0 THEN day END) as last_activity
+        FROM circulation_daily_user
+        WHERE day >= date('now', '-' || :days || ' days')
+        -- unary + keeps the planner on the (day, user_id) key range
+        -- instead of walking the whole (user_id, day) index
+        GROUP BY +user_id
+        HAVING SUM(issues) > 0 OR SUM(reservations) > 0
+    ) a
+    JOIN users u ON u.id = a.user_id
+    ORDER BY a.last_activity DESC
+"""
+
+
+def user_activity(conn: sqlite3.Connection, days: int = 30) -> list:
+    """
+    Per-user circulation totals for the last ``days`` days.
+
+    Returns:
+        List of dicts with user details, issue/return/reservation totals,
+        currently overdue loans and the last issue day
+    """
+    cursor = conn.execute(USER_ACTIVITY_SQL, {'days': days})
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Circulation aggregate maintenance')
+    parser.add_argument('--db', help='Database path (defaults to the application database)')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild all aggregates from history')
+    parser.add_argument('--catch-up', type=int, metavar='DAYS', help='Rebuild the trailing DAYS days')
+    args = parser.parse_args()
+
+    if args.db:
+        db_path = args.db
+    else:
+        from data.database import DB_PATH as db_path
+    connection = sqlite3.connect(db_path)
+    try:
+        migrate(connection)
+        if args.rebuild:
+            print(rebuild(connection))
+        elif args.catch_up is not None:
+            print(catch_up(connection, args.catch_up))
+        connection.commit()
+    finally:
+        connection.close()
@@ -0,0 +1,366 @@
+"""
+Columnar circulation analytics.
+
+Transactions are pulled into compact NumPy arrays (``int32`` ids and
+``datetime64[D]`` dates) in one streaming pass over a read-only snapshot, and
+statistics are computed with vectorised operations instead of per-report SQL:
+loan-duration distributions, per-title turnover, overdue rates by issue cohort
+and weekly trends.
+
+Extracts are cached on disk as ``.npy`` files and loaded memory-mapped. The
+cache is checked against ``PRAGMA data_version`` on every call, so arrays are
+only re-extracted after another connection has committed a change.
+
+NumPy is an optional dependency; everything else in the application works
+without it.
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+from dataclasses import dataclass, fields
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from data import archive
+from data.readonly import ReadOnlyDatabase
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'analytics_cache')
+
+# julianday() of 1970-01-01; dates are extracted as days since the epoch
+_UNIX_EPOCH_JD = 2440587.5
+
+LOAN_COLUMNS = ('id', 'user_id', 'book_id', 'issue_date', 'due_date', 'return_date')
+BOOK_COLUMNS = ('book_id', 'stock')
+
+# NULL dates become the int64 minimum, which is NaT once viewed as datetime64
+_NAT = -2 ** 63
+
+
+def _day_number(column: str) -> str:
+    return f"COALESCE(CAST(julianday({column}) - {_UNIX_EPOCH_JD} AS INTEGER), {_NAT})"
+
+
+_LOANS_SQL = f"""
+    SELECT id, user_id, book_id,
+           {_day_number('issue_date')},
+           {_day_number('due_date')},
+           {_day_number('return_date')}
+    FROM {{source}}
+    ORDER BY id
+"""
+
+_BOOKS_SQL = "SELECT id, COALESCE(stock, 0) FROM books ORDER BY id"
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError('Circulation analytics require NumPy (pip install numpy)')
+
+
+@dataclass
+class CirculationArrays:
+    """Columnar extract of the transaction history and book stock."""
+    id: Any
+    user_id: Any
+    book_id: Any
+    issue_date: Any
+    due_date: Any
+    return_date: Any  # NaT while the loan is open
+    stock_book_id: Any
+    stock: Any
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    @property
+    def returned(self):
+        """Boolean mask of loans that have been returned."""
+        return ~np.isnat(self.return_date)
+
+    def columns(self) -> Dict[str, Any]:
+        return {
+            'id': self.id, 'user_id': self.user_id, 'book_id': self.book_id,
+            'issue_date': self.issue_date, 'due_date': self.due_date,
+            'return_date': self.return_date,
+            'stock_book_id': self.stock_book_id, 'stock': self.stock,
+        }
+
+
+def _stream(conn: sqlite3.Connection, sql: str, width: int, batch_size: int):
+    """Read ``sql`` with ``fetchmany`` into one int64 block."""
+    cursor = conn.execute(sql)
+    blocks = []
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        blocks.append(np.array(rows, dtype=np.int64))
+    if not blocks:
+        return np.empty((0, width), dtype=np.int64)
+    return np.concatenate(blocks)
+
+
+def extract(conn: sqlite3.Connection, batch_size: int = 50000) -> CirculationArrays:
+    """
+    Pull transactions and book stock into NumPy arrays in one pass.
+
+    Dates are converted to day numbers inside SQLite, so no Python ``date``
+    objects or strings are created per row. Run inside a snapshot for a consistent view;
+    archived loans are included if the archive is attached (``archive.attach_if_needed``).
+    """
+    _require_numpy()
+    source = archive.loan_source(conn) if archive.is_attached(conn) else 'transactions'
+    loans = _stream(conn, _LOANS_SQL.format(source=source), len(LOAN_COLUMNS), batch_size)
+    books = _stream(conn, _BOOKS_SQL, len(BOOK_COLUMNS), batch_size)
+    return CirculationArrays(
+        id=loans[:, 0].astype(np.int32),
+        user_id=loans[:, 1].astype(np.int32),
+        book_id=loans[:, 2].astype(np.int32),
+        issue_date=loans[:, 3].view('datetime64[D]'),
+        due_date=loans[:, 4].view('datetime64[D]'),
+        return_date=loans[:, 5].view('datetime64[D]'),
+        stock_book_id=books[:, 0].astype(np.int32),
+        stock=books[:, 1].astype(np.int32),
+    )
+
+
+def _as_day(value: Union[str, date, None]):
+    if value is None:
+        return np.datetime64(date.today(), 'D')
+    return np.datetime64(value, 'D')
+
+
+def _window(arrays: CirculationArrays, start=None, end=None):
+    """Mask of loans issued in [start, end]."""
+    mask = ~np.isnat(arrays.issue_date)
+    if start is not None:
+        mask &= arrays.issue_date >= _as_day(start)
+    if end is not None:
+        mask &= arrays.issue_date <= _as_day(end)
+    return mask
+
+
+def loan_duration_distribution(arrays: CirculationArrays,
+                               percentiles: Sequence[float] = (50, 75, 90, 95, 99),
+                               bins: Sequence[int] = (0, 7, 14, 21, 28, 42, 60, 90, 180),
+                               start=None, end=None) -> Dict[str, Any]:
+    """
+    Distribution of loan durations (in days) for returned loans.
+
+    Returns:
+        Dictionary with count, mean, the requested percentiles and a histogram
+        over ``bins`` (the last bucket is open-ended)
+    """
+    _require_numpy()
+    mask = _window(arrays, start, end) & arrays.returned
+    days = (arrays.return_date[mask] - arrays.issue_date[mask]).astype(np.int64)
+    edges = np.asarray(list(bins) + [np.iinfo(np.int64).max], dtype=np.int64)
+    counts, _ = np.histogram(days, bins=edges)
+    if days.size == 0:
+        return {'count': 0, 'mean': None, 'percentiles': {}, 'histogram': []}
+    values = np.percentile(days, percentiles)
+    return {
+        'count': int(days.size),
+        'mean': float(days.mean()),
+        'percentiles': {f'p{p:g}': float(v) for p, v in zip(percentiles, values)},
+        'histogram': [
+            {'from_days': int(lo), 'to_days': int(hi) if i < len(bins) - 1 else None, 'loans': int(n)}
+            for i, (lo, hi, n) in enumerate(zip(edges[:-1], edges[1:], counts))
+        ],
+    }
+
+
+def title_turnover(arrays: CirculationArrays, start=None, end=None,
+                   limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+    """
+    Loans per title and loans per copy (turnover) over a window.
+
+    Returns:
+        Titles ordered by loan count, most borrowed first
+    """
+    _require_numpy()
+    mask = _window(arrays, start, end)
+    size = int(max(arrays.book_id.max(initial=0), arrays.stock_book_id.max(initial=0))) + 1
+    loans = np.bincount(arrays.book_id[mask], minlength=size)
+    stock = np.zeros(size, dtype=np.int64)
+    stock[arrays.stock_book_id] = arrays.stock
+    turnover = np.divide(loans, stock, out=np.zeros(size), where=stock > 0)
+
+    # Sort by loans desc, then book id asc
+    order = np.lexsort((np.arange(size), -loans))
+    order = order[loans[order] > 0]
+    if limit is not None:
+        order = order[:limit]
+    return [
+        {'book_id': int(i), 'loans': int(loans[i]), 'copies': int(stock[i]),
+         'turnover': float(turnover[i])}
+        for i in order
+    ]
+
+
+def overdue_rate_by_cohort(arrays: CirculationArrays, cohort: str = 'M',
+                           as_of: Union[str, date, None] = None,
+                           start=None, end=None) -> List[Dict[str, Any]]:
+    """
+    Share of loans that went overdue, grouped by issue period.
+
+    A loan counts as overdue if it was returned after its due date, or is
+    still open and its due date is before ``as_of`` (today by default).
+
+    Args:
+        cohort: NumPy date unit for the cohort ('M' month, 'W' week, 'Y' year)
+    """
+    _require_numpy()
+    mask = _window(arrays, start, end) & ~np.isnat(arrays.due_date)
+    issue = arrays.issue_date[mask]
+    due = arrays.due_date[mask]
+    returned = arrays.return_date[mask]
+    is_returned = ~np.isnat(returned)
+    overdue = np.where(is_returned, returned > due, due < _as_day(as_of))
+
+    periods = issue.astype(f'datetime64[{cohort}]')
+    keys, inverse = np.unique(periods, return_inverse=True)
+    loans = np.bincount(inverse, minlength=len(keys))
+    late = np.bincount(inverse, weights=overdue, minlength=len(keys))
+    return [
+        {'cohort': str(k), 'loans': int(n), 'overdue': int(o), 'overdue_rate': float(o / n)}
+        for k, n, o in zip(keys, loans, late)
+    ]
+
+
+def weekly_trends(arrays: CirculationArrays, weeks: int = 52,
+                  as_of: Union[str, date, None] = None) -> List[Dict[str, Any]]:
+    """
+    Issues and returns per ISO week (weeks start on Monday) for the last ``weeks`` weeks.
+    """
+    _require_numpy()
+    # 1970-01-01 was a Thursday; shift so week buckets start on Monday
+    monday_offset = 3
+    last = (_as_day(as_of).astype(np.int64) + monday_offset) // 7
+    first = last - weeks + 1
+
+    def per_week(dates):
+        dates = dates[~np.isnat(dates)]
+        index = (dates.astype(np.int64) + monday_offset) // 7 - first
+        index = index[(index >= 0) & (index < weeks)]
+        return np.bincount(index, minlength=weeks)
+
+    issues = per_week(arrays.issue_date)
+    returns = per_week(arrays.return_date)
+    starts = (np.arange(first, last + 1) * 7 - monday_offset).astype('datetime64[D]')
+    return [
+        {'week_start': str(s), 'issues': int(i), 'returns': int(r)}
+        for s, i, r in zip(starts, issues, returns)
+    ]
+
+
+class CirculationAnalytics:
+    """
+    Cached columnar extract of a library database.
+
+    ``arrays()`` returns memory-mapped arrays from the on-disk cache. The
+    cache is revalidated against ``PRAGMA data_version`` on each call; when
+    another connection has committed since the last check, the cache key
+    (database and WAL file stamps) is recomputed and a fresh extract is
+    written if no cached copy matches it.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, cache_dir: str = DEFAULT_CACHE_DIR,
+                 batch_size: int = 50000):
+        _require_numpy()
+        self.readonly = ReadOnlyDatabase(db_path)
+        self.cache_dir = cache_dir
+        self.batch_size = batch_size
+        self._data_version: Optional[int] = None
+        self._arrays: Optional[CirculationArrays] = None
+        self.extracts = 0  # number of extracts run by this instance
+
+    def _cache_key(self) -> str:
+        parts = []
+        for suffix in ('', '-wal'):
+            try:
+                st = os.stat(self.readonly.db_path + suffix)
+                parts.append(f'{st.st_mtime_ns:x}{st.st_size:x}')
+            except FileNotFoundError:
+                parts.append('0')
+        return '-'.join(parts)
+
+    def _load(self, path: str) -> CirculationArrays:
+        return CirculationArrays(**{
+            name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+            for name in (f.name for f in fields(CirculationArrays))
+        })
+
+    def _store(self, key: str, arrays: CirculationArrays) -> str:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=self.cache_dir, prefix='.extract-')
+        for name, values in arrays.columns().items():
+            np.save(os.path.join(tmp, f'{name}.npy'), values)
+        final = os.path.join(self.cache_dir, key)
+        try:
+            os.replace(tmp, final)
+        except OSError:
+            # Another process stored the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+        # Drop extracts for older keys
+        for entry in os.listdir(self.cache_dir):
+            if entry != key and not entry.startswith('.'):
+                shutil.rmtree(os.path.join(self.cache_dir, entry), ignore_errors=True)
+        return final
+
+    def arrays(self) -> CirculationArrays:
+        """Return the current extract, re-extracting only after data changes."""
+        version = self.readonly.data_version()
+        if self._arrays is not None and version == self._data_version:
+            return self._arrays
+
+        # Stamp the files before the snapshot starts: a commit racing the
+        # extract then yields a newer key on the next call, never a stale hit.
+        key = self._cache_key()
+        archive.attach_if_needed(self.readonly.connection)
+        with self.readonly.snapshot() as conn:
+            path = os.path.join(self.cache_dir, key)
+            if not os.path.isdir(path):
+                path = self._store(key, extract(conn, self.batch_size))
+                self.extracts += 1
+        self._arrays = self._load(path)
+        self._data_version = version
+        return self._arrays
+
+    def summary(self, weeks: int = 12) -> Dict[str, Any]:
+        """Headline statistics for dashboards and reports."""
+        arrays = self.arrays()
+        returned = arrays.returned
+        return {
+            'total_loans': len(arrays),
+            'return_rate': float(returned.mean() * 100) if len(arrays) else 0.0,
+            'loan_duration': loan_duration_distribution(arrays),
+            'popular_titles': title_turnover(arrays),
+            'weekly_trends': weekly_trends(arrays, weeks),
+        }
+
+    def close(self):
+        self._arrays = None
+        self.readonly.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description='Circulation analytics')
+    parser.add_argument('--db', help='Database path (defaults to the application database)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--weeks', type=int, default=12)
+    args = parser.parse_args()
+
+    analytics = CirculationAnalytics(args.db, args.cache_dir)
+    try:
+        print(json.dumps(analytics.summary(args.weeks), indent=2))
+    finally:
+        analytics.close()
@@ -0,0 +1,394 @@
+"""
+Archive of long-returned loans in an attached database.
+
+``transactions`` keeps every loan ever made, so the overdue, fine and
+activity queries index or scan years of history that only reports ever
+ask for. ``archive_returned`` moves loans returned before a horizon
+(``horizon_days`` ago) into the ``transactions`` table of a separate
+archive database (``<database>_archive.db`` next to it), ``ATTACH``ed as
+``archive``; fined loans stay, with their fines. It walks the candidates
+in id order, ``batch_size`` loans per batch, and each batch is two short
+transactions:
+
+1. copy the batch into the archive (only the archive is written);
+2. delete the archived rows from the main database and raise the
+   watermark (migration 017).
+
+A crash between the two leaves a loan in both databases, never in
+neither; the main database is authoritative and the next run drops such
+copies from the archive before it starts. The deletes do not touch the
+daily circulation aggregates (007), so activity and utilization reports
+keep counting archived loans.
+
+Every date on an archived loan is before the watermark. Reads through
+``loan_source``/``loan_history`` whose date range starts on or after it
+(the overdue, fine and recent-activity windows) read the main table alone;
+older or open-ended ranges attach the archive and ``UNION ALL`` it in.
+ATTACH cannot run inside a transaction, so snapshot readers call
+``attach_if_needed`` before their snapshot starts.
+
+Usage::
+
+    python -m data.archive [--db intelli_libraria.db] [--horizon-days 365] [--status]
+"""
+import logging
+import os
+import sqlite3
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from data.migrator import migrate, require
+from data.readonly import readonly_uri
+
+logger = logging.getLogger(__name__)
+
+# Migration that adds the watermark (transaction_archive_state)
+ARCHIVE_VERSION = 17
+ARCHIVE_SCHEMA = 'archive'
+DATE_COLUMNS = ('issue_date', 'due_date', 'return_date')
+DEFAULT_HORIZON_DAYS = 365
+BATCH_SIZE = 5000
+
+ARCHIVE_INDEXES = (
+    ('idx_archive_user_issue', 'user_id, issue_date'),
+    ('idx_archive_book_issue', 'book_id, issue_date'),
+    ('idx_archive_issue_date', 'issue_date'),
+    ('idx_archive_return_date', 'return_date'),
+)
+
+# Returned, every date before the cutoff (unparseable dates count as before)
+# and never fined: fines.transaction_id cascades on delete, so archiving a
+# fined loan would take its fines (and the patron's balance) with it
+_ARCHIVABLE = """
+    return_date IS NOT NULL
+    AND COALESCE(date(return_date), '') < :cutoff
+    AND COALESCE(date(issue_date), '') < :cutoff
+    AND COALESCE(date(due_date), '') < :cutoff
+    AND NOT EXISTS (SELECT 1 FROM main.fines f WHERE f.transaction_id = transactions.id)
+"""
+
+
+def archive_path_for(db_path: str) -> str:
+    """Where the archive of ``db_path`` lives."""
+    root, _ = os.path.splitext(db_path)
+    return f'{root}_archive.db'
+
+
+def _main_path(conn: sqlite3.Connection) -> str:
+    for _, name, path in conn.execute('PRAGMA database_list'):
+        if name == 'main':
+            return path
+    raise sqlite3.OperationalError('connection has no main database')
+
+
+def _day(value: Union[str, date]) -> str:
+    return value.isoformat() if isinstance(value, date) else str(value)[:10]
+
+
+def is_attached(conn: sqlite3.Connection) -> bool:
+    return any(name == ARCHIVE_SCHEMA for _, name, _ in conn.execute('PRAGMA database_list'))
+
+
+def watermark(conn: sqlite3.Connection) -> Optional[str]:
+    """The day before which loans may be archived; None if nothing has been."""
+    try:
+        row = conn.execute(
+            "SELECT watermark FROM main.transaction_archive_state WHERE id = 1"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # Migration 017 not applied
+        return None
+    return row[0] if row else None
+
+
+def needs_archive(conn: sqlite3.Connection, start: Union[str, date, None] = None) -> bool:
+    """True if loans from ``start`` on (all loans if None) may include archived ones."""
+    mark = watermark(conn)
+    return mark is not None and (start is None or _day(start) < mark)
+
+
+def _columns(conn: sqlite3.Connection, schema: str) -> List[Tuple[str, str]]:
+    return [(row[1], row[2]) for row in conn.execute(f"PRAGMA {schema}.table_info(transactions)")]
+
+
+def _ensure_archive_table(conn: sqlite3.Connection):
+    loan_columns = _columns(conn, 'main')
+    archived = {name for name, _ in _columns(conn, ARCHIVE_SCHEMA)}
+    if not archived:
+        definitions = ', '.join(
+            f"{name} {kind}{' PRIMARY KEY' if name == 'id' else ''}" for name, kind in loan_columns
+        )
+        conn.execute(
+            f"CREATE TABLE {ARCHIVE_SCHEMA}.transactions ("
+            f"{definitions}, archived_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+        )
+        for name, columns in ARCHIVE_INDEXES:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.{name} ON transactions({columns})")
+        return
+    # Columns added to transactions after the archive was created
+    for name, kind in loan_columns:
+        if name not in archived:
+            conn.execute(f"ALTER TABLE {ARCHIVE_SCHEMA}.transactions ADD COLUMN {name} {kind}")
+
+
+def attach(conn: sqlite3.Connection, archive_path: Optional[str] = None) -> bool:
+    """
+    Attach the archive as ``archive`` unless it already is.
+
+    Read-only connections (``PRAGMA query_only``) attach it read-only and
+    skip a missing file; read-write connections create it if needed.
+    Must be called outside a transaction.
+
+    Returns:
+        True if the archive is attached
+    """
+    if is_attached(conn):
+        return True
+    path = archive_path or archive_path_for(_main_path(conn))
+    mark = watermark(conn)
+    if mark is not None and not os.path.exists(path):
+        logger.warning(f"Archive {path} is missing; loans archived before {mark} are not readable")
+    if conn.execute('PRAGMA query_only').fetchone()[0]:
+        if not os.path.exists(path):
+            return False
+        conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (readonly_uri(path),))
+        return True
+    conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (path,))
+    _ensure_archive_table(conn)
+    return True
+
+
+def attach_if_needed(conn: sqlite3.Connection, start: Union[str, date, None] = None) -> bool:
+    """Attach the archive if reads from ``start`` on need it (call before a snapshot)."""
+    return needs_archive(conn, start) and attach(conn)
+
+
+def _shared_columns(conn: sqlite3.Connection) -> List[str]:
+    archived = {name for name, _ in _columns(conn, ARCHIVE_SCHEMA)}
+    return [name for name, _ in _columns(conn, 'main') if name in archived]
+
+
+def loan_source(conn: sqlite3.Connection, start: Union[str, date, None] = None) -> str:
+    """
+    A ``FROM`` item with every loan a read starting at ``start`` can see.
+
+    Either ``main.transactions`` or a ``UNION ALL`` of it and the archive
+    (with an ``archived`` column); callers alias it like a table.
+    """
+    if not attach_if_needed(conn, start):
+        return 'main.transactions'
+    columns = ', '.join(_shared_columns(conn))
+    return (f"(SELECT {columns}, 0 AS archived FROM main.transactions "
+            f"UNION ALL SELECT {columns}, 1 AS archived FROM {ARCHIVE_SCHEMA}.transactions)")
+
+
+def loan_history(conn: sqlite3.Connection, start: Union[str, date, None] = None,
+                 end: Union[str, date, None] = None, column: str = 'issue_date',
+                 user_id: Optional[int] = None, book_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Loans whose ``column`` date falls within ``start``..``end`` (inclusive days).
+
+    Args:
+        conn: An open connection, outside a transaction unless the archive
+            is already attached
+        start: First day; None for all history
+        end: Last day; None for no upper bound
+        column: One of ``DATE_COLUMNS``
+        user_id: Only this member's loans
+        book_id: Only this title's loans
+
+    Returns:
+        Loan rows as dictionaries with an ``archived`` flag, ordered by ``column``
+    """
+    if column not in DATE_COLUMNS:
+        raise ValueError(f"column must be one of {DATE_COLUMNS}, not {column!r}")
+    conditions, params = [], []
+    if start is not None:
+        conditions.append(f"{column} >= ?")
+        params.append(_day(start))
+    if end is not None:
+        conditions.append(f"{column} < date(?, '+1 day')")
+        params.append(_day(end))
+    if user_id is not None:
+        conditions.append("user_id = ?")
+        params.append(user_id)
+    if book_id is not None:
+        conditions.append("book_id = ?")
+        params.append(book_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+    arms = [('main', 0)]
+    if attach_if_needed(conn, start):
+        arms.append((ARCHIVE_SCHEMA, 1))
+        columns = ', '.join(_shared_columns(conn))
+    else:
+        columns = ', '.join(name for name, _ in _columns(conn, 'main'))
+    # The filter is repeated in each arm so both use their own indexes
+    sql = ' UNION ALL '.join(
+        f"SELECT {columns}, {flag} AS archived FROM {schema}.transactions {where}" for schema, flag in arms
+    )
+    cursor = conn.execute(f"{sql} ORDER BY {column}, id", params * len(arms))
+    names = [description[0] for description in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+def _reconcile(conn: sqlite3.Connection) -> int:
+    """Drop archive copies of loans still in the main database (a batch interrupted after its copy)."""
+    conn.execute('BEGIN')
+    try:
+        cursor = conn.execute(
+            f"""
+            DELETE FROM {ARCHIVE_SCHEMA}.transactions WHERE id IN (
+                SELECT id FROM main.transactions
+                WHERE id <= (SELECT COALESCE(MAX(id), 0) FROM {ARCHIVE_SCHEMA}.transactions)
+            )
+            """
+        )
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    return cursor.rowcount
+
+
+def archive_returned(conn: sqlite3.Connection, horizon_days: int = DEFAULT_HORIZON_DAYS,
+                     batch_size: int = BATCH_SIZE, archive_path: Optional[str] = None,
+                     today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Move loans returned more than ``horizon_days`` ago into the archive.
+
+    Args:
+        conn: An open read-write connection (any pending transaction is committed)
+        horizon_days: Loans whose dates are all older than this many days are archived
+        batch_size: Loans per batch (per pair of transactions)
+        archive_path: Archive database; defaults to ``archive_path_for`` the main database
+        today: Reference day for the horizon (tests)
+
+    Returns:
+        ``{'cutoff', 'moved', 'batches', 'reconciled', 'seconds', 'watermark'}``
+    """
+    require(conn, ARCHIVE_VERSION, 'Archiving loans')
+    if conn.in_transaction:
+        conn.commit()
+    attach(conn, archive_path)
+    path = archive_path or archive_path_for(_main_path(conn))
+    cutoff = ((today or date.today()) - timedelta(days=horizon_days)).isoformat()
+    columns = ', '.join(name for name, _ in _columns(conn, 'main'))
+    started = time.perf_counter()
+    reconciled = _reconcile(conn)
+
+    moved = batches = 0
+    last = 0
+    while True:
+        upto, count = conn.execute(
+            f"""
+            SELECT MAX(id), COUNT(*) FROM (
+                SELECT id FROM main.transactions
+                WHERE id > :last AND {_ARCHIVABLE}
+                ORDER BY id LIMIT :limit
+            )
+            """,
+            {'last': last, 'cutoff': cutoff, 'limit': batch_size}
+        ).fetchone()
+        if not count:
+            break
+        params = {'last': last, 'upto': upto, 'cutoff': cutoff}
+
+        conn.execute('BEGIN')
+        try:
+            conn.execute(
+                f"""
+                INSERT OR REPLACE INTO {ARCHIVE_SCHEMA}.transactions ({columns})
+                SELECT {columns} FROM main.transactions
+                WHERE id > :last AND id <= :upto AND {_ARCHIVABLE}
+                """,
+                params
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                "UPDATE main.transaction_archive_state "
+                "SET archiving = 1, watermark = MAX(COALESCE(watermark, ''), :cutoff) WHERE id = 1",
+                params
+            )
+            cursor = conn.execute(
+                f"""
+                DELETE FROM main.transactions
+                WHERE id > :last AND id <= :upto AND {_ARCHIVABLE}
+                  AND id IN (SELECT id FROM {ARCHIVE_SCHEMA}.transactions WHERE id > :last AND id <= :upto)
+                """,
+                params
+            )
+            conn.execute("UPDATE main.transaction_archive_state SET archiving = 0 WHERE id = 1")
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        moved += cursor.rowcount
+        batches += 1
+        last = upto
+
+    # Loans changed between their copy and their delete stay in the main database
+    reconciled += _reconcile(conn)
+    seconds = time.perf_counter() - started
+    conn.execute(
+        """
+        INSERT INTO main.transaction_archive_runs (cutoff, archive_path, moved, batches, seconds)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        (cutoff, path, moved, batches, seconds)
+    )
+    conn.commit()
+    logger.info(f"Archived {moved} loans returned before {cutoff} in {batches} batches, {seconds:.2f}s")
+    return {'cutoff': cutoff, 'moved': moved, 'batches': batches, 'reconciled': reconciled,
+            'seconds': seconds, 'watermark': watermark(conn)}
+
+
+def status(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Watermark, loan counts on each side and the recent runs."""
+    result = {'watermark': watermark(conn), 'loans': conn.execute(
+        "SELECT COUNT(*) FROM main.transactions").fetchone()[0], 'archived': None, 'runs': []}
+    if result['watermark'] is None:
+        return result
+    if attach(conn):
+        result['archived'] = conn.execute(
+            f"SELECT COUNT(*) FROM {ARCHIVE_SCHEMA}.transactions").fetchone()[0]
+    result['runs'] = conn.execute(
+        "SELECT started_at, cutoff, moved, batches, seconds FROM main.transaction_archive_runs "
+        "ORDER BY id DESC LIMIT 10"
+    ).fetchall()
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description='Archive long-returned loans')
+    parser.add_argument('--db', help='Database path (defaults to the application database)')
+    parser.add_argument('--archive', help='Archive path (defaults to <database>_archive.db)')
+    parser.add_argument('--horizon-days', type=int, default=DEFAULT_HORIZON_DAYS)
+    parser.add_argument('--batch', type=int, default=BATCH_SIZE)
+    parser.add_argument('--status', action='store_true', help='Show the archive state only')
+    args = parser.parse_args()
+
+    if args.db:
+        db_path = args.db
+    else:
+        from data.database import DB_PATH as db_path
+    connection = sqlite3.connect(db_path)
+    try:
+        migrate(connection)
+        if not args.status:
+            print(archive_returned(connection, args.horizon_days, args.batch, args.archive))
+        info = status(connection)
+        print(f"watermark {info['watermark']}  loans {info['loans']}  archived {info['archived']}")
+        for run in info['runs']:
+            print(f"  {run[0]}  before {run[1]}  moved {run[2]:8d} in {run[3]:4d} batches  {run[4]:.2f}s")
+    finally:
+        connection.close()
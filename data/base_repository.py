@@ -8,6 +8,7 @@ from dataclasses import fields, is_dataclass
 import json
 
 from .database import get_db
+from .entity_cache import get_entity_cache
 from .errors import (
     NotFoundError, 
     UniquenessError, 
@@ -31,6 +32,8 @@ class BaseRepository(Generic[T]):
     table_name: str
     model_class: Type[T]
     columns: List[str] = []
+    # Entity name for the shared entity cache; None disables caching
+    cache_entity: Optional[str] = None
     
     def __init__(self):
         if not hasattr(self, 'table_name') or not self.table_name:
@@ -207,8 +210,33 @@ class BaseRepository(Generic[T]):
             WHERE id = ?
         """
         
-        row = self._execute_query(query, (id,), fetch_one=True)
-        return self._row_to_model(row) if row else None
+        return self._cached('id', id, query, (id,))
+    
+    def _cached(self, field: str, value: Any, query: str, params: Tuple[Any, ...]) -> Optional[T]:
+        """
+        Run a single-row lookup through the entity cache.
+        
+        Args:
+            field: The lookup field used as the cache key ('id', 'isbn', ...)
+            value: The normalized lookup value
+            query: Query returning at most one row
+            params: Parameters for the query
+            
+        Returns:
+            The model instance, or None if not found
+        """
+        def load():
+            row = self._execute_query(query, params, fetch_one=True)
+            return self._row_to_model(row) if row else None
+        
+        if self.cache_entity is None:
+            return load()
+        return get_entity_cache().get(self.cache_entity, field, value, load)
+    
+    def _invalidate(self, id: int) -> None:
+        """Drop a record from the entity cache after a write."""
+        if self.cache_entity is not None:
+            get_entity_cache().invalidate(self.cache_entity, id)
     
     def get_all(
         self, 
@@ -306,6 +334,7 @@ class BaseRepository(Generic[T]):
             
             # Execute the query
             rowcount = self._execute_query(query, tuple(params))
+            self._invalidate(model.id)
             return rowcount > 0
             
         except sqlite3.IntegrityError as e:
@@ -345,6 +374,7 @@ class BaseRepository(Generic[T]):
         """
         
         cursor = self._execute_query(query, (id,))
+        self._invalidate(id)
         return cursor.rowcount > 0
     
     def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
@@ -0,0 +1,247 @@
+"""
+Multi-branch inventory.
+
+Each branch holds copies of titles; ``holdings`` has one row per
+(branch, title) with the copies owned there (``total``) and on the shelf
+(``available``), keyed by ``(branch_id, book_id)`` so that everything a
+branch screen asks for -- search, counts, checkout -- is a range of that
+key and never reads another branch's rows. Loans record the issuing
+branch in ``transactions.branch_id``.
+
+Triggers (migration 011) keep three levels of counters current:
+
+* ``holdings.available`` per branch and title,
+* ``branches.titles/copies/available`` per branch,
+* ``books.stock/available`` per title across all branches (migration 010),
+
+so the consolidated views read cached aggregates instead of summing holdings.
+Open loans recorded without a branch are issued from a holding of the title
+with a copy on the shelf, the main library's first (migration 020), so every
+loan of a held title moves all three levels. Copies are added or withdrawn
+with ``set_holding``; ``books.stock`` of a title with holdings follows the
+sum of its holdings.
+"""
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
+
+from .errors import BusinessRuleError, NotFoundError
+
+# Branch that owns the copies of databases created before branches existed
+MAIN_BRANCH_ID = 1
+
+
+def _rows(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def add_branch(conn: sqlite3.Connection, name: str, code: Optional[str] = None) -> int:
+    """Create a branch and return its id."""
+    return conn.execute(
+        "INSERT INTO branches (name, code) VALUES (?, ?)", (name.strip(), code)
+    ).lastrowid
+
+
+def list_branches(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """All branches with their cached title, copy and shelf counts."""
+    return _rows(conn.execute(
+        "SELECT id, name, code, titles, copies, available FROM branches ORDER BY name"
+    ))
+
+
+def default_branch_id(conn: sqlite3.Connection) -> Optional[int]:
+    """The branch new titles are stocked at (the oldest one)."""
+    row = conn.execute("SELECT id FROM branches ORDER BY id LIMIT 1").fetchone()
+    return row[0] if row else None
+
+
+def set_holding(conn: sqlite3.Connection, book_id: int, branch_id: int, total: int) -> Tuple[int, int]:
+    """
+    Set the number of copies of a title a branch owns.
+
+    Adding copies puts them on the shelf; withdrawing copies is refused
+    while they are on loan. A total of 0 removes the holding.
+
+    Returns:
+        ``(total, available)`` of the holding after the change
+
+    Raises:
+        NotFoundError: If the title or the branch does not exist
+        BusinessRuleError: If fewer copies than are on loan would remain
+    """
+    if total < 0:
+        raise BusinessRuleError('holding_total', "Copies cannot be negative")
+    row = conn.execute(
+        "SELECT total, available FROM holdings WHERE branch_id = ? AND book_id = ?",
+        (branch_id, book_id)
+    ).fetchone()
+    if row is None:
+        if not conn.execute("SELECT 1 FROM books WHERE id = ?", (book_id,)).fetchone():
+            raise NotFoundError('book', id=book_id)
+        if not conn.execute("SELECT 1 FROM branches WHERE id = ?", (branch_id,)).fetchone():
+            raise NotFoundError('branch', id=branch_id)
+        if total:
+            conn.execute(
+                "INSERT INTO holdings (branch_id, book_id, total, available) VALUES (?, ?, ?, ?)",
+                (branch_id, book_id, total, total)
+            )
+        return total, total
+
+    on_loan = row[0] - row[1]
+    if total < on_loan:
+        raise BusinessRuleError(
+            'holding_total', f"{on_loan} copies are on loan from this branch; cannot keep only {total}"
+        )
+    if total == 0:
+        conn.execute("DELETE FROM holdings WHERE branch_id = ? AND book_id = ?", (branch_id, book_id))
+    elif total != row[0]:
+        conn.execute(
+            "UPDATE holdings SET total = ? WHERE branch_id = ? AND book_id = ?",
+            (total, branch_id, book_id)
+        )
+    return total, total - on_loan
+
+
+def set_title_stock(conn: sqlite3.Connection, book_id: int, stock: int):
+    """
+    Apply a title-level stock edit (the book form) to its holdings.
+
+    A title held by one branch changes that holding, a title without
+    holdings is stocked at the default branch; titles held by several
+    branches must be changed per branch.
+
+    Raises:
+        BusinessRuleError: If the title is held by more than one branch
+    """
+    held = conn.execute(
+        "SELECT branch_id, total FROM holdings WHERE book_id = ? LIMIT 2", (book_id,)
+    ).fetchall()
+    if len(held) > 1:
+        raise BusinessRuleError(
+            'branch_stock', "This title is held by several branches; change its copies per branch"
+        )
+    if held:
+        set_holding(conn, book_id, held[0][0], stock)
+        return
+    if not conn.execute("SELECT 1 FROM books WHERE id = ?", (book_id,)).fetchone():
+        raise NotFoundError('book', id=book_id)
+    branch_id = default_branch_id(conn)
+    if branch_id is None:
+        conn.execute("UPDATE books SET stock = ? WHERE id = ?", (stock, book_id))
+        return
+    # Unassigned copies become the default branch's holding
+    conn.execute("UPDATE books SET stock = 0 WHERE id = ?", (book_id,))
+    set_holding(conn, book_id, branch_id, stock)
+
+
+def search(conn: sqlite3.Connection, branch_id: int, query: Optional[str] = None,
+           available_only: bool = False, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+    """Titles held by one branch, with that branch's copies, by title."""
+    sql = """
+        SELECT b.id, b.title, b.author, b.isbn, b.edition,
+               h.total AS stock, h.available
+        FROM holdings h
+        JOIN books b ON b.id = h.book_id
+        WHERE h.branch_id = ?
+    """
+    params: List[Any] = [branch_id]
+    if available_only:
+        sql += " AND h.available > 0"
+    if query:
+        pattern = f"%{query}%"
+        sql += " AND (b.title LIKE ? OR b.author LIKE ? OR b.isbn LIKE ?)"
+        params += [pattern, pattern, pattern]
+    sql += " ORDER BY b.title LIMIT ? OFFSET ?"
+    return _rows(conn.execute(sql, params + [limit, offset]))
+
+
+def branch_counts(conn: sqlite3.Connection, branch_id: int) -> Dict[str, int]:
+    """Cached title, copy, shelf and on-loan counts of one branch."""
+    row = conn.execute(
+        "SELECT titles, copies, available FROM branches WHERE id = ?", (branch_id,)
+    ).fetchone()
+    if row is None:
+        raise NotFoundError('branch', id=branch_id)
+    titles, copies, available = row
+    return {'titles': titles, 'copies': copies, 'available': available, 'on_loan': copies - available}
+
+
+def title_availability(conn: sqlite3.Connection, book_id: int) -> Dict[str, Any]:
+    """
+    Where a title can be borrowed: its per-branch holdings and the
+    consolidated counts from ``books``.
+    """
+    row = conn.execute("SELECT title, stock, available FROM books WHERE id = ?", (book_id,)).fetchone()
+    if row is None:
+        raise NotFoundError('book', id=book_id)
+    branches = _rows(conn.execute(
+        """
+        SELECT h.branch_id, br.name AS branch, h.total, h.available
+        FROM holdings h
+        JOIN branches br ON br.id = h.branch_id
+        WHERE h.book_id = ?
+        ORDER BY h.available DESC, br.name
+        """,
+        (book_id,)
+    ))
+    return {'book_id': book_id, 'title': row[0], 'total': row[1], 'available': row[2],
+            'branches': branches}
+
+
+def network_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Copies and shelf counts across all branches, from the per-branch counters."""
+    copies, available = conn.execute(
+        "SELECT COALESCE(SUM(copies), 0), COALESCE(SUM(available), 0) FROM branches"
+    ).fetchone()
+    return {'branches': conn.execute("SELECT COUNT(*) FROM branches").fetchone()[0],
+            'copies': copies, 'available': available, 'on_loan': copies - available}
+
+
+def verify(conn: sqlite3.Connection) -> List[Tuple[Optional[int], str, int, int]]:
+    """
+    Recompute the branch counters from holdings and loans, and check that
+    the holdings of each held title add up to its ``books.available``.
+
+    Returns:
+        ``(branch_id, counter, cached, actual)`` for every mismatch; title
+        mismatches have no branch and the counter ``title <book_id>``
+    """
+    mismatches = []
+    cursor = conn.execute(
+        """
+        SELECT br.id, br.titles, br.copies, br.available,
+               COUNT(h.book_id), COALESCE(SUM(h.total), 0), COALESCE(SUM(h.available), 0)
+        FROM branches br
+        LEFT JOIN holdings h ON h.branch_id = br.id
+        GROUP BY br.id
+        """
+    )
+    for branch_id, *values in cursor.fetchall():
+        for name, cached, actual in zip(('titles', 'copies', 'available'), values[:3], values[3:]):
+            if cached != actual:
+                mismatches.append((branch_id, name, cached, actual))
+    cursor = conn.execute(
+        """
+        SELECT h.branch_id, h.book_id, h.available, h.total - COUNT(t.id)
+        FROM holdings h
+        LEFT JOIN transactions t
+          ON t.book_id = h.book_id AND t.branch_id = h.branch_id AND t.return_date IS NULL
+        GROUP BY h.branch_id, h.book_id
+        HAVING h.available != h.total - COUNT(t.id)
+        """
+    )
+    for branch_id, book_id, cached, actual in cursor.fetchall():
+        mismatches.append((branch_id, f'holding {book_id}', cached, actual))
+    # Loans outside any holding take copies off books.available only
+    cursor = conn.execute(
+        """
+        SELECT b.id, b.available, SUM(h.available)
+        FROM holdings h
+        JOIN books b ON b.id = h.book_id
+        GROUP BY h.book_id
+        HAVING b.available != SUM(h.available)
+        """
+    )
+    for book_id, cached, actual in cursor.fetchall():
+        mismatches.append((None, f'title {book_id}', cached, actual))
+    return mismatches
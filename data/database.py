@@ -1,19 +1,23 @@
 """
 Database connection and migration management for Intelli-Libraria.
 
-This module provides a singleton database connection pool, migration runner,
-and context manager for database operations.
+This module provides a singleton database connection pool, context manager
+for database operations, and runs the migration engine (``data.migrator``)
+on first use.
 """
 import os
 import sqlite3
 from contextlib import contextmanager
-from pathlib import Path
 from typing import Iterator, Optional
 
+from data.migrator import migrate
+
 # Database file path (single shared DB for the whole app)
-# Place the DB in the project root and name it 'intelli_libraria.db'
-DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'intelli_libraria.db')
-MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+# Place the DB in the project root and name it 'intelli_libraria.db';
+# INTELLI_LIBRARIA_DB selects another one, as it does for database.DB_FILE
+DB_PATH = os.environ.get('INTELLI_LIBRARIA_DB') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'intelli_libraria.db'
+)
 
 # Custom row factory for namedtuple-like access
 class DictRow(dict):    
@@ -68,58 +72,14 @@ class Database:
         finally:
             conn.close()
 
-    def _get_migration_files(self) -> list[tuple[int, str]]:
-        """Get sorted list of migration files."""
-        migrations = []
-        for f in Path(MIGRATIONS_DIR).glob('*.sql'):
-            try:
-                migration_id = int(f.stem.split('_')[0])
-                migrations.append((migration_id, str(f)))
-            except (ValueError, IndexError):
-                continue
-        return sorted(migrations, key=lambda x: x[0])
-
-    def _get_applied_migrations(self, conn: sqlite3.Connection) -> set[int]:
-        """Get set of applied migration IDs."""
-        try:
-            cursor = conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS schema_migrations (
-                    id INTEGER PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
-            cursor.execute("SELECT id, name FROM schema_migrations")
-            return {row['id'] for row in cursor.fetchall()}
-        except sqlite3.Error as e:
-            print(f"Error checking applied migrations: {e}")
-            return set()
-
     def _run_migrations(self):
-        """Run all pending migrations."""
-        with self.get_conn() as conn:
-            applied = self._get_applied_migrations(conn)
-            cursor = conn.cursor()
-            
-            for migration_id, migration_file in self._get_migration_files():
-                if migration_id in applied:
-                    continue
-
-                try:
-                    with open(migration_file, 'r', encoding='utf-8') as f:
-                        sql = f.read()
-                    
-                    cursor.executescript(sql)
-                    cursor.execute(
-                        "INSERT INTO schema_migrations (id, name) VALUES (?, ?)",
-                        (migration_id, os.path.basename(migration_file))
-                    )
-                    print(f"Applied migration: {migration_file}")
-                except Exception as e:
-                    print(f"Error applying migration {migration_file}: {e}")
-                    raise
+        """Apply pending migrations (a single PRAGMA read when the schema is current)."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for applied in migrate(conn):
+                print(f"Applied migration: {applied.name} ({applied.seconds * 1000:.1f}ms)")
+        finally:
+            conn.close()
 
 # Singleton instance
 db = Database()
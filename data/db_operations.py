@@ -6,6 +6,8 @@ Provides high-level database operations using the DatabaseHandler.
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime, timedelta
 from db_handler import db
+from data import archive
+from data.readonly import ReadOnlyDatabase
 import logging
 
 logger = logging.getLogger(__name__)
@@ -134,13 +136,6 @@ class DBOperations:
                 commit=True
             )
             
-            # Update book availability
-            db.execute_query(
-                "UPDATE books SET available = available - 1 WHERE id = ?",
-                (book_id,),
-                commit=True
-            )
-            
             return {
                 'success': True,
                 'message': 'Reservation created successfully.',
@@ -189,7 +184,7 @@ class DBOperations:
             # Start transaction
             db.execute_query("BEGIN TRANSACTION")
             
-            # Create transaction
+            # Create transaction (triggers keep books.available current)
             db.execute_query(
                 """
                 INSERT INTO transactions 
@@ -200,13 +195,6 @@ class DBOperations:
                 commit=False
             )
             
-            # Update book availability
-            db.execute_query(
-                "UPDATE books SET available = available - 1 WHERE id = ?",
-                (book_id,),
-                commit=False
-            )
-            
             # Complete transaction
             db.execute_query("COMMIT")
             
@@ -270,67 +258,73 @@ class DBOperations:
         start_date: Optional[str] = None,
         end_date: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Generate various reports."""
+        """Generate various reports on a read-only snapshot connection."""
+        readonly = ReadOnlyDatabase(db.db_path)
         try:
-            if report_type == 'overdue_books':
-                return db.execute_query(
-                    """
-                    SELECT t.*, u.full_name, b.title, b.author
-                    FROM transactions t
-                    JOIN users u ON t.user_id = u.id
-                    JOIN books b ON t.book_id = b.id
-                    WHERE t.status = 'overdue'
-                    ORDER BY t.due_date
-                    """,
-                    fetch=True,
-                    many=True
-                ) or []
-                
-            elif report_type == 'popular_books':
-                return db.execute_query(
-                    """
-                    SELECT b.*, COUNT(t.id) as borrow_count
-                    FROM books b
-                    LEFT JOIN transactions t ON b.id = t.book_id
-                    GROUP BY b.id
-                    ORDER BY borrow_count DESC
-                    LIMIT 10
-                    """,
-                    fetch=True,
-                    many=True
-                ) or []
-                
-            elif report_type == 'user_activity':
-                date_filter = ""
-                params = []
-                
-                if start_date and end_date:
-                    date_filter = "AND t.issue_date BETWEEN ? AND ?"
-                    params.extend([start_date, end_date])
-                
-                return db.execute_query(
-                    f"""
-                    SELECT u.id, u.full_name, u.email,
-                           COUNT(t.id) as transactions_count,
-                           SUM(CASE WHEN t.status = 'overdue' THEN 1 ELSE 0 END) as overdue_count,
-                           COALESCE(SUM(f.amount), 0) as total_fines
-                    FROM users u
-                    LEFT JOIN transactions t ON u.id = t.user_id
-                    LEFT JOIN fines f ON u.id = f.user_id
-                    WHERE u.role = 'member' {date_filter}
-                    GROUP BY u.id
-                    ORDER BY transactions_count DESC
-                    """,
-                    tuple(params),
-                    fetch=True,
-                    many=True
-                ) or []
-                
+            # Loan counts include archived loans from the first day read on
+            # (all history unless the activity report is given a range);
+            # ATTACH cannot run inside the snapshot
+            since = start_date if report_type == 'user_activity' and start_date and end_date else None
+            archive.attach_if_needed(readonly.connection, since)
+            with readonly.snapshot() as conn:
+                loans = archive.loan_source(conn, since)
+                if report_type == 'overdue_books':
+                    return readonly.query(
+                        """
+                        SELECT t.*, u.full_name, b.title, b.author
+                        FROM transactions t
+                        JOIN users u ON t.user_id = u.id
+                        JOIN books b ON t.book_id = b.id
+                        WHERE t.status = 'overdue'
+                        ORDER BY t.due_date
+                        """
+                    )
+                    
+                elif report_type == 'popular_books':
+                    return readonly.query(
+                        f"""
+                        SELECT b.*, COUNT(t.id) as borrow_count
+                        FROM books b
+                        LEFT JOIN {loans} t ON b.id = t.book_id
+                        GROUP BY b.id
+                        ORDER BY borrow_count DESC
+                        LIMIT 10
+                        """
+                    )
+                    
+                elif report_type == 'user_activity':
+                    date_filter = ""
+                    params = []
+                    
+                    if start_date and end_date:
+                        date_filter = "AND t.issue_date BETWEEN ? AND ?"
+                        params.extend([start_date, end_date])
+                    
+                    return readonly.query(
+                        f"""
+                        SELECT u.id, u.full_name, u.email,
+                               COUNT(t.id) as transactions_count,
+                               SUM(CASE WHEN t.status = 'overdue' THEN 1 ELSE 0 END) as overdue_count,
+                               COALESCE(pb.fined_cents, 0) / 100.0 as total_fines,
+                               COALESCE(pb.balance_cents, 0) / 100.0 as outstanding_fines
+                        FROM users u
+                        LEFT JOIN {loans} t ON u.id = t.user_id
+                        -- One balance row per patron, so loans are not multiplied by fines
+                        LEFT JOIN patron_balances pb ON pb.user_id = u.id
+                        WHERE u.role = 'member' {date_filter}
+                        GROUP BY u.id
+                        ORDER BY transactions_count DESC
+                        """,
+                        tuple(params)
+                    )
+                    
             return []
             
         except Exception as e:
             logger.error(f"Error generating {report_type} report: {e}")
             return []
+        finally:
+            readonly.close()
 
 # Singleton instance
 db_ops = DBOperations()
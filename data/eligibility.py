@@ -0,0 +1,418 @@
+"""
+Borrowing eligibility: configurable rules checked in a single query.
+
+Every checkout path asks the same questions: does the patron exist and is
+the account active, does the title exist (at the branch) with a copy
+free, and is the patron within the limits. The limits are rows of
+``borrowing_rules`` (migration 019):
+
+* ``max_loans``        - open loans per patron
+* ``max_title_loans``  - open loans of one title per patron (1 forbids a
+  second copy, 0 makes a title reference-only)
+* ``max_fine_balance`` - outstanding fines in cents (``patron_balances``,
+  018) above which checkout is blocked
+
+A rule applies to every patron, or only to one ``role``. A title rule can
+also be limited to one ``book_id``. The most specific active rule wins.
+``compile_rules`` turns the active rules into ``CASE`` expressions with
+their limits as parameters, and builds one statement around them. That
+statement returns every verdict for a batch of (patron, title) requests,
+passed in as one JSON parameter (a single request binds its ids
+directly). A single check and a "can these N patrons borrow X" check cost
+one round trip either way.
+
+Compiled statements are cached per database and carry
+``borrowing_rules_state.version`` in their result. A rule edit (from any
+connection) is noticed on the next check, which recompiles and runs again.
+Databases without 019 fall back to ``DEFAULT_RULES``.
+
+Usage::
+
+    python -m data.eligibility [--db intelli_libraria.db] [--list]
+        [--set RULE LIMIT [--role ROLE] [--book ID] [--disable]] [--check USER BOOK]
+"""
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from data.errors import ValidationError
+from data.migrator import migrate
+
+logger = logging.getLogger(__name__)
+
+RULES = ('max_loans', 'max_title_loans', 'max_fine_balance')
+
+# Verdict columns in the order their failures are reported
+CHECKS = ('user_found', 'user_active', 'book_found', 'held_by_branch', 'book_available',
+          'loan_limit', 'title_limit', 'fine_limit')
+
+
+@dataclass(frozen=True)
+class Rule:
+    rule: str
+    limit: int  # open loans, or cents for max_fine_balance
+    role: Optional[str] = None
+    book_id: Optional[int] = None
+
+
+# What the checkout code paths enforced before the rules were configurable
+DEFAULT_RULES = (Rule('max_loans', 5), Rule('max_title_loans', 1))
+
+
+@dataclass
+class Verdict:
+    """Whether ``user_id`` may borrow ``book_id``, with the result of every check."""
+    user_id: int
+    book_id: int
+    title: Optional[str]
+    checks: Dict[str, bool]
+    open_loans: int = 0
+    loan_limit: Optional[int] = None
+    title_loans: int = 0
+    title_limit: Optional[int] = None
+    balance_cents: int = 0
+    fine_limit: Optional[int] = None
+
+    @property
+    def eligible(self) -> bool:
+        return all(self.checks.values())
+
+    @property
+    def failed(self) -> List[str]:
+        return [name for name in CHECKS if not self.checks[name]]
+
+    @property
+    def message(self) -> Optional[str]:
+        """Why the first failing check failed, in the wording of the desktop pages."""
+        if self.eligible:
+            return None
+        failed = self.failed[0]
+        if failed == 'loan_limit':
+            return f"Maximum borrow limit reached ({self.loan_limit} books)"
+        if failed == 'title_limit':
+            if self.title_limit == 0:
+                return "This book is for reference only and cannot be borrowed"
+            return "You have already borrowed this book"
+        if failed == 'fine_limit':
+            return (f"Outstanding fines of ${self.balance_cents / 100:.2f} exceed the "
+                    f"${self.fine_limit / 100:.2f} limit")
+        return _MESSAGES[failed]
+
+
+_MESSAGES = {
+    'user_found': "User not found",
+    'user_active': "User account is not active",
+    'book_found': "Book not found",
+    'held_by_branch': "Book is not held by this branch",
+    'book_available': "Book is not available for borrowing",
+}
+
+
+@dataclass
+class CompiledRules:
+    """The eligibility statements for one rule set, by (branch, bulk)."""
+    statements: Dict[Tuple[bool, bool], str]
+    params: Dict[str, Any]
+    version: Optional[int]
+    rules: Tuple[Rule, ...] = field(default=())
+
+
+def _features(conn: sqlite3.Connection) -> FrozenSet[str]:
+    """The optional tables and columns the statement can use in this database."""
+    tables = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name IN "
+        "('borrowing_rules_state', 'patron_balances', 'holdings')"
+    )}
+    if any(row[1] == 'role' for row in conn.execute("PRAGMA table_info(users)")):
+        tables.add('users.role')
+    return frozenset(tables)
+
+
+def load_rules(conn: sqlite3.Connection) -> Tuple[Optional[int], Tuple[Rule, ...]]:
+    """The active rules and the rules version (``DEFAULT_RULES`` and None without 019)."""
+    try:
+        version = conn.execute("SELECT version FROM borrowing_rules_state WHERE id = 1").fetchone()
+        rows = conn.execute(
+            "SELECT rule, limit_value, role, book_id FROM borrowing_rules WHERE active = 1 ORDER BY id"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None, DEFAULT_RULES
+    return (version[0] if version else None), tuple(Rule(*row) for row in rows)
+
+
+def _limit_case(rules: Iterable[Rule], name: str, params: Dict[str, Any], features: FrozenSet[str]) -> str:
+    """A CASE choosing the most specific ``name`` limit for the row's role and title."""
+    scoped = sorted((rule for rule in rules if rule.rule == name),
+                    key=lambda rule: (rule.book_id is None, rule.role is None))
+    whens = []
+    default = 'NULL'
+    for rule in scoped:
+        if rule.role is not None and 'users.role' not in features:
+            continue
+        key = f'p{len(params)}'
+        params[key] = rule.limit
+        conditions = []
+        if rule.book_id is not None:
+            params[f'{key}_book'] = rule.book_id
+            conditions.append(f'book_id = :{key}_book')
+        if rule.role is not None:
+            params[f'{key}_role'] = rule.role.lower()
+            conditions.append(f'role = :{key}_role')
+        if conditions:
+            whens.append(f"WHEN {' AND '.join(conditions)} THEN :{key}")
+        elif default == 'NULL':
+            default = f':{key}'
+    if not whens:
+        return default
+    return f"CASE {' '.join(whens)} ELSE {default} END"
+
+
+def compile_rules(rules: Sequence[Rule], features: FrozenSet[str],
+                  version: Optional[int] = None) -> CompiledRules:
+    """
+    Build the eligibility statement for ``rules``.
+
+    The bulk statements read their requests from ``:requests``, a JSON array
+    of ``[user_id, book_id]`` pairs, and return one row per pair in order. A
+    single request binds ``:user_id`` and ``:book_id`` directly, which skips
+    the JSON parsing and the materialized patron table.
+    """
+    params: Dict[str, Any] = {}
+    loan_case = _limit_case(rules, 'max_loans', params, features)
+    title_case = _limit_case(rules, 'max_title_loans', params, features)
+    balances = 'patron_balances' in features
+    fine_case = _limit_case(rules, 'max_fine_balance', params, features) if balances else 'NULL'
+    role = 'lower(u.role)' if 'users.role' in features else 'NULL'
+    version_sql = ("(SELECT version FROM borrowing_rules_state WHERE id = 1)"
+                   if 'borrowing_rules_state' in features else 'NULL')
+
+    def statement(branch: bool, bulk: bool) -> str:
+        if bulk:
+            # Materialized so each count runs once per request, not once per use
+            requests = ("SELECT CAST(key AS INTEGER) AS seq, json_extract(value, '$[0]') AS user_id, "
+                        "json_extract(value, '$[1]') AS book_id FROM json_each(:requests)")
+        else:
+            requests = "SELECT 0 AS seq, :user_id AS user_id, :book_id AS book_id"
+        return f"""
+            WITH request AS (
+                {requests}
+            ),
+            patron AS {'MATERIALIZED' if bulk else ''} (
+                SELECT r.seq, r.user_id, r.book_id, u.id AS found_user, u.status, {role} AS role,
+                       b.id AS found_book, b.title,
+                       {'h.available' if branch else 'b.available'} AS available,
+                       {'h.book_id IS NOT NULL' if branch else '1'} AS held,
+                       (SELECT COUNT(*) FROM transactions t
+                        WHERE t.user_id = r.user_id AND t.return_date IS NULL) AS open_loans,
+                       (SELECT COUNT(*) FROM transactions t
+                        WHERE t.user_id = r.user_id AND t.book_id = r.book_id
+                          AND t.return_date IS NULL) AS title_loans,
+                       {'COALESCE(pb.balance_cents, 0)' if balances else '0'} AS balance_cents
+                FROM request r
+                LEFT JOIN users u ON u.id = r.user_id
+                LEFT JOIN books b ON b.id = r.book_id
+                {'LEFT JOIN holdings h ON h.branch_id = :branch_id AND h.book_id = r.book_id' if branch else ''}
+                {'LEFT JOIN patron_balances pb ON pb.user_id = r.user_id' if balances else ''}
+            ),
+            limits AS (
+                SELECT p.*, {loan_case} AS loan_limit, {title_case} AS title_limit,
+                       {fine_case} AS fine_limit
+                FROM patron p
+            )
+            SELECT user_id, book_id, title, open_loans, loan_limit, title_loans, title_limit,
+                   balance_cents, fine_limit,
+                   found_user IS NOT NULL,
+                   COALESCE(lower(status) = 'active', 0),
+                   found_book IS NOT NULL,
+                   held,
+                   COALESCE(available, 0) > 0,
+                   loan_limit IS NULL OR open_loans < loan_limit,
+                   title_limit IS NULL OR title_loans < title_limit,
+                   fine_limit IS NULL OR balance_cents <= fine_limit,
+                   {version_sql} AS rules_version
+            FROM limits
+            ORDER BY seq
+        """
+
+    statements = {(branch, bulk): statement(branch, bulk) for branch in (False, True) for bulk in (False, True)}
+    return CompiledRules(statements, params, version, tuple(rules))
+
+
+_compiled: Dict[str, CompiledRules] = {}
+_compiled_lock = threading.Lock()
+
+
+def _main_path(conn: sqlite3.Connection) -> str:
+    for _, name, path in conn.execute('PRAGMA database_list'):
+        if name == 'main':
+            return path
+    return ''
+
+
+def _compile_for(conn: sqlite3.Connection, refresh: bool = False) -> CompiledRules:
+    """The cached statement for this database, compiled again when ``refresh`` is set."""
+    path = _main_path(conn)
+    with _compiled_lock:
+        compiled = _compiled.get(path) if path else None
+    if compiled is None or refresh:
+        version, rules = load_rules(conn)
+        compiled = compile_rules(rules, _features(conn), version)
+        if path:
+            with _compiled_lock:
+                _compiled[path] = compiled
+        logger.debug(f"Compiled {len(rules)} borrowing rules (version {version})")
+    return compiled
+
+
+def _run(conn: sqlite3.Connection, compiled: CompiledRules, pairs: List[Tuple[int, int]],
+         branch_id: Optional[int]) -> List[tuple]:
+    params = dict(compiled.params)
+    bulk = len(pairs) > 1
+    if bulk:
+        params['requests'] = json.dumps(pairs)
+    else:
+        params['user_id'], params['book_id'] = pairs[0]
+    if branch_id is not None:
+        params['branch_id'] = branch_id
+    return conn.execute(compiled.statements[(branch_id is not None, bulk)], params).fetchall()
+
+
+def check_many(conn: sqlite3.Connection, requests: Iterable[Tuple[int, int]],
+               branch_id: Optional[int] = None) -> List[Verdict]:
+    """
+    Evaluate every (user_id, book_id) request in one statement.
+
+    Each request is judged against the current state alone: two requests
+    for the last copy are both eligible, and the checkout that commits
+    first takes it.
+
+    Returns:
+        One Verdict per request, in order
+    """
+    pairs = [(int(user_id), int(book_id)) for user_id, book_id in requests]
+    if not pairs:
+        return []
+    compiled = _compile_for(conn)
+    try:
+        rows = _run(conn, compiled, pairs, branch_id)
+    except sqlite3.OperationalError:
+        # Compiled against another schema (a migration ran since); try once more
+        compiled = _compile_for(conn, refresh=True)
+        rows = _run(conn, compiled, pairs, branch_id)
+    if rows[0][-1] != compiled.version:
+        compiled = _compile_for(conn, refresh=True)
+        rows = _run(conn, compiled, pairs, branch_id)
+    return [
+        Verdict(row[0], row[1], row[2], dict(zip(CHECKS, map(bool, row[9:17]))),
+                open_loans=row[3], loan_limit=row[4], title_loans=row[5], title_limit=row[6],
+                balance_cents=row[7], fine_limit=row[8])
+        for row in rows
+    ]
+
+
+def check(conn: sqlite3.Connection, user_id: int, book_id: int,
+          branch_id: Optional[int] = None) -> Verdict:
+    """Whether ``user_id`` may borrow ``book_id`` (from ``branch_id``'s holding, if given)."""
+    return check_many(conn, [(user_id, book_id)], branch_id)[0]
+
+
+def check_patrons(conn: sqlite3.Connection, user_ids: Iterable[int], book_id: int,
+                  branch_id: Optional[int] = None) -> List[Verdict]:
+    """Whether each of ``user_ids`` may borrow ``book_id``, in one statement."""
+    return check_many(conn, [(user_id, book_id) for user_id in user_ids], branch_id)
+
+
+def list_rules(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """Every rule, active or not, most general first."""
+    cursor = conn.execute(
+        """
+        SELECT id, rule, role, book_id, limit_value, active, note, updated_at
+        FROM borrowing_rules
+        ORDER BY rule, book_id IS NOT NULL, role IS NOT NULL, role, book_id
+        """
+    )
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def set_rule(conn: sqlite3.Connection, rule: str, limit: int, role: Optional[str] = None,
+             book_id: Optional[int] = None, active: bool = True, note: Optional[str] = None) -> int:
+    """
+    Create or change the rule for one scope.
+
+    Returns:
+        The rule id
+
+    Raises:
+        ValidationError: For an unknown rule, a negative limit, or a title on a patron rule
+    """
+    if rule not in RULES:
+        raise ValidationError('rule', f"Must be one of {', '.join(RULES)}", rule)
+    if limit is None or int(limit) < 0:
+        raise ValidationError('limit', 'Must be zero or more', limit)
+    if book_id is not None and rule != 'max_title_loans':
+        raise ValidationError('book_id', 'Only title rules apply to one book', book_id)
+    role = role.strip().lower() if role else None
+    with conn:
+        cursor = conn.execute(
+            """
+            UPDATE borrowing_rules
+            SET limit_value = ?, active = ?, note = COALESCE(?, note), updated_at = CURRENT_TIMESTAMP
+            WHERE rule = ? AND role IS ? AND book_id IS ?
+            RETURNING id
+            """,
+            (int(limit), int(bool(active)), note, rule, role, book_id)
+        )
+        row = cursor.fetchone()
+        if row:
+            return row[0]
+        return conn.execute(
+            "INSERT INTO borrowing_rules (rule, role, book_id, limit_value, active, note) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (rule, role, book_id, int(limit), int(bool(active)), note)
+        ).lastrowid
+
+
+if __name__ == "__main__":
+    import argparse
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description='Borrowing eligibility rules')
+    parser.add_argument('--db', help='Database path (defaults to the application database)')
+    parser.add_argument('--list', action='store_true', help='Show every rule')
+    parser.add_argument('--set', nargs=2, metavar=('RULE', 'LIMIT'),
+                        help='Create or change a rule (max_fine_balance is in cents)')
+    parser.add_argument('--role', help='Scope --set to one role')
+    parser.add_argument('--book', type=int, help='Scope --set (max_title_loans) to one title')
+    parser.add_argument('--disable', action='store_true', help='Store the --set rule switched off')
+    parser.add_argument('--check', nargs=2, type=int, metavar=('USER', 'BOOK'),
+                        help='Show the verdicts for one checkout')
+    args = parser.parse_args()
+
+    if args.db:
+        db_path = args.db
+    else:
+        from data.database import DB_PATH as db_path
+    connection = sqlite3.connect(db_path)
+    try:
+        migrate(connection)
+        if args.set:
+            rule_id = set_rule(connection, args.set[0], int(args.set[1]), args.role, args.book,
+                               active=not args.disable)
+            print(f"rule {rule_id} saved")
+        if args.list or args.set:
+            for row in list_rules(connection):
+                scope = ' '.join(filter(None, (row['role'] and f"role={row['role']}",
+                                               row['book_id'] and f"book={row['book_id']}"))) or 'everyone'
+                print(f"{row['id']:4d}  {row['rule']:17s} {row['limit_value']:6d}  "
+                      f"{'on ' if row['active'] else 'off'}  {scope}")
+        if args.check:
+            verdict = check(connection, *args.check)
+            print(f"user {verdict.user_id} book {verdict.book_id} ({verdict.title}): "
+                  f"{'eligible' if verdict.eligible else verdict.message}")
+            for name in CHECKS:
+                print(f"  {name:15s} {'ok' if verdict.checks[name] else 'FAILED'}")
+    finally:
+        connection.close()
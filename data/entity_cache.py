@@ -0,0 +1,221 @@
+"""
+Bounded LRU/TTL cache for single-entity reads.
+
+Book and user rows are looked up by id and by natural key (ISBN, email,
+user code) over and over by the borrow flow and the edit dialogs. This cache
+keeps recently used rows in memory, bounded by entry count and age.
+
+Entries are invalidated three ways:
+
+* write-through: ``update_*``/``delete_*`` call ``invalidate()`` after commit;
+* other connections (including other processes): triggers from migration 009
+  append the changed id to ``entity_changes``; when ``PRAGMA data_version``
+  shows another connection has committed, the new log rows are read and only
+  those entities are evicted;
+* age: entries older than ``ttl`` seconds are reloaded.
+"""
+import copy
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from data.readonly import ReadOnlyDatabase, _default_db_path
+
+CacheKey = Tuple[str, str, Hashable, str]
+
+
+class EntityCache:
+    """
+    Thread-safe LRU cache of entity rows keyed by ``(entity, field, value, shape)``.
+
+    Every cached row is also indexed by ``(entity, id)`` so one invalidation
+    drops the row under all of its keys (id, ISBN, email, ...) and shapes.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, maxsize: int = 2048, ttl: float = 300.0):
+        self.db_path = db_path or _default_db_path()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: 'OrderedDict[CacheKey, Tuple[float, Any, Any]]' = OrderedDict()
+        self._by_entity: Dict[Tuple[str, Any], Set[CacheKey]] = {}
+        self._lock = threading.RLock()
+        self._readonly = ReadOnlyDatabase(self.db_path)
+        self._data_version: Optional[int] = None
+        # Bumped on every invalidation so a load racing a write is not stored
+        self._generation = 0
+        self._last_change: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    # -- change tracking -------------------------------------------------
+
+    def _sync(self):
+        """Evict entities changed by other connections since the last check."""
+        try:
+            version = self._readonly.data_version()
+        except sqlite3.Error:
+            self._clear()
+            return
+        if version == self._data_version:
+            return
+        self._data_version = version
+        try:
+            if self._last_change is None:
+                # First check: everything cached so far predates the log position
+                self._clear()
+                row = self._readonly.connection.execute(
+                    "SELECT COALESCE(MAX(seq), 0) FROM entity_changes"
+                ).fetchone()
+                self._last_change = row[0]
+                return
+            rows = self._readonly.connection.execute(
+                "SELECT seq, entity, entity_id FROM entity_changes WHERE seq > ? ORDER BY seq",
+                (self._last_change,)
+            ).fetchall()
+        except sqlite3.OperationalError:
+            # No change log in this database: fall back to a full flush
+            self._clear()
+            return
+        if rows and rows[0][0] != self._last_change + 1:
+            # The log was trimmed past our position
+            self._clear()
+        else:
+            for _, entity, entity_id in rows:
+                self._invalidate(entity, entity_id)
+        if rows:
+            self._last_change = rows[-1][0]
+
+    # -- storage ---------------------------------------------------------
+
+    def _clear(self):
+        self._generation += 1
+        self._entries.clear()
+        self._by_entity.clear()
+
+    def _drop(self, key: CacheKey):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._by_entity.get((key[0], entry[1]))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_entity[(key[0], entry[1])]
+
+    def _invalidate(self, entity: str, entity_id: Any) -> int:
+        self._generation += 1
+        keys = self._by_entity.pop((entity, entity_id), set())
+        for key in keys:
+            self._entries.pop(key, None)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def _store(self, key: CacheKey, entity_id: Any, value: Any):
+        self._drop(key)
+        self._entries[key] = (time.monotonic(), entity_id, value)
+        self._by_entity.setdefault((key[0], entity_id), set()).add(key)
+        while len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    # -- public API --------------------------------------------------------
+
+    def get(self, entity: str, field: str, value: Hashable, loader: Callable[[], Any],
+            id_of: Callable[[Any], Any] = None, shape: str = 'model') -> Any:
+        """
+        Return the cached row for ``(entity, field, value, shape)``, loading it on a miss.
+
+        Args:
+            entity: Entity name ('book', 'user')
+            field: Lookup field ('id', 'isbn', 'email', 'user_code', ...)
+            value: Lookup value
+            loader: Called on a miss; returns the row or None
+            id_of: Extracts the entity id from a loaded row (defaults to
+                ``value`` for id lookups, else ``row['id']``/``row.id``/``row[0]``)
+            shape: What ``loader`` returns ('model', 'dict', 'tuple'); callers
+                that load the same entity in different shapes never get each
+                other's rows
+
+        Returns:
+            A copy of the cached row, or None if it does not exist (misses
+            for missing rows are not cached)
+        """
+        key = (entity, field, value, shape)
+        with self._lock:
+            self._sync()
+            entry = self._entries.get(key)
+            if entry is not None:
+                if time.monotonic() - entry[0] <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.copy(entry[2])
+                self._drop(key)
+                self.expirations += 1
+            self.misses += 1
+            generation = self._generation
+
+        row = loader()
+        if row is None:
+            return None
+        entity_id = value if field == 'id' else (id_of or _row_id)(row)
+        with self._lock:
+            if generation == self._generation:
+                self._store(key, entity_id, row)
+        return copy.copy(row)
+
+    def invalidate(self, entity: str, entity_id: Any) -> int:
+        """Drop every cached key of one entity; returns the number of keys dropped."""
+        with self._lock:
+            return self._invalidate(entity, entity_id)
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate, eviction and invalidation counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+    def close(self):
+        with self._lock:
+            self._clear()
+            self._readonly.close()
+
+
+def _row_id(row: Any) -> Any:
+    if isinstance(row, dict):
+        return row['id']
+    if hasattr(row, 'id'):
+        return row.id
+    return row[0]
+
+
+_caches: Dict[str, EntityCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_entity_cache(db_path: Optional[str] = None) -> EntityCache:
+    """Return the shared entity cache for ``db_path``."""
+    key = os.path.abspath(db_path or _default_db_path())
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = EntityCache(key)
+        return _caches[key]
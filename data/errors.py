@@ -1,6 +1,7 @@
 """
 Custom exceptions for the Intelli-Libraria data layer.
 """
+from typing import Any
 
 class DataError(Exception):
     """Base class for all data-related exceptions."""
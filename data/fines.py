@@ -0,0 +1,309 @@
+"""
+Fine ledger: fines, payments and a per-patron balance kept by triggers.
+
+Migration 018 gives ``fines`` a ``user_id`` (copied from the loan), records
+payments in ``payments`` and keeps ``patron_balances`` current from both:
+every insert, update or delete of a fine or payment adjusts the patron's
+``fined_cents``, ``paid_cents`` and ``balance_cents`` in the same statement.
+Amounts are summed in whole cents so balances never drift by float error.
+
+* A fine is assessed when a late loan's ``return_date`` is set (0.50 per
+  day, ``FINE_PER_DAY``), whichever code path returns it.
+* A payment settles the patron's oldest unpaid fines first; a fine is marked
+  ``paid`` once the payments cover it in full. Payments are not edited, they
+  are deleted and posted again; deleting one marks the newest paid fines the
+  remaining payments no longer cover as unpaid again (migration 022).
+* Credit left over from earlier payments settles a fine as it is assessed,
+  oldest first, the same way (migration 024).
+* ``patron_fines`` reads ``idx_fines_user`` alone and ``top_debtors`` walks
+  ``idx_patron_balances_balance`` backwards, so neither touches ``fines``
+  rows or sums anything per request.
+
+``post_payments`` applies a batch in one transaction; each payment's
+``reference`` is unique, so re-posting a batch that was interrupted or
+already applied only adds the payments that are missing.
+
+Usage::
+
+    python -m data.fines [--db intelli_libraria.db] [--top 10] [--patron ID] [--rebuild]
+"""
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from data import archive
+from data.errors import ValidationError
+from data.migrator import migrate
+
+logger = logging.getLogger(__name__)
+
+# The ledger is migration 018; 022 made deleting a payment unsettle fines and
+# 024 lets credit settle new fines
+LEDGER_VERSION = 24
+FINE_PER_DAY = 0.50
+# Users looked up per statement when validating a batch
+_USER_CHUNK = 500
+
+REBUILD_BALANCES_SQL = """
+    INSERT INTO patron_balances (user_id, fined_cents, paid_cents, balance_cents)
+    SELECT user_id, SUM(fined), SUM(paid), SUM(fined) - SUM(paid)
+    FROM (
+        SELECT user_id, CAST(ROUND(amount * 100) AS INTEGER) AS fined, 0 AS paid
+        FROM fines WHERE user_id IS NOT NULL
+        UNION ALL
+        SELECT user_id, 0, CAST(ROUND(amount * 100) AS INTEGER) FROM payments
+    )
+    GROUP BY user_id
+"""
+
+# Ledger rows for the fine page: assessed fines (their loan may be archived),
+# then open loans still accruing; {loans} is an archive.loan_source
+FINE_ROWS_SQL = """
+    SELECT * FROM (
+        SELECT f.user_id, COALESCE(b.title, 'Unknown Book') AS book_title,
+               date(t.issue_date) AS issue_date, date(t.return_date) AS return_date,
+               MAX(0, CAST(julianday(date(t.return_date)) - julianday(date(t.due_date)) AS INTEGER))
+                   AS days_overdue,
+               f.amount, CASE WHEN f.paid THEN 'Paid' ELSE 'Unpaid' END AS status,
+               f.transaction_id, f.created_at AS sort_date
+        FROM fines f
+        LEFT JOIN {loans} t ON t.id = f.transaction_id
+        LEFT JOIN books b ON b.id = t.book_id
+        UNION ALL
+        SELECT t.user_id, COALESCE(b.title, 'Unknown Book'), date(t.issue_date), NULL,
+               CAST(julianday('now') - julianday(date(t.due_date)) AS INTEGER),
+               ROUND((julianday(date('now')) - julianday(date(t.due_date))) * :per_day, 2),
+               'Accruing', t.id, t.due_date
+        FROM main.transactions t
+        LEFT JOIN books b ON b.id = t.book_id
+        WHERE t.return_date IS NULL AND t.due_date < date('now')
+    )
+    WHERE :search = ''
+       OR CAST(user_id AS TEXT) = :search
+       OR book_title LIKE :pattern
+       OR issue_date LIKE :pattern
+       OR return_date LIKE :pattern
+       OR status LIKE :pattern
+    ORDER BY sort_date DESC
+    LIMIT :limit
+"""
+
+
+@dataclass(frozen=True)
+class Payment:
+    """One payment to post; ``reference`` (a receipt number) makes posting idempotent."""
+    user_id: int
+    amount: float
+    method: str = 'cash'
+    reference: Optional[str] = None
+
+
+@dataclass
+class PostingReport:
+    """Outcome of ``post_payments``; ``duplicates`` were already posted."""
+    posted: int
+    duplicates: int
+    cents: int
+    seconds: float = 0.0
+
+
+def _cents(amount: float) -> int:
+    return int(round(amount * 100))
+
+
+@contextmanager
+def _atomic(conn: sqlite3.Connection, name: str) -> Iterator[None]:
+    """
+    Write the block all or nothing without committing anything of the caller's.
+
+    Inside the caller's transaction the block runs in a SAVEPOINT and is left
+    for the caller to commit; otherwise it gets a ``BEGIN IMMEDIATE``
+    transaction of its own.
+    """
+    if conn.in_transaction:
+        conn.execute(f'SAVEPOINT {name}')
+        try:
+            yield
+        except BaseException:
+            conn.execute(f'ROLLBACK TO {name}')
+            conn.execute(f'RELEASE {name}')
+            raise
+        conn.execute(f'RELEASE {name}')
+        return
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+    conn.execute('COMMIT')
+
+
+def patron_balance(conn: sqlite3.Connection, user_id: int) -> Dict[str, float]:
+    """A patron's total fined, total paid and outstanding balance, in dollars."""
+    row = conn.execute(
+        "SELECT fined_cents, paid_cents, balance_cents FROM patron_balances WHERE user_id = ?",
+        (user_id,)
+    ).fetchone()
+    fined, paid, balance = row or (0, 0, 0)
+    return {'fined': fined / 100, 'paid': paid / 100, 'balance': balance / 100}
+
+
+def patron_fines(conn: sqlite3.Connection, user_id: int, unpaid_only: bool = False) -> List[Dict[str, Any]]:
+    """
+    A patron's fines, oldest first, read from ``idx_fines_user`` alone.
+
+    Returns:
+        Dicts with id, transaction_id, amount, paid and created_at
+    """
+    sql = "SELECT id, transaction_id, amount, paid, created_at FROM fines WHERE user_id = ?"
+    if unpaid_only:
+        sql += " AND paid = 0"
+    sql += " ORDER BY created_at, id"
+    return [
+        {'id': row[0], 'transaction_id': row[1], 'amount': row[2], 'paid': bool(row[3]),
+         'created_at': row[4]}
+        for row in conn.execute(sql, (user_id,))
+    ]
+
+
+def top_debtors(conn: sqlite3.Connection, limit: int = 10) -> List[Dict[str, Any]]:
+    """The ``limit`` patrons owing the most, largest balance first."""
+    rows = conn.execute(
+        """
+        SELECT b.user_id, u.full_name, b.balance_cents
+        FROM patron_balances b
+        LEFT JOIN users u ON u.id = b.user_id
+        WHERE b.balance_cents > 0
+        ORDER BY b.balance_cents DESC
+        LIMIT ?
+        """,
+        (limit,)
+    ).fetchall()
+    return [{'user_id': user_id, 'name': name, 'balance': cents / 100}
+            for user_id, name, cents in rows]
+
+
+def fine_rows(conn: sqlite3.Connection, search: str = '', limit: int = 1000) -> List[tuple]:
+    """
+    Fine page rows matching ``search`` (a patron id, or part of a title, date or status).
+
+    Call outside a transaction: the loan archive is attached if loans have
+    been archived.
+
+    Returns:
+        Tuples of user_id, book_title, issue_date, return_date, days_overdue,
+        amount, status and transaction_id, newest first
+    """
+    search = search.strip()
+    sql = FINE_ROWS_SQL.format(loans=archive.loan_source(conn))
+    rows = conn.execute(sql, {
+        'search': search, 'pattern': f'%{search}%', 'per_day': FINE_PER_DAY, 'limit': limit,
+    }).fetchall()
+    return [tuple(row)[:8] for row in rows]
+
+
+def post_payments(conn: sqlite3.Connection,
+                  payments: Iterable[Union[Payment, Sequence[Any]]]) -> PostingReport:
+    """
+    Post a batch of payments in one transaction.
+
+    The whole batch is validated first (positive amounts, existing patrons),
+    so a bad line rejects the batch before anything is written. Payments whose
+    reference is already posted are skipped and counted as duplicates. Inside
+    a transaction the caller has open, the batch is posted in a SAVEPOINT and
+    committed with the caller's transaction.
+
+    Args:
+        conn: A read-write connection
+        payments: ``Payment`` objects or ``(user_id, amount[, method[, reference]])`` tuples
+
+    Returns:
+        A PostingReport
+
+    Raises:
+        ValidationError: If an amount is not positive or a patron does not exist
+    """
+    started = time.perf_counter()
+    batch = [p if isinstance(p, Payment) else Payment(*p) for p in payments]
+    for payment in batch:
+        if not payment.amount or payment.amount <= 0 or _cents(payment.amount) == 0:
+            raise ValidationError('amount', 'Payments must be at least one cent', payment.amount)
+    user_ids = sorted({payment.user_id for payment in batch})
+    for start in range(0, len(user_ids), _USER_CHUNK):
+        chunk = user_ids[start:start + _USER_CHUNK]
+        found = {row[0] for row in conn.execute(
+            f"SELECT id FROM users WHERE id IN ({','.join('?' * len(chunk))})", chunk
+        )}
+        missing = [user_id for user_id in chunk if user_id not in found]
+        if missing:
+            raise ValidationError('user_id', 'No such patron', missing[0])
+
+    before = conn.total_changes
+    posted = cents = 0
+    with _atomic(conn, 'post_payments'):
+        for payment in batch:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO payments (user_id, amount, method, reference) VALUES (?, ?, ?, ?)",
+                (payment.user_id, round(payment.amount, 2), payment.method, payment.reference)
+            )
+            if cursor.rowcount:
+                posted += 1
+                cents += _cents(payment.amount)
+    report = PostingReport(posted, len(batch) - posted, cents, time.perf_counter() - started)
+    logger.info(f"Posted {posted} payments (${cents / 100:.2f}), {report.duplicates} already posted, "
+                f"{conn.total_changes - before} rows changed in {report.seconds:.3f}s")
+    return report
+
+
+def rebuild_balances(conn: sqlite3.Connection) -> int:
+    """
+    Recompute every patron's balance from ``fines`` and ``payments`` in one pass.
+
+    Inside a transaction the caller has open, the rebuild is left for the
+    caller to commit.
+
+    Returns:
+        The number of patrons with a balance row
+    """
+    with _atomic(conn, 'rebuild_balances'):
+        conn.execute("DELETE FROM patron_balances")
+        count = conn.execute(REBUILD_BALANCES_SQL).rowcount
+    return count
+
+
+if __name__ == "__main__":
+    import argparse
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description='Patron fine balances')
+    parser.add_argument('--db', help='Database path (defaults to the application database)')
+    parser.add_argument('--top', type=int, default=10, help='Show the N largest balances')
+    parser.add_argument('--patron', type=int, help='Show one patron\'s fines')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute every balance first')
+    args = parser.parse_args()
+
+    if args.db:
+        db_path = args.db
+    else:
+        from data.database import DB_PATH as db_path
+    connection = sqlite3.connect(db_path)
+    try:
+        migrate(connection)
+        if args.rebuild:
+            print(f"rebuilt {rebuild_balances(connection)} balances")
+        if args.patron is not None:
+            balance = patron_balance(connection, args.patron)
+            print(f"patron {args.patron}: fined ${balance['fined']:.2f}  paid ${balance['paid']:.2f}  "
+                  f"owes ${balance['balance']:.2f}")
+            for fine in patron_fines(connection, args.patron):
+                print(f"  {fine['created_at']}  loan {fine['transaction_id']}  ${fine['amount']:.2f}  "
+                      f"{'paid' if fine['paid'] else 'unpaid'}")
+        else:
+            for debtor in top_debtors(connection, args.top):
+                print(f"{debtor['user_id']:8d}  {debtor['name'] or '?':30s}  ${debtor['balance']:.2f}")
+    finally:
+        connection.close()
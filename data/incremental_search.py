@@ -0,0 +1,329 @@
+"""
+Search-as-you-type for the inventory and patron screens.
+
+``SearchController`` sits between a search box and the database:
+
+* A search matches rows in which every typed word starts a word of one of
+  the indexed columns (``trigram_search.prefix_expression``). That predicate
+  only gets stricter as the query is extended (more letters, more words), so
+  when a previous result set was complete the new one is filtered from it
+  in memory, immediately and without touching the database.
+* Other keystrokes are debounced: one arriving after a quiet spell is
+  queried at once, one arriving in a burst once typing pauses for ``delay``
+  seconds (or at the latest ``max_wait`` seconds after the first deferred
+  keystroke). The quiet spell is as long as the last query took, up to
+  ``delay``, so cheap queries are hardly ever deferred.
+  A newer keystroke drops a pending query and interrupts a running one
+  (``Connection.interrupt``).
+* Book searches that look like an ISBN also list the books whose ISBN
+  starts with what was typed, first (``trigram_search.isbn_matches``). They
+  always go to the database: an ISBN prefix does not narrow a title match.
+* Queries matching nothing fall back to the typo-tolerant trigram search.
+
+Every search runs on one worker thread that owns a read-only connection; the
+result callback is called on that thread (Qt pages forward it through a
+signal). Cached result sets are dropped when another connection commits.
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from heapq import nsmallest
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from data import trigram_search
+from data.readonly import ReadOnlyDatabase
+
+DEFAULT_DELAY = 0.1
+DEFAULT_MAX_WAIT = 0.2
+DEFAULT_LIMIT = 200
+# Result sets up to this size are kept whole so later keystrokes can narrow them
+MAX_CACHED_ROWS = 2000
+MAX_CACHED_QUERIES = 8
+
+
+@dataclass
+class SearchResult:
+    """Rows for ``text``, best match first.
+
+    ``source`` is 'cache' (narrowed in memory), 'index' (word-prefix query),
+    'isbn' (only ISBN prefixes matched) or 'fuzzy' (trigram similarity, used
+    when nothing matched exactly).
+    """
+    text: str
+    rows: List[Dict[str, Any]]
+    source: str
+    seconds: float
+
+
+class _Entry:
+    """A cached row with the normalized text and words of its indexed columns."""
+    __slots__ = ('row', 'texts', 'words')
+
+    def __init__(self, row: sqlite3.Row, columns: Tuple[str, ...]):
+        self.row = row
+        self.texts = tuple(trigram_search.normalize(row[column]) for column in columns)
+        self.words = tuple(word for text in self.texts for word in text.split())
+
+    def rank(self, typed: str) -> Tuple[int, int, int]:
+        """Columns starting with what was typed first, then shorter ones."""
+        starts = any(text.startswith(typed) for text in self.texts)
+        return (0 if starts else 1, min(len(text) for text in self.texts), self.row['id'])
+
+
+def words(text: str) -> Tuple[str, ...]:
+    return tuple(trigram_search.normalize(text).split())
+
+
+def extends(query: Tuple[str, ...], base: Tuple[str, ...]) -> bool:
+    """True if every row matching ``query`` also matches ``base``."""
+    return all(any(word.startswith(prefix) for word in query) for prefix in base)
+
+
+def row_matches(query: Tuple[str, ...], value_words: Tuple[str, ...]) -> bool:
+    """Every query word starts one of ``value_words``."""
+    return all(any(word.startswith(prefix) for word in value_words) for prefix in query)
+
+
+class SearchController:
+    """
+    Debounced, cancellable search over one trigram index ('books' or 'users').
+
+    Args:
+        on_results: Called with a ``SearchResult`` for the latest query only
+        index: Key of ``trigram_search.INDEXES``
+        db_path: Database to search (defaults to the application database)
+        delay: Seconds of quiet before a deferred query is sent
+        max_wait: Longest a query is deferred while typing goes on
+        limit: Maximum rows per result
+    """
+
+    def __init__(self, on_results: Callable[[SearchResult], None], index: str = 'books',
+                 db_path: Optional[str] = None, delay: float = DEFAULT_DELAY,
+                 max_wait: float = DEFAULT_MAX_WAIT, limit: int = DEFAULT_LIMIT):
+        self.on_results = on_results
+        self.index = index
+        self.delay = delay
+        self.max_wait = max_wait
+        self.limit = limit
+        self.stats = {'keystrokes': 0, 'cache': 0, 'index': 0, 'isbn': 0, 'fuzzy': 0,
+                      'cancelled': 0}
+        self._readonly = ReadOnlyDatabase(db_path)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='search')
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._timer: Optional[threading.Timer] = None
+        self._deferred_since: Optional[float] = None
+        self._last_query_end = 0.0
+        self._last_query_cost = 0.0
+        self._running_sql = False
+        # normalized words -> (data_version, entries); only complete result sets
+        self._cache: 'OrderedDict[Tuple[str, ...], Tuple[int, List[_Entry]]]' = OrderedDict()
+
+    # -- GUI thread -------------------------------------------------------
+
+    def text_changed(self, text: str):
+        """Handle a keystroke: answer from the cache, query now or query after a pause."""
+        query = words(text)
+        with self._lock:
+            generation = self._supersede()
+            self.stats['keystrokes'] += 1
+            if not query:
+                self._deferred_since = None
+                return
+            now = time.perf_counter()
+            quiet = now - self._last_query_end >= min(self.delay, self._last_query_cost)
+            cached = not self._isbn(text) and self._cached_base(query) is not None
+            if cached or (
+                    quiet and self._deferred_since is None and not self._running_sql):
+                self._executor.submit(self._run, generation, text, now)
+            else:
+                self._schedule(generation, text, now)
+
+    def search_now(self, text: str) -> Future:
+        """Search without debouncing (e.g. on Enter); the Future resolves to the result."""
+        with self._lock:
+            generation = self._supersede()
+        return self._executor.submit(self._run, generation, text, time.perf_counter())
+
+    def cancel(self):
+        """Drop pending and running searches (the search box was cleared)."""
+        with self._lock:
+            self._supersede()
+            self._deferred_since = None
+
+    def invalidate(self):
+        """Forget cached result sets."""
+        with self._lock:
+            self._cache.clear()
+
+    def close(self):
+        self.cancel()
+        self._executor.submit(self._readonly.close)
+        self._executor.shutdown(wait=True)
+
+    def _supersede(self) -> int:
+        """Start a new generation: drop the pending query, interrupt the running one."""
+        self._generation += 1
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._running_sql:
+            self._readonly.connection.interrupt()
+            self.stats['cancelled'] += 1
+        return self._generation
+
+    def _schedule(self, generation: int, text: str, started: float, fuzzy: bool = False):
+        """Run the search after the debounce delay (called with the lock held)."""
+        if self._deferred_since is None:
+            self._deferred_since = started
+        wait = max(0.0, min(self.delay, self._deferred_since + self.max_wait - started))
+        self._timer = threading.Timer(wait, self._executor.submit,
+                                      (self._run, generation, text, started, fuzzy))
+        self._timer.daemon = True
+        self._timer.start()
+
+    # -- worker thread ----------------------------------------------------
+
+    def _isbn(self, text: str) -> bool:
+        return self.index == 'books' and trigram_search.is_isbn_query(text)
+
+    def _cached_base(self, query: Tuple[str, ...]) -> Optional[Tuple[str, ...]]:
+        """The smallest cached result set that contains every match of ``query``."""
+        bases = [base for base in self._cache if extends(query, base)]
+        return min(bases, key=lambda base: len(self._cache[base][1])) if bases else None
+
+    def _stale(self, generation: int) -> bool:
+        with self._lock:
+            return generation != self._generation
+
+    def _run(self, generation: int, text: str, started: float,
+             fuzzy: bool = False) -> Optional[SearchResult]:
+        if self._stale(generation):
+            return None
+        try:
+            result = self._search(generation, text, started, fuzzy)
+        except sqlite3.OperationalError as e:
+            if 'interrupt' not in str(e):
+                print(f"Search error: {e}")
+                raise
+            if self._stale(generation):
+                return None
+            # Hit by an interrupt meant for the query before it
+            result = self._search(generation, text, started, fuzzy)
+        if result is None or self._stale(generation):
+            return None
+        self.on_results(result)
+        return result
+
+    def _search(self, generation: int, text: str, started: float,
+                fuzzy: bool) -> Optional[SearchResult]:
+        query = words(text)
+        if not query:
+            return SearchResult(text, [], 'index', time.perf_counter() - started)
+        version = self._readonly.data_version()
+        isbn = self._isbn(text)
+        with self._lock:
+            base = None if isbn else self._cached_base(query)
+            if base is not None and self._cache[base][0] != version:
+                self._cache.clear()
+                base = None
+            if base is not None:
+                self._cache.move_to_end(base)
+                cached = self._cache[base][1]
+        if base is not None and not fuzzy:
+            entries = [entry for entry in cached if row_matches(query, entry.words)]
+            if entries:
+                self.stats['cache'] += 1
+                if query not in self._cache:
+                    self._remember(query, version, entries)
+                return SearchResult(text, self._ranked(text, entries), 'cache',
+                                    time.perf_counter() - started)
+            # Nothing starts with what was typed: once typing pauses, try the
+            # typo-tolerant search
+            with self._lock:
+                if generation == self._generation:
+                    self._schedule(generation, text, started, fuzzy=True)
+            return None
+
+        with self._lock:
+            if generation != self._generation:
+                return None
+            self._running_sql = True
+            self._deferred_since = None
+            sql_started = time.perf_counter()
+        try:
+            conn = self._readonly.connection
+            isbn_rows = []
+            if isbn and not fuzzy:
+                isbn_rows = self._rows(conn, [match.id for match in
+                                              trigram_search.isbn_matches(conn, text, self.limit)])
+            entries, complete = ([], False) if fuzzy else self._prefix_entries(conn, text)
+            if entries:
+                source = 'index'
+                if complete:
+                    self._remember(query, version, entries)
+            elif isbn_rows:
+                source, rows = 'isbn', []
+            else:
+                source = 'fuzzy'
+                matches = trigram_search.search(conn, self.index, text, self.limit)
+                rows = self._rows(conn, [match.id for match in matches])
+        finally:
+            with self._lock:
+                self._running_sql = False
+                self._last_query_end = time.perf_counter()
+                self._last_query_cost = self._last_query_end - sql_started
+        self.stats[source] += 1
+        if source == 'index':
+            rows = self._ranked(text, entries)
+        if isbn_rows:
+            found = {row['id'] for row in isbn_rows}
+            rows = (isbn_rows + [row for row in rows if row['id'] not in found])[:self.limit]
+        return SearchResult(text, rows, source, time.perf_counter() - started)
+
+    def _prefix_entries(self, conn: sqlite3.Connection, text: str) -> Tuple[List[_Entry], bool]:
+        """
+        Every row matching ``text`` if there are at most ``MAX_CACHED_ROWS``
+        (complete), else just the first ``limit`` (one or two letters typed).
+        """
+        fts_table, table, columns = trigram_search.INDEXES[self.index]
+        expression = trigram_search.prefix_expression(text)
+        # Counting the matches only reads the index
+        found = conn.execute(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM {fts_table} WHERE {fts_table} MATCH ? LIMIT ?)",
+            (expression, MAX_CACHED_ROWS + 1)
+        ).fetchone()[0]
+        cursor = conn.execute(
+            f"""
+            SELECT t.* FROM {table} t
+            JOIN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ? LIMIT ?) m
+              ON m.rowid = t.id
+            """,
+            (expression, found if found <= MAX_CACHED_ROWS else self.limit)
+        )
+        return [_Entry(row, columns) for row in cursor], found <= MAX_CACHED_ROWS
+
+    def _remember(self, query: Tuple[str, ...], version: int, entries: List[_Entry]):
+        with self._lock:
+            self._cache[query] = (version, entries)
+            while len(self._cache) > MAX_CACHED_QUERIES:
+                self._cache.popitem(last=False)
+
+    def _ranked(self, text: str, entries: List[_Entry]) -> List[Dict[str, Any]]:
+        """The best ``limit`` rows as dictionaries."""
+        typed = trigram_search.normalize(text)
+        best = nsmallest(self.limit, entries, key=lambda entry: entry.rank(typed))
+        return [dict(entry.row) for entry in best]
+
+    def _rows(self, conn: sqlite3.Connection, ids: List[int]) -> List[Dict[str, Any]]:
+        """The full rows for ``ids``, in that order."""
+        if not ids:
+            return []
+        table = trigram_search.INDEXES[self.index][1]
+        placeholders = ', '.join('?' * len(ids))
+        rows = conn.execute(f"SELECT * FROM {table} WHERE id IN ({placeholders})", ids).fetchall()
+        position = {row_id: i for i, row_id in enumerate(ids)}
+        return sorted((dict(row) for row in rows), key=lambda row: position[row['id']])
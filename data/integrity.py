@@ -0,0 +1,584 @@
+"""
+Set-based integrity checks for the library database.
+
+One catalogue (``CHECKS``) replaces the one-off ``check_*``, ``verify_*``
+and ``fix_*`` scripts that probed the database row by row. Each check is a
+single query returning the offending rows (the first column identifies
+the row). ``run_checks`` runs it once, with a window ``COUNT(*) OVER ()``,
+so the same statement gives both the total and a sample of the rows.
+Checks whose tables or columns do not exist in the database are skipped.
+With ``workers`` > 1 the checks of a file database run side by side on
+read-only connections (``data.readonly``). Most of them scan
+``transactions`` or one of its covering indexes, so the wall time is
+roughly that of the slowest check.
+
+Checks that have a safe fix carry it as set-based ``repair`` statements.
+With ``repair=True`` the repairs of the failing checks run in one write
+transaction, each inside its own savepoint. The checks are then run again,
+so the report shows what remains (and a repair that exposed new problems,
+such as a normalized status duplicating another, gets another round).
+Repairs only derive values the database already implies: counters from
+loans, balances from the fine ledger, statuses from return dates, the case
+of a status. Orphans and impossible dates are reported for a person to
+resolve: a fine whose loan is missing may belong to an archive that is not
+at hand, and a reservation may be the only trace of a deleted member.
+
+The report is a JSON-ready dictionary::
+
+    {"database": ..., "checked_at": ..., "seconds": ..., "repair": false, "ok": true,
+     "checks": [{"name", "severity", "description", "status", "count",
+                 "sample", "seconds", "repaired", "error"}]}
+
+``status`` is ``ok``, ``failed``, ``repaired`` or ``skipped``; ``ok`` is
+False when a check of severity ``error`` still fails.
+
+Usage::
+
+    python -m data.integrity [--db intelli_libraria.db] [--repair] [--json] [--only NAME ...] [--workers 4]
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from data import archive, fines
+from data.readonly import ReadOnlyDatabase
+
+OPEN_LOAN_STATUSES = ('Borrowed', 'Issued', 'Overdue')
+LOAN_STATUSES = OPEN_LOAN_STATUSES + ('Returned', 'Lost')
+RESERVATION_STATUSES = ('Active', 'Fulfilled', 'Cancelled')
+USER_STATUSES = ('Active', 'Inactive')
+REPAIR_ROUNDS = 3
+
+
+def _sql_list(values: Sequence[str]) -> str:
+    return ', '.join(f"'{value}'" for value in values)
+
+
+def _canonical_case(column: str, values: Sequence[str], otherwise: str) -> str:
+    """A CASE mapping differently cased or padded spellings of ``values`` onto them."""
+    whens = ' '.join(f"WHEN '{value.lower()}' THEN '{value}'" for value in values)
+    return f"CASE lower(trim({column})) {whens} ELSE {otherwise} END"
+
+
+@dataclass(frozen=True)
+class Check:
+    name: str
+    severity: str  # 'error' or 'warning'
+    description: str
+    sql: str
+    requires: Tuple[str, ...]  # 'table' or 'table.column'
+    repair: Tuple[str, ...] = ()
+
+
+CHECKS: Tuple[Check, ...] = (
+    Check(
+        'orphaned_loans', 'error',
+        'Loans whose member or title no longer exists (one row per missing reference)',
+        # Each arm reads only the loan id and one key, so it can scan the (user_id, ...)
+        # or (book_id, ...) index in key order instead of probing users and books at random
+        """
+        SELECT id, 'user' AS missing, user_id AS missing_id FROM transactions
+        WHERE user_id NOT IN (SELECT id FROM users)
+        UNION ALL
+        SELECT id, 'book', book_id FROM transactions
+        WHERE book_id NOT IN (SELECT id FROM books)
+        """,
+        ('transactions.user_id', 'transactions.book_id', 'users', 'books'),
+    ),
+    Check(
+        'orphaned_reservations', 'error',
+        'Reservations whose member or title no longer exists',
+        """
+        SELECT id, user_id, book_id FROM reservations
+        WHERE user_id NOT IN (SELECT id FROM users) OR book_id NOT IN (SELECT id FROM books)
+        """,
+        ('reservations.user_id', 'reservations.book_id', 'users', 'books'),
+    ),
+    Check(
+        'orphaned_fines', 'error',
+        'Fines for loans that exist neither in transactions nor in the archive',
+        """
+        SELECT f.id, f.transaction_id, f.amount
+        FROM fines f
+        WHERE f.transaction_id NOT IN (SELECT id FROM main.transactions)
+          AND f.transaction_id NOT IN ({archived_loan_ids})
+        """,
+        ('fines.transaction_id', 'transactions'),
+    ),
+    Check(
+        'orphaned_holdings', 'error',
+        'Branch holdings of a title or branch that no longer exists',
+        """
+        SELECT h.branch_id, h.book_id, h.total
+        FROM holdings h
+        LEFT JOIN branches br ON br.id = h.branch_id
+        LEFT JOIN books b ON b.id = h.book_id
+        WHERE br.id IS NULL OR b.id IS NULL
+        """,
+        ('holdings', 'branches', 'books'),
+    ),
+    Check(
+        'availability_drift', 'error',
+        'Titles whose available copies differ from stock minus open loans',
+        """
+        SELECT b.id, b.stock, b.available, b.stock - COALESCE(o.open_loans, 0) AS expected
+        FROM books b
+        LEFT JOIN (
+            SELECT book_id, COUNT(*) AS open_loans FROM transactions
+            WHERE return_date IS NULL GROUP BY book_id
+        ) o ON o.book_id = b.id
+        WHERE b.available IS NOT b.stock - COALESCE(o.open_loans, 0)
+        """,
+        ('books.stock', 'books.available', 'transactions.return_date'),
+        repair=(
+            """
+            UPDATE books SET available = stock - (
+                SELECT COUNT(*) FROM transactions t
+                WHERE t.book_id = books.id AND t.return_date IS NULL
+            )
+            WHERE available IS NOT stock - (
+                SELECT COUNT(*) FROM transactions t
+                WHERE t.book_id = books.id AND t.return_date IS NULL
+            )
+            """,
+        ),
+    ),
+    Check(
+        'overlent_titles', 'warning',
+        'Titles with more open loans than copies in stock',
+        """
+        SELECT b.id, b.stock, COUNT(*) AS open_loans
+        FROM transactions t
+        JOIN books b ON b.id = t.book_id
+        WHERE t.return_date IS NULL
+        GROUP BY b.id
+        HAVING COUNT(*) > b.stock
+        """,
+        ('books.stock', 'transactions.return_date'),
+    ),
+    Check(
+        'holdings_drift', 'error',
+        "Branch holdings whose available copies differ from total minus the branch's open loans",
+        """
+        SELECT h.branch_id, h.book_id, h.total, h.available,
+               h.total - COALESCE(o.open_loans, 0) AS expected
+        FROM holdings h
+        LEFT JOIN (
+            SELECT branch_id, book_id, COUNT(*) AS open_loans FROM transactions
+            WHERE return_date IS NULL AND branch_id IS NOT NULL
+            GROUP BY branch_id, book_id
+        ) o ON o.branch_id = h.branch_id AND o.book_id = h.book_id
+        WHERE h.available IS NOT h.total - COALESCE(o.open_loans, 0)
+        """,
+        ('holdings', 'transactions.branch_id'),
+        repair=(
+            # The holdings_branch_counters trigger moves the branch totals along
+            """
+            UPDATE holdings SET available = total - (
+                SELECT COUNT(*) FROM transactions t
+                WHERE t.branch_id = holdings.branch_id AND t.book_id = holdings.book_id
+                  AND t.return_date IS NULL
+            )
+            WHERE available IS NOT total - (
+                SELECT COUNT(*) FROM transactions t
+                WHERE t.branch_id = holdings.branch_id AND t.book_id = holdings.book_id
+                  AND t.return_date IS NULL
+            )
+            """,
+        ),
+    ),
+    Check(
+        'branch_totals_drift', 'error',
+        'Branches whose title, copy or availability counters differ from their holdings',
+        """
+        SELECT br.id, br.titles, br.copies, br.available,
+               COALESCE(h.titles, 0) AS expected_titles, COALESCE(h.copies, 0) AS expected_copies,
+               COALESCE(h.available, 0) AS expected_available
+        FROM branches br
+        LEFT JOIN (
+            SELECT branch_id, COUNT(*) AS titles, SUM(total) AS copies, SUM(available) AS available
+            FROM holdings GROUP BY branch_id
+        ) h ON h.branch_id = br.id
+        WHERE br.titles IS NOT COALESCE(h.titles, 0)
+           OR br.copies IS NOT COALESCE(h.copies, 0)
+           OR br.available IS NOT COALESCE(h.available, 0)
+        """,
+        ('branches.titles', 'holdings'),
+        repair=(
+            """
+            UPDATE branches SET
+                titles = (SELECT COUNT(*) FROM holdings h WHERE h.branch_id = branches.id),
+                copies = (SELECT COALESCE(SUM(total), 0) FROM holdings h WHERE h.branch_id = branches.id),
+                available = (SELECT COALESCE(SUM(available), 0) FROM holdings h WHERE h.branch_id = branches.id)
+            """,
+        ),
+    ),
+    Check(
+        'fine_balance_drift', 'error',
+        'Patrons whose balance differs from their fines minus their payments',
+        """
+        WITH ledger AS (
+            SELECT user_id, SUM(fined) AS fined, SUM(paid) AS paid
+            FROM (
+                SELECT user_id, CAST(ROUND(amount * 100) AS INTEGER) AS fined, 0 AS paid
+                FROM fines WHERE user_id IS NOT NULL
+                UNION ALL
+                SELECT user_id, 0, CAST(ROUND(amount * 100) AS INTEGER) FROM payments
+            )
+            GROUP BY user_id
+        )
+        SELECT l.user_id, p.balance_cents, l.fined - l.paid AS expected_cents
+        FROM ledger l
+        LEFT JOIN patron_balances p ON p.user_id = l.user_id
+        WHERE p.fined_cents IS NOT l.fined OR p.paid_cents IS NOT l.paid
+           OR p.balance_cents IS NOT l.fined - l.paid
+        UNION ALL
+        SELECT p.user_id, p.balance_cents, 0
+        FROM patron_balances p
+        WHERE (p.fined_cents != 0 OR p.paid_cents != 0 OR p.balance_cents != 0)
+          AND p.user_id NOT IN (SELECT user_id FROM ledger)
+        """,
+        ('patron_balances.balance_cents', 'payments.amount', 'fines.user_id'),
+        repair=("DELETE FROM patron_balances", fines.REBUILD_BALANCES_SQL),
+    ),
+    Check(
+        'invalid_loan_status', 'error',
+        f'Loans whose status is not one of {", ".join(LOAN_STATUSES)}',
+        f"""
+        SELECT id, status, return_date FROM transactions
+        WHERE status IS NULL OR status NOT IN ({_sql_list(LOAN_STATUSES)})
+        """,
+        ('transactions.status', 'transactions.return_date'),
+        repair=(
+            f"""
+            UPDATE transactions SET status = {_canonical_case(
+                'status', LOAN_STATUSES,
+                "CASE WHEN return_date IS NULL THEN 'Borrowed' ELSE 'Returned' END")}
+            WHERE status IS NULL OR status NOT IN ({_sql_list(LOAN_STATUSES)})
+            """,
+        ),
+    ),
+    Check(
+        'loan_status_mismatch', 'error',
+        'Returned loans with an open status, or open loans marked Returned',
+        f"""
+        SELECT id, status, return_date FROM transactions
+        WHERE (return_date IS NOT NULL AND status IN ({_sql_list(OPEN_LOAN_STATUSES)}))
+           OR (return_date IS NULL AND status = 'Returned')
+        """,
+        ('transactions.status', 'transactions.return_date'),
+        repair=(
+            f"""
+            UPDATE transactions SET status = 'Returned'
+            WHERE return_date IS NOT NULL AND status IN ({_sql_list(OPEN_LOAN_STATUSES)})
+            """,
+            """
+            UPDATE transactions SET status = 'Borrowed'
+            WHERE return_date IS NULL AND status = 'Returned'
+            """,
+        ),
+    ),
+    Check(
+        'impossible_loan_dates', 'error',
+        'Loans with a missing or unreadable issue date, a due or return date before it, '
+        'or a date in the future',
+        """
+        SELECT id, issue_date, due_date, return_date,
+               CASE
+                   WHEN date(issue_date) IS NULL THEN 'issue date missing or unreadable'
+                   WHEN due_date IS NOT NULL AND date(due_date) IS NULL THEN 'due date unreadable'
+                   WHEN return_date IS NOT NULL AND date(return_date) IS NULL THEN 'return date unreadable'
+                   WHEN date(due_date) < date(issue_date) THEN 'due before issue'
+                   WHEN date(return_date) < date(issue_date) THEN 'returned before issue'
+                   WHEN date(issue_date) > date('now') THEN 'issued in the future'
+                   ELSE 'returned in the future'
+               END AS problem
+        FROM transactions
+        -- The plain text comparisons are cheap and never miss an ISO date that is out of
+        -- order; date() then drops the same-day candidates that differ only in format
+        WHERE date(issue_date) IS NULL
+           OR (due_date IS NOT NULL AND date(due_date) IS NULL)
+           OR (return_date IS NOT NULL AND date(return_date) IS NULL)
+           OR (due_date < issue_date AND date(due_date) < date(issue_date))
+           OR (return_date < issue_date AND date(return_date) < date(issue_date))
+           OR (issue_date > date('now') AND date(issue_date) > date('now'))
+           OR (return_date > date('now') AND date(return_date) > date('now'))
+        """,
+        ('transactions.issue_date', 'transactions.due_date', 'transactions.return_date'),
+    ),
+    Check(
+        'duplicate_open_loans', 'warning',
+        'Members with more than one open loan of the same title',
+        """
+        SELECT book_id, user_id, COUNT(*) AS open_loans, group_concat(id) AS loan_ids
+        FROM transactions
+        WHERE return_date IS NULL
+        GROUP BY book_id, user_id
+        HAVING COUNT(*) > 1
+        """,
+        ('transactions.return_date',),
+    ),
+    Check(
+        'duplicate_isbns', 'warning',
+        'ISBNs shared by more than one title record',
+        """
+        SELECT isbn, COUNT(*) AS titles, group_concat(id) AS book_ids
+        FROM books
+        WHERE trim(COALESCE(isbn, '')) <> ''
+        GROUP BY isbn
+        HAVING COUNT(*) > 1
+        """,
+        ('books.isbn',),
+    ),
+    Check(
+        'invalid_reservation_status', 'error',
+        f'Reservations whose status is not one of {", ".join(RESERVATION_STATUSES)}',
+        f"""
+        SELECT id, status FROM reservations
+        WHERE status IS NULL OR status NOT IN ({_sql_list(RESERVATION_STATUSES)})
+        """,
+        ('reservations.status',),
+        repair=(
+            # NULL has always been read as Active; anything unreadable is cancelled
+            f"""
+            UPDATE reservations SET status = CASE WHEN status IS NULL THEN 'Active' ELSE {_canonical_case(
+                'status', RESERVATION_STATUSES, "'Cancelled'")} END
+            WHERE status IS NULL OR status NOT IN ({_sql_list(RESERVATION_STATUSES)})
+            """,
+        ),
+    ),
+    Check(
+        'duplicate_active_reservations', 'error',
+        'Active reservations repeating an earlier active reservation of the same member and title',
+        """
+        SELECT r.id, r.user_id, r.book_id
+        FROM reservations r
+        WHERE r.status = 'Active'
+          AND EXISTS (SELECT 1 FROM reservations o
+                      WHERE o.book_id = r.book_id AND o.user_id = r.user_id
+                        AND o.status = 'Active' AND o.id < r.id)
+        """,
+        ('reservations.status',),
+        repair=(
+            """
+            UPDATE reservations SET status = 'Cancelled'
+            WHERE status = 'Active'
+              AND EXISTS (SELECT 1 FROM reservations o
+                          WHERE o.book_id = reservations.book_id AND o.user_id = reservations.user_id
+                            AND o.status = 'Active' AND o.id < reservations.id)
+            """,
+        ),
+    ),
+    Check(
+        'invalid_user_status', 'error',
+        f'Members whose status is not one of {", ".join(USER_STATUSES)}',
+        f"""
+        SELECT id, status FROM users
+        WHERE status IS NULL OR status NOT IN ({_sql_list(USER_STATUSES)})
+        """,
+        ('users.status',),
+        repair=(
+            f"""
+            UPDATE users SET status = {_canonical_case('status', USER_STATUSES, 'status')}
+            WHERE status NOT IN ({_sql_list(USER_STATUSES)})
+            """,
+        ),
+    ),
+)
+
+
+def _schema(conn: sqlite3.Connection) -> Set[str]:
+    """``table`` and ``table.column`` names of the main database."""
+    names = set()
+    tables = [row[0] for row in conn.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")]
+    for table in tables:
+        names.add(table)
+        names.update(f"{table}.{row[1]}" for row in conn.execute(f"PRAGMA main.table_info({table})"))
+    return names
+
+
+def _select(names: Optional[Iterable[str]]) -> List[Check]:
+    if names is None:
+        return list(CHECKS)
+    by_name = {check.name: check for check in CHECKS}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown checks: {', '.join(unknown)}")
+    return [by_name[name] for name in names]
+
+
+def _archived_loan_ids(conn: sqlite3.Connection) -> str:
+    # Fines may belong to archived loans
+    return 'SELECT id FROM archive.transactions' if archive.attach_if_needed(conn) else 'SELECT 0 WHERE 0'
+
+
+def _run(conn: sqlite3.Connection, check: Check, result: Dict[str, Any], sample: int):
+    """Run one check and record its count, sample rows and timing in ``result``."""
+    started = time.perf_counter()
+    try:
+        sql = check.sql.format(archived_loan_ids=_archived_loan_ids(conn))
+        cursor = conn.execute(f"SELECT *, COUNT(*) OVER () AS _total FROM ({sql}) LIMIT ?", (sample or 1,))
+        names = [description[0] for description in cursor.description][:-1]
+        rows = [tuple(row) for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        result['error'] = str(e)
+        result['status'] = 'failed'
+        return
+    finally:
+        result['seconds'] = round(time.perf_counter() - started, 4)
+    result['count'] = rows[0][-1] if rows else 0
+    result['sample'] = [dict(zip(names, row[:-1])) for row in rows[:sample]]
+    result['status'] = 'failed' if result['count'] else 'ok'
+
+
+def run_checks(conn: sqlite3.Connection, repair: bool = False, only: Optional[Iterable[str]] = None,
+               sample: int = 5, workers: int = 1) -> Dict[str, Any]:
+    """
+    Run the catalogue (or the ``only`` checks) and optionally repair what fails.
+
+    Args:
+        conn: An open connection, outside a transaction (read-write for ``repair``)
+        repair: Apply the repairs of failing checks and check again
+        only: Names of the checks to run; all of ``CHECKS`` if None
+        sample: Offending rows to include per check
+        workers: Checks to run at once, each on its own read-only connection
+            (file databases only; 1 runs them in order on ``conn``)
+
+    Returns:
+        The report described in the module docstring
+    """
+    checks = _select(only)
+    started = time.perf_counter()
+    database = archive._main_path(conn)
+    schema = _schema(conn)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    runnable: List[Check] = []
+    for check in checks:
+        result = {'name': check.name, 'severity': check.severity, 'description': check.description,
+                  'status': 'skipped', 'count': 0, 'sample': [], 'seconds': 0.0}
+        results[check.name] = result
+        missing = [name for name in check.requires if name not in schema]
+        if missing:
+            result['error'] = f"missing {', '.join(missing)}"
+            continue
+        runnable.append(check)
+
+    def check_all(selected):
+        if workers <= 1 or not database:
+            for check in selected:
+                _run(conn, check, results[check.name], sample)
+            return
+        readers: List[ReadOnlyDatabase] = []
+        local = threading.local()
+
+        def run_on_reader(check):
+            if not hasattr(local, 'reader'):
+                local.reader = ReadOnlyDatabase(database)
+                readers.append(local.reader)
+            _run(local.reader.connection, check, results[check.name], sample)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='integrity') as pool:
+                list(pool.map(run_on_reader, selected))
+        finally:
+            for reader in readers:
+                reader.close()
+
+    check_all(runnable)
+
+    repaired: Set[str] = set()
+    for _ in range(REPAIR_ROUNDS if repair else 0):
+        # A repair can expose problems for a later check (a normalized status that
+        # duplicates another), so repair again until nothing repairable fails
+        repairable = [check for check in runnable
+                      if check.repair and results[check.name]['status'] == 'failed'
+                      and 'error' not in results[check.name]]
+        if not repairable:
+            break
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for check in repairable:
+                result = results[check.name]
+                conn.execute('SAVEPOINT integrity_repair')
+                try:
+                    result['repaired'] = result.get('repaired', 0) + sum(
+                        conn.execute(statement).rowcount
+                        for statement in check.repair
+                    )
+                    conn.execute('RELEASE integrity_repair')
+                except sqlite3.Error as e:
+                    conn.execute('ROLLBACK TO integrity_repair')
+                    conn.execute('RELEASE integrity_repair')
+                    result['error'] = f'repair failed: {e}'
+                repaired.add(check.name)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        # Repairs can settle other checks too (holdings feed branch totals): check everything again
+        check_all(runnable)
+    for name in repaired:
+        result = results[name]
+        if result['status'] == 'ok' and result.get('repaired'):
+            result['status'] = 'repaired'
+
+    report = [results[check.name] for check in checks]
+    return {
+        'database': database,
+        'checked_at': datetime.now().isoformat(timespec='seconds'),
+        'seconds': round(time.perf_counter() - started, 4),
+        'repair': repair,
+        'ok': not any(r['severity'] == 'error' and r['status'] == 'failed' for r in report),
+        'checks': report,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """The report as a table for the terminal."""
+    lines = [f"{report['database']}  {report['checked_at']}  {report['seconds'] * 1000:.0f}ms"]
+    for result in report['checks']:
+        detail = result.get('error', '')
+        if result.get('repaired'):
+            detail = f"repaired {result['repaired']} rows {detail}".strip()
+        lines.append(f"  {result['status']:9s} {result['name']:30s} {result['count']:8d} "
+                     f"{result['seconds'] * 1000:8.1f}ms  {detail}")
+        for row in result['sample']:
+            lines.append(f"            {row}")
+    lines.append('OK' if report['ok'] else 'PROBLEMS FOUND')
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    parser = argparse.ArgumentParser(description='Check (and repair) database integrity')
+    parser.add_argument('--db', help='Database path (defaults to the application database)')
+    parser.add_argument('--repair', action='store_true', help='Apply the repairs of failing checks')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--only', nargs='+', metavar='NAME', choices=[c.name for c in CHECKS])
+    parser.add_argument('--sample', type=int, default=5, help='Offending rows shown per check')
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                        help='Checks to run at once')
+    args = parser.parse_args()
+
+    if args.db:
+        db_path = args.db
+    else:
+        from data.database import DB_PATH as db_path
+    connection = sqlite3.connect(db_path)
+    try:
+        result = run_checks(connection, repair=args.repair, only=args.only, sample=args.sample,
+                            workers=args.workers)
+    finally:
+        connection.close()
+    print(json.dumps(result, indent=2, default=str) if args.json else format_report(result))
+    sys.exit(0 if result['ok'] else 1)
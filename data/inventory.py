@@ -0,0 +1,138 @@
+"""
+Inventory availability counters.
+
+``books.available`` is ``stock - open loans`` (``stock`` is the number of
+copies owned). Triggers on ``transactions`` and ``books`` (migration 010)
+keep it current, so the circulation code never adjusts it by hand and a
+checkout without a free copy is refused by the database itself.
+
+``reconcile`` recounts open loans for every title in one grouped pass and,
+with ``repair=True``, corrects the drifted counters with a single UPDATE
+(e.g. after a bulk import with the triggers dropped)::
+
+    python -m data.inventory --db intelli_libraria.db [--repair]
+"""
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+# Temp table the reconciliation counts open loans into (one row per title on loan)
+_OPEN_LOANS = """
+CREATE TEMP TABLE IF NOT EXISTS inventory_open_loans (
+    book_id INTEGER PRIMARY KEY,
+    loans INTEGER NOT NULL
+)
+"""
+
+_EXPECTED = "books.stock - COALESCE((SELECT loans FROM inventory_open_loans o WHERE o.book_id = books.id), 0)"
+
+
+@dataclass(frozen=True)
+class Drift:
+    book_id: int
+    title: str
+    stock: int
+    open_loans: int
+    available: int
+
+    @property
+    def expected(self) -> int:
+        return self.stock - self.open_loans
+
+
+@dataclass
+class ReconcileReport:
+    titles: int
+    drifted: List[Drift] = field(default_factory=list)
+    repaired: int = 0
+    seconds: float = 0.0
+
+    @property
+    def overcommitted(self) -> List[Drift]:
+        """Titles with more copies on loan than owned."""
+        return [d for d in self.drifted if d.expected < 0]
+
+    @property
+    def ok(self) -> bool:
+        return not self.drifted
+
+
+def reconcile(conn: sqlite3.Connection, repair: bool = False) -> ReconcileReport:
+    """
+    Compare every title's counter with its open loans, optionally fixing them.
+
+    The count runs inside one transaction (``BEGIN IMMEDIATE`` when repairing),
+    so loans issued concurrently cannot be half-counted.
+
+    Args:
+        conn: An open connection (read-write when ``repair`` is set)
+        repair: Set ``available = stock - open loans`` on the drifted titles
+
+    Returns:
+        A ReconcileReport listing the drifted titles as found before the repair
+    """
+    started = time.perf_counter()
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute('BEGIN IMMEDIATE' if repair else 'BEGIN')
+    try:
+        conn.execute(_OPEN_LOANS)
+        conn.execute("DELETE FROM inventory_open_loans")
+        conn.execute(
+            """
+            INSERT INTO inventory_open_loans (book_id, loans)
+            SELECT book_id, COUNT(*) FROM transactions
+            WHERE return_date IS NULL
+            GROUP BY book_id
+            """
+        )
+        titles = conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+        rows = conn.execute(
+            """
+            SELECT b.id, b.title, b.stock, COALESCE(o.loans, 0), b.available
+            FROM books b
+            LEFT JOIN inventory_open_loans o ON o.book_id = b.id
+            WHERE b.available IS NOT b.stock - COALESCE(o.loans, 0)
+            ORDER BY b.id
+            """
+        ).fetchall()
+        report = ReconcileReport(titles, [Drift(*row) for row in rows])
+        if repair and rows:
+            report.repaired = conn.execute(
+                f"UPDATE books SET available = {_EXPECTED} WHERE available IS NOT {_EXPECTED}"
+            ).rowcount
+        conn.execute("DELETE FROM inventory_open_loans")
+        if own_transaction:
+            conn.execute('COMMIT')
+    except Exception:
+        if own_transaction and conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Check or repair the book availability counters')
+    parser.add_argument('--db', help='Database path (defaults to the application database)')
+    parser.add_argument('--repair', action='store_true', help='Fix the drifted counters')
+    parser.add_argument('--limit', type=int, default=20, help='Drifted titles to list')
+    args = parser.parse_args()
+
+    if args.db:
+        db_path = args.db
+    else:
+        from data.database import DB_PATH as db_path
+    connection = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        result = reconcile(connection, repair=args.repair)
+    finally:
+        connection.close()
+    print(f"{result.titles} titles checked in {result.seconds * 1000:.1f}ms, "
+          f"{len(result.drifted)} drifted, {len(result.overcommitted)} overcommitted, "
+          f"{result.repaired} repaired")
+    for drift in result.drifted[:args.limit]:
+        print(f"  #{drift.book_id} {drift.title!r}: available {drift.available}, "
+              f"expected {drift.expected} ({drift.stock} owned, {drift.open_loans} on loan)")
@@ -0,0 +1,152 @@
+"""
+Migration 006: column fix-ups for databases created by older releases.
+
+Replaces the PRAGMA table_info / ALTER TABLE cascade that
+``database.update_database_schema`` ran on every start, and the
+borrowed_date -> issue_date scripts that used to live in ``migrations/``.
+Every step checks the current schema first, so it is a no-op on databases
+that are already in shape.
+"""
+import re
+
+USER_COLUMNS = [
+    ('user_code', 'TEXT'),
+    ('full_name', 'TEXT'),
+    ('phone', 'TEXT'),
+    ('contact', 'TEXT'),
+    ('address', 'TEXT'),
+    ('role', "TEXT DEFAULT 'Member'"),
+    ('status', "TEXT DEFAULT 'Active'"),
+    # SQLite cannot add a column with a non-constant default via ALTER TABLE
+    ('created_at', 'TIMESTAMP'),
+    ('updated_at', 'TIMESTAMP'),
+]
+
+BOOK_COLUMNS = [
+    ('title', 'TEXT'),
+    ('author', 'TEXT'),
+    ('isbn', 'TEXT'),
+    ('edition', 'TEXT'),
+    ('stock', 'INTEGER DEFAULT 0'),
+    ('available', 'INTEGER NOT NULL DEFAULT 0'),
+]
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _ordered_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _add_missing(conn, table, wanted):
+    present = _columns(conn, table)
+    for name, declaration in wanted:
+        if name not in present:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+    return present
+
+
+def _isbn_unique_index(conn):
+    for _, name, unique, *_ in conn.execute("PRAGMA index_list(books)").fetchall():
+        if unique and 'isbn' in [row[2] for row in conn.execute(f"PRAGMA index_info({name})")]:
+            return name
+    return None
+
+
+def _fix_users(conn):
+    before = _add_missing(conn, 'users', USER_COLUMNS)
+    if 'username' in before:
+        conn.execute("UPDATE users SET full_name = COALESCE(full_name, username)")
+    conn.execute(
+        """
+        UPDATE users SET user_code = 'USR-' || printf('%06d', id)
+        WHERE user_code IS NULL OR user_code = ''
+        """
+    )
+    conn.execute(
+        """
+        UPDATE users SET created_at = COALESCE(created_at, CURRENT_TIMESTAMP),
+                         updated_at = COALESCE(updated_at, CURRENT_TIMESTAMP)
+        WHERE created_at IS NULL OR updated_at IS NULL
+        """
+    )
+
+
+def _fix_books(conn):
+    before = _add_missing(conn, 'books', BOOK_COLUMNS)
+    if 'available' not in before:
+        conn.execute("UPDATE books SET available = COALESCE(stock, 0)")
+
+    # Earlier schemas enforced a UNIQUE isbn, which made re-adding copies fail
+    unique_index = _isbn_unique_index(conn)
+    if unique_index is None:
+        return
+    if not unique_index.startswith('sqlite_autoindex_'):
+        conn.execute(f'DROP INDEX "{unique_index}"')
+        return
+
+    # A UNIQUE column constraint cannot be dropped; rebuild the table from its
+    # own definition minus the constraint, keeping every column
+    table_sql = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'books'"
+    ).fetchone()[0]
+    relaxed = re.sub(r'(\bisbn\b[^,]*?)\s+UNIQUE\b', r'\1', table_sql, count=1, flags=re.IGNORECASE)
+    if relaxed == table_sql:
+        return  # table-level UNIQUE (...) constraint; leave it alone
+    relaxed = re.sub(r'^\s*CREATE\s+TABLE\s+("?books"?)', 'CREATE TABLE books__migrate', relaxed,
+                     flags=re.IGNORECASE)
+    # DROP TABLE takes the table's triggers and indexes with it; recreate them after
+    dependents = [
+        row[0] for row in conn.execute(
+            "SELECT sql FROM sqlite_master WHERE tbl_name = 'books' "
+            "AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+        )
+    ]
+    columns = ', '.join(f'"{name}"' for name in _ordered_columns(conn, 'books'))
+    conn.execute(relaxed)
+    conn.execute(f"INSERT INTO books__migrate ({columns}) SELECT {columns} FROM books")
+    conn.execute("DROP TABLE books")
+    conn.execute("ALTER TABLE books__migrate RENAME TO books")
+    for sql in dependents:
+        conn.execute(sql)
+
+
+def _fix_reservations(conn):
+    if not _columns(conn, 'reservations'):
+        conn.execute(
+            """
+            CREATE TABLE reservations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                book_id INTEGER NOT NULL,
+                reservation_date TEXT NOT NULL,
+                status TEXT DEFAULT 'Active' CHECK(status IN ('Active', 'Fulfilled', 'Cancelled')),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+                FOREIGN KEY (book_id) REFERENCES books (id) ON DELETE CASCADE
+            )
+            """
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_reservations_user_id ON reservations(user_id)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_reservations_status ON reservations(status)')
+    else:
+        _add_missing(conn, 'reservations', [('reservation_date', 'TEXT'),
+                                            ('status', "TEXT DEFAULT 'Active'")])
+
+
+def _fix_transactions(conn):
+    columns = _columns(conn, 'transactions')
+    if 'borrowed_date' in columns and 'issue_date' not in columns:
+        conn.execute("ALTER TABLE transactions RENAME COLUMN borrowed_date TO issue_date")
+
+
+def upgrade(conn):
+    if _columns(conn, 'users'):
+        _fix_users(conn)
+    if _columns(conn, 'books'):
+        _fix_books(conn)
+    _fix_reservations(conn)
+    _fix_transactions(conn)
@@ -0,0 +1,238 @@
+-- Daily circulation aggregates (per day, per book per day, per user per day).
+-- Kept current by the triggers below; data/aggregates.py rebuilds any window
+-- from the source tables (nightly catch-up).
+--
+-- Events:
+--   issues       loans issued that day (transactions.issue_date)
+--   returns      loans returned that day (transactions.return_date)
+--   overdues     returns that came back after their due date, on the return day
+--   reservations holds placed that day (reservations.reservation_date)
+--   loan_days    total loan length of the day's returns (daily table only)
+
+CREATE TABLE IF NOT EXISTS circulation_daily (
+    day TEXT PRIMARY KEY,
+    issues INTEGER NOT NULL DEFAULT 0,
+    returns INTEGER NOT NULL DEFAULT 0,
+    overdues INTEGER NOT NULL DEFAULT 0,
+    reservations INTEGER NOT NULL DEFAULT 0,
+    loan_days REAL NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS circulation_daily_book (
+    day TEXT NOT NULL,
+    book_id INTEGER NOT NULL,
+    issues INTEGER NOT NULL DEFAULT 0,
+    returns INTEGER NOT NULL DEFAULT 0,
+    overdues INTEGER NOT NULL DEFAULT 0,
+    reservations INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, book_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS circulation_daily_user (
+    day TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    issues INTEGER NOT NULL DEFAULT 0,
+    returns INTEGER NOT NULL DEFAULT 0,
+    overdues INTEGER NOT NULL DEFAULT 0,
+    reservations INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, user_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_circulation_daily_book_book ON circulation_daily_book(book_id, day);
+CREATE INDEX IF NOT EXISTS idx_circulation_daily_user_user ON circulation_daily_user(user_id, day);
+
+-- One row per circulation event; the rebuild job aggregates this view
+CREATE VIEW IF NOT EXISTS circulation_events AS
+    SELECT date(issue_date) AS day, book_id, user_id,
+           1 AS issues, 0 AS returns, 0 AS overdues, 0 AS reservations, 0 AS loan_days
+    FROM transactions
+    WHERE issue_date IS NOT NULL
+    UNION ALL
+    SELECT date(return_date), book_id, user_id,
+           0, 1, date(return_date) > date(due_date), 0,
+           COALESCE(julianday(date(return_date)) - julianday(date(issue_date)), 0)
+    FROM transactions
+    WHERE return_date IS NOT NULL
+    UNION ALL
+    SELECT date(reservation_date), book_id, user_id, 0, 0, 0, 1, 0
+    FROM reservations
+    WHERE reservation_date IS NOT NULL;
+
+-- Backfill from the existing history
+INSERT OR REPLACE INTO circulation_daily (day, issues, returns, overdues, reservations, loan_days)
+SELECT day, SUM(issues), SUM(returns), SUM(overdues), SUM(reservations), SUM(loan_days)
+FROM circulation_events WHERE day IS NOT NULL GROUP BY day;
+
+INSERT OR REPLACE INTO circulation_daily_book (day, book_id, issues, returns, overdues, reservations)
+SELECT day, book_id, SUM(issues), SUM(returns), SUM(overdues), SUM(reservations)
+FROM circulation_events WHERE day IS NOT NULL GROUP BY day, book_id;
+
+INSERT OR REPLACE INTO circulation_daily_user (day, user_id, issues, returns, overdues, reservations)
+SELECT day, user_id, SUM(issues), SUM(returns), SUM(overdues), SUM(reservations)
+FROM circulation_events WHERE day IS NOT NULL GROUP BY day, user_id;
+
+-- Loan issued (or inserted already returned)
+CREATE TRIGGER IF NOT EXISTS circulation_agg_transaction_insert
+AFTER INSERT ON transactions
+BEGIN
+    INSERT INTO circulation_daily (day, issues) SELECT date(NEW.issue_date), 1
+        WHERE NEW.issue_date IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET issues = issues + 1;
+    INSERT INTO circulation_daily_book (day, book_id, issues) SELECT date(NEW.issue_date), NEW.book_id, 1
+        WHERE NEW.issue_date IS NOT NULL
+        ON CONFLICT(day, book_id) DO UPDATE SET issues = issues + 1;
+    INSERT INTO circulation_daily_user (day, user_id, issues) SELECT date(NEW.issue_date), NEW.user_id, 1
+        WHERE NEW.issue_date IS NOT NULL
+        ON CONFLICT(day, user_id) DO UPDATE SET issues = issues + 1;
+
+    INSERT INTO circulation_daily (day, returns, overdues, loan_days)
+        SELECT date(NEW.return_date), 1, date(NEW.return_date) > date(NEW.due_date),
+               COALESCE(julianday(date(NEW.return_date)) - julianday(date(NEW.issue_date)), 0)
+        WHERE NEW.return_date IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET returns = returns + 1,
+            overdues = overdues + excluded.overdues, loan_days = loan_days + excluded.loan_days;
+    INSERT INTO circulation_daily_book (day, book_id, returns, overdues)
+        SELECT date(NEW.return_date), NEW.book_id, 1, date(NEW.return_date) > date(NEW.due_date)
+        WHERE NEW.return_date IS NOT NULL
+        ON CONFLICT(day, book_id) DO UPDATE SET returns = returns + 1, overdues = overdues + excluded.overdues;
+    INSERT INTO circulation_daily_user (day, user_id, returns, overdues)
+        SELECT date(NEW.return_date), NEW.user_id, 1, date(NEW.return_date) > date(NEW.due_date)
+        WHERE NEW.return_date IS NOT NULL
+        ON CONFLICT(day, user_id) DO UPDATE SET returns = returns + 1, overdues = overdues + excluded.overdues;
+END;
+
+-- Loan deleted: withdraw its issue and return events
+CREATE TRIGGER IF NOT EXISTS circulation_agg_transaction_delete
+AFTER DELETE ON transactions
+BEGIN
+    UPDATE circulation_daily SET issues = issues - 1
+        WHERE OLD.issue_date IS NOT NULL AND day = date(OLD.issue_date);
+    UPDATE circulation_daily_book SET issues = issues - 1
+        WHERE OLD.issue_date IS NOT NULL AND day = date(OLD.issue_date) AND book_id = OLD.book_id;
+    UPDATE circulation_daily_user SET issues = issues - 1
+        WHERE OLD.issue_date IS NOT NULL AND day = date(OLD.issue_date) AND user_id = OLD.user_id;
+
+    UPDATE circulation_daily SET returns = returns - 1,
+            overdues = overdues - (date(OLD.return_date) > date(OLD.due_date)),
+            loan_days = loan_days - COALESCE(julianday(date(OLD.return_date)) - julianday(date(OLD.issue_date)), 0)
+        WHERE OLD.return_date IS NOT NULL AND day = date(OLD.return_date);
+    UPDATE circulation_daily_book SET returns = returns - 1,
+            overdues = overdues - (date(OLD.return_date) > date(OLD.due_date))
+        WHERE OLD.return_date IS NOT NULL AND day = date(OLD.return_date) AND book_id = OLD.book_id;
+    UPDATE circulation_daily_user SET returns = returns - 1,
+            overdues = overdues - (date(OLD.return_date) > date(OLD.due_date))
+        WHERE OLD.return_date IS NOT NULL AND day = date(OLD.return_date) AND user_id = OLD.user_id;
+END;
+
+-- Issue date, borrower or book changed: move the issue event
+CREATE TRIGGER IF NOT EXISTS circulation_agg_transaction_reissue
+AFTER UPDATE OF issue_date, user_id, book_id ON transactions
+WHEN OLD.issue_date IS NOT NEW.issue_date
+  OR OLD.user_id IS NOT NEW.user_id
+  OR OLD.book_id IS NOT NEW.book_id
+BEGIN
+    UPDATE circulation_daily SET issues = issues - 1
+        WHERE OLD.issue_date IS NOT NULL AND day = date(OLD.issue_date);
+    UPDATE circulation_daily_book SET issues = issues - 1
+        WHERE OLD.issue_date IS NOT NULL AND day = date(OLD.issue_date) AND book_id = OLD.book_id;
+    UPDATE circulation_daily_user SET issues = issues - 1
+        WHERE OLD.issue_date IS NOT NULL AND day = date(OLD.issue_date) AND user_id = OLD.user_id;
+
+    INSERT INTO circulation_daily (day, issues) SELECT date(NEW.issue_date), 1
+        WHERE NEW.issue_date IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET issues = issues + 1;
+    INSERT INTO circulation_daily_book (day, book_id, issues) SELECT date(NEW.issue_date), NEW.book_id, 1
+        WHERE NEW.issue_date IS NOT NULL
+        ON CONFLICT(day, book_id) DO UPDATE SET issues = issues + 1;
+    INSERT INTO circulation_daily_user (day, user_id, issues) SELECT date(NEW.issue_date), NEW.user_id, 1
+        WHERE NEW.issue_date IS NOT NULL
+        ON CONFLICT(day, user_id) DO UPDATE SET issues = issues + 1;
+END;
+
+-- Loan returned (or return corrected): move the return event
+CREATE TRIGGER IF NOT EXISTS circulation_agg_transaction_return
+AFTER UPDATE OF return_date, due_date, issue_date, user_id, book_id ON transactions
+WHEN OLD.return_date IS NOT NEW.return_date
+  OR (NEW.return_date IS NOT NULL AND (
+        OLD.due_date IS NOT NEW.due_date
+     OR OLD.issue_date IS NOT NEW.issue_date
+     OR OLD.user_id IS NOT NEW.user_id
+     OR OLD.book_id IS NOT NEW.book_id))
+BEGIN
+    UPDATE circulation_daily SET returns = returns - 1,
+            overdues = overdues - (date(OLD.return_date) > date(OLD.due_date)),
+            loan_days = loan_days - COALESCE(julianday(date(OLD.return_date)) - julianday(date(OLD.issue_date)), 0)
+        WHERE OLD.return_date IS NOT NULL AND day = date(OLD.return_date);
+    UPDATE circulation_daily_book SET returns = returns - 1,
+            overdues = overdues - (date(OLD.return_date) > date(OLD.due_date))
+        WHERE OLD.return_date IS NOT NULL AND day = date(OLD.return_date) AND book_id = OLD.book_id;
+    UPDATE circulation_daily_user SET returns = returns - 1,
+            overdues = overdues - (date(OLD.return_date) > date(OLD.due_date))
+        WHERE OLD.return_date IS NOT NULL AND day = date(OLD.return_date) AND user_id = OLD.user_id;
+
+    INSERT INTO circulation_daily (day, returns, overdues, loan_days)
+        SELECT date(NEW.return_date), 1, date(NEW.return_date) > date(NEW.due_date),
+               COALESCE(julianday(date(NEW.return_date)) - julianday(date(NEW.issue_date)), 0)
+        WHERE NEW.return_date IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET returns = returns + 1,
+            overdues = overdues + excluded.overdues, loan_days = loan_days + excluded.loan_days;
+    INSERT INTO circulation_daily_book (day, book_id, returns, overdues)
+        SELECT date(NEW.return_date), NEW.book_id, 1, date(NEW.return_date) > date(NEW.due_date)
+        WHERE NEW.return_date IS NOT NULL
+        ON CONFLICT(day, book_id) DO UPDATE SET returns = returns + 1, overdues = overdues + excluded.overdues;
+    INSERT INTO circulation_daily_user (day, user_id, returns, overdues)
+        SELECT date(NEW.return_date), NEW.user_id, 1, date(NEW.return_date) > date(NEW.due_date)
+        WHERE NEW.return_date IS NOT NULL
+        ON CONFLICT(day, user_id) DO UPDATE SET returns = returns + 1, overdues = overdues + excluded.overdues;
+END;
+
+-- Hold placed
+CREATE TRIGGER IF NOT EXISTS circulation_agg_reservation_insert
+AFTER INSERT ON reservations
+WHEN NEW.reservation_date IS NOT NULL
+BEGIN
+    INSERT INTO circulation_daily (day, reservations) VALUES (date(NEW.reservation_date), 1)
+        ON CONFLICT(day) DO UPDATE SET reservations = reservations + 1;
+    INSERT INTO circulation_daily_book (day, book_id, reservations) VALUES (date(NEW.reservation_date), NEW.book_id, 1)
+        ON CONFLICT(day, book_id) DO UPDATE SET reservations = reservations + 1;
+    INSERT INTO circulation_daily_user (day, user_id, reservations) VALUES (date(NEW.reservation_date), NEW.user_id, 1)
+        ON CONFLICT(day, user_id) DO UPDATE SET reservations = reservations + 1;
+END;
+
+-- Hold deleted
+CREATE TRIGGER IF NOT EXISTS circulation_agg_reservation_delete
+AFTER DELETE ON reservations
+WHEN OLD.reservation_date IS NOT NULL
+BEGIN
+    UPDATE circulation_daily SET reservations = reservations - 1
+        WHERE day = date(OLD.reservation_date);
+    UPDATE circulation_daily_book SET reservations = reservations - 1
+        WHERE day = date(OLD.reservation_date) AND book_id = OLD.book_id;
+    UPDATE circulation_daily_user SET reservations = reservations - 1
+        WHERE day = date(OLD.reservation_date) AND user_id = OLD.user_id;
+END;
+
+-- Hold re-dated or moved to another borrower/title
+CREATE TRIGGER IF NOT EXISTS circulation_agg_reservation_update
+AFTER UPDATE OF reservation_date, user_id, book_id ON reservations
+WHEN OLD.reservation_date IS NOT NEW.reservation_date
+  OR OLD.user_id IS NOT NEW.user_id
+  OR OLD.book_id IS NOT NEW.book_id
+BEGIN
+    UPDATE circulation_daily SET reservations = reservations - 1
+        WHERE OLD.reservation_date IS NOT NULL AND day = date(OLD.reservation_date);
+    UPDATE circulation_daily_book SET reservations = reservations - 1
+        WHERE OLD.reservation_date IS NOT NULL AND day = date(OLD.reservation_date) AND book_id = OLD.book_id;
+    UPDATE circulation_daily_user SET reservations = reservations - 1
+        WHERE OLD.reservation_date IS NOT NULL AND day = date(OLD.reservation_date) AND user_id = OLD.user_id;
+
+    INSERT INTO circulation_daily (day, reservations) SELECT date(NEW.reservation_date), 1
+        WHERE NEW.reservation_date IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET reservations = reservations + 1;
+    INSERT INTO circulation_daily_book (day, book_id, reservations) SELECT date(NEW.reservation_date), NEW.book_id, 1
+        WHERE NEW.reservation_date IS NOT NULL
+        ON CONFLICT(day, book_id) DO UPDATE SET reservations = reservations + 1;
+    INSERT INTO circulation_daily_user (day, user_id, reservations) SELECT date(NEW.reservation_date), NEW.user_id, 1
+        WHERE NEW.reservation_date IS NOT NULL
+        ON CONFLICT(day, user_id) DO UPDATE SET reservations = reservations + 1;
+END;
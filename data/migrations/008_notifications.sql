@@ -0,0 +1,32 @@
+-- Migration: 008_notifications.sql
+-- Description: Notification queue for due-soon, overdue and hold-ready notices
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    kind TEXT NOT NULL CHECK(kind IN ('due_soon', 'overdue', 'hold_ready')),
+    -- transactions.id for loan notices, reservations.id for hold notices
+    ref_id INTEGER NOT NULL,
+    -- Distinguishes repeat notices for the same loan (due date, overdue week)
+    notice_key TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending' CHECK(status IN ('pending', 'sent', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+    UNIQUE (kind, ref_id, notice_key)
+);
+
+-- Delivery queue scan
+CREATE INDEX IF NOT EXISTS idx_notifications_status ON notifications(status, id);
+CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications(user_id, created_at);
+
+-- Open loans by due date: due-soon and overdue scans are range queries on this
+CREATE INDEX IF NOT EXISTS idx_transactions_open_due
+    ON transactions(due_date) WHERE return_date IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_reservations_book_status ON reservations(book_id, status);
@@ -0,0 +1,41 @@
+-- Migration: 009_entity_changes.sql
+-- Description: Change log read by the entity cache (data/entity_cache.py) to
+-- evict rows written by other connections. Only the newest 10000 changes are
+-- kept; a cache that falls further behind flushes everything.
+
+CREATE TABLE IF NOT EXISTS entity_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity TEXT NOT NULL,
+    entity_id INTEGER NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS entity_changes_trim
+AFTER INSERT ON entity_changes
+WHEN NEW.seq % 1000 = 0
+BEGIN
+    DELETE FROM entity_changes WHERE seq <= NEW.seq - 10000;
+END;
+
+CREATE TRIGGER IF NOT EXISTS entity_changes_books_update
+AFTER UPDATE ON books
+BEGIN
+    INSERT INTO entity_changes (entity, entity_id) VALUES ('book', OLD.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS entity_changes_books_delete
+AFTER DELETE ON books
+BEGIN
+    INSERT INTO entity_changes (entity, entity_id) VALUES ('book', OLD.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS entity_changes_users_update
+AFTER UPDATE ON users
+BEGIN
+    INSERT INTO entity_changes (entity, entity_id) VALUES ('user', OLD.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS entity_changes_users_delete
+AFTER DELETE ON users
+BEGIN
+    INSERT INTO entity_changes (entity, entity_id) VALUES ('user', OLD.id);
+END;
@@ -0,0 +1,65 @@
+-- Migration: 010_availability_triggers.sql
+-- Description: books.available is derived from open loans,
+--     available = stock - (loans of the title with return_date IS NULL),
+-- and kept current by the triggers below, so application code never adjusts
+-- the counters by hand. books.stock is the number of copies owned; changing
+-- it moves available by the same amount. data/inventory.py verifies and
+-- repairs the counters in one set-based pass.
+
+CREATE INDEX IF NOT EXISTS idx_transactions_open_book
+ON transactions(book_id) WHERE return_date IS NULL;
+
+-- Older releases decremented stock together with available on every checkout.
+-- Where the two are still equal, give the copies that are out back to stock.
+UPDATE books SET stock = stock + (
+    SELECT COUNT(*) FROM transactions t
+    WHERE t.book_id = books.id AND t.return_date IS NULL
+)
+WHERE available = stock
+  AND EXISTS (SELECT 1 FROM transactions t WHERE t.book_id = books.id AND t.return_date IS NULL);
+
+UPDATE books SET available = stock - (
+    SELECT COUNT(*) FROM transactions t
+    WHERE t.book_id = books.id AND t.return_date IS NULL
+);
+
+-- Refuse a checkout when no copy is left, whichever code path issues it
+CREATE TRIGGER IF NOT EXISTS availability_loan_check
+BEFORE INSERT ON transactions
+WHEN NEW.return_date IS NULL
+ AND (SELECT available FROM books WHERE id = NEW.book_id) <= 0
+BEGIN
+    SELECT RAISE(ABORT, 'No copies available');
+END;
+
+CREATE TRIGGER IF NOT EXISTS availability_loan_insert
+AFTER INSERT ON transactions
+WHEN NEW.return_date IS NULL
+BEGIN
+    UPDATE books SET available = available - 1 WHERE id = NEW.book_id;
+END;
+
+-- Returns, re-opened loans and loans moved to another title
+CREATE TRIGGER IF NOT EXISTS availability_loan_update
+AFTER UPDATE OF book_id, return_date ON transactions
+WHEN (OLD.return_date IS NULL) != (NEW.return_date IS NULL) OR OLD.book_id != NEW.book_id
+BEGIN
+    UPDATE books SET available = available + 1
+    WHERE id = OLD.book_id AND OLD.return_date IS NULL;
+    UPDATE books SET available = available - 1
+    WHERE id = NEW.book_id AND NEW.return_date IS NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS availability_loan_delete
+AFTER DELETE ON transactions
+WHEN OLD.return_date IS NULL
+BEGIN
+    UPDATE books SET available = available + 1 WHERE id = OLD.book_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS availability_stock_change
+AFTER UPDATE OF stock ON books
+WHEN NEW.stock IS NOT OLD.stock
+BEGIN
+    UPDATE books SET available = available + (NEW.stock - OLD.stock) WHERE id = NEW.id;
+END;
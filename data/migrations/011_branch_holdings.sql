@@ -0,0 +1,120 @@
+-- Migration: 011_branch_holdings.sql
+-- Description: Per-branch holdings. holdings has one row per (branch, title)
+-- with the copies the branch owns and how many are on its shelf; loans record
+-- the issuing branch in transactions.branch_id. Triggers keep
+--   holdings.available  (per branch and title)
+--   branches.titles / copies / available  (per branch)
+--   books.stock / available  (per title, all branches; migration 010)
+-- current, so branch screens read their own holdings range and consolidated
+-- figures come from the cached counters. See data/branches.py.
+
+CREATE TABLE IF NOT EXISTS branches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    code TEXT UNIQUE,
+    titles INTEGER NOT NULL DEFAULT 0,
+    copies INTEGER NOT NULL DEFAULT 0,
+    available INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- The primary key is the branch-scoped index: every branch query is a range of it
+CREATE TABLE IF NOT EXISTS holdings (
+    branch_id INTEGER NOT NULL REFERENCES branches(id),
+    book_id INTEGER NOT NULL REFERENCES books(id),
+    total INTEGER NOT NULL DEFAULT 0 CHECK (total >= 0),
+    available INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (branch_id, book_id)
+) WITHOUT ROWID;
+
+-- Where is a title held (consolidated availability per title)
+CREATE INDEX IF NOT EXISTS idx_holdings_book ON holdings(book_id, branch_id);
+
+ALTER TABLE transactions ADD COLUMN branch_id INTEGER REFERENCES branches(id);
+
+-- Existing copies all belong to the main library
+INSERT OR IGNORE INTO branches (id, name, code) VALUES (1, 'Main Library', 'MAIN');
+
+INSERT OR IGNORE INTO holdings (branch_id, book_id, total, available)
+SELECT 1, id, COALESCE(stock, 0), COALESCE(available, 0) FROM books;
+
+UPDATE transactions SET branch_id = 1 WHERE return_date IS NULL;
+
+UPDATE branches SET
+    titles = (SELECT COUNT(*) FROM holdings h WHERE h.branch_id = branches.id),
+    copies = (SELECT COALESCE(SUM(total), 0) FROM holdings h WHERE h.branch_id = branches.id),
+    available = (SELECT COALESCE(SUM(available), 0) FROM holdings h WHERE h.branch_id = branches.id);
+
+-- Loans issued at a branch
+CREATE TRIGGER IF NOT EXISTS holdings_loan_check
+BEFORE INSERT ON transactions
+WHEN NEW.branch_id IS NOT NULL AND NEW.return_date IS NULL
+ AND COALESCE((SELECT available FROM holdings
+               WHERE branch_id = NEW.branch_id AND book_id = NEW.book_id), 0) <= 0
+BEGIN
+    SELECT RAISE(ABORT, 'No copies available at this branch');
+END;
+
+CREATE TRIGGER IF NOT EXISTS holdings_loan_insert
+AFTER INSERT ON transactions
+WHEN NEW.branch_id IS NOT NULL AND NEW.return_date IS NULL
+BEGIN
+    UPDATE holdings SET available = available - 1
+    WHERE branch_id = NEW.branch_id AND book_id = NEW.book_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS holdings_loan_update
+AFTER UPDATE OF book_id, branch_id, return_date ON transactions
+WHEN (OLD.return_date IS NULL) != (NEW.return_date IS NULL)
+  OR OLD.book_id != NEW.book_id OR OLD.branch_id IS NOT NEW.branch_id
+BEGIN
+    UPDATE holdings SET available = available + 1
+    WHERE branch_id = OLD.branch_id AND book_id = OLD.book_id AND OLD.return_date IS NULL;
+    UPDATE holdings SET available = available - 1
+    WHERE branch_id = NEW.branch_id AND book_id = NEW.book_id AND NEW.return_date IS NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS holdings_loan_delete
+AFTER DELETE ON transactions
+WHEN OLD.branch_id IS NOT NULL AND OLD.return_date IS NULL
+BEGIN
+    UPDATE holdings SET available = available + 1
+    WHERE branch_id = OLD.branch_id AND book_id = OLD.book_id;
+END;
+
+-- Copies added to or withdrawn from a branch move the title and branch totals
+CREATE TRIGGER IF NOT EXISTS holdings_insert
+AFTER INSERT ON holdings
+BEGIN
+    UPDATE books SET stock = stock + NEW.total WHERE id = NEW.book_id;
+    UPDATE branches SET titles = titles + 1, copies = copies + NEW.total,
+                        available = available + NEW.available
+    WHERE id = NEW.branch_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS holdings_total_change
+AFTER UPDATE OF total ON holdings
+WHEN NEW.total != OLD.total
+BEGIN
+    UPDATE holdings SET available = available + (NEW.total - OLD.total)
+    WHERE branch_id = NEW.branch_id AND book_id = NEW.book_id;
+    UPDATE books SET stock = stock + (NEW.total - OLD.total) WHERE id = NEW.book_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS holdings_branch_counters
+AFTER UPDATE ON holdings
+WHEN NEW.total != OLD.total OR NEW.available != OLD.available
+BEGIN
+    UPDATE branches SET copies = copies + (NEW.total - OLD.total),
+                        available = available + (NEW.available - OLD.available)
+    WHERE id = NEW.branch_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS holdings_delete
+AFTER DELETE ON holdings
+BEGIN
+    UPDATE books SET stock = stock - OLD.total WHERE id = OLD.book_id;
+    UPDATE branches SET titles = titles - 1, copies = copies - OLD.total,
+                        available = available - OLD.available
+    WHERE id = OLD.branch_id;
+END;
@@ -0,0 +1,107 @@
+-- Migration: 012_trigram_search.sql
+-- Description: Trigram indexes for typo-tolerant search over book titles and
+-- authors and patron names and e-mails (data/trigram_search.py). They are
+-- contentless FTS5 tables kept in sync with books/users by triggers; every
+-- word is indexed padded with two leading spaces and one trailing space
+-- (as pg_trgm does), so word starts and ends count as trigrams and short
+-- misspelt words still match. trigram_frequencies holds each trigram's
+-- document frequency (a snapshot of the fts5vocab tables, which count it by
+-- walking the posting list), so a query can cheaply pick its rarest trigrams.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS books_trigrams USING fts5(
+    title, author, content='', tokenize='trigram'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS books_trigrams_vocab USING fts5vocab(books_trigrams, 'row');
+
+CREATE VIRTUAL TABLE IF NOT EXISTS users_trigrams USING fts5(
+    full_name, email, content='', tokenize='trigram'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS users_trigrams_vocab USING fts5vocab(users_trigrams, 'row');
+
+CREATE TABLE IF NOT EXISTS trigram_frequencies (
+    index_name TEXT NOT NULL,
+    term TEXT NOT NULL,
+    documents INTEGER NOT NULL,
+    PRIMARY KEY (index_name, term)
+) WITHOUT ROWID;
+
+INSERT INTO books_trigrams (rowid, title, author)
+SELECT id,
+       '  ' || replace(lower(trim(title)), ' ', '  ') || ' ',
+       '  ' || replace(lower(trim(author)), ' ', '  ') || ' '
+FROM books;
+
+INSERT INTO users_trigrams (rowid, full_name, email)
+SELECT id,
+       '  ' || replace(lower(trim(full_name)), ' ', '  ') || ' ',
+       '  ' || replace(lower(trim(email)), ' ', '  ') || ' '
+FROM users;
+
+INSERT OR REPLACE INTO trigram_frequencies (index_name, term, documents)
+SELECT 'books', term, doc FROM books_trigrams_vocab;
+
+INSERT OR REPLACE INTO trigram_frequencies (index_name, term, documents)
+SELECT 'users', term, doc FROM users_trigrams_vocab;
+
+CREATE TRIGGER IF NOT EXISTS books_trigrams_insert
+AFTER INSERT ON books
+BEGIN
+    INSERT INTO books_trigrams (rowid, title, author)
+    VALUES (NEW.id,
+            '  ' || replace(lower(trim(NEW.title)), ' ', '  ') || ' ',
+            '  ' || replace(lower(trim(NEW.author)), ' ', '  ') || ' ');
+END;
+
+CREATE TRIGGER IF NOT EXISTS books_trigrams_delete
+AFTER DELETE ON books
+BEGIN
+    INSERT INTO books_trigrams (books_trigrams, rowid, title, author)
+    VALUES ('delete', OLD.id,
+            '  ' || replace(lower(trim(OLD.title)), ' ', '  ') || ' ',
+            '  ' || replace(lower(trim(OLD.author)), ' ', '  ') || ' ');
+END;
+
+-- Only edits of the indexed columns; counter updates leave the index alone
+CREATE TRIGGER IF NOT EXISTS books_trigrams_update
+AFTER UPDATE OF title, author ON books
+BEGIN
+    INSERT INTO books_trigrams (books_trigrams, rowid, title, author)
+    VALUES ('delete', OLD.id,
+            '  ' || replace(lower(trim(OLD.title)), ' ', '  ') || ' ',
+            '  ' || replace(lower(trim(OLD.author)), ' ', '  ') || ' ');
+    INSERT INTO books_trigrams (rowid, title, author)
+    VALUES (NEW.id,
+            '  ' || replace(lower(trim(NEW.title)), ' ', '  ') || ' ',
+            '  ' || replace(lower(trim(NEW.author)), ' ', '  ') || ' ');
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_trigrams_insert
+AFTER INSERT ON users
+BEGIN
+    INSERT INTO users_trigrams (rowid, full_name, email)
+    VALUES (NEW.id,
+            '  ' || replace(lower(trim(NEW.full_name)), ' ', '  ') || ' ',
+            '  ' || replace(lower(trim(NEW.email)), ' ', '  ') || ' ');
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_trigrams_delete
+AFTER DELETE ON users
+BEGIN
+    INSERT INTO users_trigrams (users_trigrams, rowid, full_name, email)
+    VALUES ('delete', OLD.id,
+            '  ' || replace(lower(trim(OLD.full_name)), ' ', '  ') || ' ',
+            '  ' || replace(lower(trim(OLD.email)), ' ', '  ') || ' ');
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_trigrams_update
+AFTER UPDATE OF full_name, email ON users
+BEGIN
+    INSERT INTO users_trigrams (users_trigrams, rowid, full_name, email)
+    VALUES ('delete', OLD.id,
+            '  ' || replace(lower(trim(OLD.full_name)), ' ', '  ') || ' ',
+            '  ' || replace(lower(trim(OLD.email)), ' ', '  ') || ' ');
+    INSERT INTO users_trigrams (rowid, full_name, email)
+    VALUES (NEW.id,
+            '  ' || replace(lower(trim(NEW.full_name)), ' ', '  ') || ' ',
+            '  ' || replace(lower(trim(NEW.email)), ' ', '  ') || ' ');
+END;
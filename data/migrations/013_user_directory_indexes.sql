@@ -0,0 +1,15 @@
+-- Migration: 013_user_directory_indexes.sql
+-- Description: Indexes behind the paged user directory (data/user_directory.py).
+-- Pages are read in id order after the last id shown, so the role/status
+-- filters are indexed together with id; user codes are matched by prefix
+-- (LIKE 'usr-12%' uses a NOCASE index). Names and e-mails are matched by word
+-- prefix through the users_trigrams index of migration 012.
+
+CREATE INDEX IF NOT EXISTS idx_users_user_code_nocase ON users(user_code COLLATE NOCASE);
+
+CREATE INDEX IF NOT EXISTS idx_users_role_status_id
+ON users(role COLLATE NOCASE, status COLLATE NOCASE, id);
+
+CREATE INDEX IF NOT EXISTS idx_users_role_id ON users(role COLLATE NOCASE, id);
+
+CREATE INDEX IF NOT EXISTS idx_users_status_id ON users(status COLLATE NOCASE, id);
@@ -0,0 +1,7 @@
+-- Migration: 014_reservation_list_index.sql
+-- Description: Index behind the paged reservations list
+-- (database.get_all_reservations with a limit). Pages are read newest first
+-- and continue after the (reservation_date, id) of the last row shown, so
+-- each page is an index range scan instead of a sort of the whole table.
+
+CREATE INDEX IF NOT EXISTS idx_reservations_date_id ON reservations(reservation_date, id);
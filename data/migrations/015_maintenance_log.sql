@@ -0,0 +1,21 @@
+-- Migration: 015_maintenance_log.sql
+-- Description: One row per idle-time maintenance run
+-- (services/maintenance_service.py): what ran, how long it took, and the
+-- database's WAL size, freelist and fragmentation before and after, so they
+-- can be followed over time.
+
+CREATE TABLE IF NOT EXISTS maintenance_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    seconds REAL NOT NULL,
+    tasks TEXT NOT NULL,
+    page_size INTEGER,
+    page_count INTEGER,
+    freelist_pages INTEGER,
+    freelist_after INTEGER,
+    wal_bytes INTEGER,
+    wal_bytes_after INTEGER,
+    fragmentation REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_maintenance_log_started ON maintenance_log(started_at);
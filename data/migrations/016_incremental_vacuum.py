@@ -0,0 +1,34 @@
+"""
+Migration 016: switch the database to ``auto_vacuum = INCREMENTAL``.
+
+Deleted rows leave free pages behind that the file never gives back. With
+incremental auto-vacuum the idle-time maintenance
+(``services/maintenance_service.py``) returns them in small, bounded
+``PRAGMA incremental_vacuum`` steps instead. An existing database only
+changes mode when it is rebuilt by ``VACUUM``, which cannot run inside the
+migration's transaction, so it runs after the commit. ``VACUUM`` rewrites
+the whole file and the migrations run at start-up, so only databases up to
+``MAX_VACUUM_BYTES`` are rebuilt here; larger ones, or any where it fails
+(another connection holds the database), keep working without it and are
+left to the maintenance service, which makes the switch when the database
+is idle and within its time budget.
+"""
+
+INCREMENTAL = 2
+# Same as MaintenanceService's default max_vacuum_bytes
+MAX_VACUUM_BYTES = 64 * 1024 * 1024
+
+
+def upgrade(conn):
+    # Nothing to change inside the transaction
+    pass
+
+
+def after_commit(conn):
+    if conn.execute('PRAGMA auto_vacuum').fetchone()[0] == INCREMENTAL:
+        return
+    page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+    if conn.execute('PRAGMA page_count').fetchone()[0] * page_size > MAX_VACUUM_BYTES:
+        return
+    conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+    conn.execute('VACUUM')
@@ -0,0 +1,54 @@
+-- Archive of long-returned loans (data/archive.py).
+--
+-- Returned loans older than the archive horizon move to the `transactions`
+-- table of a separate archive database that is ATTACHed when a report
+-- needs it. Every date on an archived loan is before `watermark`, so a
+-- read whose date range starts on or after it never touches the archive.
+--
+-- `archiving` is set only inside the archive job's delete transaction, so no
+-- other connection ever sees it set.
+
+CREATE TABLE IF NOT EXISTS transaction_archive_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    watermark TEXT,
+    archiving INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO transaction_archive_state (id) VALUES (1);
+
+CREATE TABLE IF NOT EXISTS transaction_archive_runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    cutoff TEXT NOT NULL,
+    archive_path TEXT NOT NULL,
+    moved INTEGER NOT NULL,
+    batches INTEGER NOT NULL,
+    seconds REAL NOT NULL
+);
+
+-- Archived loans leave the daily aggregates (007) alone: their issue and
+-- return events still happened
+DROP TRIGGER IF EXISTS circulation_agg_transaction_delete;
+
+CREATE TRIGGER circulation_agg_transaction_delete
+AFTER DELETE ON transactions
+WHEN (SELECT archiving FROM transaction_archive_state WHERE id = 1) IS NOT 1
+BEGIN
+    UPDATE circulation_daily SET issues = issues - 1
+        WHERE OLD.issue_date IS NOT NULL AND day = date(OLD.issue_date);
+    UPDATE circulation_daily_book SET issues = issues - 1
+        WHERE OLD.issue_date IS NOT NULL AND day = date(OLD.issue_date) AND book_id = OLD.book_id;
+    UPDATE circulation_daily_user SET issues = issues - 1
+        WHERE OLD.issue_date IS NOT NULL AND day = date(OLD.issue_date) AND user_id = OLD.user_id;
+
+    UPDATE circulation_daily SET returns = returns - 1,
+            overdues = overdues - (date(OLD.return_date) > date(OLD.due_date)),
+            loan_days = loan_days - COALESCE(julianday(date(OLD.return_date)) - julianday(date(OLD.issue_date)), 0)
+        WHERE OLD.return_date IS NOT NULL AND day = date(OLD.return_date);
+    UPDATE circulation_daily_book SET returns = returns - 1,
+            overdues = overdues - (date(OLD.return_date) > date(OLD.due_date))
+        WHERE OLD.return_date IS NOT NULL AND day = date(OLD.return_date) AND book_id = OLD.book_id;
+    UPDATE circulation_daily_user SET returns = returns - 1,
+            overdues = overdues - (date(OLD.return_date) > date(OLD.due_date))
+        WHERE OLD.return_date IS NOT NULL AND day = date(OLD.return_date) AND user_id = OLD.user_id;
+END;
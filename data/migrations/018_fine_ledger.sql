@@ -0,0 +1,174 @@
+-- Migration: 018_fine_ledger.sql
+-- Description: A fine ledger. Fines are assessed when a late loan is
+-- returned, payments are recorded in their own table, and patron_balances
+-- keeps each patron's totals in whole cents (fines - payments = balance).
+-- Triggers keep it current. fines.user_id is denormalized from the loan so a
+-- patron's fines, and the ranking of debtors, can be read from an index
+-- alone. Payments settle the oldest unpaid fines first; fines.paid is set
+-- once a fine is fully covered. data/fines.py holds the read and posting
+-- API and rebuilds the balances in one pass.
+
+-- Legacy databases adopted at 005 may never have had a fines table (as in 001)
+CREATE TABLE IF NOT EXISTS fines (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    transaction_id INTEGER NOT NULL,
+    amount REAL NOT NULL CHECK(amount >= 0),
+    reason TEXT,
+    paid INTEGER DEFAULT 0 CHECK(paid IN (0,1)),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (transaction_id) REFERENCES transactions(id) ON DELETE CASCADE
+);
+
+ALTER TABLE fines ADD COLUMN user_id INTEGER;
+
+UPDATE fines SET user_id = (SELECT t.user_id FROM transactions t WHERE t.id = fines.transaction_id);
+
+-- Late returns the fine page has been showing as unpaid: 0.50 per day late
+INSERT INTO fines (transaction_id, user_id, amount, reason, paid, created_at)
+SELECT t.id, t.user_id,
+       ROUND((julianday(date(t.return_date)) - julianday(date(t.due_date))) * 0.50, 2),
+       'Overdue', 0, COALESCE(datetime(t.return_date), CURRENT_TIMESTAMP)
+FROM transactions t
+WHERE date(t.return_date) > date(t.due_date)
+  AND NOT EXISTS (SELECT 1 FROM fines f WHERE f.transaction_id = t.id);
+
+CREATE INDEX IF NOT EXISTS idx_fines_user
+ON fines(user_id, paid, created_at, amount, transaction_id);
+
+CREATE TABLE IF NOT EXISTS payments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    amount REAL NOT NULL CHECK (amount > 0),
+    method TEXT NOT NULL DEFAULT 'cash',
+    -- Receipt or batch line; posting the same reference twice is a no-op
+    reference TEXT UNIQUE,
+    paid_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_payments_user ON payments(user_id, paid_at, amount);
+
+-- Fines marked paid before payments were recorded
+INSERT OR IGNORE INTO payments (user_id, amount, method, reference, paid_at)
+SELECT user_id, amount, 'legacy', 'fine:' || id, COALESCE(updated_at, created_at, CURRENT_TIMESTAMP)
+FROM fines
+WHERE paid = 1 AND user_id IS NOT NULL AND amount > 0;
+
+CREATE TABLE IF NOT EXISTS patron_balances (
+    user_id INTEGER PRIMARY KEY,
+    fined_cents INTEGER NOT NULL DEFAULT 0,
+    paid_cents INTEGER NOT NULL DEFAULT 0,
+    balance_cents INTEGER NOT NULL DEFAULT 0
+);
+
+-- Top debtors: read backwards, user_id is the rowid
+CREATE INDEX IF NOT EXISTS idx_patron_balances_balance ON patron_balances(balance_cents);
+
+INSERT INTO patron_balances (user_id, fined_cents, paid_cents, balance_cents)
+SELECT user_id, SUM(fined), SUM(paid), SUM(fined) - SUM(paid)
+FROM (
+    SELECT user_id, CAST(ROUND(amount * 100) AS INTEGER) AS fined, 0 AS paid
+    FROM fines WHERE user_id IS NOT NULL
+    UNION ALL
+    SELECT user_id, 0, CAST(ROUND(amount * 100) AS INTEGER) FROM payments
+)
+GROUP BY user_id;
+
+-- Assess the fine when a late loan comes back, whichever code path returns it
+CREATE TRIGGER IF NOT EXISTS fine_ledger_assess
+AFTER UPDATE OF return_date ON transactions
+WHEN OLD.return_date IS NULL AND date(NEW.return_date) > date(NEW.due_date)
+ AND NOT EXISTS (SELECT 1 FROM fines WHERE transaction_id = NEW.id)
+BEGIN
+    INSERT INTO fines (transaction_id, user_id, amount, reason, paid)
+    VALUES (NEW.id, NEW.user_id,
+            ROUND((julianday(date(NEW.return_date)) - julianday(date(NEW.due_date))) * 0.50, 2),
+            'Overdue', 0);
+END;
+
+-- Fines inserted without a patron take the loan's
+CREATE TRIGGER IF NOT EXISTS fine_ledger_fill_user
+AFTER INSERT ON fines
+WHEN NEW.user_id IS NULL
+BEGIN
+    UPDATE fines SET user_id = (SELECT user_id FROM transactions WHERE id = NEW.transaction_id)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS fine_ledger_fine_insert
+AFTER INSERT ON fines
+WHEN NEW.user_id IS NOT NULL
+BEGIN
+    INSERT INTO patron_balances (user_id, fined_cents, balance_cents)
+    VALUES (NEW.user_id, CAST(ROUND(NEW.amount * 100) AS INTEGER), CAST(ROUND(NEW.amount * 100) AS INTEGER))
+    ON CONFLICT (user_id) DO UPDATE SET
+        fined_cents = fined_cents + excluded.fined_cents,
+        balance_cents = balance_cents + excluded.fined_cents;
+END;
+
+CREATE TRIGGER IF NOT EXISTS fine_ledger_fine_update
+AFTER UPDATE OF user_id, amount ON fines
+WHEN OLD.user_id IS NOT NEW.user_id OR OLD.amount IS NOT NEW.amount
+BEGIN
+    UPDATE patron_balances SET
+        fined_cents = fined_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER),
+        balance_cents = balance_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER)
+    WHERE user_id = OLD.user_id;
+    INSERT INTO patron_balances (user_id, fined_cents, balance_cents)
+    SELECT NEW.user_id, CAST(ROUND(NEW.amount * 100) AS INTEGER), CAST(ROUND(NEW.amount * 100) AS INTEGER)
+    WHERE NEW.user_id IS NOT NULL
+    ON CONFLICT (user_id) DO UPDATE SET
+        fined_cents = fined_cents + excluded.fined_cents,
+        balance_cents = balance_cents + excluded.fined_cents;
+END;
+
+CREATE TRIGGER IF NOT EXISTS fine_ledger_fine_delete
+AFTER DELETE ON fines
+WHEN OLD.user_id IS NOT NULL
+BEGIN
+    UPDATE patron_balances SET
+        fined_cents = fined_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER),
+        balance_cents = balance_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER)
+    WHERE user_id = OLD.user_id;
+END;
+
+-- Credit the payment, then mark the oldest unpaid fines it (with earlier
+-- unallocated credit) fully covers as paid
+CREATE TRIGGER IF NOT EXISTS fine_ledger_payment_insert
+AFTER INSERT ON payments
+BEGIN
+    INSERT INTO patron_balances (user_id, paid_cents, balance_cents)
+    VALUES (NEW.user_id, CAST(ROUND(NEW.amount * 100) AS INTEGER), -CAST(ROUND(NEW.amount * 100) AS INTEGER))
+    ON CONFLICT (user_id) DO UPDATE SET
+        paid_cents = paid_cents + excluded.paid_cents,
+        balance_cents = balance_cents + excluded.balance_cents;
+    UPDATE fines SET paid = 1
+    WHERE id IN (
+        SELECT id FROM (
+            SELECT id, SUM(CAST(ROUND(amount * 100) AS INTEGER))
+                       OVER (ORDER BY created_at, id) AS running
+            FROM fines WHERE user_id = NEW.user_id AND paid = 0
+        )
+        WHERE running <= (
+            SELECT COALESCE(SUM(CAST(ROUND(amount * 100) AS INTEGER)), 0)
+            FROM fines WHERE user_id = NEW.user_id AND paid = 0
+        ) - (SELECT balance_cents FROM patron_balances WHERE user_id = NEW.user_id)
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS fine_ledger_payment_delete
+AFTER DELETE ON payments
+BEGIN
+    UPDATE patron_balances SET
+        paid_cents = paid_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER),
+        balance_cents = balance_cents + CAST(ROUND(OLD.amount * 100) AS INTEGER)
+    WHERE user_id = OLD.user_id;
+END;
+
+-- A posted payment is corrected by deleting it and posting the right one
+CREATE TRIGGER IF NOT EXISTS fine_ledger_payment_immutable
+BEFORE UPDATE OF user_id, amount ON payments
+BEGIN
+    SELECT RAISE(ABORT, 'Payments cannot be changed; delete and post again');
+END;
@@ -0,0 +1,33 @@
+-- Migration: 020_loan_default_branch.sql
+-- Description: Open loans recorded without a branch (the desktop checkout and
+-- the other paths that do not pick one) are issued from a holding of the
+-- title that has a copy on the shelf, the main library's first. Without it the
+-- availability triggers (010) took the copy off books.available but the
+-- holdings triggers (011) skipped the loan, so holdings and branch counters
+-- drifted above the title's count. See data/branches.py.
+
+-- Loans recorded between 011 and this migration: the triggers of 011 move
+-- the holding (and branch) counters as each loan is assigned
+UPDATE transactions SET branch_id = (
+    SELECT h.branch_id FROM holdings h
+    WHERE h.book_id = transactions.book_id AND h.available > 0
+    ORDER BY h.branch_id != 1, h.branch_id
+    LIMIT 1
+)
+WHERE branch_id IS NULL AND return_date IS NULL
+  AND EXISTS (SELECT 1 FROM holdings h
+              WHERE h.book_id = transactions.book_id AND h.available > 0);
+
+CREATE TRIGGER IF NOT EXISTS holdings_loan_default_branch
+AFTER INSERT ON transactions
+WHEN NEW.branch_id IS NULL AND NEW.return_date IS NULL
+BEGIN
+    UPDATE transactions SET branch_id = (
+        SELECT branch_id FROM holdings
+        WHERE book_id = NEW.book_id AND available > 0
+        ORDER BY branch_id != 1, branch_id
+        LIMIT 1
+    )
+    WHERE id = NEW.id
+      AND EXISTS (SELECT 1 FROM holdings WHERE book_id = NEW.book_id AND available > 0);
+END;
@@ -0,0 +1,107 @@
+-- Migration: 021_search_normalization.sql
+-- Description: Index the trigram search columns the way the queries are
+-- normalized (data/trigram_search.normalize): tabs, newlines and runs of
+-- spaces collapse to one space before every word is padded. The triggers of
+-- 012 only replaced single spaces, so a title with a tab or a double space
+-- was indexed with trigrams no query produces. Replaces the triggers and
+-- rebuilds both indexes and their frequency snapshot.
+--
+-- Also indexes books.isbn for the ISBN prefix search that runs before the
+-- trigram search (LIKE '978-0%' uses a NOCASE index).
+
+CREATE INDEX IF NOT EXISTS idx_books_isbn_nocase ON books(isbn COLLATE NOCASE);
+
+DROP TRIGGER IF EXISTS books_trigrams_insert;
+DROP TRIGGER IF EXISTS books_trigrams_delete;
+DROP TRIGGER IF EXISTS books_trigrams_update;
+DROP TRIGGER IF EXISTS users_trigrams_insert;
+DROP TRIGGER IF EXISTS users_trigrams_delete;
+DROP TRIGGER IF EXISTS users_trigrams_update;
+
+INSERT INTO books_trigrams (books_trigrams) VALUES ('delete-all');
+INSERT INTO users_trigrams (users_trigrams) VALUES ('delete-all');
+
+-- lower(), then control whitespace to spaces, trim, and collapse runs of
+-- spaces (each space gets a char(1) marker, a marker followed by a space is
+-- dropped, then the remaining markers)
+INSERT INTO books_trigrams (rowid, title, author)
+SELECT id,
+       '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(title), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ',
+       '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(author), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' '
+FROM books;
+
+INSERT INTO users_trigrams (rowid, full_name, email)
+SELECT id,
+       '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(full_name), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ',
+       '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(email), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' '
+FROM users;
+
+DELETE FROM trigram_frequencies;
+
+INSERT INTO trigram_frequencies (index_name, term, documents)
+SELECT 'books', term, doc FROM books_trigrams_vocab;
+
+INSERT INTO trigram_frequencies (index_name, term, documents)
+SELECT 'users', term, doc FROM users_trigrams_vocab;
+
+CREATE TRIGGER IF NOT EXISTS books_trigrams_insert
+AFTER INSERT ON books
+BEGIN
+    INSERT INTO books_trigrams (rowid, title, author)
+    VALUES (NEW.id,
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(NEW.title), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ',
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(NEW.author), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ');
+END;
+
+CREATE TRIGGER IF NOT EXISTS books_trigrams_delete
+AFTER DELETE ON books
+BEGIN
+    INSERT INTO books_trigrams (books_trigrams, rowid, title, author)
+    VALUES ('delete', OLD.id,
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(OLD.title), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ',
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(OLD.author), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ');
+END;
+
+CREATE TRIGGER IF NOT EXISTS books_trigrams_update
+AFTER UPDATE OF title, author ON books
+BEGIN
+    INSERT INTO books_trigrams (books_trigrams, rowid, title, author)
+    VALUES ('delete', OLD.id,
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(OLD.title), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ',
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(OLD.author), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ');
+    INSERT INTO books_trigrams (rowid, title, author)
+    VALUES (NEW.id,
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(NEW.title), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ',
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(NEW.author), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ');
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_trigrams_insert
+AFTER INSERT ON users
+BEGIN
+    INSERT INTO users_trigrams (rowid, full_name, email)
+    VALUES (NEW.id,
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(NEW.full_name), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ',
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(NEW.email), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ');
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_trigrams_delete
+AFTER DELETE ON users
+BEGIN
+    INSERT INTO users_trigrams (users_trigrams, rowid, full_name, email)
+    VALUES ('delete', OLD.id,
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(OLD.full_name), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ',
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(OLD.email), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ');
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_trigrams_update
+AFTER UPDATE OF full_name, email ON users
+BEGIN
+    INSERT INTO users_trigrams (users_trigrams, rowid, full_name, email)
+    VALUES ('delete', OLD.id,
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(OLD.full_name), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ',
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(OLD.email), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ');
+    INSERT INTO users_trigrams (rowid, full_name, email)
+    VALUES (NEW.id,
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(NEW.full_name), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ',
+            '  ' || replace(replace(replace(replace(trim(replace(replace(replace(replace(replace(lower(NEW.email), char(9), ' '), char(10), ' '), char(11), ' '), char(12), ' '), char(13), ' ')), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), ' ', '  ') || ' ');
+END;
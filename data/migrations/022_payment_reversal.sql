@@ -0,0 +1,41 @@
+-- Migration: 022_payment_reversal.sql
+-- Description: Deleting a payment (018 corrects a payment by deleting it and
+-- posting the right one) restored the patron's balance but left the fines it
+-- had settled marked paid. The replacement trigger also marks the newest
+-- paid fines that the remaining payments no longer cover as unpaid, the
+-- reverse of fine_ledger_payment_insert, which settles the oldest first.
+-- Fines left marked paid by payments deleted before this migration are
+-- corrected the same way. See data/fines.py.
+
+DROP TRIGGER IF EXISTS fine_ledger_payment_delete;
+
+UPDATE fines SET paid = 0
+WHERE id IN (
+    SELECT id FROM (
+        SELECT id, user_id, SUM(CAST(ROUND(amount * 100) AS INTEGER))
+                            OVER (PARTITION BY user_id ORDER BY created_at, id) AS running
+        FROM fines WHERE user_id IS NOT NULL AND paid = 1
+    ) settled
+    WHERE running > (
+        SELECT COALESCE(SUM(CAST(ROUND(p.amount * 100) AS INTEGER)), 0)
+        FROM payments p WHERE p.user_id = settled.user_id
+    )
+);
+
+CREATE TRIGGER IF NOT EXISTS fine_ledger_payment_reverse
+AFTER DELETE ON payments
+BEGIN
+    UPDATE patron_balances SET
+        paid_cents = paid_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER),
+        balance_cents = balance_cents + CAST(ROUND(OLD.amount * 100) AS INTEGER)
+    WHERE user_id = OLD.user_id;
+    UPDATE fines SET paid = 0
+    WHERE id IN (
+        SELECT id FROM (
+            SELECT id, SUM(CAST(ROUND(amount * 100) AS INTEGER))
+                       OVER (ORDER BY created_at, id) AS running
+            FROM fines WHERE user_id = OLD.user_id AND paid = 1
+        )
+        WHERE running > (SELECT paid_cents FROM patron_balances WHERE user_id = OLD.user_id)
+    );
+END;
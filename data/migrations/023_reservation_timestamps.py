@@ -0,0 +1,33 @@
+"""
+Migration 023: timestamp columns on legacy reservations tables.
+
+Databases built by the old runner (such as the committed
+``intelli_libraria.db``) carry 001's ``update_reservations_timestamp``
+trigger on a ``reservations`` table created without ``created_at`` and
+``updated_at``, so every UPDATE of a reservation failed with "no such column:
+updated_at". 006 only added the columns the reservation code reads. The
+columns are added here and backfilled from the reservation date.
+"""
+
+RESERVATION_COLUMNS = [
+    # SQLite cannot add a column with a non-constant default via ALTER TABLE
+    ('created_at', 'TIMESTAMP'),
+    ('updated_at', 'TIMESTAMP'),
+]
+
+
+def upgrade(conn):
+    present = {row[1] for row in conn.execute("PRAGMA table_info(reservations)")}
+    missing = [(name, declaration) for name, declaration in RESERVATION_COLUMNS if name not in present]
+    if not present or not missing:
+        return
+    for name, declaration in missing:
+        conn.execute(f"ALTER TABLE reservations ADD COLUMN {name} {declaration}")
+    conn.execute(
+        """
+        UPDATE reservations SET
+            created_at = COALESCE(created_at, datetime(reservation_date), CURRENT_TIMESTAMP),
+            updated_at = COALESCE(updated_at, created_at, datetime(reservation_date), CURRENT_TIMESTAMP)
+        WHERE created_at IS NULL OR updated_at IS NULL
+        """
+    )
@@ -0,0 +1,109 @@
+-- Migration: 024_fine_credit_allocation.sql
+-- Description: Only fine_ledger_payment_insert settled fines, so a fine
+-- assessed while the patron had unallocated credit (a negative
+-- balance_cents, e.g. after an overpayment) stayed unpaid although the
+-- credit covered it. The fine triggers now run the same allocation as a
+-- payment: the oldest unpaid fines whose running total the credit
+-- (payments minus paid fines) covers are marked paid. So does the reversal
+-- trigger from 022 once it has unsettled fines, so credit left over after a
+-- deleted payment still settles what it covers. Fines left unpaid under
+-- credit before this migration are settled the same way. See data/fines.py.
+
+UPDATE fines SET paid = 1
+WHERE id IN (
+    SELECT unpaid.id FROM (
+        SELECT id, user_id,
+               SUM(CAST(ROUND(amount * 100) AS INTEGER))
+                   OVER (PARTITION BY user_id ORDER BY created_at, id) AS running,
+               SUM(CAST(ROUND(amount * 100) AS INTEGER)) OVER (PARTITION BY user_id) AS unpaid_cents
+        FROM fines WHERE user_id IS NOT NULL AND paid = 0
+    ) unpaid
+    JOIN patron_balances b ON b.user_id = unpaid.user_id
+    WHERE unpaid.running <= unpaid.unpaid_cents - b.balance_cents
+);
+
+DROP TRIGGER IF EXISTS fine_ledger_fine_insert;
+DROP TRIGGER IF EXISTS fine_ledger_fine_update;
+DROP TRIGGER IF EXISTS fine_ledger_payment_reverse;
+
+CREATE TRIGGER IF NOT EXISTS fine_ledger_fine_insert
+AFTER INSERT ON fines
+WHEN NEW.user_id IS NOT NULL
+BEGIN
+    INSERT INTO patron_balances (user_id, fined_cents, balance_cents)
+    VALUES (NEW.user_id, CAST(ROUND(NEW.amount * 100) AS INTEGER), CAST(ROUND(NEW.amount * 100) AS INTEGER))
+    ON CONFLICT (user_id) DO UPDATE SET
+        fined_cents = fined_cents + excluded.fined_cents,
+        balance_cents = balance_cents + excluded.fined_cents;
+    UPDATE fines SET paid = 1
+    WHERE id IN (
+        SELECT id FROM (
+            SELECT id, SUM(CAST(ROUND(amount * 100) AS INTEGER))
+                       OVER (ORDER BY created_at, id) AS running
+            FROM fines WHERE user_id = NEW.user_id AND paid = 0
+        )
+        WHERE running <= (
+            SELECT COALESCE(SUM(CAST(ROUND(amount * 100) AS INTEGER)), 0)
+            FROM fines WHERE user_id = NEW.user_id AND paid = 0
+        ) - (SELECT balance_cents FROM patron_balances WHERE user_id = NEW.user_id)
+    );
+END;
+
+-- fine_ledger_fill_user gives a fine its patron by this path
+CREATE TRIGGER IF NOT EXISTS fine_ledger_fine_update
+AFTER UPDATE OF user_id, amount ON fines
+WHEN OLD.user_id IS NOT NEW.user_id OR OLD.amount IS NOT NEW.amount
+BEGIN
+    UPDATE patron_balances SET
+        fined_cents = fined_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER),
+        balance_cents = balance_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER)
+    WHERE user_id = OLD.user_id;
+    INSERT INTO patron_balances (user_id, fined_cents, balance_cents)
+    SELECT NEW.user_id, CAST(ROUND(NEW.amount * 100) AS INTEGER), CAST(ROUND(NEW.amount * 100) AS INTEGER)
+    WHERE NEW.user_id IS NOT NULL
+    ON CONFLICT (user_id) DO UPDATE SET
+        fined_cents = fined_cents + excluded.fined_cents,
+        balance_cents = balance_cents + excluded.fined_cents;
+    UPDATE fines SET paid = 1
+    WHERE id IN (
+        SELECT id FROM (
+            SELECT id, SUM(CAST(ROUND(amount * 100) AS INTEGER))
+                       OVER (ORDER BY created_at, id) AS running
+            FROM fines WHERE user_id = NEW.user_id AND paid = 0
+        )
+        WHERE running <= (
+            SELECT COALESCE(SUM(CAST(ROUND(amount * 100) AS INTEGER)), 0)
+            FROM fines WHERE user_id = NEW.user_id AND paid = 0
+        ) - (SELECT balance_cents FROM patron_balances WHERE user_id = NEW.user_id)
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS fine_ledger_payment_reverse
+AFTER DELETE ON payments
+BEGIN
+    UPDATE patron_balances SET
+        paid_cents = paid_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER),
+        balance_cents = balance_cents + CAST(ROUND(OLD.amount * 100) AS INTEGER)
+    WHERE user_id = OLD.user_id;
+    UPDATE fines SET paid = 0
+    WHERE id IN (
+        SELECT id FROM (
+            SELECT id, SUM(CAST(ROUND(amount * 100) AS INTEGER))
+                       OVER (ORDER BY created_at, id) AS running
+            FROM fines WHERE user_id = OLD.user_id AND paid = 1
+        )
+        WHERE running > (SELECT paid_cents FROM patron_balances WHERE user_id = OLD.user_id)
+    );
+    UPDATE fines SET paid = 1
+    WHERE id IN (
+        SELECT id FROM (
+            SELECT id, SUM(CAST(ROUND(amount * 100) AS INTEGER))
+                       OVER (ORDER BY created_at, id) AS running
+            FROM fines WHERE user_id = OLD.user_id AND paid = 0
+        )
+        WHERE running <= (
+            SELECT COALESCE(SUM(CAST(ROUND(amount * 100) AS INTEGER)), 0)
+            FROM fines WHERE user_id = OLD.user_id AND paid = 0
+        ) - (SELECT balance_cents FROM patron_balances WHERE user_id = OLD.user_id)
+    );
+END;
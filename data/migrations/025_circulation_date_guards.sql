@@ -0,0 +1,185 @@
+-- Migration: 025_circulation_date_guards.sql
+-- Description: The circulation aggregate triggers (007, and 017's
+-- transaction_delete) skipped events whose date column was NULL but stored
+-- date(column) as the day. A date SQLite cannot parse passed the guard and
+-- date() turned it into NULL, so the insert or update that set it aborted
+-- with "NOT NULL constraint failed: circulation_daily.day"; an unparseable
+-- due date likewise made the overdue flag NULL. The triggers now guard on
+-- date(column) IS NOT NULL and count an overdue only when both dates parse,
+-- which is what the rebuild from circulation_events (day IS NOT NULL, SUM
+-- ignoring NULL) already did. See data/aggregates.py.
+
+DROP TRIGGER IF EXISTS circulation_agg_transaction_insert;
+DROP TRIGGER IF EXISTS circulation_agg_transaction_delete;
+DROP TRIGGER IF EXISTS circulation_agg_transaction_reissue;
+DROP TRIGGER IF EXISTS circulation_agg_transaction_return;
+DROP TRIGGER IF EXISTS circulation_agg_reservation_insert;
+DROP TRIGGER IF EXISTS circulation_agg_reservation_delete;
+DROP TRIGGER IF EXISTS circulation_agg_reservation_update;
+
+-- Loan issued (or inserted already returned)
+CREATE TRIGGER IF NOT EXISTS circulation_agg_transaction_insert
+AFTER INSERT ON transactions
+BEGIN
+    INSERT INTO circulation_daily (day, issues) SELECT date(NEW.issue_date), 1
+        WHERE date(NEW.issue_date) IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET issues = issues + 1;
+    INSERT INTO circulation_daily_book (day, book_id, issues) SELECT date(NEW.issue_date), NEW.book_id, 1
+        WHERE date(NEW.issue_date) IS NOT NULL
+        ON CONFLICT(day, book_id) DO UPDATE SET issues = issues + 1;
+    INSERT INTO circulation_daily_user (day, user_id, issues) SELECT date(NEW.issue_date), NEW.user_id, 1
+        WHERE date(NEW.issue_date) IS NOT NULL
+        ON CONFLICT(day, user_id) DO UPDATE SET issues = issues + 1;
+
+    INSERT INTO circulation_daily (day, returns, overdues, loan_days)
+        SELECT date(NEW.return_date), 1, COALESCE(date(NEW.return_date) > date(NEW.due_date), 0),
+               COALESCE(julianday(date(NEW.return_date)) - julianday(date(NEW.issue_date)), 0)
+        WHERE date(NEW.return_date) IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET returns = returns + 1,
+            overdues = overdues + excluded.overdues, loan_days = loan_days + excluded.loan_days;
+    INSERT INTO circulation_daily_book (day, book_id, returns, overdues)
+        SELECT date(NEW.return_date), NEW.book_id, 1, COALESCE(date(NEW.return_date) > date(NEW.due_date), 0)
+        WHERE date(NEW.return_date) IS NOT NULL
+        ON CONFLICT(day, book_id) DO UPDATE SET returns = returns + 1, overdues = overdues + excluded.overdues;
+    INSERT INTO circulation_daily_user (day, user_id, returns, overdues)
+        SELECT date(NEW.return_date), NEW.user_id, 1, COALESCE(date(NEW.return_date) > date(NEW.due_date), 0)
+        WHERE date(NEW.return_date) IS NOT NULL
+        ON CONFLICT(day, user_id) DO UPDATE SET returns = returns + 1, overdues = overdues + excluded.overdues;
+END;
+
+-- Loan deleted: withdraw its issue and return events (not when it is archived, 017)
+CREATE TRIGGER IF NOT EXISTS circulation_agg_transaction_delete
+AFTER DELETE ON transactions
+WHEN (SELECT archiving FROM transaction_archive_state WHERE id = 1) IS NOT 1
+BEGIN
+    UPDATE circulation_daily SET issues = issues - 1
+        WHERE date(OLD.issue_date) IS NOT NULL AND day = date(OLD.issue_date);
+    UPDATE circulation_daily_book SET issues = issues - 1
+        WHERE date(OLD.issue_date) IS NOT NULL AND day = date(OLD.issue_date) AND book_id = OLD.book_id;
+    UPDATE circulation_daily_user SET issues = issues - 1
+        WHERE date(OLD.issue_date) IS NOT NULL AND day = date(OLD.issue_date) AND user_id = OLD.user_id;
+
+    UPDATE circulation_daily SET returns = returns - 1,
+            overdues = overdues - COALESCE(date(OLD.return_date) > date(OLD.due_date), 0),
+            loan_days = loan_days - COALESCE(julianday(date(OLD.return_date)) - julianday(date(OLD.issue_date)), 0)
+        WHERE date(OLD.return_date) IS NOT NULL AND day = date(OLD.return_date);
+    UPDATE circulation_daily_book SET returns = returns - 1,
+            overdues = overdues - COALESCE(date(OLD.return_date) > date(OLD.due_date), 0)
+        WHERE date(OLD.return_date) IS NOT NULL AND day = date(OLD.return_date) AND book_id = OLD.book_id;
+    UPDATE circulation_daily_user SET returns = returns - 1,
+            overdues = overdues - COALESCE(date(OLD.return_date) > date(OLD.due_date), 0)
+        WHERE date(OLD.return_date) IS NOT NULL AND day = date(OLD.return_date) AND user_id = OLD.user_id;
+END;
+
+-- Issue date, borrower or book changed: move the issue event
+CREATE TRIGGER IF NOT EXISTS circulation_agg_transaction_reissue
+AFTER UPDATE OF issue_date, user_id, book_id ON transactions
+WHEN OLD.issue_date IS NOT NEW.issue_date
+  OR OLD.user_id IS NOT NEW.user_id
+  OR OLD.book_id IS NOT NEW.book_id
+BEGIN
+    UPDATE circulation_daily SET issues = issues - 1
+        WHERE date(OLD.issue_date) IS NOT NULL AND day = date(OLD.issue_date);
+    UPDATE circulation_daily_book SET issues = issues - 1
+        WHERE date(OLD.issue_date) IS NOT NULL AND day = date(OLD.issue_date) AND book_id = OLD.book_id;
+    UPDATE circulation_daily_user SET issues = issues - 1
+        WHERE date(OLD.issue_date) IS NOT NULL AND day = date(OLD.issue_date) AND user_id = OLD.user_id;
+
+    INSERT INTO circulation_daily (day, issues) SELECT date(NEW.issue_date), 1
+        WHERE date(NEW.issue_date) IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET issues = issues + 1;
+    INSERT INTO circulation_daily_book (day, book_id, issues) SELECT date(NEW.issue_date), NEW.book_id, 1
+        WHERE date(NEW.issue_date) IS NOT NULL
+        ON CONFLICT(day, book_id) DO UPDATE SET issues = issues + 1;
+    INSERT INTO circulation_daily_user (day, user_id, issues) SELECT date(NEW.issue_date), NEW.user_id, 1
+        WHERE date(NEW.issue_date) IS NOT NULL
+        ON CONFLICT(day, user_id) DO UPDATE SET issues = issues + 1;
+END;
+
+-- Loan returned (or return corrected): move the return event
+CREATE TRIGGER IF NOT EXISTS circulation_agg_transaction_return
+AFTER UPDATE OF return_date, due_date, issue_date, user_id, book_id ON transactions
+WHEN OLD.return_date IS NOT NEW.return_date
+  OR (NEW.return_date IS NOT NULL AND (
+        OLD.due_date IS NOT NEW.due_date
+     OR OLD.issue_date IS NOT NEW.issue_date
+     OR OLD.user_id IS NOT NEW.user_id
+     OR OLD.book_id IS NOT NEW.book_id))
+BEGIN
+    UPDATE circulation_daily SET returns = returns - 1,
+            overdues = overdues - COALESCE(date(OLD.return_date) > date(OLD.due_date), 0),
+            loan_days = loan_days - COALESCE(julianday(date(OLD.return_date)) - julianday(date(OLD.issue_date)), 0)
+        WHERE date(OLD.return_date) IS NOT NULL AND day = date(OLD.return_date);
+    UPDATE circulation_daily_book SET returns = returns - 1,
+            overdues = overdues - COALESCE(date(OLD.return_date) > date(OLD.due_date), 0)
+        WHERE date(OLD.return_date) IS NOT NULL AND day = date(OLD.return_date) AND book_id = OLD.book_id;
+    UPDATE circulation_daily_user SET returns = returns - 1,
+            overdues = overdues - COALESCE(date(OLD.return_date) > date(OLD.due_date), 0)
+        WHERE date(OLD.return_date) IS NOT NULL AND day = date(OLD.return_date) AND user_id = OLD.user_id;
+
+    INSERT INTO circulation_daily (day, returns, overdues, loan_days)
+        SELECT date(NEW.return_date), 1, COALESCE(date(NEW.return_date) > date(NEW.due_date), 0),
+               COALESCE(julianday(date(NEW.return_date)) - julianday(date(NEW.issue_date)), 0)
+        WHERE date(NEW.return_date) IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET returns = returns + 1,
+            overdues = overdues + excluded.overdues, loan_days = loan_days + excluded.loan_days;
+    INSERT INTO circulation_daily_book (day, book_id, returns, overdues)
+        SELECT date(NEW.return_date), NEW.book_id, 1, COALESCE(date(NEW.return_date) > date(NEW.due_date), 0)
+        WHERE date(NEW.return_date) IS NOT NULL
+        ON CONFLICT(day, book_id) DO UPDATE SET returns = returns + 1, overdues = overdues + excluded.overdues;
+    INSERT INTO circulation_daily_user (day, user_id, returns, overdues)
+        SELECT date(NEW.return_date), NEW.user_id, 1, COALESCE(date(NEW.return_date) > date(NEW.due_date), 0)
+        WHERE date(NEW.return_date) IS NOT NULL
+        ON CONFLICT(day, user_id) DO UPDATE SET returns = returns + 1, overdues = overdues + excluded.overdues;
+END;
+
+-- Hold placed
+CREATE TRIGGER IF NOT EXISTS circulation_agg_reservation_insert
+AFTER INSERT ON reservations
+WHEN date(NEW.reservation_date) IS NOT NULL
+BEGIN
+    INSERT INTO circulation_daily (day, reservations) VALUES (date(NEW.reservation_date), 1)
+        ON CONFLICT(day) DO UPDATE SET reservations = reservations + 1;
+    INSERT INTO circulation_daily_book (day, book_id, reservations) VALUES (date(NEW.reservation_date), NEW.book_id, 1)
+        ON CONFLICT(day, book_id) DO UPDATE SET reservations = reservations + 1;
+    INSERT INTO circulation_daily_user (day, user_id, reservations) VALUES (date(NEW.reservation_date), NEW.user_id, 1)
+        ON CONFLICT(day, user_id) DO UPDATE SET reservations = reservations + 1;
+END;
+
+-- Hold deleted
+CREATE TRIGGER IF NOT EXISTS circulation_agg_reservation_delete
+AFTER DELETE ON reservations
+WHEN date(OLD.reservation_date) IS NOT NULL
+BEGIN
+    UPDATE circulation_daily SET reservations = reservations - 1
+        WHERE day = date(OLD.reservation_date);
+    UPDATE circulation_daily_book SET reservations = reservations - 1
+        WHERE day = date(OLD.reservation_date) AND book_id = OLD.book_id;
+    UPDATE circulation_daily_user SET reservations = reservations - 1
+        WHERE day = date(OLD.reservation_date) AND user_id = OLD.user_id;
+END;
+
+-- Hold re-dated or moved to another borrower/title
+CREATE TRIGGER IF NOT EXISTS circulation_agg_reservation_update
+AFTER UPDATE OF reservation_date, user_id, book_id ON reservations
+WHEN OLD.reservation_date IS NOT NEW.reservation_date
+  OR OLD.user_id IS NOT NEW.user_id
+  OR OLD.book_id IS NOT NEW.book_id
+BEGIN
+    UPDATE circulation_daily SET reservations = reservations - 1
+        WHERE date(OLD.reservation_date) IS NOT NULL AND day = date(OLD.reservation_date);
+    UPDATE circulation_daily_book SET reservations = reservations - 1
+        WHERE date(OLD.reservation_date) IS NOT NULL AND day = date(OLD.reservation_date) AND book_id = OLD.book_id;
+    UPDATE circulation_daily_user SET reservations = reservations - 1
+        WHERE date(OLD.reservation_date) IS NOT NULL AND day = date(OLD.reservation_date) AND user_id = OLD.user_id;
+
+    INSERT INTO circulation_daily (day, reservations) SELECT date(NEW.reservation_date), 1
+        WHERE date(NEW.reservation_date) IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET reservations = reservations + 1;
+    INSERT INTO circulation_daily_book (day, book_id, reservations) SELECT date(NEW.reservation_date), NEW.book_id, 1
+        WHERE date(NEW.reservation_date) IS NOT NULL
+        ON CONFLICT(day, book_id) DO UPDATE SET reservations = reservations + 1;
+    INSERT INTO circulation_daily_user (day, user_id, reservations) SELECT date(NEW.reservation_date), NEW.user_id, 1
+        WHERE date(NEW.reservation_date) IS NOT NULL
+        ON CONFLICT(day, user_id) DO UPDATE SET reservations = reservations + 1;
+END;
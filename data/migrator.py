@@ -0,0 +1,332 @@
+"""
+Schema migration engine.
+
+The schema version lives in ``PRAGMA user_version``, so a warm start costs
+one pragma read and an integer comparison against ``SCHEMA_VERSION``. Only
+when the database is behind are ``data/migrations`` scanned and the pending
+migrations applied, each in its own ``BEGIN IMMEDIATE`` transaction together
+with the version bump, so a failed migration leaves the database at the
+previous version.
+
+Migrations are numbered files in ``data/migrations``:
+
+* ``NNN_name.sql`` -- a SQL script. Top-level ``BEGIN``/``COMMIT`` and
+  ``PRAGMA foreign_keys`` statements are ignored; the engine owns the
+  transaction and disables foreign keys around it.
+* ``NNN_name.py`` -- a module with ``upgrade(conn)``. It runs inside the
+  transaction and must not commit (or call ``executescript``, which does).
+  An optional ``after_commit(conn)`` runs once the migration has committed,
+  for statements that cannot run in a transaction (``VACUUM``); it is not
+  retried if it fails, so it must be safe to leave undone.
+
+Each applied migration is recorded with its duration in ``schema_migrations``.
+Databases created before ``user_version`` was used are adopted: one that
+has a ``users`` table already has ``LEGACY_BASELINE`` (the schema
+``database.create_tables`` builds), plus whatever its ``schema_migrations``
+rows record (matched by name).
+
+Nothing else changes the schema: code that reads a migration's tables calls
+``require()`` with its number, which raises ``SchemaVersionError`` on an
+older database instead of creating them on the spot.
+
+Usage::
+
+    python -m data.migrator --db intelli_libraria.db [--status]
+"""
+import importlib.util
+import logging
+import os
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+
+# Highest migration number in MIGRATIONS_DIR; bump it with every new migration
+SCHEMA_VERSION = 25
+
+# Databases with a users table but no user_version already have what 001-005 create
+LEGACY_BASELINE = 5
+
+_FILE_PATTERN = re.compile(r'^(\d+)_(\w+)\.(sql|py)$')
+_COMMENTS = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+_SKIPPED_STATEMENT = re.compile(
+    r'^(BEGIN(\s+(DEFERRED|IMMEDIATE|EXCLUSIVE))?(\s+TRANSACTION)?|(COMMIT|END)(\s+TRANSACTION)?'
+    r'|PRAGMA\s+foreign_keys\s*=\s*\w+)\s*;?$',
+    re.IGNORECASE
+)
+
+
+class MigrationError(Exception):
+    """A migration failed; the database stays at the version before it."""
+
+
+class SchemaVersionError(MigrationError):
+    """The database is older than the code reading it; its migrations have not run."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    path: str
+
+    @property
+    def kind(self) -> str:
+        return 'py' if self.path.endswith('.py') else 'sql'
+
+
+@dataclass(frozen=True)
+class AppliedMigration:
+    version: int
+    name: str
+    seconds: float
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def is_current(conn: sqlite3.Connection, target: int = SCHEMA_VERSION) -> bool:
+    """The warm-start check: True when no migration is pending."""
+    return current_version(conn) >= target
+
+
+def require(conn: sqlite3.Connection, version: int, feature: str):
+    """
+    Check that migration ``version`` has been applied before ``feature`` uses its tables.
+
+    Features never create their tables themselves: the schema only changes
+    through ``migrate()``, which the application runs at start-up.
+
+    Raises:
+        SchemaVersionError: If the database is at an older version
+    """
+    current = current_version(conn)
+    if current < version:
+        raise SchemaVersionError(
+            f"{feature} needs schema version {version} but the database is at {current}; "
+            f"run python -m data.migrator"
+        )
+
+
+def discover(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    """All migrations in ``directory``, in version order."""
+    migrations = {}
+    for entry in os.scandir(directory):
+        match = _FILE_PATTERN.match(entry.name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationError(f"Duplicate migration number {version}: "
+                                 f"{migrations[version].name} and {entry.name}")
+        migrations[version] = Migration(version, entry.name, entry.path)
+    return [migrations[v] for v in sorted(migrations)]
+
+
+def split_statements(script: str) -> Iterator[str]:
+    """Split a SQL script into complete statements (trigger bodies stay whole)."""
+    buffer = ''
+    for piece in script.split(';'):
+        buffer += piece + ';'
+        if sqlite3.complete_statement(buffer):
+            statement = buffer.strip()
+            buffer = ''
+            if _COMMENTS.sub('', statement).strip(' \t\r\n;'):
+                yield statement
+    if _COMMENTS.sub('', buffer).strip(' \t\r\n;'):
+        raise MigrationError(f"Incomplete SQL statement at end of script: {buffer.strip()[:80]}")
+
+
+def _run_sql(conn: sqlite3.Connection, path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        script = f.read()
+    for statement in split_statements(script):
+        if _SKIPPED_STATEMENT.match(_COMMENTS.sub('', statement).strip()):
+            continue
+        conn.execute(statement)
+
+
+def _run_python(conn: sqlite3.Connection, migration: Migration):
+    spec = importlib.util.spec_from_file_location(f"_migration_{migration.version:03d}", migration.path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    upgrade = getattr(module, 'upgrade', None)
+    if upgrade is None:
+        raise MigrationError(f"{migration.name} has no upgrade(conn) function")
+    upgrade(conn)
+    return getattr(module, 'after_commit', None)
+
+
+def _ensure_history_table(conn: sqlite3.Connection):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            duration_ms REAL
+        )
+        """
+    )
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(schema_migrations)")}
+    if 'duration_ms' not in columns:
+        conn.execute("ALTER TABLE schema_migrations ADD COLUMN duration_ms REAL")
+
+
+def _stem(name: str) -> str:
+    match = _FILE_PATTERN.match(name)
+    return match.group(2) if match else name
+
+
+def _adopted(conn: sqlite3.Connection, migrations: List[Migration]) -> Set[int]:
+    """Migrations a database without ``user_version`` already has."""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    adopted = set()
+    if 'users' in tables:
+        # create_tables (or the old runner) already built the schema; never replay the
+        # baseline, whose sample data would collide with the rows the database holds
+        adopted.update(range(1, LEGACY_BASELINE + 1))
+    if 'schema_migrations' in tables:
+        # Matched by name: migrations were renumbered when the engine replaced the old runner
+        recorded = {_stem(row[0]) for row in conn.execute("SELECT name FROM schema_migrations")}
+        adopted.update(m.version for m in migrations if _stem(m.name) in recorded)
+    return adopted
+
+
+def _apply(conn: sqlite3.Connection, migration: Migration) -> Optional[AppliedMigration]:
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        # Another process may have migrated while we waited for the lock
+        if current_version(conn) >= migration.version:
+            conn.execute('ROLLBACK')
+            return None
+        started = time.perf_counter()
+        after_commit = None
+        if migration.kind == 'sql':
+            _run_sql(conn, migration.path)
+        else:
+            after_commit = _run_python(conn, migration)
+        seconds = time.perf_counter() - started
+        violations = conn.execute('PRAGMA foreign_key_check').fetchall()
+        if violations:
+            logger.warning(f"{migration.name}: {len(violations)} foreign key violations")
+        _ensure_history_table(conn)
+        conn.execute(
+            "INSERT OR REPLACE INTO schema_migrations (id, name, duration_ms) VALUES (?, ?, ?)",
+            (migration.version, migration.name, seconds * 1000)
+        )
+        conn.execute(f'PRAGMA user_version = {int(migration.version)}')
+        conn.execute('COMMIT')
+    except Exception as e:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise MigrationError(f"Migration {migration.name} failed: {e}") from e
+    if after_commit is not None:
+        try:
+            after_commit(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"{migration.name}: after_commit failed: {e}")
+        seconds = time.perf_counter() - started
+    return AppliedMigration(migration.version, migration.name, seconds)
+
+
+def migrate(conn: sqlite3.Connection, target: int = SCHEMA_VERSION,
+            directory: str = MIGRATIONS_DIR) -> List[AppliedMigration]:
+    """
+    Bring the database up to ``target``.
+
+    Args:
+        conn: An open read-write connection (any pending transaction is committed)
+        target: Version to migrate to
+        directory: Where the migration files live
+
+    Returns:
+        The migrations applied by this call with their durations (empty on a warm start)
+
+    Raises:
+        MigrationError: If a migration fails; earlier ones stay applied
+    """
+    if is_current(conn, target):
+        return []
+    if conn.in_transaction:
+        conn.commit()
+
+    version = current_version(conn)
+    migrations = discover(directory)
+    already_applied = _adopted(conn, migrations) if version == 0 else set()
+    foreign_keys = conn.execute('PRAGMA foreign_keys').fetchone()[0]
+    conn.execute('PRAGMA foreign_keys = OFF')
+    applied = []
+    try:
+        for migration in migrations:
+            if migration.version <= version or migration.version > target:
+                continue
+            if migration.version in already_applied:
+                conn.execute(f'PRAGMA user_version = {int(migration.version)}')
+                continue
+            result = _apply(conn, migration)
+            if result is not None:
+                logger.info(f"Applied {result.name} in {result.seconds * 1000:.1f}ms")
+                applied.append(result)
+    finally:
+        conn.execute(f'PRAGMA foreign_keys = {int(foreign_keys)}')
+    return applied
+
+
+def history(conn: sqlite3.Connection) -> List[tuple]:
+    """``(id, name, applied_at, duration_ms)`` rows of applied migrations."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(schema_migrations)")}
+    if not columns:
+        return []
+    duration = 'duration_ms' if 'duration_ms' in columns else 'NULL'
+    return conn.execute(
+        f"SELECT id, name, applied_at, {duration} FROM schema_migrations ORDER BY id"
+    ).fetchall()
+
+
+def migrate_path(db_path: str, target: int = SCHEMA_VERSION) -> List[AppliedMigration]:
+    """Open ``db_path``, migrate it and close it again."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return migrate(conn, target)
+    finally:
+        conn.close()
+
+
+def pending(conn: sqlite3.Connection, directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    """Migrations newer than the database's version."""
+    version = current_version(conn)
+    return [m for m in discover(directory) if m.version > version]
+
+
+if __name__ == "__main__":
+    import argparse
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description='Apply pending schema migrations')
+    parser.add_argument('--db', help='Database path (defaults to the application database)')
+    parser.add_argument('--status', action='store_true', help='Show versions and timings only')
+    args = parser.parse_args()
+
+    db_path = args.db
+    if db_path is None:
+        db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'intelli_libraria.db')
+    conn = sqlite3.connect(db_path)
+    try:
+        if not args.status:
+            for result in migrate(conn):
+                print(f"applied {result.name:45s} {result.seconds * 1000:9.1f}ms")
+        print(f"schema version {current_version(conn)} (latest {SCHEMA_VERSION})")
+        for version, name, applied_at, duration_ms in history(conn):
+            timing = f"{duration_ms:9.1f}ms" if duration_ms is not None else ' ' * 11
+            print(f"  {version:03d} {name:45s} {timing}  {applied_at}")
+        for migration in pending(conn):
+            print(f"  {migration.version:03d} {migration.name:45s}  pending")
+    finally:
+        conn.close()
@@ -0,0 +1,153 @@
+"""
+Read-only snapshot connections for reports and dashboards.
+
+Analytical reads (activity, inventory, overdue and borrowed-books reports)
+open the database with a ``mode=ro`` URI and ``PRAGMA query_only`` so they can
+never take the write lock, and they read inside explicit snapshot boundaries
+so a long report holds its WAL read mark only for as long as it needs it.
+Reports are executed on a dedicated worker thread via ``ReportExecutor`` so
+circulation writes on the GUI thread are never queued behind them.
+"""
+import os
+import sqlite3
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+def _default_db_path() -> str:
+    # Imported lazily: importing data.database runs the migration check.
+    from data.database import DB_PATH
+    return DB_PATH
+
+
+def readonly_uri(db_path: str) -> str:
+    """Build a ``file:`` URI that opens ``db_path`` in read-only mode."""
+    return Path(os.path.abspath(db_path)).as_uri() + '?mode=ro'
+
+
+class ReadOnlyDatabase:
+    """
+    Read-only connection to the library database.
+
+    The connection is opened lazily, is owned by the thread that first uses it
+    and refuses every statement that would modify the database. Use
+    ``snapshot()`` to group several queries into one consistent read
+    transaction; queries run outside a snapshot use autocommit reads.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, busy_timeout_ms: int = 5000):
+        self.db_path = db_path or _default_db_path()
+        self.busy_timeout_ms = busy_timeout_ms
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            readonly_uri(self.db_path),
+            uri=True,
+            isolation_level=None,  # snapshot boundaries are explicit
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA query_only = ON')
+        conn.execute(f'PRAGMA busy_timeout = {int(self.busy_timeout_ms)}')
+        return conn
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The underlying read-only connection (opened on first use)."""
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    @contextmanager
+    def snapshot(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run the enclosed queries against a single consistent snapshot.
+
+        The read transaction is started eagerly so every query inside the block
+        sees the same database state, and it is always ended on exit so the
+        WAL read mark is released and checkpoints can make progress.
+        """
+        conn = self.connection
+        conn.execute('BEGIN')
+        try:
+            # A deferred BEGIN only pins the snapshot at the first read.
+            conn.execute('SELECT 1 FROM sqlite_master LIMIT 1').fetchall()
+            yield conn
+        finally:
+            conn.execute('COMMIT')
+
+    def query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+        """Execute a read query and return the rows as dictionaries."""
+        cursor = self.connection.execute(sql, params)
+        return [dict(row) for row in cursor.fetchall()]
+
+    def data_version(self) -> int:
+        """Return ``PRAGMA data_version`` (changes when another connection commits)."""
+        return self.connection.execute('PRAGMA data_version').fetchone()[0]
+
+    def close(self):
+        """Close the underlying connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> 'ReadOnlyDatabase':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ReportExecutor:
+    """
+    Runs report callables on a dedicated worker thread.
+
+    Each submitted callable receives the worker's ``ReadOnlyDatabase``; the
+    call is wrapped in a snapshot so a report sees one consistent view of the
+    data. The connection is created on the worker thread and reused for every
+    report, so reports never share a connection with circulation writes.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or _default_db_path()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='reports')
+        self._readonly: Optional[ReadOnlyDatabase] = None
+
+    def _run(self, func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        if self._readonly is None:
+            self._readonly = ReadOnlyDatabase(self.db_path)
+        with self._readonly.snapshot():
+            return func(self._readonly, *args, **kwargs)
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Schedule ``func(readonly_db, *args, **kwargs)`` on the report thread.
+
+        Returns:
+            A Future resolving to the callable's return value
+        """
+        return self._executor.submit(self._run, func, args, kwargs)
+
+    def submit_query(self, sql: str, params: Tuple[Any, ...] = ()) -> Future:
+        """Schedule a single read query; the Future resolves to a list of dicts."""
+        return self.submit(lambda ro: ro.query(sql, params))
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker thread and close its connection."""
+        if wait and self._readonly is not None:
+            self._executor.submit(self._readonly.close)
+        self._executor.shutdown(wait=wait)
+
+
+_executors: Dict[str, ReportExecutor] = {}
+
+
+def get_report_executor(db_path: Optional[str] = None) -> ReportExecutor:
+    """Return the shared report executor for ``db_path`` (one worker per database)."""
+    key = os.path.abspath(db_path or _default_db_path())
+    if key not in _executors:
+        _executors[key] = ReportExecutor(key)
+    return _executors[key]
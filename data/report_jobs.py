@@ -0,0 +1,320 @@
+"""
+Asynchronous report jobs with progress, cancellation and a result cache.
+
+``ReportJobs.submit`` runs a report from ``REPORTS`` on the read-only report
+thread (``data.readonly.ReportExecutor``) and returns a ``ReportJob`` at once:
+
+* Rows are fetched in chunks; after each chunk ``on_progress(job)`` is called
+  with ``job.rows`` and, when the report has run before, ``job.expected`` (the
+  previous row count), so pages can show a determinate progress bar.
+* ``job.cancel()`` drops a queued job, or aborts a running one from the
+  SQLite progress handler between VM steps and chunks.
+* Results are cached by report type, parameters and ``PRAGMA data_version``.
+  The version is read before the job's snapshot starts, so an entry is never
+  newer than its key says. Reports in ``DATED_REPORTS`` compare against
+  ``date('now')``, which moves at midnight without a new data version, so
+  their key also carries the day. A report whose data has not changed since it last
+  ran completes inside ``submit`` without reaching the worker.
+* Entries are charged their estimated size against ``budget_bytes``. When a
+  new result does not fit, entries for older data versions go first, then
+  the least recently used.
+
+``on_progress`` and ``on_done`` are called on the report thread (on the
+calling thread for cache hits); Qt pages forward them through a signal.
+"""
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from data.aggregates import USER_ACTIVITY_SQL
+from data.readonly import ReadOnlyDatabase, ReportExecutor, get_report_executor
+
+# Report type -> (SQL with named parameters, default parameters)
+REPORTS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    'Inventory Status': ("""
+        SELECT title, author, isbn, available, COUNT(*) as total
+        FROM books
+        GROUP BY isbn
+        ORDER BY title
+    """, {}),
+    'Borrowed Books': ("""
+        SELECT b.title, u.full_name as borrower, t.issue_date, t.due_date, t.status
+        FROM transactions t
+        JOIN books b ON t.book_id = b.id
+        JOIN users u ON t.user_id = u.id
+        WHERE t.status IN ('Borrowed', 'Overdue')
+        ORDER BY t.due_date
+    """, {}),
+    'Overdue Books': ("""
+        SELECT b.title, u.full_name as borrower, t.issue_date, t.due_date, t.status
+        FROM transactions t
+        JOIN books b ON t.book_id = b.id
+        JOIN users u ON t.user_id = u.id
+        WHERE t.return_date IS NULL AND t.due_date < date('now')
+        ORDER BY t.due_date
+    """, {}),
+    'User Activity': (USER_ACTIVITY_SQL, {'days': 30}),
+}
+# Reports whose rows depend on the current date
+DATED_REPORTS = frozenset({'Overdue Books', 'User Activity'})
+
+DEFAULT_BUDGET_BYTES = 64 * 1024 * 1024
+CHUNK_ROWS = 500
+# SQLite VM instructions between cancellation checks while a statement runs
+PROGRESS_OPCODES = 20000
+# Rows measured to estimate the size of a result
+SIZE_SAMPLE_ROWS = 200
+
+
+class ReportCancelled(Exception):
+    """The job was cancelled before it finished."""
+
+
+@dataclass
+class ReportResult:
+    """The rows of one report run; ``version`` is the data version they reflect."""
+    report: str
+    params: Tuple[Tuple[str, Any], ...]
+    columns: List[str]
+    rows: List[Dict[str, Any]]
+    version: int
+    seconds: float
+    nbytes: int = 0
+
+
+def estimate_bytes(rows: List[Dict[str, Any]]) -> int:
+    """Approximate memory held by ``rows``, measured on an evenly spread sample."""
+    if not rows:
+        return 0
+    step = max(1, len(rows) // SIZE_SAMPLE_ROWS)
+    sample = rows[::step]
+    measured = sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values())
+                   for row in sample)
+    return sys.getsizeof(rows) + measured * len(rows) // len(sample)
+
+
+class ResultCache:
+    """Report results by (report, params, data_version) under a memory budget."""
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.nbytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evicted': 0}
+        self._entries: 'OrderedDict[Tuple[str, tuple, int], ReportResult]' = OrderedDict()
+        # (report, params) -> row count of the last run, kept after its entry goes
+        self._row_counts: Dict[Tuple[str, tuple], int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, report: str, params: tuple, version: int) -> Optional[ReportResult]:
+        with self._lock:
+            result = self._entries.get((report, params, version))
+            if result is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end((report, params, version))
+            self.stats['hits'] += 1
+            return result
+
+    def expected_rows(self, report: str, params: tuple) -> Optional[int]:
+        with self._lock:
+            return self._row_counts.get((report, params))
+
+    def put(self, result: ReportResult, current_version: int):
+        """Cache ``result``, evicting stale then least recently used entries to fit."""
+        with self._lock:
+            self._row_counts[(result.report, result.params)] = len(result.rows)
+            # Versions only move forward: an older run of the same report can never hit again
+            for key in [key for key in self._entries if key[:2] == (result.report, result.params)]:
+                self._drop(key)
+            if result.nbytes > self.budget_bytes:
+                return
+            stale = [key for key in self._entries if key[2] != current_version]
+            for key in stale + list(self._entries):
+                if self.nbytes + result.nbytes <= self.budget_bytes:
+                    break
+                if key in self._entries:
+                    self._drop(key)
+                    self.stats['evicted'] += 1
+            self._entries[(result.report, result.params, result.version)] = result
+            self.nbytes += result.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: Tuple[str, tuple, int]):
+        self.nbytes -= self._entries.pop(key).nbytes
+
+
+@dataclass(eq=False)
+class ReportJob:
+    """
+    One run of a report. ``status`` moves from 'queued' to 'running' and ends
+    as 'done', 'cancelled' or 'failed'; ``cached`` is True if the result came
+    from the cache.
+    """
+    report: str
+    params: Dict[str, Any]
+    status: str = 'queued'
+    rows: int = 0
+    expected: Optional[int] = None
+    cached: bool = False
+    result: Optional[ReportResult] = None
+    error: Optional[BaseException] = None
+    _cancelled: bool = field(default=False, repr=False)
+    _done: Future = field(default_factory=Future, repr=False)
+    _queued: Optional[Future] = field(default=None, repr=False)
+    _on_done: Optional[Callable[['ReportJob'], None]] = field(default=None, repr=False)
+
+    @property
+    def progress(self) -> Optional[float]:
+        """Fraction of the expected rows fetched, if the report has run before."""
+        if self.status == 'done':
+            return 1.0
+        if not self.expected:
+            return None
+        return min(self.rows / self.expected, 0.99)
+
+    @property
+    def finished(self) -> bool:
+        return self._done.done()
+
+    def cancel(self) -> bool:
+        """Stop the job; returns False if it had already finished."""
+        if self.finished:
+            return False
+        self._cancelled = True
+        if self._queued is not None and self._queued.cancel():
+            # Never reached the report thread
+            self._finish('cancelled', error=ReportCancelled())
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> 'ReportJob':
+        """Block until the job has finished (for scripts and tests)."""
+        self._done.result(timeout)
+        return self
+
+    def _finish(self, status: str, result: Optional[ReportResult] = None,
+                error: Optional[BaseException] = None):
+        self.status = status
+        self.result = result
+        self.error = error
+        if self._done.set_running_or_notify_cancel():
+            self._done.set_result(self)
+        if self._on_done is not None:
+            self._on_done(self)
+
+
+class ReportJobs:
+    """
+    Runs ``REPORTS`` on the report thread, with a shared result cache.
+
+    Args:
+        db_path: Database to report on (defaults to the application database)
+        budget_bytes: Memory budget of the result cache
+        executor: Report thread to use (the shared one for ``db_path`` if None)
+    """
+
+    def __init__(self, db_path: Optional[str] = None, budget_bytes: int = DEFAULT_BUDGET_BYTES,
+                 executor: Optional[ReportExecutor] = None):
+        self._executor = executor or get_report_executor(db_path)
+        self.cache = ResultCache(budget_bytes)
+        # data_version values only compare within one connection, so every
+        # version (lookup and tag) is read through this one
+        self._versions = ReadOnlyDatabase(self._executor.db_path)
+        self._versions_lock = threading.Lock()
+
+    def data_version(self) -> int:
+        with self._versions_lock:
+            return self._versions.data_version()
+
+    def submit(self, report: str, params: Optional[Dict[str, Any]] = None,
+               on_progress: Optional[Callable[[ReportJob], None]] = None,
+               on_done: Optional[Callable[[ReportJob], None]] = None) -> ReportJob:
+        """
+        Start ``report`` with ``params`` (merged over its defaults).
+
+        Returns:
+            The job; already finished if the cache had the result
+        """
+        if report not in REPORTS:
+            raise ValueError(f"Unknown report: {report}")
+        merged = {**REPORTS[report][1], **(params or {})}
+        key = tuple(sorted(merged.items()))
+        if report in DATED_REPORTS:
+            key += (('as_of', date.today().isoformat()),)
+        job = ReportJob(report, merged, _on_done=on_done)
+        version = self.data_version()
+        cached = self.cache.get(report, key, version)
+        if cached is not None:
+            job.cached = True
+            job.rows = len(cached.rows)
+            job._finish('done', result=cached)
+            return job
+        job.expected = self.cache.expected_rows(report, key)
+        job._queued = self._executor.submit(self._run, job, key, version, on_progress)
+        return job
+
+    def close(self):
+        self._versions.close()
+
+    def _run(self, readonly: ReadOnlyDatabase, job: ReportJob, key: tuple, version: int,
+             on_progress: Optional[Callable[[ReportJob], None]]):
+        """Fetch the report in chunks on the report thread (inside its snapshot)."""
+        if job._cancelled:
+            job._finish('cancelled', error=ReportCancelled())
+            return
+        job.status = 'running'
+        started = time.perf_counter()
+        conn = readonly.connection
+        conn.set_progress_handler(lambda: 1 if job._cancelled else 0, PROGRESS_OPCODES)
+        try:
+            cursor = conn.execute(REPORTS[job.report][0], job.params)
+            columns = [description[0] for description in cursor.description]
+            rows: List[Dict[str, Any]] = []
+            while True:
+                chunk = cursor.fetchmany(CHUNK_ROWS)
+                if not chunk:
+                    break
+                rows.extend(dict(row) for row in chunk)
+                job.rows = len(rows)
+                if job._cancelled:
+                    raise ReportCancelled()
+                if on_progress is not None:
+                    on_progress(job)
+        except (sqlite3.OperationalError, ReportCancelled) as e:
+            if not job._cancelled:
+                job._finish('failed', error=e)
+                return
+            job._finish('cancelled', error=ReportCancelled())
+            return
+        except Exception as e:
+            job._finish('failed', error=e)
+            return
+        finally:
+            conn.set_progress_handler(None, 0)
+        result = ReportResult(job.report, key, columns, rows, version,
+                              time.perf_counter() - started, estimate_bytes(rows))
+        self.cache.put(result, version)
+        job._finish('done', result=result)
+
+
+_jobs: Dict[str, ReportJobs] = {}
+
+
+def get_report_jobs(db_path: Optional[str] = None) -> ReportJobs:
+    """Return the shared report job manager for ``db_path`` (one cache per database)."""
+    executor = get_report_executor(db_path)
+    if executor.db_path not in _jobs:
+        _jobs[executor.db_path] = ReportJobs(executor=executor)
+    return _jobs[executor.db_path]
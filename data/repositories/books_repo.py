@@ -18,6 +18,7 @@ class BookRepository(BaseRepository[Book]):
     
     table_name = 'books'
     model_class = Book
+    cache_entity = 'book'
     columns = [
         'book_code', 'title', 'authors', 'isbn', 
         'quantity_total', 'quantity_available', 'branch'
@@ -118,8 +119,7 @@ class BookRepository(BaseRepository[Book]):
             WHERE isbn = ?
         """
         
-        row = self._execute_query(query, (isbn,), fetch_one=True)
-        return self._row_to_model(row) if row else None
+        return self._cached('isbn', isbn, query, (isbn,))
     
     def get_by_code(self, book_code: str) -> Optional[Book]:
         """
@@ -136,8 +136,7 @@ class BookRepository(BaseRepository[Book]):
             WHERE book_code = ?
         """
         
-        row = self._execute_query(query, (book_code,), fetch_one=True)
-        return self._row_to_model(row) if row else None
+        return self._cached('book_code', book_code, query, (book_code,))
     
     def get_available_books(self) -> List[Book]:
         """
@@ -16,6 +16,7 @@ from ..errors import (
     ValidationError
 )
 from ..validators import validate
+from .. import archive, eligibility
 from ..database import get_db
 from .base_repository import BaseRepository
 
@@ -33,6 +34,16 @@ class TransactionRepository(BaseRepository[Transaction]):
     
     # Default lending period in days
     DEFAULT_LENDING_DAYS = 14
+
+    # data.eligibility check -> business rule reported when it fails
+    ELIGIBILITY_RULES = {
+        'user_active': 'user_inactive',
+        'held_by_branch': 'book_unavailable',
+        'book_available': 'book_unavailable',
+        'loan_limit': 'loan_limit',
+        'title_limit': 'duplicate_loan',
+        'fine_limit': 'fines_outstanding',
+    }
     
     def __init__(self):
         super().__init__()
@@ -75,12 +86,10 @@ class TransactionRepository(BaseRepository[Transaction]):
             The created Transaction instance
             
         Raises:
-            BusinessRuleError: If the book is not available or user has reached borrowing limit
+            BusinessRuleError: If a borrowing rule is not met (the book is not available,
+                the user is inactive or has reached a limit)
             NotFoundError: If the book or user is not found
         """
-        from .books_repo import BookRepository
-        from .users_repo import UserRepository
-        
         # Set default dates if not provided
         if issue_date is None:
             issue_date = date.today()
@@ -99,41 +108,14 @@ class TransactionRepository(BaseRepository[Transaction]):
             try:
                 cursor = conn.cursor()
                 
-                # Check if book exists and is available
-                book_repo = BookRepository()
-                book = book_repo.get_by_id(book_id)
-                if not book:
+                # Every borrowing rule in one query (see data.eligibility)
+                verdict = eligibility.check(conn, user_id, book_id)
+                if not verdict.checks['book_found']:
                     raise NotFoundError('Book', id=book_id)
-                    
-                if book.quantity_available <= 0:
-                    raise BusinessRuleError(
-                        'book_unavailable',
-                        f"Book {book_id} is not available for borrowing"
-                    )
-                
-                # Check if user exists and can borrow
-                user_repo = UserRepository()
-                user = user_repo.get_by_id(user_id)
-                if not user:
+                if not verdict.checks['user_found']:
                     raise NotFoundError('User', id=user_id)
-                    
-                if user.status != 'Active':
-                    raise BusinessRuleError(
-                        'user_inactive',
-                        f"User {user_id} is not active and cannot borrow books"
-                    )
-                
-                # Check if user already has this book checked out
-                existing_loan_query = """
-                    SELECT id FROM transactions
-                    WHERE book_id = ? AND user_id = ? AND status = 'Issued'
-                """
-                cursor.execute(existing_loan_query, (book_id, user_id))
-                if cursor.fetchone():
-                    raise BusinessRuleError(
-                        'duplicate_loan',
-                        f"User {user_id} already has this book checked out"
-                    )
+                if not verdict.eligible:
+                    raise BusinessRuleError(self.ELIGIBILITY_RULES[verdict.failed[0]], verdict.message)
                 
                 # Create the transaction
                 transaction = Transaction(
@@ -296,7 +278,8 @@ class TransactionRepository(BaseRepository[Transaction]):
         include_past: bool = True
     ) -> List[Transaction]:
         """
-        Get all transactions for a specific user.
+        Get all transactions for a specific user, archived ones included
+        when past transactions are.
         
         Args:
             user_id: The ID of the user
@@ -306,11 +289,11 @@ class TransactionRepository(BaseRepository[Transaction]):
         Returns:
             List of transactions for the user
         """
-        query = f"""
+        query = """
             SELECT t.*, 
                    b.title as book_title,
                    u.full_name as user_name
-            FROM {self.table_name} t
+            FROM {loans} t
             JOIN books b ON t.book_id = b.id
             JOIN users u ON t.user_id = u.id
             WHERE t.user_id = ?
@@ -330,7 +313,9 @@ class TransactionRepository(BaseRepository[Transaction]):
         
         query += " ORDER BY t.due_date"
         
-        rows = self._execute_query(query, tuple(params))
+        with get_db() as conn:
+            loans = archive.loan_source(conn, None if include_past else date.today())
+            rows = [dict(row) for row in conn.execute(query.format(loans=loans), tuple(params))]
         return [self._row_to_model(row) for row in rows]
     
     def get_book_transactions(
@@ -339,7 +324,7 @@ class TransactionRepository(BaseRepository[Transaction]):
         limit: int = 10
     ) -> List[Transaction]:
         """
-        Get transaction history for a specific book.
+        Get transaction history for a specific book, archived loans included.
         
         Args:
             book_id: The ID of the book
@@ -348,19 +333,21 @@ class TransactionRepository(BaseRepository[Transaction]):
         Returns:
             List of transactions for the book
         """
-        query = f"""
-            SELECT t.*, 
-                   b.title as book_title,
-                   u.full_name as user_name
-            FROM {self.table_name} t
-            JOIN books b ON t.book_id = b.id
-            JOIN users u ON t.user_id = u.id
-            WHERE t.book_id = ?
-            ORDER BY t.issue_date DESC
-            LIMIT ?
-        """
-        
-        rows = self._execute_query(query, (book_id, limit))
+        with get_db() as conn:
+            rows = [dict(row) for row in conn.execute(
+                f"""
+                SELECT t.*, 
+                       b.title as book_title,
+                       u.full_name as user_name
+                FROM {archive.loan_source(conn)} t
+                JOIN books b ON t.book_id = b.id
+                JOIN users u ON t.user_id = u.id
+                WHERE t.book_id = ?
+                ORDER BY t.issue_date DESC
+                LIMIT ?
+                """,
+                (book_id, limit)
+            )]
         return [self._row_to_model(row) for row in rows]
     
     def get_active_loans_count(self, user_id: int) -> int:
@@ -390,6 +377,14 @@ class TransactionRepository(BaseRepository[Transaction]):
         """
         Get borrowing statistics for the given date range.
         
+        The period totals count circulation events inside the window:
+        ``total_loans`` loans issued, ``returns_in_period`` loans returned and
+        ``late_returns`` those returned after their due date (whenever they
+        were issued). Rates are taken within one group: ``late_return_rate``
+        and ``avg_loan_days`` are over the returns in the window.
+        ``currently_overdue`` counts loans issued in the window that are still
+        out past their due date.
+        
         Args:
             start_date: Start date of the period (defaults to 30 days ago)
             end_date: End date of the period (defaults to today)
@@ -403,30 +398,40 @@ class TransactionRepository(BaseRepository[Transaction]):
         if start_date is None:
             start_date = end_date - timedelta(days=30)
         
-        query = """
+        # Period totals come from the daily aggregates (see data/aggregates.py);
+        # only the still-open loans are read from transactions, via the due_date index.
+        totals_query = """
             SELECT 
-                COUNT(*) as total_loans,
-                SUM(CASE WHEN status = 'Returned' THEN 1 ELSE 0 END) as returned_loans,
-                SUM(CASE WHEN status = 'Overdue' THEN 1 ELSE 0 END) as overdue_loans,
-                SUM(CASE WHEN status = 'Issued' AND due_date < ? THEN 1 ELSE 0 END) as currently_overdue,
-                AVG(julianday(return_date) - julianday(issue_date)) as avg_loan_days
+                COALESCE(SUM(issues), 0) as total_loans,
+                COALESCE(SUM(returns), 0) as returns_in_period,
+                COALESCE(SUM(overdues), 0) as late_returns,
+                SUM(loan_days) / NULLIF(SUM(returns), 0) as avg_loan_days
+            FROM circulation_daily
+            WHERE day BETWEEN ? AND ?
+        """
+        
+        currently_overdue_query = """
+            SELECT COUNT(*) as currently_overdue
             FROM transactions
-            WHERE issue_date BETWEEN ? AND ?
+            WHERE status = 'Issued' AND due_date < ?
+              AND issue_date BETWEEN ? AND ?
         """
         
         with get_db() as conn:
             cursor = conn.cursor()
+            cursor.execute(totals_query, (start_date.isoformat(), end_date.isoformat()))
+            stats = dict(cursor.fetchone())
             cursor.execute(
-                query, 
+                currently_overdue_query, 
                 (end_date.isoformat(), start_date.isoformat(), end_date.isoformat())
             )
-            stats = dict(cursor.fetchone())
+            stats['currently_overdue'] = cursor.fetchone()['currently_overdue']
             
-            # Calculate return rate (percentage of returned loans)
-            if stats['total_loans'] > 0:
-                stats['return_rate'] = (stats['returned_loans'] / stats['total_loans']) * 100
+            # Share of the window's returns that came back late
+            if stats['returns_in_period'] > 0:
+                stats['late_return_rate'] = (stats['late_returns'] / stats['returns_in_period']) * 100
             else:
-                stats['return_rate'] = 0
+                stats['late_return_rate'] = 0
                 
             # Convert average loan days to float (it comes as a string from SQLite)
             if stats['avg_loan_days'] is not None:
@@ -25,6 +25,7 @@ class UserRepository(BaseRepository[User]):
     
     table_name = 'users'
     model_class = User
+    cache_entity = 'user'
     columns = [
         'user_code', 'full_name', 'email', 'phone',
         'role', 'status'
@@ -140,8 +141,7 @@ class UserRepository(BaseRepository[User]):
             WHERE LOWER(email) = LOWER(?)
         """
         
-        row = self._execute_query(query, (email,), fetch_one=True)
-        return self._row_to_model(row) if row else None
+        return self._cached('email', email.lower(), query, (email,))
     
     def get_by_phone(self, phone: str) -> Optional[User]:
         """
@@ -179,8 +179,7 @@ class UserRepository(BaseRepository[User]):
             WHERE user_code = ?
         """
         
-        row = self._execute_query(query, (user_code,), fetch_one=True)
-        return self._row_to_model(row) if row else None
+        return self._cached('user_code', user_code, query, (user_code,))
     
     def generate_user_code(self, full_name: str, max_attempts: int = 10) -> str:
         """
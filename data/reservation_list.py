@@ -0,0 +1,163 @@
+"""
+In-memory reservations list behind the reservation management screen.
+
+The screen keeps one ``ReservationList`` as the source of its table model
+and filters it through a proxy model, so a keystroke re-runs a filter
+instead of rebuilding rows and widgets:
+
+* Rows are loaded page by page (``fetch_reservations`` with a limit and
+  the key of the last row, through ``database.get_all_reservations``),
+  newest first, and stored as compact
+  tuples. Book titles and member names repeat across reservations and are
+  interned, so each distinct string is held once.
+* ``matching(text)`` finds the distinct titles and names containing the
+  search text (there are far fewer of them than reservations); a row is
+  shown when its title or name is in that set. A search extending the
+  previous one (containing it) only looks through the previous matches.
+"""
+import sqlite3
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+PAGE_SIZE = 2000
+
+# Row layout
+ID, BOOK_TITLE, USER_NAME, RESERVATION_DATE, STATUS = range(5)
+
+Row = Tuple[int, str, str, str, str]
+
+
+def fetch_reservations(conn: sqlite3.Connection, limit: Optional[int] = None,
+                       after: Optional[Tuple[str, int]] = None) -> List[Dict[str, Any]]:
+    """
+    Reservations with user and book details, newest first.
+
+    Args:
+        conn: An open connection
+        limit: Return at most this many rows (one page); None for all
+        after: ``(reservation_date, id)`` of the last row of the previous page
+
+    Returns:
+        One dictionary per reservation
+    """
+    where, params = "", []
+    if after is not None:
+        where = "WHERE (r.reservation_date, r.id) < (?, ?)"
+        params += list(after)
+    page = ""
+    if limit is not None:
+        page = "LIMIT ?"
+        params.append(int(limit))
+    # Pages are index range scans on idx_reservations_date_id (migration 014)
+    cursor = conn.execute(
+        f"""
+        SELECT r.id AS reservation_id, r.user_id, r.book_id, r.reservation_date, r.status,
+               u.full_name AS user_name, u.email AS user_email,
+               b.title AS book_title, b.author AS book_author, b.isbn AS book_isbn
+        FROM reservations r
+        JOIN users u ON r.user_id = u.id
+        JOIN books b ON r.book_id = b.id
+        {where}
+        ORDER BY r.reservation_date DESC, r.id DESC
+        {page}
+        """,
+        params
+    )
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+class ReservationList:
+    """Reservations loaded so far, with the distinct titles and names they use."""
+
+    def __init__(self):
+        self.rows: List[Row] = []
+        self.complete = False
+        # Key of the last loaded row, where the next page continues
+        self.cursor: Optional[Tuple[str, int]] = None
+        self._strings: Dict[str, str] = {}
+        self._lowered: Dict[str, str] = {}
+        self._last_search: Optional[Tuple[str, FrozenSet[str]]] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _intern(self, value: Any) -> str:
+        text = '' if value is None else str(value)
+        return self._strings.setdefault(text, text)
+
+    def _searchable(self, value: Any) -> str:
+        text = self._intern(value)
+        if text not in self._lowered:
+            self._lowered[text] = text.lower()
+        return text
+
+    def extend(self, reservations: Iterable[Dict[str, Any]]) -> int:
+        """
+        Append rows shaped like ``database.get_all_reservations``' dictionaries.
+
+        Returns:
+            Number of rows added
+        """
+        intern, searchable = self._intern, self._searchable
+        added = [
+            (r.get('reservation_id', r.get('id')), searchable(r.get('book_title')),
+             searchable(r.get('user_name')), intern(r.get('reservation_date')),
+             intern(r.get('status')))
+            for r in reservations
+        ]
+        if added:
+            self.rows.extend(added)
+            last = added[-1]
+            self.cursor = (last[RESERVATION_DATE], last[ID])
+            # New titles or names may match the last search
+            self._last_search = None
+        return len(added)
+
+    def load_page(self, fetch: Callable[..., List[Dict[str, Any]]],
+                  page_size: int = PAGE_SIZE) -> int:
+        """
+        Load the next page with ``fetch(limit=, after=)``; marks the list
+        complete when a short page comes back.
+
+        Returns:
+            Number of rows added
+        """
+        if self.complete:
+            return 0
+        added = self.extend(fetch(limit=page_size, after=self.cursor))
+        if added < page_size:
+            self.complete = True
+        return added
+
+    def clear(self):
+        self.__init__()
+
+    def index_of(self, reservation_id: int) -> Optional[int]:
+        """Position of a reservation in ``rows`` (a linear scan, for one click)."""
+        for position, reservation in enumerate(self.rows):
+            if reservation[ID] == reservation_id:
+                return position
+        return None
+
+    def matching(self, text: str) -> Optional[FrozenSet[str]]:
+        """
+        The distinct titles and names containing ``text`` (case-insensitive),
+        or None when ``text`` is empty and every row is shown.
+        """
+        needle = text.lower().strip()
+        if not needle:
+            return None
+        candidates: Iterable[str] = self._lowered
+        if self._last_search is not None and self._last_search[0] in needle:
+            candidates = self._last_search[1]
+        lowered = self._lowered
+        matched = frozenset(value for value in candidates if needle in lowered[value])
+        self._last_search = (needle, matched)
+        return matched
+
+    def accepts(self, row: int, matched: Optional[FrozenSet[str]]) -> bool:
+        """True if row ``row`` is shown for a ``matching`` result."""
+        if matched is None:
+            return True
+        reservation = self.rows[row]
+        return reservation[BOOK_TITLE] in matched or reservation[USER_NAME] in matched
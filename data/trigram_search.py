@@ -0,0 +1,233 @@
+"""
+Typo-tolerant search over book titles/authors and patron names/e-mails.
+
+Migration 012 keeps FTS5 trigram indexes (``books_trigrams``,
+``users_trigrams``) in sync with ``books`` and ``users``, with every word
+padded by spaces so word starts and ends are trigrams too. A search
+
+1. splits the normalized, padded query into trigrams,
+2. looks up each trigram's document frequency in ``trigram_frequencies``
+   and probes only the rarest ones (at most ``MAX_PROBES`` trigrams and
+   about ``MAX_POSTINGS`` index entries), so its cost depends on the query,
+   not on the size of the table,
+3. re-ranks the best candidates by trigram similarity to the query.
+
+A misspelt word still shares most of its trigrams with the right one, so
+"frank herbrt" finds Frank Herbert. Single-character queries fall back
+to a prefix match. Book searches that look like an ISBN first list the
+books whose ISBN starts with what was typed (``isbn_matches``).
+
+Migration 021 made the triggers normalize whitespace the way ``normalize``
+does; the two must stay in step, or rows are indexed with trigrams no query
+produces.
+"""
+import re
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+# index name: (FTS table, content table, indexed columns)
+INDEXES: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    'books': ('books_trigrams', 'books', ('title', 'author')),
+    'users': ('users_trigrams', 'users', ('full_name', 'email')),
+}
+
+MAX_PROBES = 12
+MAX_POSTINGS = 25_000
+MIN_CANDIDATES = 200
+DEFAULT_MIN_SCORE = 0.3
+
+# The whitespace the triggers of migration 021 collapse (SQLite's trim()
+# and replace() know nothing of Unicode spaces)
+_WHITESPACE = re.compile(r'[ \t\n\v\f\r]+')
+# Digits and hyphens, optionally ending in the X check digit
+_ISBN_QUERY = re.compile(r'^[0-9][0-9-]*[0-9Xx]?$')
+
+
+@dataclass(frozen=True)
+class Match:
+    id: int
+    score: float
+    values: Tuple[Optional[str], ...]
+
+
+def normalize(text: str) -> str:
+    """``text`` lowercased, with every run of whitespace made one space (as migration 021 indexes it)."""
+    return _WHITESPACE.sub(' ', (text or '').lower()).strip(' ')
+
+
+def padded(text: str) -> str:
+    """``text`` as indexed: each word with two leading and one trailing space."""
+    return '  ' + normalize(text).replace(' ', '  ') + ' '
+
+
+def trigrams(text: str) -> Set[str]:
+    """The trigrams the index holds for ``text``."""
+    text = padded(text)
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def similarity(query_grams: Set[str], text: Optional[str]) -> float:
+    """
+    How well ``text`` matches the query: the share of the query's trigrams
+    found in it, discounted for the trigrams of ``text`` the query lacks
+    (so a whole-title match ranks above a match inside a long title).
+    """
+    grams = trigrams(text or '')
+    if not grams or not query_grams:
+        return 0.0
+    shared = len(query_grams & grams)
+    return shared / (len(query_grams) + 0.25 * (len(grams) - shared))
+
+
+def refresh_frequencies(conn: sqlite3.Connection, index: Optional[str] = None) -> int:
+    """
+    Re-snapshot the trigram document frequencies from the FTS vocabularies.
+
+    The snapshot only steers which trigrams a search probes, so it may lag
+    behind edits; trigrams it does not know yet are probed first (they are
+    new, hence rare). Run it after bulk imports.
+
+    Returns:
+        Number of trigrams recorded
+    """
+    recorded = 0
+    for name in ([index] if index else list(INDEXES)):
+        fts_table = INDEXES[name][0]
+        conn.execute("DELETE FROM trigram_frequencies WHERE index_name = ?", (name,))
+        recorded += conn.execute(
+            f"""
+            INSERT INTO trigram_frequencies (index_name, term, documents)
+            SELECT ?, term, doc FROM {fts_table}_vocab
+            """,
+            (name,)
+        ).rowcount
+    return recorded
+
+
+def _probes(conn: sqlite3.Connection, index: str, grams: Set[str]) -> List[str]:
+    """The rarest query trigrams, within the postings budget."""
+    placeholders = ', '.join('?' * len(grams))
+    known = dict(conn.execute(
+        f"""
+        SELECT term, documents FROM trigram_frequencies
+        WHERE index_name = ? AND term IN ({placeholders})
+        """,
+        (index,) + tuple(grams)
+    ).fetchall())
+    probes, postings = [], 0
+    for doc, term in sorted((doc, term) for term, doc in known.items()):
+        if probes and (len(probes) >= MAX_PROBES or postings + doc > MAX_POSTINGS):
+            break
+        probes.append(term)
+        postings += doc
+    # Trigrams missing from the snapshot were indexed after it was taken (or
+    # occur nowhere): probing them costs next to nothing
+    return sorted(grams - known.keys()) + probes
+
+
+def prefix_expression(text: str) -> str:
+    """
+    FTS query for rows in which every word of ``text`` starts a word of one
+    of the indexed columns: each word is matched as a phrase with the two
+    leading spaces the index puts before every word.
+    """
+    return ' AND '.join('"  {}"'.format(word.replace('"', '""')) for word in normalize(text).split())
+
+
+def _fetch(conn: sqlite3.Connection, table: str, columns: Sequence[str],
+           ids: Sequence[int]) -> List[tuple]:
+    if not ids:
+        return []
+    placeholders = ', '.join('?' * len(ids))
+    return conn.execute(
+        f"SELECT id, {', '.join(columns)} FROM {table} WHERE id IN ({placeholders})", tuple(ids)
+    ).fetchall()
+
+
+def search(conn: sqlite3.Connection, index: str, text: str, limit: int = 20,
+           min_score: float = DEFAULT_MIN_SCORE) -> List[Match]:
+    """
+    Rank the rows of ``index`` ('books' or 'users') by similarity to ``text``.
+
+    Args:
+        conn: An open connection to a database with migration 012 applied
+        index: Key of ``INDEXES``
+        text: What the user typed
+        limit: Maximum number of matches
+        min_score: Matches scoring lower than this are dropped
+
+    Returns:
+        Matches, best first, with the indexed column values
+    """
+    fts_table, table, columns = INDEXES[index]
+    query = normalize(text)
+    if not query:
+        return []
+    if len(query) < 2:
+        conditions = ' OR '.join(f"{column} LIKE ?" for column in columns)
+        rows = conn.execute(
+            f"SELECT id, {', '.join(columns)} FROM {table} WHERE {conditions} LIMIT ?",
+            tuple(f"{query}%" for _ in columns) + (limit,)
+        ).fetchall()
+        return [Match(row[0], 1.0, tuple(row[1:])) for row in rows]
+
+    grams = trigrams(query)
+    probes = _probes(conn, index, grams)
+    if not probes:
+        return []
+    expression = ' OR '.join('"{}"'.format(term.replace('"', '""')) for term in probes)
+    ids = [row[0] for row in conn.execute(
+        f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ? ORDER BY rank LIMIT ?",
+        (expression, max(MIN_CANDIDATES, limit * 10))
+    )]
+
+    matches = []
+    for row in _fetch(conn, table, columns, ids):
+        score = max(similarity(grams, value) for value in row[1:])
+        if score >= min_score:
+            matches.append(Match(row[0], round(score, 4), tuple(row[1:])))
+    matches.sort(key=lambda match: (-match.score, match.id))
+    return matches[:limit]
+
+
+def is_isbn_query(text: str) -> bool:
+    """True if ``text`` could be the start of an ISBN."""
+    return bool(_ISBN_QUERY.match((text or '').strip()))
+
+
+def isbn_matches(conn: sqlite3.Connection, text: str, limit: int = 20) -> List[Match]:
+    """
+    Books whose ISBN starts with ``text`` as typed (hyphens included), in
+    ISBN order; nothing unless ``text`` looks like an ISBN.
+    """
+    if not is_isbn_query(text):
+        return []
+    term = text.strip()
+    rows = conn.execute(
+        """
+        SELECT id, title, author FROM books
+        WHERE isbn LIKE ? ORDER BY isbn COLLATE NOCASE LIMIT ?
+        """,
+        (term + '%', limit)
+    ).fetchall()
+    return [Match(row[0], 1.0, tuple(row[1:])) for row in rows]
+
+
+def search_books(conn: sqlite3.Connection, text: str, limit: int = 20,
+                 min_score: float = DEFAULT_MIN_SCORE) -> List[Match]:
+    """
+    Books by ISBN prefix, then by title or author; ``Match.values`` is
+    ``(title, author)``.
+    """
+    matches = isbn_matches(conn, text, limit)
+    found = {match.id for match in matches}
+    matches += [match for match in search(conn, 'books', text, limit, min_score)
+                if match.id not in found]
+    return matches[:limit]
+
+
+def search_users(conn: sqlite3.Connection, text: str, limit: int = 20,
+                 min_score: float = DEFAULT_MIN_SCORE) -> List[Match]:
+    """Patrons by full name or e-mail; ``Match.values`` is ``(full_name, email)``."""
+    return search(conn, 'users', text, limit, min_score)
@@ -0,0 +1,137 @@
+"""
+Paged, filtered member directory for the user management screen.
+
+The screen never loads the whole ``users`` table. It asks for one page at
+a time, in id order after the last id it shows (keyset paging, so page
+1000 costs what page 1 costs), with every filter applied in SQL:
+
+* ``search`` matches a word prefix of the name or e-mail (the
+  ``users_trigrams`` index of migration 012), a user code prefix
+  (``idx_users_user_code_nocase``) or, if it is a number, the user id;
+  when none of those match, the typo-tolerant trigram search is used,
+* ``role`` and ``status`` are equality filters on the indexes of
+  migration 013.
+"""
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from . import trigram_search
+
+PAGE_SIZE = 200
+
+# Row shape returned by ``fetch_page``
+COLUMNS = ('id', 'user_code', 'full_name', 'email', 'role', 'status')
+
+
+@dataclass(frozen=True)
+class DirectoryQuery:
+    """What the directory is filtered by; empty values do not filter."""
+    search: str = ''
+    role: Optional[str] = None
+    status: Optional[str] = None
+
+
+@dataclass
+class DirectoryPage:
+    rows: List[Tuple[Any, ...]]
+    # Pass as ``after_id`` for the next page; None when this was the last one
+    next_after: Optional[int]
+    fuzzy: bool = False
+
+
+def _like_prefix(text: str) -> str:
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return escaped + '%'
+
+
+def _filters(query: DirectoryQuery) -> Tuple[List[str], List[Any]]:
+    conditions, params = [], []
+    if query.role:
+        conditions.append("role = ? COLLATE NOCASE")
+        params.append(query.role)
+    if query.status:
+        conditions.append("status = ? COLLATE NOCASE")
+        params.append(query.status)
+    return conditions, params
+
+
+def _search_condition(search: str) -> Tuple[str, List[Any]]:
+    """Prefix match on name/e-mail words, user code or id."""
+    # One id set per index, rather than OR-ing the tests on every row
+    matches = [
+        "SELECT rowid FROM users_trigrams WHERE users_trigrams MATCH ?",
+        "SELECT id FROM users WHERE user_code LIKE ? ESCAPE '\\'",
+    ]
+    params: List[Any] = [trigram_search.prefix_expression(search), _like_prefix(search)]
+    if search.isdigit():
+        matches.append("SELECT ?")
+        params.append(int(search))
+    return 'id IN (' + ' UNION ALL '.join(matches) + ')', params
+
+
+def _select(conditions: List[str]) -> str:
+    where = ' AND '.join(conditions) if conditions else '1'
+    return f"""
+        SELECT id, COALESCE(user_code, ''), COALESCE(full_name, ''), COALESCE(email, ''),
+               COALESCE(role, 'Member'), COALESCE(status, 'Active')
+        FROM users
+        WHERE {where}
+    """
+
+
+def fetch_page(conn: sqlite3.Connection, query: DirectoryQuery, after_id: int = 0,
+               limit: int = PAGE_SIZE) -> DirectoryPage:
+    """
+    One page of the directory, in id order.
+
+    Args:
+        conn: An open connection (migrations 012 and 013 applied)
+        query: Search text and filters
+        after_id: Last id of the previous page (0 for the first page)
+        limit: Page size
+
+    Returns:
+        The page; rows are ``COLUMNS`` tuples
+    """
+    search = ' '.join(query.search.split())
+    conditions, params = _filters(query)
+    if search:
+        condition, search_params = _search_condition(search)
+        conditions.insert(0, condition)
+        params = search_params + params
+    rows = conn.execute(
+        _select(conditions + ["id > ?"]) + " ORDER BY id LIMIT ?",
+        params + [after_id, limit + 1]
+    ).fetchall()
+    if not rows and search and after_id == 0:
+        return _fuzzy_page(conn, query, search, limit)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return DirectoryPage(rows, rows[-1][0] if has_more else None)
+
+
+def _fuzzy_page(conn: sqlite3.Connection, query: DirectoryQuery, search: str,
+                limit: int) -> DirectoryPage:
+    """Misspelt names and e-mails, best match first (a single page)."""
+    ids = [match.id for match in trigram_search.search_users(conn, search, limit)]
+    if not ids:
+        return DirectoryPage([], None, fuzzy=True)
+    conditions, params = _filters(query)
+    conditions.insert(0, f"id IN ({', '.join('?' * len(ids))})")
+    rows = conn.execute(_select(conditions), ids + params).fetchall()
+    position = {user_id: i for i, user_id in enumerate(ids)}
+    rows.sort(key=lambda row: position[row[0]])
+    return DirectoryPage(rows, None, fuzzy=True)
+
+
+def count(conn: sqlite3.Connection, query: DirectoryQuery) -> int:
+    """Number of members matching ``query`` (without the typo-tolerant fallback)."""
+    search = ' '.join(query.search.split())
+    conditions, params = _filters(query)
+    if search:
+        condition, search_params = _search_condition(search)
+        conditions.insert(0, condition)
+        params = search_params + params
+    where = ' AND '.join(conditions) if conditions else '1'
+    return conn.execute(f"SELECT COUNT(*) FROM users WHERE {where}", params).fetchone()[0]
@@ -0,0 +1,217 @@
+"""
+Single-writer queue with group commit.
+
+One thread owns the only read-write connection to a database and runs
+write jobs submitted from any thread. Jobs that queue up while a batch is
+committing are coalesced into the next transaction (one fsync); a positive
+``max_delay`` additionally holds a batch open for late arrivals, which only
+pays off when commits are expensive. Each job runs inside its own
+SAVEPOINT so a failing job is rolled back on its own without aborting the
+rest of the batch. Callers get a ``concurrent.futures.Future`` that
+resolves once the batch has committed.
+
+Usage::
+
+    queue = get_write_queue(db_path)
+    success, message = queue.call(circulation.borrow_book, user_id, book_id)
+
+A job is ``func(conn, *args, **kwargs)``; it must not commit or roll back
+itself (``services.circulation`` functions join the open transaction).
+"""
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteQueue:
+    """Runs write jobs for one database on a dedicated writer thread."""
+
+    def __init__(self, db_path: str, max_batch: int = 256, max_delay: float = 0.0,
+                 busy_timeout_ms: int = 30000, synchronous: str = 'NORMAL',
+                 setup: Optional[Callable[[sqlite3.Connection], None]] = None):
+        """
+        Args:
+            db_path: Database file
+            max_batch: Most jobs committed together
+            max_delay: How long (seconds) the first job of a batch waits for company
+            busy_timeout_ms: Busy timeout against writers in other processes
+            synchronous: ``PRAGMA synchronous`` of the writer (FULL syncs every commit)
+            setup: Called once with the writer connection before the first batch
+        """
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.busy_timeout_ms = busy_timeout_ms
+        self.synchronous = synchronous
+        self._setup = setup
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._stats = {'jobs': 0, 'failed': 0, 'batches': 0, 'commit_failures': 0}
+        self._ready = threading.Event()
+        self._startup_error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._startup_error is not None:
+            raise self._startup_error
+
+    # -- producer side -----------------------------------------------------
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queue ``func(conn, *args, **kwargs)``; the future resolves after commit."""
+        future: Future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError('Write queue is closed')
+            self._jobs.put((future, func, args, kwargs))
+        return future
+
+    def call(self, func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Submit a job and wait for its result (re-raises the job's exception)."""
+        return self.submit(func, *args, **kwargs).result(timeout)
+
+    def execute(self, sql: str, params: Tuple[Any, ...] = ()) -> int:
+        """Run one statement through the queue; returns the affected row count."""
+        return self.call(lambda conn: conn.execute(sql, params).rowcount)
+
+    def stats(self) -> Dict[str, float]:
+        stats = dict(self._stats)
+        stats['mean_batch'] = stats['jobs'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop accepting jobs, finish the queued ones and close the connection."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._jobs.put(_STOP)
+        self._thread.join(timeout)
+
+    # -- writer thread -----------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000,
+                               isolation_level=None)
+        conn.execute(f'PRAGMA busy_timeout = {int(self.busy_timeout_ms)}')
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute(f'PRAGMA synchronous = {self.synchronous}')
+        conn.execute('PRAGMA foreign_keys = ON')
+        if self._setup is not None:
+            self._setup(conn)
+        return conn
+
+    def _next_batch(self) -> Tuple[List[tuple], bool]:
+        first = self._jobs.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                job = self._jobs.get(timeout=remaining) if remaining > 0 else self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is _STOP:
+                return batch, True
+            batch.append(job)
+        return batch, False
+
+    def _run_batch(self, conn: sqlite3.Connection, batch: List[tuple]):
+        # Drop jobs whose callers cancelled them while they were queued
+        batch = [job for job in batch if job[0].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        outcomes = []
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+        except sqlite3.Error as e:
+            for future, *_ in batch:
+                future.set_exception(e)
+            self._stats['commit_failures'] += 1
+            return
+
+        for future, func, args, kwargs in batch:
+            conn.execute('SAVEPOINT job')
+            try:
+                result = func(conn, *args, **kwargs)
+            except Exception as e:
+                conn.execute('ROLLBACK TO job')
+                conn.execute('RELEASE job')
+                outcomes.append((future, False, e))
+            else:
+                conn.execute('RELEASE job')
+                outcomes.append((future, True, result))
+
+        try:
+            conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            logger.error(f"Group commit of {len(batch)} jobs failed: {e}")
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            self._stats['commit_failures'] += 1
+            outcomes = [(future, False, e) for future, _, _ in outcomes]
+
+        self._stats['batches'] += 1
+        self._stats['jobs'] += len(outcomes)
+        for future, ok, value in outcomes:
+            if ok:
+                future.set_result(value)
+            else:
+                self._stats['failed'] += 1
+                future.set_exception(value)
+
+    def _run(self):
+        try:
+            conn = self._connect()
+        except BaseException as e:
+            self._startup_error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            stop = False
+            while not stop:
+                batch, stop = self._next_batch()
+                if batch:
+                    try:
+                        self._run_batch(conn, batch)
+                    except sqlite3.Error as e:
+                        # Savepoint bookkeeping failed; nothing in the batch is committed
+                        logger.exception('Write batch aborted')
+                        if conn.in_transaction:
+                            conn.execute('ROLLBACK')
+                        for future, *_ in batch:
+                            if not future.done():
+                                future.set_exception(e)
+        finally:
+            conn.close()
+
+
+_queues: Dict[str, WriteQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_write_queue(db_path: str,
+                    setup: Optional[Callable[[sqlite3.Connection], None]] = None) -> WriteQueue:
+    """
+    Return the process-wide write queue for ``db_path``.
+
+    ``setup`` is passed to the queue when this call creates it, so it runs
+    once per process, on the writer thread, before the first batch.
+    """
+    with _queues_lock:
+        write_queue = _queues.get(db_path)
+        if write_queue is None:
+            write_queue = _queues[db_path] = WriteQueue(db_path, setup=setup)
+        return write_queue
@@ -2,13 +2,25 @@ import os
 import sqlite3
 from PyQt5.QtWidgets import QMessageBox
 
+from data.branches import set_title_stock
+from data.entity_cache import get_entity_cache
+from data.errors import BusinessRuleError
+from data.migrator import MigrationError, migrate, is_current as schema_is_current
+from data.reservation_list import fetch_reservations
+from data import trigram_search
+from data.write_queue import get_write_queue
+from services import circulation
+
+# Use the database file in the project root (INTELLI_LIBRARIA_DB selects another one)
+DB_FILE = os.environ.get('INTELLI_LIBRARIA_DB') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'intelli_libraria.db'
+)
+
 def create_connection():
     """Create a database connection to the SQLite database."""
-    # Use the database file in the project root
-    db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'intelli_libraria.db')
     conn = None
     try:
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(DB_FILE)
         # Enable foreign key constraints
         conn.execute("PRAGMA foreign_keys = ON")
         return conn
@@ -16,171 +28,49 @@ def create_connection():
         print(f"Error connecting to database: {e}")
         raise
 
-def update_database_schema(conn):
-    """Update the database schema to match the current application requirements."""
-    try:
-        cursor = conn.cursor()
-        # Enable foreign key support
-        cursor.execute("PRAGMA foreign_keys = ON")
-        
-        # Inspect current users table columns
-        cursor.execute("PRAGMA table_info(users)")
-        columns = [column[1] for column in cursor.fetchall()]
+def create_readonly_connection():
+    """Create a read-only connection for report queries.
 
-        # Ensure modern schema columns exist
-        if 'user_code' not in columns:
-            cursor.execute("ALTER TABLE users ADD COLUMN user_code TEXT")
-        if 'full_name' not in columns:
-            cursor.execute("ALTER TABLE users ADD COLUMN full_name TEXT")
-        if 'phone' not in columns:
-            cursor.execute("ALTER TABLE users ADD COLUMN phone TEXT")
-        if 'contact' not in columns:
-            cursor.execute("ALTER TABLE users ADD COLUMN contact TEXT")
-        if 'address' not in columns:
-            cursor.execute("ALTER TABLE users ADD COLUMN address TEXT")
-        if 'role' not in columns:
-            cursor.execute("ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'Member'")
-        if 'status' not in columns:
-            cursor.execute("ALTER TABLE users ADD COLUMN status TEXT DEFAULT 'Active'")
-        if 'created_at' not in columns:
-            # SQLite cannot add a column with a non-constant default via ALTER TABLE
-            cursor.execute("ALTER TABLE users ADD COLUMN created_at TIMESTAMP")
-        if 'updated_at' not in columns:
-            cursor.execute("ALTER TABLE users ADD COLUMN updated_at TIMESTAMP")
-        conn.commit()
+    Reports opened through this connection can never take the write lock, so
+    long analytical reads do not hold up checkouts and returns.
 
-        # Backfill data for newly added columns
-        # If full_name is missing but username exists, copy it
-        if 'username' in columns:
-            try:
-                cursor.execute("UPDATE users SET full_name = COALESCE(full_name, username)")
-            except Exception:
-                pass
-        # Generate user_code for rows where it is NULL
-        try:
-            cursor.execute(
-                """
-                UPDATE users
-                SET user_code = COALESCE(user_code, 'USR-' || printf('%06d', id))
-                WHERE user_code IS NULL OR user_code = ''
-                """
-            )
-        except Exception:
-            pass
+    Returns:
+        ReadOnlyDatabase: use ``snapshot()`` for a consistent multi-query read
+    """
+    from data.readonly import ReadOnlyDatabase
+    return ReadOnlyDatabase(DB_FILE)
 
-        # Backfill created_at/updated_at if they exist but are NULL
-        try:
-            cursor.execute("PRAGMA table_info(users)")
-            cols_after = {row[1] for row in cursor.fetchall()}
-            if 'created_at' in cols_after:
-                cursor.execute("UPDATE users SET created_at = COALESCE(created_at, CURRENT_TIMESTAMP)")
-            if 'updated_at' in cols_after:
-                cursor.execute("UPDATE users SET updated_at = COALESCE(updated_at, CURRENT_TIMESTAMP)")
-            conn.commit()
-        except Exception:
-            pass
+def execute_report_query(query, params=()):
+    """Execute a report query on a read-only snapshot connection.
 
-        # Ensure books table has expected columns
-        try:
-            cursor.execute("PRAGMA table_info(books)")
-            book_cols = {row[1] for row in cursor.fetchall()}
-
-            # Create books if missing entirely (older dbs)
-            if not book_cols:
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS books (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        title TEXT NOT NULL,
-                        author TEXT NOT NULL,
-                        isbn TEXT NOT NULL UNIQUE,
-                        edition TEXT,
-                        stock INTEGER NOT NULL DEFAULT 0
-                    )
-                ''')
-            else:
-                if 'title' not in book_cols:
-                    cursor.execute("ALTER TABLE books ADD COLUMN title TEXT")
-                if 'author' not in book_cols:
-                    cursor.execute("ALTER TABLE books ADD COLUMN author TEXT")
-                if 'isbn' not in book_cols:
-                    cursor.execute("ALTER TABLE books ADD COLUMN isbn TEXT")
-                if 'edition' not in book_cols:
-                    cursor.execute("ALTER TABLE books ADD COLUMN edition TEXT")
-                if 'stock' not in book_cols:
-                    cursor.execute("ALTER TABLE books ADD COLUMN stock INTEGER DEFAULT 0")
-                # If ISBN is enforced UNIQUE via an index, relax it to allow duplicates.
-                # Some earlier schemas created a UNIQUE constraint on isbn which caused
-                # frequent insert failures. We'll rebuild the table without UNIQUE if needed.
-                def _isbn_unique_index_name() -> str | None:
-                    try:
-                        cursor.execute("PRAGMA index_list(books)")
-                        for idx in cursor.fetchall():
-                            # idx: (seq, name, unique, origin, partial)
-                            if idx[2] == 1:  # unique
-                                cursor.execute(f"PRAGMA index_info({idx[1]})")
-                                cols = [r[2] for r in cursor.fetchall()]
-                                if cols == ['isbn'] or 'isbn' in cols:
-                                    return idx[1]
-                    except Exception:
-                        return None
-                    return None
-
-                unique_idx = _isbn_unique_index_name()
-                if unique_idx is not None:
-                    try:
-                        cursor.execute("BEGIN")
-                        # Create new table without UNIQUE constraint
-                        cursor.execute('''
-                            CREATE TABLE IF NOT EXISTS books__tmp_migrate (
-                                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                                title TEXT NOT NULL,
-                                author TEXT NOT NULL,
-                                isbn TEXT NOT NULL,
-                                edition TEXT,
-                                stock INTEGER NOT NULL
-                            )
-                        ''')
-                        cursor.execute('''
-                            INSERT INTO books__tmp_migrate (id, title, author, isbn, edition, stock)
-                            SELECT id, title, author, isbn, edition, stock FROM books
-                        ''')
-                        cursor.execute('DROP TABLE books')
-                        cursor.execute('ALTER TABLE books__tmp_migrate RENAME TO books')
-                        cursor.execute('COMMIT')
-                    except Exception:
-                        cursor.execute('ROLLBACK')
-        except Exception as _:
-            # Keep going; some SQLite versions may restrict ALTERs
-            pass
+    Args:
+        query (str): SQL query to execute
+        params (tuple, optional): Parameters for the query. Defaults to ().
 
-        # Ensure reservations table has expected columns
-        try:
-            cursor.execute("PRAGMA table_info(reservations)")
-            res_cols = {row[1] for row in cursor.fetchall()}
-            if not res_cols:
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS reservations (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER NOT NULL,
-                        book_id INTEGER NOT NULL,
-                        reservation_date TEXT NOT NULL,
-                        status TEXT DEFAULT 'Active' CHECK(status IN ('Active', 'Fulfilled', 'Cancelled')),
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
-                        FOREIGN KEY (book_id) REFERENCES books (id) ON DELETE CASCADE
-                    )
-                ''')
-                # Create indexes for better performance
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_reservations_user_id ON reservations(user_id)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_reservations_book_id ON reservations(book_id)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_reservations_status ON reservations(status)')
-            else:
-                if 'reservation_date' not in res_cols:
-                    cursor.execute("ALTER TABLE reservations ADD COLUMN reservation_date TEXT")
-        except Exception:
-            pass
+    Returns:
+        list: List of dictionaries representing the query results
+    """
+    readonly = create_readonly_connection()
+    try:
+        with readonly.snapshot():
+            return readonly.query(query, params)
     except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        raise
+    finally:
+        readonly.close()
+
+def update_database_schema(conn):
+    """Bring the database schema up to date.
+
+    Pending migrations from ``data/migrations`` are applied by the migration
+    engine; when the schema is current this is a single ``PRAGMA user_version``
+    read.
+    """
+    try:
+        for applied in migrate(conn):
+            print(f"Applied migration {applied.name} in {applied.seconds * 1000:.1f}ms")
+    except MigrationError as e:
         print(f"Error updating database schema: {e}")
 
 def execute_query(query, params=()):
@@ -214,6 +104,9 @@ def create_tables():
     conn = create_connection()
     if conn is not None:
         try:
+            # Warm start: the schema is already at the latest version
+            if schema_is_current(conn):
+                return
             cursor = conn.cursor()
             # Create users table (modern schema) if it doesn't exist
             cursor.execute('''
@@ -302,9 +195,11 @@ def add_book(title, author, isbn, edition, stock):
                 return False
 
         cursor.execute(
-            "INSERT INTO books (title, author, isbn, edition, stock, available) VALUES (?, ?, ?, ?, ?, ?)",
-            (title, author, isbn, edition, stock, stock)
+            "INSERT INTO books (title, author, isbn, edition, stock, available) VALUES (?, ?, ?, ?, 0, 0)",
+            (title, author, isbn, edition)
         )
+        # New copies are shelved at the default branch; the holding triggers set stock/available
+        set_title_stock(conn, cursor.lastrowid, max(stock, 0))
         conn.commit()
         return True, "Reservation created successfully"
     except sqlite3.Error as e:
@@ -330,7 +225,8 @@ def get_all_books():
                 id as book_code,
                 '' as publisher,
                 '' as publication_year,
-                '' as category
+                '' as category,
+                available
             FROM books 
             ORDER BY title
         """)
@@ -482,10 +378,10 @@ def get_recent_transactions(limit=8):
     Returns:
         list: List of dictionaries containing transaction details with consistent field names
     """
-    conn = None
+    readonly = None
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
+        readonly = create_readonly_connection()
+        cursor = readonly.connection.cursor()
         
         cursor.execute("""
             SELECT 
@@ -525,17 +421,22 @@ def get_recent_transactions(limit=8):
         traceback.print_exc()
         return []
     finally:
-        if conn:
-            conn.close()
+        if readonly:
+            readonly.close()
 
 def get_book_by_id(book_id):
-    """Fetch a single book by its ID."""
+    """Fetch a single book by its ID (served from the entity cache when possible)."""
+    return get_entity_cache(DB_FILE).get('book', 'id', book_id, lambda: _load_book_by_id(book_id),
+                                         shape='dict')
+
+def _load_book_by_id(book_id):
+    """Read a book row as a dict, bypassing the cache."""
     conn = create_connection()
     try:
         cursor = conn.cursor()
         cursor.execute(
             """
-            SELECT id, title, author, isbn, edition, stock 
+            SELECT id, title, author, isbn, edition, stock, available 
             FROM books 
             WHERE id = ?
             """, 
@@ -549,7 +450,8 @@ def get_book_by_id(book_id):
                 'author': book[2],
                 'isbn': book[3],
                 'edition': book[4],
-                'stock': book[5]
+                'stock': book[5],
+                'available': book[6]
             }
         return None
     except sqlite3.Error as e:
@@ -588,6 +490,7 @@ def delete_book(book_id):
             cursor = conn.cursor()
             cursor.execute('DELETE FROM books WHERE id = ?', (book_id,))
             conn.commit()
+            get_entity_cache(DB_FILE).invalidate('book', book_id)
             return cursor.rowcount > 0
         except sqlite3.Error as e:
             print(f"Error deleting book: {e}")
@@ -650,7 +553,24 @@ def update_book(book_id, title, author, isbn, edition, stock):
         cursor.execute("SELECT id FROM books WHERE isbn = ? AND id != ?", (isbn, book_id))
         if cursor.fetchone():
             return False, f"A book with ISBN {isbn} already exists"
-        
+
+        # Copies on loan cannot be removed from stock (available would go negative)
+        cursor.execute(
+            "SELECT COUNT(*) FROM transactions WHERE book_id = ? AND return_date IS NULL",
+            (book_id,)
+        )
+        on_loan = cursor.fetchone()[0]
+        if stock < on_loan:
+            return False, f"Stock cannot be lower than the {on_loan} copies currently on loan"
+
+        # Stock is the sum of the branch holdings; the triggers move books.stock
+        # and available along with the holding
+        try:
+            set_title_stock(conn, book_id, stock)
+        except BusinessRuleError as e:
+            conn.rollback()
+            return False, e.message
+
         # Update the book
         cursor.execute('''
             UPDATE books 
@@ -658,15 +578,15 @@ def update_book(book_id, title, author, isbn, edition, stock):
                 author = ?, 
                 isbn = ?, 
                 edition = CASE WHEN ? = '' THEN NULL ELSE ? END, 
-                stock = ?,
                 updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
-        ''', (title, author, isbn, edition, edition, stock, book_id))
+        ''', (title, author, isbn, edition, edition, book_id))
         
         if cursor.rowcount == 0:
             return False, "No changes were made to the book"
             
         conn.commit()
+        get_entity_cache(DB_FILE).invalidate('book', book_id)
         return True, "Reservation created successfully", "Book updated successfully"
         
     except sqlite3.IntegrityError as e:
@@ -866,35 +786,20 @@ def add_reservation(book_id, user_id, reservation_date, status="Active"):
         user_id = resolved_user_id
             
         # Check if the book exists and is available
-        cursor.execute("SELECT id, title, stock FROM books WHERE id = ?", (book_id,))
+        cursor.execute("SELECT id, title, available FROM books WHERE id = ?", (book_id,))
         book = cursor.fetchone()
         if not book:
             return False, f"Error: Book with ID {book_id} not found"
             
-        if book[2] <= 0:  # Check stock
+        if book[2] <= 0:  # Check copies on the shelf
             return False, f"Error: '{book[1]}' is currently out of stock"
             
-        # Insert the reservation
+        # Insert the reservation (availability counts loans only, see data.inventory)
         cursor.execute("""
             INSERT INTO reservations (book_id, user_id, reservation_date, status)
             VALUES (?, ?, ?, ?)
         """, (book_id, user_id, reservation_date, status))
         
-        # Decrement the book stock and available when column exists
-        try:
-            cursor.execute(
-                """
-                UPDATE books 
-                SET stock = stock - 1,
-                    available = CASE WHEN (SELECT COUNT(1) FROM pragma_table_info('books') WHERE name='available') > 0 
-                                     THEN available - 1 ELSE stock END
-                WHERE id = ? AND stock > 0
-                """,
-                (book_id,)
-            )
-        except Exception:
-            cursor.execute("UPDATE books SET stock = stock - 1 WHERE id = ? AND stock > 0", (book_id,))
-        
         conn.commit()
         return True, f"Successfully reserved '{book[1]}' for user ID {user_id}"
         
@@ -907,45 +812,22 @@ def add_reservation(book_id, user_id, reservation_date, status="Active"):
         if conn:
             conn.close()
 
-def get_all_reservations():
+def get_all_reservations(limit=None, after=None):
     """
-    Fetch all reservations with user and book details.
-    
+    Fetch reservations with user and book details, newest first.
+
+    Args:
+        limit (int, optional): Return at most this many rows (one page)
+        after (tuple, optional): (reservation_date, reservation_id) of the last
+            row of the previous page; the page continues after it
+
     Returns:
         list: List of dictionaries containing reservation details with user and book information
     """
     conn = create_connection()
     if conn is not None:
         try:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT 
-                    r.id as reservation_id,
-                    r.user_id,
-                    r.book_id,
-                    r.reservation_date,
-                    r.status,
-                    u.full_name as user_name,
-                    u.email as user_email,
-                    b.title as book_title,
-                    b.author as book_author,
-                    b.isbn as book_isbn
-                FROM 
-                    reservations r
-                JOIN 
-                    users u ON r.user_id = u.id
-                JOIN 
-                    books b ON r.book_id = b.id
-                ORDER BY 
-                    r.reservation_date DESC
-            """)
-            
-            results = cursor.fetchall()
-            # Convert Row objects to dictionaries
-            return [dict(row) for row in results]
-            
+            return fetch_reservations(conn, limit, after)
         except sqlite3.Error as e:
             print(f"Error fetching reservations: {e}")
             return []
@@ -984,6 +866,75 @@ def get_all_users():
         if conn:
             conn.close()
 
+def search_users(text, limit=200):
+    """Find users by id or by (possibly misspelt) name or e-mail.
+
+    Args:
+        text (str): What was typed into the search box
+        limit (int, optional): Maximum number of users. Defaults to 200.
+
+    Returns:
+        list[tuple]: Same shape as ``get_all_users``, best match first
+    """
+    conn = create_connection()
+    try:
+        ids = [match.id for match in trigram_search.search_users(conn, text, limit)]
+        term = (text or '').strip()
+        if term.isdigit() and int(term) not in ids:
+            ids.insert(0, int(term))
+        if not ids:
+            return []
+        placeholders = ', '.join('?' * len(ids))
+        cursor = conn.execute(
+            f"""
+            SELECT 
+                id,
+                COALESCE(full_name, '') AS full_name,
+                COALESCE(email, '') AS email,
+                COALESCE(role, 'Member') AS role,
+                COALESCE(status, 'Active') AS status,
+                COALESCE(phone, contact) AS contact,
+                COALESCE(address, '') AS address
+            FROM users
+            WHERE id IN ({placeholders})
+            """,
+            ids
+        )
+        rank = {user_id: i for i, user_id in enumerate(ids)}
+        return sorted(cursor.fetchall(), key=lambda row: rank[row[0]])
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return []
+    finally:
+        if conn:
+            conn.close()
+
+def search_books(text, limit=200):
+    """Find books by (possibly misspelt) title or author, best match first.
+
+    Args:
+        text (str): What was typed into the search box
+        limit (int, optional): Maximum number of books. Defaults to 200.
+
+    Returns:
+        list: List of dictionaries with the book columns
+    """
+    conn = create_connection()
+    try:
+        conn.row_factory = sqlite3.Row
+        ids = [match.id for match in trigram_search.search_books(conn, text, limit)]
+        if not ids:
+            return []
+        placeholders = ', '.join('?' * len(ids))
+        rows = conn.execute(f"SELECT * FROM books WHERE id IN ({placeholders})", ids).fetchall()
+        rank = {book_id: i for i, book_id in enumerate(ids)}
+        return sorted((dict(row) for row in rows), key=lambda book: rank[book['id']])
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        raise
+    finally:
+        conn.close()
+
 def add_user(full_name, email, role, status, phone=None, contact=None, address=None):
     """Add a new user to the database.
     
@@ -1156,6 +1107,7 @@ def delete_user(user_id):
         cursor = conn.cursor()
         cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
         conn.commit()
+        get_entity_cache(DB_FILE).invalidate('user', user_id)
         return True
     except sqlite3.Error as e:
         print(f"Database error: {e}")
@@ -1167,9 +1119,16 @@ def delete_user(user_id):
 def get_user_by_id(user_id):
     """Fetch a single user by their ID, returned as tuple.
 
+    Served from the entity cache when possible (see data/entity_cache.py).
+
     Returns:
         tuple | None: (id, full_name, email, role, status, contact, address)
     """
+    return get_entity_cache(DB_FILE).get('user', 'id', user_id, lambda: _load_user_by_id(user_id),
+                                         shape='tuple')
+
+def _load_user_by_id(user_id):
+    """Read a user row as a tuple, bypassing the cache."""
     conn = create_connection()
     try:
         cursor = conn.cursor()
@@ -1286,6 +1245,7 @@ def update_user(user_id, full_name, email, role, status, phone=None, contact=Non
             return False, "No changes were made to the user"
             
         conn.commit()
+        get_entity_cache(DB_FILE).invalidate('user', user_id)
         return True, "User updated successfully"
         
     except sqlite3.IntegrityError as e:
@@ -1310,9 +1270,10 @@ def get_overdue_books():
     Returns:
         list: List of dictionaries containing overdue book details
     """
+    readonly = None
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
+        readonly = create_readonly_connection()
+        cursor = readonly.connection.cursor()
         
         cursor.execute("""
             SELECT 
@@ -1341,56 +1302,33 @@ def get_overdue_books():
         print(f"Error fetching overdue books: {e}")
         return []
     finally:
-        if conn:
-            conn.close()
+        if readonly:
+            readonly.close()
 
 def get_user_activity(days=30):
     """Fetch user activity within the specified number of days.
     
+    Reads the daily per-user circulation aggregates (see data/aggregates.py),
+    so the cost depends on the window length rather than the loan history.
+    
     Args:
         days (int): Number of days of activity to retrieve
         
     Returns:
         list: List of dictionaries containing user activity
     """
+    from data.aggregates import user_activity
+    readonly = None
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                u.id as user_id,
-                u.full_name as user_name,
-                u.email as user_email,
-                u.role as user_role,
-                COUNT(DISTINCT t.id) as total_borrowed,
-                COUNT(DISTINCT r.id) as total_reservations,
-                COUNT(DISTINCT CASE 
-                    WHEN t.status = 'Returned' THEN t.id 
-                END) as books_returned,
-                COUNT(DISTINCT CASE 
-                    WHEN t.status = 'Issued' AND t.due_date < date('now') 
-                    THEN t.id 
-                END) as overdue_books,
-                MAX(t.issue_date) as last_activity
-            FROM users u
-            LEFT JOIN transactions t ON u.id = t.user_id
-            LEFT JOIN reservations r ON u.id = r.user_id
-            WHERE t.issue_date >= date('now', ? || ' days')
-               OR r.reservation_date >= date('now', ? || ' days')
-            GROUP BY u.id, u.full_name, u.email, u.role
-            ORDER BY last_activity DESC
-        """, (f'-{days}', f'-{days}'))
-        
-        columns = [column[0] for column in cursor.description]
-        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        readonly = create_readonly_connection()
+        return user_activity(readonly.connection, days)
         
     except sqlite3.Error as e:
         print(f"Error fetching user activity: {e}")
         return []
     finally:
-        if conn:
-            conn.close()
+        if readonly:
+            readonly.close()
 
 def ensure_tables_exist(cursor):
     """Ensure all required tables exist with correct schema."""
@@ -1422,10 +1360,41 @@ def ensure_tables_exist(cursor):
     END;
     ''')
 
+def _prepare_writer(conn):
+    # Runs once on the write-queue thread, before its first batch
+    ensure_tables_exist(conn.cursor())
+
+def get_writer():
+    """Return the application database's write queue (see data/write_queue.py)."""
+    return get_write_queue(DB_FILE, setup=_prepare_writer)
+
+def submit_borrow(user_id, book_id, days=14):
+    """
+    Queue a checkout on the write queue without waiting for it.
+    
+    Returns:
+        Future: resolves to the ``services.circulation.checkout`` result once
+        the batch holding it has committed
+    """
+    return get_writer().submit(circulation.checkout, user_id, book_id, days)
+
+def submit_return(user_id, book_id):
+    """
+    Queue a return on the write queue without waiting for it.
+    
+    Returns:
+        Future: resolves to the ``services.circulation.checkin`` result
+    """
+    return get_writer().submit(circulation.checkin, user_id, book_id)
+
 def borrow_book(user_id, book_id, days=14):
     """
     Borrow a book for a user with validation and proper error handling.
     
+    The checks and updates run as one job on the database's write queue, so
+    concurrent checkouts are group-committed instead of fighting for the lock.
+    Waits for the result; pages use ``submit_borrow`` instead.
+    
     Args:
         user_id (int): ID of the user borrowing the book
         book_id (int): ID of the book to be borrowed
@@ -1434,85 +1403,15 @@ def borrow_book(user_id, book_id, days=14):
     Returns:
         tuple: (success: bool, message: str) - Status and message
     """
-    conn = None
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-        
-        # Ensure tables exist with correct schema
-        ensure_tables_exist(cursor)
-        
-        # 1. Validate user exists and is active
-        cursor.execute("SELECT id, status FROM users WHERE id = ?", (user_id,))
-        user = cursor.fetchone()
-        if not user:
-            return False, "User not found"
-        if user[1] != 'Active':
-            return False, "User account is not active"
-            
-        # 2. Validate book exists and is available
-        cursor.execute("SELECT id, title, stock FROM books WHERE id = ?", (book_id,))
-        book = cursor.fetchone()
-        if not book:
-            return False, "Book not found"
-        if book[2] <= 0:
-            return False, "Book is not available for borrowing"
-            
-        # 3. Check if user has reached maximum borrow limit
-        cursor.execute("""
-            SELECT COUNT(*) FROM transactions 
-            WHERE user_id = ? AND return_date IS NULL
-        """, (user_id,))
-        borrowed_count = cursor.fetchone()[0]
-        if borrowed_count >= 5:  # Max 5 books per user
-            return False, "Maximum borrow limit reached (5 books)"
-            
-        # 4. Check if book is already borrowed by this user
-        cursor.execute("""
-            SELECT id FROM transactions 
-            WHERE user_id = ? AND book_id = ? AND return_date IS NULL
-        """, (user_id, book_id))
-        if cursor.fetchone():
-            return False, "You have already borrowed this book"
-            
-        # 5. Calculate due date
-        from datetime import datetime, timedelta
-        issue_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        due_date = (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
-        
-        # 6. Create transaction
-        cursor.execute("""
-            INSERT INTO transactions 
-            (user_id, book_id, issue_date, due_date, status)
-            VALUES (?, ?, ?, ?, 'Borrowed')
-        """, (user_id, book_id, issue_date, due_date))
-        
-        # 7. Update book stock and available count
-        cursor.execute("""
-            UPDATE books 
-            SET stock = stock - 1,
-                available = available - 1
-            WHERE id = ? AND stock > 0
-        """, (book_id,))
-        
-        if cursor.rowcount == 0:
-            conn.rollback()
-            return False, "Failed to update book availability"
-            
-        conn.commit()
-        return True, f"Successfully borrowed '{book[1]}'. Due date: {due_date}"
-        
+        outcome = submit_borrow(user_id, book_id, days).result()
+        return outcome['success'], outcome['message']
     except sqlite3.Error as e:
-        if conn:
-            conn.rollback()
         error_msg = str(e)
         print(f"Error borrowing book: {error_msg}")
         if "no such column" in error_msg.lower():
             return False, "Database schema error. Please contact administrator."
         return False, f"Database error: {error_msg}"
-    finally:
-        if conn:
-            conn.close()
 
 # Initialize the database and tables when this module is imported
 create_tables()
@@ -35,7 +35,7 @@ def test_borrow():
         cursor.execute("SELECT id, title, available FROM books WHERE id = 1001")
         book = cursor.fetchone()
         if not book:
-            print("\nError: Test book not found. Please run verify_and_fix_db.py first.")
+            print("\nError: Test book not found. Please run fix_borrow_functionality.py first.")
             return
             
         print(f"\nTest book found: {book}")
@@ -1,9 +1,11 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, 
                             QHeaderView, QLineEdit, QHBoxLayout, QSizePolicy, QFrame, QMessageBox)
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QColor
 import database
-from datetime import datetime, timedelta
+from data import fines
+from data.migrator import require
+from table_delegates import PillDelegate
 
 class FineManagementPage(QWidget):
     def __init__(self):
@@ -44,11 +46,19 @@ class FineManagementPage(QWidget):
                 border: 1px solid #1976d2;
             }
         """)
+        # Filtering runs in SQL (data.fines.fine_rows) once typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.load_fine_records)
         self.search_bar.textChanged.connect(self.filter_table)
         main_layout.addWidget(self.search_bar)
 
         # Create table
         self.table = QTableWidget(len(self.table_data), 7)
+        self.table.setItemDelegateForColumn(6, PillDelegate({
+            'paid': ('#e8f5e9', '#2e7d32', '#e8f5e9'),
+        }, ('#ffebee', '#c62828', '#ffebee'), self.table))
         self.table.setHorizontalHeaderLabels([
             "User ID", "Book Title", "Issue Date", "Return Date", "Overdue Days", "Fine Amount", "Payment Status"
         ])
@@ -93,94 +103,36 @@ class FineManagementPage(QWidget):
         self.load_fine_records()
 
     def load_fine_records(self):
-        """Load fine records from the database"""
+        """Load the fine ledger rows matching the search text from the database"""
         try:
-            # Fetch overdue transactions with fine information
             conn = database.create_connection()
-            cursor = conn.cursor()
-            
-            # Query to compute fine information dynamically to work with schemas
-            cursor.execute('''
-                SELECT 
-                    t.id as transaction_id,
-                    t.user_id as user_id,
-                    COALESCE(b.title, 'Unknown Book') as book_title,
-                    t.issue_date,
-                    t.due_date,
-                    CASE 
-                        WHEN t.due_date IS NOT NULL 
-                        THEN CAST((julianday('now') - julianday(t.due_date)) AS INTEGER)
-                        ELSE 0
-                    END as days_overdue,
-                    -- Compute fine on the fly: 0.50 per day, never negative
-                    CASE 
-                        WHEN t.due_date IS NOT NULL AND (julianday('now') - julianday(t.due_date)) > 0 
-                            THEN ROUND((julianday('now') - julianday(t.due_date)) * 0.50, 2)
-                        ELSE 0
-                    END as fine_amount,
-                    CASE 
-                        WHEN lower(t.status) = 'returned' AND 
-                             (julianday('now') - julianday(t.due_date)) > 0 
-                            THEN 'Unpaid (Returned)'
-                        WHEN lower(t.status) = 'overdue' AND 
-                             (julianday('now') - julianday(t.due_date)) > 0 
-                            THEN 'Unpaid (Overdue)'
-                        WHEN lower(t.status) = 'lost' THEN 'Unpaid (Lost Book)'
-                        WHEN (julianday('now') - julianday(t.due_date)) <= 0 OR t.due_date IS NULL THEN 'No Fine'
-                        ELSE 'No Fine'
-                    END as payment_status,
-                    COALESCE(u.full_name, 'Unknown User') as user_name
-                FROM transactions t
-                LEFT JOIN books b ON t.book_id = b.id
-                LEFT JOIN users u ON t.user_id = u.id
-                WHERE t.issue_date IS NOT NULL
-                ORDER BY t.due_date DESC NULLS LAST
-            ''')
-            
-            # Store the data for searching and display
-            self.table_data = []
-            for row in cursor.fetchall():
-                transaction_id = int(row[0])
-                user_id_val = str(row[1])
-                book_title = row[2]
-                # Parse dates flexibly: support 'YYYY-MM-DD HH:MM:SS' and 'YYYY-MM-DD'
-                def _fmt_date(value):
-                    if not value:
-                        return ''
-                    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
-                        try:
-                            return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
-                        except Exception:
-                            continue
-                    # Fallback: return as-is to avoid crashing
-                    return str(value)
-                borrowed_date = _fmt_date(row[3])
-                due_date = _fmt_date(row[4])
-                days_overdue = max(0, int(float(row[5]))) if row[5] else 0
-                fine_amount = f"${row[6]:.2f}" if row[6] else "$0.00"
-                payment_status = row[7]
-                
-                # Append user_id for display and keep transaction_id for selection in last slot
-                self.table_data.append((
-                    user_id_val,
+            try:
+                require(conn, fines.LEDGER_VERSION, 'The fine page')
+                rows = fines.fine_rows(conn, self.search_bar.text())
+            finally:
+                conn.close()
+
+            # Assessed fines show Paid/Unpaid from the ledger; open overdue loans are Accruing
+            self.table_data = [
+                (
+                    str(user_id),
                     book_title,
-                    borrowed_date,
-                    due_date,
-                    str(days_overdue),
-                    fine_amount,
-                    payment_status,
+                    issue_date or '',
+                    return_date or '',
+                    str(max(0, days_overdue or 0)),
+                    f"${amount:.2f}" if amount else "$0.00",
+                    status,
                     transaction_id
-                ))
-                
-            conn.close()
-            
-            # Update the table with the fetched data
+                )
+                for user_id, book_title, issue_date, return_date, days_overdue, amount, status, transaction_id
+                in rows
+            ]
             self.populate_table(self.table_data)
-            
+
         except Exception as e:
             QMessageBox.critical(self, "Database Error", f"Failed to load fine records: {str(e)}")
             print(f"Error loading fine records: {str(e)}")
-    
+
     def populate_table(self, data):
         """Populate the table with the provided data"""
         try:
@@ -215,54 +167,13 @@ class FineManagementPage(QWidget):
                 fine_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
                 self.table.setItem(row, 5, fine_item)
                 
-                # Set status with appropriate styling
-                pill = QLabel(status)
-                pill.setAlignment(Qt.AlignCenter)
-                pill.setFixedHeight(32)
-                if status == "Paid":
-                    pill.setStyleSheet("""
-                        background: #e8f5e9;
-                        color: #2e7d32;
-                        border-radius: 16px;
-                        font-size: 15px;
-                        font-weight: 700;
-                        font-family: 'Inter', 'Segoe UI', Arial, sans-serif;
-                        padding: 0 24px;
-                    """)
-                else:
-                    pill.setStyleSheet("""
-                        background: #ffebee;
-                        color: #c62828;
-                        border-radius: 16px;
-                        font-size: 15px;
-                        font-weight: 700;
-                        font-family: 'Inter', 'Segoe UI', Arial, sans-serif;
-                        padding: 0 24px;
-                    """)
-                pill.setText(status)
-                self.table.setCellWidget(row, 6, pill)
+                # Status is painted as a pill by the status delegate
+                self.table.setItem(row, 6, QTableWidgetItem(status))
                 
         except Exception as e:
             print(f"Error populating table: {str(e)}")
             QMessageBox.warning(self, "Error", f"Failed to update the fines table: {str(e)}")
     
     def filter_table(self, text):
-        """Filter the table based on the search text"""
-        if not text:
-            self.populate_table(self.table_data)
-            return
-            
-        search_text = text.lower()
-        filtered_data = []
-        for row in self.table_data:
-            # Search in all columns except fine amount (remove $ for better search)
-            row_text = ' '.join([str(cell).lower() for i, cell in enumerate(row) if i != 5])  # Skip fine amount column
-            if (search_text in row[1].lower() or  # Book Title
-                search_text in row[2].lower() or  # Issue Date
-                search_text in row[3].lower() or  # Return Date
-                search_text in row[4].lower() or  # Overdue Days
-                search_text in row[5].lower().replace('$', '') or  # Fine Amount (without $)
-                search_text in row[6].lower()):   # Payment Status
-                filtered_data.append(row)
-                
-        self.populate_table(filtered_data)
\ No newline at end of file
+        """Reload the table for the search text once typing pauses"""
+        self.search_timer.start()
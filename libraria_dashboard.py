@@ -100,13 +100,14 @@ class LibrariaDashboard(QMainWindow):
             books = database.get_all_books()
             self.book_table.setRowCount(len(books))
             
+            # Rows follow get_all_books: id, title, author, isbn, edition, stock, ..., available
             for row, book in enumerate(books):
-                self.book_table.setItem(row, 0, QTableWidgetItem(str(book.get('id', ''))))
-                self.book_table.setItem(row, 1, QTableWidgetItem(book.get('title', '')))
-                self.book_table.setItem(row, 2, QTableWidgetItem(book.get('author', '')))
-                self.book_table.setItem(row, 3, QTableWidgetItem(book.get('genre', 'N/A')))
-                self.book_table.setItem(row, 4, QTableWidgetItem(str(book.get('stock', 0))))
-                available = "Yes" if book.get('stock', 0) > 0 else "No"
+                self.book_table.setItem(row, 0, QTableWidgetItem(str(book[0])))
+                self.book_table.setItem(row, 1, QTableWidgetItem(book[1] or ''))
+                self.book_table.setItem(row, 2, QTableWidgetItem(book[2] or ''))
+                self.book_table.setItem(row, 3, QTableWidgetItem('N/A'))
+                self.book_table.setItem(row, 4, QTableWidgetItem(str(book[5] or 0)))
+                available = "Yes" if (book[-1] or 0) > 0 else "No"
                 self.book_table.setItem(row, 5, QTableWidgetItem(available))
                 
                 # Center align all cells
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 from passlib.hash import bcrypt
 from enum import Enum
 import logging
+from data import eligibility
 from database import (
     create_connection,
     get_borrowed_books_count,
@@ -180,65 +181,17 @@ class LibraryBackend:
                 cursor.execute('BEGIN TRANSACTION')
 
                 try:
-                    # 1. Verify book exists and is available
-                    cursor.execute('''
-                        SELECT id, title, stock 
-                        FROM books 
-                        WHERE id = ?
-                    ''', (book_id,))
-                    
-                    book = cursor.fetchone()
-                    if not book:
-                        raise ValueError(f"Book with ID {book_id} not found")
-                    
-                    book_dict = dict(book)
-                    stock = book_dict.get('stock', 0)
-                        
-                    if stock <= 0:
-                        raise ValueError(f"Book '{book_dict.get('title', 'Unknown')}' is out of stock")
-
-                    # 2. Verify user exists and is active
-                    cursor.execute('''
-                        SELECT id, full_name, status
-                        FROM users 
-                        WHERE id = ?
-                    ''', (user_id,))
-                    
-                    user = cursor.fetchone()
-                    if not user:
-                        raise ValueError(f"User with ID {user_id} not found")
-                        
-                    user_dict = dict(user)
-                    if user_dict.get('status', '').lower() != 'active':
-                        raise ValueError(f"User account is not active (Status: {user_dict.get('status')})")
+                    # 1. Every borrowing rule in one query (see data.eligibility)
+                    verdict = eligibility.check(conn, user_id, book_id)
+                    if not verdict.eligible:
+                        raise ValueError(verdict.message)
 
-                    # 3. Check borrowing limit (max 5 books)
-                    cursor.execute('''
-                        SELECT COUNT(*) as active_loans 
-                        FROM transactions 
-                        WHERE user_id = ? AND return_date IS NULL
-                    ''', (user_id,))
-                    
-                    active_loans = cursor.fetchone()['active_loans']
-                    if active_loans >= 5:  # Default max borrow limit
-                        raise ValueError("Maximum borrowing limit of 5 books reached")
-
-                    # 4. Calculate due date and current timestamp
+                    # 2. Calculate due date and current timestamp
                     now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                     due_date = (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
 
-                    # 5. Update book quantity
-                    cursor.execute('''
-                        UPDATE books 
-                        SET stock = stock - 1,
-                            updated_at = ?
-                        WHERE id = ? AND stock > 0
-                    ''', (now, book_id))
-
-                    if cursor.rowcount == 0:
-                        raise ValueError("Failed to update book availability")
-
-                    # 6. Create transaction record
+                    # 3. Create transaction record (the availability triggers
+                    # decrement books.available, see data.inventory)
                     cursor.execute('''
                         INSERT INTO transactions 
                         (user_id, book_id, issue_date, due_date, status, created_at, updated_at)
@@ -246,7 +199,7 @@ class LibraryBackend:
                     ''', (user_id, book_id, now, due_date, now, now))
 
                     conn.commit()
-                    return True, f"Successfully borrowed '{book_dict.get('title', 'the book')}'. Due: {due_date}"
+                    return True, f"Successfully borrowed '{verdict.title}'. Due: {due_date}"
 
                 except ValueError as ve:
                     conn.rollback()
@@ -312,18 +265,6 @@ class LibraryBackend:
                     conn.rollback()
                     return False, "Failed to update transaction. It may have already been returned."
                 
-                # Update book stock
-                cursor.execute('''
-                    UPDATE books 
-                    SET stock = stock + 1,
-                        updated_at = ?
-                    WHERE id = ?
-                ''', (now, transaction['book_id']))
-                
-                if cursor.rowcount == 0:
-                    conn.rollback()
-                    return False, "Failed to update book stock. Book not found."
-                
                 conn.commit()
                 logger.info(f"Successfully processed return for transaction {transaction_id}")
                 return True, "Book returned successfully"
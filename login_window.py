@@ -7,6 +7,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QPixmap, QFont, QPainter, QIcon, QColor
 from PyQt5.QtCore import Qt, pyqtSignal
 from signup_page_clean import SignupPage
+from pixmap_cache import background_pixmap
 
 from PyQt5.QtCore import pyqtSignal
 
@@ -16,35 +17,24 @@ class BackgroundWidget(QWidget):
     
     def __init__(self, pixmap_path, parent=None):
         super().__init__(parent)
-        self.pixmap = QPixmap(pixmap_path)
+        self.pixmap_path = pixmap_path
+        # The image covering the current size; rebuilt on resize from the
+        # screen-sized copy in the pixmap cache, only drawn when painting
+        self.scaled_pixmap = QPixmap()
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
     def resizeEvent(self, event):
         """Handle window resize events to update the background."""
         super().resizeEvent(event)
+        self.scaled_pixmap = background_pixmap(self.pixmap_path, self.size(), self.devicePixelRatioF())
         self.resized.emit()  # Emit the resized signal
         self.update()
         
     def paintEvent(self, event):
         """Paints the background image, scaled to cover the entire widget."""
-        if not self.pixmap.isNull():
-            # Get the current window size
-            window_size = self.size()
-            # Calculate the scaled size that covers the window while maintaining aspect ratio
-            scaled_pixmap = self.pixmap.scaled(
-                window_size, 
-                Qt.KeepAspectRatioByExpanding,
-                Qt.SmoothTransformation
-            )
-            
-            # Calculate the position to center the pixmap
-            x = (scaled_pixmap.width() - window_size.width()) // 2
-            y = (scaled_pixmap.height() - window_size.height()) // 2
-            
-            # Create a painter and draw the pixmap
+        if not self.scaled_pixmap.isNull():
             painter = QPainter(self)
-            painter.setRenderHint(QPainter.SmoothPixmapTransform)
-            painter.drawPixmap(0, 0, scaled_pixmap, x, y, window_size.width(), window_size.height())
+            painter.drawPixmap(0, 0, self.scaled_pixmap)
             painter.end()
             
         super().paintEvent(event)
@@ -1,3 +1,4 @@
+import logging
 import os
 import sys
 import warnings
@@ -21,10 +22,10 @@ from PyQt5.QtCore import Qt, QObject, pyqtSignal, QLoggingCategory
 # Suppress specific Qt categories
 QLoggingCategory.setFilterRules('*.debug=false')
 
-# Import application components
+# Import application components; the login window and the dashboard pages
+# are imported by the splash screen's warm-up, on worker threads
 from classic_splash import ClassicSplashScreen
-from login_window import LoginWindow
-from dashboard_window import DashboardWindow
+from theme import apply_theme
 
 class Application(QObject):
     logout_requested = pyqtSignal()
@@ -44,11 +45,16 @@ def main():
         # Suppress Qt warnings about style sheets
         os.environ["QT_STYLE_OVERRIDE"] = ""
     
+    # Warm-up timings and other progress messages
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
     
     # Set application style and palette
     app.setStyle("Fusion")
+    # One application style sheet compiled from the design tokens
+    apply_theme(app)
     
     # Set high DPI scale factor (you can adjust this value as needed)
     app.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
@@ -56,7 +62,22 @@ def main():
     # Create application instance
     app_instance = Application()
     
+    def start_backups():
+        # Daily online snapshots into backups/ (services.backup_service)
+        import database
+        from services.backup_service import BackupScheduler, BackupService
+        return BackupScheduler(BackupService(database.DB_FILE)).start()
+
+    def start_maintenance():
+        # ANALYZE, incremental vacuum and WAL checkpoints while the desk is idle
+        import database
+        from services.maintenance_service import MaintenanceScheduler, MaintenanceService
+        return MaintenanceScheduler(MaintenanceService(database.DB_FILE)).start()
+
     def show_login():
+        from login_window import LoginWindow
+        from dashboard_window import DashboardWindow
+
         # Close any existing windows
         for widget in QApplication.topLevelWidgets():
             if isinstance(widget, QMainWindow):
@@ -70,8 +91,10 @@ def main():
         # The window is already shown in its __init__ method
         
         def on_login_success():
-            # When login is successful, show dashboard
-            dashboard = DashboardWindow()
+            # When login is successful, show dashboard; its cards use the
+            # counts read during the warm-up if nothing has changed since
+            counters = splash.results.get('counters')
+            dashboard = DashboardWindow(counters=counters.value.take() if counters and counters.ok else None)
             dashboard.showMaximized()  # Show maximized with title bar
             login_window.close()
             
@@ -106,8 +129,13 @@ def main():
             pass
         login_window.login_successful.connect(on_login_success)
     
+    def on_warmed_up():
+        app_instance.backups = start_backups()
+        app_instance.maintenance = start_maintenance()
+        show_login()
+
     # Initial show of login screen
-    splash = ClassicSplashScreen(on_finished_callback=show_login)
+    splash = ClassicSplashScreen(on_finished_callback=on_warmed_up)
     splash.showFullScreen()
     
     sys.exit(app.exec_())
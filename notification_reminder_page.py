@@ -6,11 +6,17 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                            QDialogButtonBox)
 from PyQt5.QtCore import Qt, QDateTime, pyqtSignal, QSize, QPoint
 from PyQt5.QtGui import QFont, QIcon, QPixmap, QColor, QPainter, QPainterPath, QCursor
+from table_delegates import ActionButton, ActionButtonsDelegate, action_item
 
 class NotificationReminderPage(QWidget):
+    # Theme variant of each notification filter chip
+    CHIP_VARIANTS = {'All': 'danger', 'Due Date': 'primary', 'Reservation': 'success'}
+
     def __init__(self):
         super().__init__()
-        self.setStyleSheet("background: #f4f5f7;")
+        # Styled by the application theme (QWidget#notificationPage)
+        self.setObjectName("notificationPage")
+        self.setAttribute(Qt.WA_StyledBackground, True)
         self.main_layout = QVBoxLayout(self)
         # Tighter margins to widen content and reduce bottom whitespace
         self.main_layout.setContentsMargins(24, 16, 24, 10)
@@ -19,38 +25,7 @@ class NotificationReminderPage(QWidget):
         # State for the Notifications screen
         self.active_filter = 'All'
         self.search_query = ''
-        self.notifications_data = [
-            {
-                'title': 'Due Date Reminder',
-                'description': "The book 'The Secret Garden' is due in 2 days.",
-                'date': '2024-03-15',
-                'category': 'Due Date',
-            },
-            {
-                'title': 'Reservation Update',
-                'description': "Your reservation for 'The Great Gatsby' is now available.",
-                'date': '2024-03-14',
-                'category': 'Reservation',
-            },
-            {
-                'title': 'Return Confirmation',
-                'description': "The book 'To Kill a Mockingbird' has been returned successfully.",
-                'date': '2024-03-12',
-                'category': 'Reservation',
-            },
-            {
-                'title': 'Overdue Notice',
-                'description': "The book '1984' is overdue by 1 day.",
-                'date': '2024-03-10',
-                'category': 'Due Date',
-            },
-            {
-                'title': 'Reservation Cancellation',
-                'description': "Your reservation for 'Pride and Prejudice' has been cancelled.",
-                'date': '2024-03-08',
-                'category': 'Reservation',
-            },
-        ]
+        self.notifications_data = self.load_notifications()
         # Initialize reminders list
         self.reminders = [
             {"id": 1, "title": "Return 'The Great Gatsby'", "datetime": "2024-08-20 11:00 AM", "description": "Return the book to the library.", "completed": False},
@@ -61,12 +36,23 @@ class NotificationReminderPage(QWidget):
         ]
         self.render()
 
+    def load_notifications(self):
+        """Load the most recent circulation notices queued by the notification service."""
+        try:
+            import database
+            from services.notification_service import NotificationService
+            return NotificationService(database.DB_FILE).recent()
+        except Exception as e:
+            print(f"Error loading notifications: {e}")
+            return []
+
     def clear_main_layout(self):
         """Clear all widgets from the main layout to prevent duplication"""
         while self.main_layout.count():
             item = self.main_layout.takeAt(0)
             widget = item.widget()
             if widget:
+                widget.hide()
                 widget.deleteLater()
             # Also clear any layouts
             if item.layout():
@@ -79,6 +65,7 @@ class NotificationReminderPage(QWidget):
                 item = layout.takeAt(0)
                 widget = item.widget()
                 if widget:
+                    widget.hide()
                     widget.deleteLater()
                 if item.layout():
                     self.clear_layout(item.layout())
@@ -88,7 +75,7 @@ class NotificationReminderPage(QWidget):
         
         # Title (always shown)
         title_label = QLabel("Notifications & Reminders")
-        title_label.setStyleSheet("font-size: 28px; font-family: 'Inter', 'Segoe UI', Arial, sans-serif; font-weight: 800; color: #232b36; margin-bottom: 6px; margin-top: 0px;")
+        title_label.setObjectName("pageTitle")
         self.main_layout.addWidget(title_label, alignment=Qt.AlignLeft)
         
         # Tabs always below the heading
@@ -99,13 +86,10 @@ class NotificationReminderPage(QWidget):
         notif_tab = QLabel('Notifications')
         remind_tab = QLabel('Reminders')
         
-        # Clear any previous styling and set clean states
-        if self.current_tab == 'notifications':
-            notif_tab.setStyleSheet('font-size: 18px; color: #232b36; margin-right: 16px; border-bottom: 2px solid #3b82f6; padding-bottom: 2px; background: none; font-weight: bold;')
-            remind_tab.setStyleSheet('font-size: 18px; color: #9ca3af; margin-right: 16px; padding-bottom: 2px; background: none; font-weight: normal; border-bottom: none;')
-        else:
-            notif_tab.setStyleSheet('font-size: 18px; color: #9ca3af; margin-right: 16px; padding-bottom: 2px; background: none; font-weight: normal; border-bottom: none;')
-            remind_tab.setStyleSheet('font-size: 18px; color: #232b36; margin-right: 16px; border-bottom: 2px solid #3b82f6; padding-bottom: 2px; background: none; font-weight: bold;')
+        # The theme underlines the active tab (QLabel#pageTab[active="true"])
+        for tab, name in ((notif_tab, 'notifications'), (remind_tab, 'reminders')):
+            tab.setObjectName("pageTab")
+            tab.setProperty("active", self.current_tab == name)
         
         notif_tab.setCursor(Qt.PointingHandCursor)
         remind_tab.setCursor(Qt.PointingHandCursor)
@@ -118,21 +102,7 @@ class NotificationReminderPage(QWidget):
         # Add Add Reminder button to the right corner with minimal spacing
         if self.current_tab == 'reminders':
             add_btn = QPushButton("Add Reminder")
-            add_btn.setStyleSheet("""
-                QPushButton {
-                    background: #3b82f6;
-                    color: white;
-                    font-size: 15px;
-                    font-weight: 600;
-                    border-radius: 12px;
-                    padding: 10px 28px;
-                    border: none;
-                    margin: 0px;
-                }
-                QPushButton:hover {
-                    background: #2563eb;
-                }
-            """)
+            add_btn.setProperty("variant", "primary")
             add_btn.clicked.connect(self.show_add_reminder_form)  # Connect button click
             tab_row.addStretch(1)  # This pushes the button to the right corner
             tab_row.addWidget(add_btn, alignment=Qt.AlignRight)
@@ -154,23 +124,7 @@ class NotificationReminderPage(QWidget):
         search_input.setPlaceholderText("Search notifications")
         search_input.setText(self.search_query)
         search_input.textChanged.connect(self.on_search_changed)
-        search_input.setStyleSheet(
-            """
-            QLineEdit {
-                background: #ffffff;
-                border: 1.5px solid #e5e7eb;
-                border-radius: 10px;
-                padding: 16px 20px;
-                font-size: 16px;
-                font-family: 'Inter', 'Segoe UI', Arial, sans-serif;
-                color: #232b36;
-                margin: 8px 0 12px 0;
-            }
-            QLineEdit:focus {
-                border: 1.5px solid #3b82f6;
-            }
-            """
-        )
+        search_input.setObjectName("searchInput")
         self.main_layout.addWidget(search_input)
 
         # Filter chips row with minimal spacing
@@ -193,56 +147,9 @@ class NotificationReminderPage(QWidget):
         btn.setChecked(selected)
         btn.clicked.connect(lambda: self.on_chip_clicked(text))
         
-        # Set different background colors based on the button text
-        if text == 'All':
-            bg_color = "#ef4444"  # Red
-            hover_color = "#dc2626"
-            text_color = "white"
-        elif text == 'Due Date':
-            bg_color = "#3b82f6"  # Blue
-            hover_color = "#2563eb"
-            text_color = "white"
-        elif text == 'Reservation':
-            bg_color = "#10b981"  # Green
-            hover_color = "#059669"
-            text_color = "white"
-        else:
-            bg_color = "#f3f4f6"  # Default gray
-            hover_color = "#e5e7eb"
-            text_color = "#374151"
-            
-        # Create style string with f-strings for dynamic colors
-        style = f"""
-            QPushButton {{
-                background: {bg_color};
-                color: {text_color};
-                border: 1px solid {bg_color};
-                border-radius: 16px;
-                padding: 8px 20px;
-                font-size: 13px;
-                font-weight: 600;
-                min-width: 100px;
-                margin: 2px 1px;  /* Minimal horizontal margin between buttons */
-                border-top-right-radius: 16px;
-                border-bottom-right-radius: 16px;
-                border-top-left-radius: 16px;
-                border-bottom-left-radius: 16px;
-            }}
-            QPushButton:hover {{
-                background: {hover_color};
-                border-color: {hover_color};
-            }}
-            QPushButton:checked {{
-                background: {bg_color};
-                color: {text_color};
-                border: 1px solid {bg_color};
-            }}
-            QPushButton:checked:hover {{
-                background: {hover_color};
-                border-color: {hover_color};
-            }}
-        """
-        btn.setStyleSheet(style)
+        # Chip colour by filter; the theme styles QPushButton[variant][chip="true"]
+        btn.setProperty("variant", self.CHIP_VARIANTS.get(text, "primary"))
+        btn.setProperty("chip", True)
         return btn
 
     def on_chip_clicked(self, label):
@@ -283,10 +190,12 @@ class NotificationReminderPage(QWidget):
     def render_notifications_content(self):
         """Render the notifications tab content matching the reference layout."""
         # Clear existing content
-        while self.main_layout.count() > 3:  # Keep title, tab row, and search bar
-            item = self.main_layout.takeAt(3)
+        while self.main_layout.count() > 4:  # Keep title, tab row, search bar and chips
+            item = self.main_layout.takeAt(4)
             widget = item.widget()
             if widget:
+                # Hidden now so it is not painted under the new content
+                widget.hide()
                 widget.deleteLater()
         
         # Filtered data
@@ -311,28 +220,10 @@ class NotificationReminderPage(QWidget):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setFrameShape(QFrame.NoFrame)
-        scroll.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background: transparent;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: #f1f1f1;
-                width: 8px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background: #c1c1c1;
-                min-height: 20px;
-                border-radius: 4px;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-        """)
+        scroll.setObjectName("notificationList")
         
         container = QWidget()
+        container.setObjectName("notificationItems")
         container_layout = QVBoxLayout(container)
         container_layout.setContentsMargins(0, 0, 10, 0)  # Add right margin for scrollbar
         container_layout.setSpacing(10)
@@ -340,7 +231,7 @@ class NotificationReminderPage(QWidget):
         # Add a message if no notifications match the filter
         if not filtered:
             no_results = QLabel("No notifications found matching your search.")
-            no_results.setStyleSheet("color: #6b7280; font-style: italic; padding: 20px; text-align: center;")
+            no_results.setObjectName("emptyState")
             container_layout.addWidget(no_results)
         
         scroll.setWidget(container)
@@ -348,15 +239,7 @@ class NotificationReminderPage(QWidget):
         for item in filtered:
             row = QWidget()
             # Borderless row to match the reference image
-            row.setStyleSheet(
-                """
-                QWidget {
-                    background: transparent;
-                    border: none;
-                    border-radius: 0px;
-                }
-                """
-            )
+            row.setObjectName("notificationRow")
             row.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
             row.setMinimumHeight(64)
             row_layout = QHBoxLayout(row)
@@ -367,7 +250,7 @@ class NotificationReminderPage(QWidget):
             icon = QLabel(self.get_icon_for_item(item))
             icon.setFixedSize(36, 36)
             icon.setAlignment(Qt.AlignCenter)
-            icon.setStyleSheet("background: #f3f4f6; border: none; border-radius: 8px;")
+            icon.setObjectName("notificationIcon")
             try:
                 icon.setFont(QFont("Segoe UI Emoji", 20))
             except Exception:
@@ -380,10 +263,10 @@ class NotificationReminderPage(QWidget):
             text_layout.setSpacing(2)
 
             title = QLabel(item['title'])
-            title.setStyleSheet("font-size: 15px; font-weight: 700; color: #111827; background: transparent;")
+            title.setObjectName("notificationTitle")
             desc = QLabel(item['description'])
             desc.setWordWrap(True)
-            desc.setStyleSheet("font-size: 13px; color: #6b7280; background: transparent;")
+            desc.setObjectName("notificationText")
 
             text_layout.addWidget(title)
             text_layout.addWidget(desc)
@@ -396,7 +279,7 @@ class NotificationReminderPage(QWidget):
             right_layout.setAlignment(Qt.AlignRight | Qt.AlignTop)
 
             date_label = QLabel(item['date'])
-            date_label.setStyleSheet("font-size: 14px; font-weight: 700; color: #64748b; background: transparent;")
+            date_label.setObjectName("notificationDate")
 
             right_layout.addWidget(date_label)
             # Spacer to keep minimal vertical size
@@ -418,22 +301,7 @@ class NotificationReminderPage(QWidget):
         footer.addStretch(1)
         mark_all = QPushButton("Mark all as read")
         mark_all.clicked.connect(self.on_mark_all_read)
-        mark_all.setStyleSheet(
-            """
-            QPushButton {
-                background-color: #1e90ff;
-                color: white;
-                border: none;
-                border-radius: 12px;
-                padding: 8px 16px;
-                font-size: 14px;
-                font-weight: 600;
-            }
-            QPushButton:hover {
-                background-color: #1c86ee;
-            }
-            """
-        )
+        mark_all.setProperty("variant", "primary")
         footer.addWidget(mark_all)
         # Reduce space below the footer by adding a small stretch with low factor
         wrapper = QWidget()
@@ -469,22 +337,8 @@ class NotificationReminderPage(QWidget):
         search_bar = QLineEdit()
         search_bar.setPlaceholderText("Search reminders by title or description")
         search_bar.textChanged.connect(self.filter_reminders)
-        search_bar.setStyleSheet("""
-            QLineEdit {
-                background: #ffffff;
-                border: 1.5px solid #e5e7eb;
-                border-radius: 8px;
-                padding: 10px 16px;
-                font-size: 14px;
-                color: #1f2937;
-                margin-bottom: 16px;
-            }
-            QLineEdit:focus {
-                border: 1.5px solid #3b82f6;
-                outline: none;
-                background: #ffffff;
-            }
-        """)
+        search_bar.setObjectName("searchInput")
+        search_bar.setProperty("compact", True)
         self.search_bar = search_bar  # Store reference for filtering
         self.main_layout.addWidget(search_bar)
         
@@ -500,29 +354,15 @@ class NotificationReminderPage(QWidget):
         table.setAlternatingRowColors(False)
         table.setFocusPolicy(Qt.NoFocus)
         table.verticalHeader().setDefaultSectionSize(54)
-        table.setStyleSheet("""
-            QTableWidget {
-                background: #fff;
-                border-radius: 16px;
-                font-size: 16px;
-                font-family: 'Inter', 'Segoe UI', Arial, sans-serif;
-                border: 1.5px solid #e5e7eb;
-                padding: 0px;
-            }
-            QTableWidget::item {
-                border-bottom: 1px solid #e5e7eb;
-                padding: 0px 0px;
-            }
-            QHeaderView::section {
-                background: #fff;
-                color: #232b36;
-                font-weight: 700;
-                font-size: 16px;
-                border: none;
-                padding: 16px 8px;
-                font-family: 'Inter', 'Segoe UI', Arial, sans-serif;
-            }
-        """)
+        self.reminder_actions = ActionButtonsDelegate(table, buttons=(
+            ActionButton('edit', "Edit", '#3b82f6', '#ffffff', '#3b82f6'),
+            ActionButton('delete', "Delete", '#ef4444', '#ffffff', '#ef4444'),
+            ActionButton('complete', "Complete", '#10b981', '#ffffff', '#10b981'),
+            ActionButton('undo', "Undo", '#10b981', '#ffffff', '#10b981'),
+        ), button_size=QSize(72, 28), radius=6)
+        self.reminder_actions.clicked.connect(self.on_reminder_action)
+        table.setItemDelegateForColumn(3, self.reminder_actions)
+        table.setObjectName("contentTable")
         
         # Populate the table with reminders
         self.populate_reminders_table(table)
@@ -763,102 +603,24 @@ class NotificationReminderPage(QWidget):
                 desc_item.setData(Qt.TextColorRole, QColor("#6b7280"))
             table.setItem(row, 2, desc_item)
             
-            # Create action buttons
-            actions_widget = QWidget()
-            actions_widget.setStyleSheet("background: transparent;")
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(0, 0, 0, 0)
-            actions_layout.setSpacing(6)
-            
-            # Edit button
-            edit_btn = QPushButton("Edit")
-            edit_btn.setCursor(Qt.PointingHandCursor)
-            edit_btn.setStyleSheet("""
-                QPushButton {
-                    background: #3b82f6;
-                    color: white;
-                    border: none;
-                    border-radius: 6px;
-                    padding: 4px 12px;
-                    min-width: 60px;
-                    min-height: 28px;
-                    font-size: 12px;
-                    font-weight: 500;
-                    margin-right: 6px;
-                }
-                QPushButton:hover {
-                    background: #2563eb;
-                }
-                QPushButton:pressed {
-                    background: #1d4ed8;
-                }
-                QPushButton:disabled {
-                    background: #94a3b8;
-                }
-            """)
-            edit_btn.clicked.connect(lambda _, r=row: self.edit_reminder(r))
-            
-            # Delete button
-            delete_btn = QPushButton("Delete")
-            delete_btn.setCursor(Qt.PointingHandCursor)
-            delete_btn.setStyleSheet("""
-                QPushButton {
-                    background: #ef4444;
-                    color: white;
-                    border: none;
-                    border-radius: 6px;
-                    padding: 4px 12px;
-                    min-width: 60px;
-                    min-height: 28px;
-                    font-size: 12px;
-                    font-weight: 500;
-                    margin-right: 6px;
-                }
-                QPushButton:hover {
-                    background: #dc2626;
-                }
-                QPushButton:pressed {
-                    background: #b91c1c;
-                }
-            """)
-            delete_btn.clicked.connect(lambda _, r=row: self.delete_reminder(r))
-            
-            # Complete/Undo button
-            complete_text = "Undo" if reminder["completed"] else "Complete"
-            complete_btn = QPushButton(complete_text)
-            complete_btn.setCursor(Qt.PointingHandCursor)
-            complete_btn.setStyleSheet("""
-                QPushButton {
-                    background: #10b981;
-                    color: white;
-                    border: none;
-                    border-radius: 6px;
-                    padding: 4px 12px;
-                    min-width: 70px;
-                    padding: 2px 8px;
-                    min-height: 28px;
-                    font-size: 12px;
-                    font-weight: 500;
-                }
-                QPushButton:hover {
-                    background: #059669;
-                }
-                QPushButton:pressed {
-                    background: #047857;
-                }
-            """)
-            complete_btn.clicked.connect(lambda _, r=row: self.toggle_reminder_completion(r))
-            
+            # Edit/Delete/Complete are painted by the actions delegate; the
+            # row number is the index into self.reminders
             if reminder["completed"]:
-                edit_btn.setEnabled(False)
-            
-            actions_layout.addWidget(edit_btn)
-            actions_layout.addWidget(delete_btn)
-            actions_layout.addWidget(complete_btn)
-            table.setCellWidget(row, 3, actions_widget)
-            # Set minimum width for the actions column
-            table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeToContents)
-            table.horizontalHeader().setMinimumSectionSize(240)  # Ensure enough width for all buttons
+                table.setItem(row, 3, action_item(actions=('edit', 'delete', 'undo'),
+                                                  disabled=('edit',)))
+            else:
+                table.setItem(row, 3, action_item(actions=('edit', 'delete', 'complete')))
+        # Set minimum width for the actions column
+        table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeToContents)
+        table.horizontalHeader().setMinimumSectionSize(240)  # Ensure enough width for all buttons
+
+    def on_reminder_action(self, action, row):
+        if action == 'edit':
+            self.edit_reminder(row)
+        elif action == 'delete':
+            self.delete_reminder(row)
+        elif action in ('complete', 'undo'):
+            self.toggle_reminder_completion(row)
     
     def edit_reminder(self, row):
         """Handle edit reminder action by navigating to Add Reminder screen"""
@@ -0,0 +1,158 @@
+"""
+Rendered icons and background images, kept in ``QPixmapCache``.
+
+Icons and backgrounds used to be loaded and scaled where they were drawn:
+the login background decoded a 6000x4000 photo once and smoothly rescaled
+all of it on every paint, and the sign-up page read its photo from disk
+again on every resize. Here each one is produced once and then reused:
+
+* ``svg_pixmap(name, size, ratio)`` rasterises ``icons/<name>.svg`` for one
+  size and device pixel ratio. The SVGs are compiled into
+  ``resources_rc`` (``pyrcc5 resources.qrc -o resources_rc.py``) and read
+  from ``:/icons``; an icon missing from the resource file is read from
+  disk. ``icon(name)`` wraps it in a ``QIcon`` that asks for the exact
+  size it is drawn at.
+* ``background_pixmap(path, size, ratio)`` covers ``size`` with the image,
+  cropped around its centre. The image is decoded once straight to the
+  size covering the desktop (``QImageReader`` scales JPEGs while decoding)
+  and that copy is cached; each size is scaled from it rather than from
+  the original file. The large photos stay on disk rather than in the
+  resource file, which would hold them in memory, at full size, for the
+  life of the process.
+
+Icons are keyed by name, pixel size and ratio, backgrounds by path and
+ratio; ``QPixmapCache`` drops the least recently used entries when it is
+over ``CACHE_LIMIT_KB``.
+"""
+import os
+
+from PyQt5.QtCore import QFile, QRect, QSize, Qt
+from PyQt5.QtGui import QGuiApplication, QIcon, QIconEngine, QImageReader, QPainter, QPixmap, QPixmapCache
+from PyQt5.QtSvg import QSvgRenderer
+from PyQt5.QtWidgets import QApplication, QStyleOption
+
+import resources_rc  # noqa: F401  (registers :/icons)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Room for two screen-sized backgrounds and the icons (Qt's default is 10 MB)
+CACHE_LIMIT_KB = 64 * 1024
+
+
+def _ensure_cache_limit():
+    if QPixmapCache.cacheLimit() < CACHE_LIMIT_KB:
+        QPixmapCache.setCacheLimit(CACHE_LIMIT_KB)
+
+
+def _svg_source(name):
+    resource = f':/icons/{name}.svg'
+    if QFile.exists(resource):
+        return resource
+    return os.path.join(BASE_DIR, 'icons', f'{name}.svg')
+
+
+def svg_pixmap(name, size, ratio=1.0):
+    """
+    ``icons/<name>.svg`` rendered at ``size`` (logical pixels) for a device
+    pixel ratio; a null pixmap if the icon does not exist.
+    """
+    width, height = round(size.width() * ratio), round(size.height() * ratio)
+    key = f'svg:{name}:{width}x{height}@{ratio:g}'
+    pixmap = QPixmapCache.find(key)
+    if pixmap is not None and not pixmap.isNull():
+        return pixmap
+    renderer = QSvgRenderer(_svg_source(name))
+    if not renderer.isValid():
+        return QPixmap()
+    pixmap = QPixmap(width, height)
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    renderer.render(painter)
+    painter.end()
+    pixmap.setDevicePixelRatio(ratio)
+    _ensure_cache_limit()
+    QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+class _SvgIconEngine(QIconEngine):
+    """Icon engine handing out cached renders of one SVG."""
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+    def pixmap(self, size, mode, state):
+        # ``size`` is in device pixels here; QIcon sets the ratio afterwards
+        pixmap = svg_pixmap(self.name, size)
+        if mode == QIcon.Disabled and not pixmap.isNull():
+            key = f'svg-disabled:{self.name}:{size.width()}x{size.height()}'
+            disabled = QPixmapCache.find(key)
+            if disabled is None or disabled.isNull():
+                disabled = QApplication.style().generatedIconPixmap(mode, pixmap, QStyleOption())
+                QPixmapCache.insert(key, disabled)
+            return disabled
+        return pixmap
+
+    def paint(self, painter, rect, mode, state):
+        ratio = painter.device().devicePixelRatioF() if painter.device() else 1.0
+        size = QSize(round(rect.width() * ratio), round(rect.height() * ratio))
+        painter.drawPixmap(rect, self.pixmap(size, mode, state))
+
+    def clone(self):
+        return _SvgIconEngine(self.name)
+
+
+def icon(name):
+    """A ``QIcon`` for ``icons/<name>.svg``, rasterised per size and ratio on demand."""
+    return QIcon(_SvgIconEngine(name))
+
+
+def _desktop_size(ratio):
+    """Pixel size of the desktop (all screens side by side) at ``ratio``."""
+    screen = QGuiApplication.primaryScreen()
+    size = screen.virtualSize() if screen is not None else QSize(1920, 1080)
+    return QSize(round(size.width() * ratio), round(size.height() * ratio))
+
+
+def _decode_covering(path, size):
+    """Decode ``path`` at the smallest size covering ``size`` (a null pixmap on failure)."""
+    reader = QImageReader(path)
+    original = reader.size()
+    if original.isValid():
+        reader.setScaledSize(original.scaled(size, Qt.KeepAspectRatioByExpanding))
+    image = reader.read()
+    if image.isNull():
+        return QPixmap()
+    return QPixmap.fromImage(image)
+
+
+def background_pixmap(path, size, ratio=1.0):
+    """
+    The image at ``path`` scaled to cover ``size`` (logical pixels) for a
+    device pixel ratio and cropped around its centre, or a null pixmap if
+    it cannot be read.
+    """
+    width, height = round(size.width() * ratio), round(size.height() * ratio)
+    key = f'background:{path}@{ratio:g}'
+    source = QPixmapCache.find(key)
+    if source is None or source.isNull():
+        source = QPixmap()
+    if source.width() < width or source.height() < height:
+        # Decoded covering the desktop; a window outgrowing that (or the
+        # copy cached so far) gets a copy half as large again, so a window
+        # dragged bigger step by step is not decoded at every step
+        desktop = _desktop_size(ratio)
+        source = _decode_covering(path, QSize(
+            max(width, desktop.width(), source.width() * 3 // 2),
+            max(height, desktop.height(), source.height() * 3 // 2),
+        ))
+        if source.isNull():
+            return source
+        _ensure_cache_limit()
+        QPixmapCache.insert(key, source)
+    scaled = source.scaled(width, height, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+    pixmap = scaled.copy(QRect((scaled.width() - width) // 2, (scaled.height() - height) // 2,
+                               width, height))
+    pixmap.setDevicePixelRatio(ratio)
+    return pixmap
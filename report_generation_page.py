@@ -1,14 +1,28 @@
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QVBoxLayout, QHBoxLayout, QRadioButton, QButtonGroup, QGroupBox, QComboBox, 
-    QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QFrame, QSizePolicy, QDateEdit, QMessageBox
+    QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QFrame, QSizePolicy, QDateEdit, QMessageBox,
+    QProgressBar
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QSize, pyqtSignal
 from PyQt5.QtGui import QFont, QColor
 import database
+from table_delegates import ActionButton, ActionButtonsDelegate, action_item
+from data.report_jobs import get_report_jobs
+from theme import set_variant
 
 class ReportGenerationPage(QWidget):
+    # Emitted from the report thread with a ReportJob; delivered on the GUI thread (queued)
+    report_progress = pyqtSignal(object)
+    report_ready = pyqtSignal(object)
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Reports run as jobs on the read-only report thread (see data/report_jobs.py)
+        self._reports = get_report_jobs(database.DB_FILE)
+        self._job = None
+        # Queued even when emitted on the GUI thread: a cached report finishes inside submit()
+        self.report_progress.connect(self._show_progress, Qt.QueuedConnection)
+        self.report_ready.connect(self._show_report_preview, Qt.QueuedConnection)
         self.initUI()
 
     def initUI(self):
@@ -113,6 +127,16 @@ class ReportGenerationPage(QWidget):
             }
         """)
         self.generate_btn.clicked.connect(self.generate_report)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFixedWidth(240)
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.hide()
+        self.cancel_btn = QPushButton("Cancel")
+        set_variant(self.cancel_btn, 'variant', 'secondary')
+        self.cancel_btn.clicked.connect(self.cancel_report)
+        self.cancel_btn.hide()
+        btn_row.addWidget(self.progress_bar)
+        btn_row.addWidget(self.cancel_btn)
         btn_row.addWidget(self.generate_btn)
         btn_row_widget = QWidget()
         btn_row_widget.setLayout(btn_row)
@@ -170,6 +194,12 @@ class ReportGenerationPage(QWidget):
                 font-family: 'Inter', 'Segoe UI', Arial, sans-serif;
             }
         """)
+        # The Delete buttons are painted; a click reports the row
+        self.delete_delegate = ActionButtonsDelegate(self.table, buttons=(
+            ActionButton('delete', "Delete", '#ef4444', '#ffffff', '#ef4444'),
+        ), button_size=QSize(80, 32), radius=6)
+        self.delete_delegate.clicked.connect(lambda action, row: self._on_delete_clicked(row))
+        self._set_actions_column(5)
         main_layout.addWidget(self.table)
 
         # Example data for preview
@@ -189,39 +219,13 @@ class ReportGenerationPage(QWidget):
             self.table.setItem(row, 2, QTableWidgetItem(isbn))
             self.table.setItem(row, 3, QTableWidgetItem(available))
             self.table.setItem(row, 4, QTableWidgetItem(total))
-            # Create and style the delete button
-            delete_btn = QPushButton("Delete")
-            delete_btn.setFixedSize(80, 32)
-            delete_btn.setStyleSheet("""
-                QPushButton {
-                    background: #ef4444;
-                    color: white;
-                    border: none;
-                    border-radius: 6px;
-                    padding: 6px 12px;
-                    font-size: 13px;
-                    font-weight: 500;
-                    min-width: 80px;
-                }
-                QPushButton:hover {
-                    background: #dc2626;
-                    box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
-                }
-                QPushButton:pressed {
-                    background: #b91c1c;
-                }
-            """)
-            delete_btn.clicked.connect(lambda checked, r=row: self._on_delete_clicked(r))
-            
-            # Create a container widget for proper centering with adjusted margins
-            container = QWidget()
-            container.setStyleSheet("background: transparent;")
-            layout = QHBoxLayout(container)
-            layout.setSpacing(0)
-            layout.setContentsMargins(8, 6, 8, 6)  # Add some vertical padding
-            layout.addWidget(delete_btn, 0, Qt.AlignCenter)
-            container.setLayout(layout)
-            self.table.setCellWidget(row, 5, container)  # Place in Actions column (index 5)
+            self.table.setItem(row, 5, action_item())  # Actions column (index 5)
+
+    def _set_actions_column(self, column):
+        """Paint the Delete buttons in ``column`` only."""
+        for col in range(self.table.columnCount()):
+            self.table.setItemDelegateForColumn(
+                col, self.delete_delegate if col == column else self.table.itemDelegate())
 
     def _on_delete_clicked(self, row):
         """Handle delete button click"""
@@ -263,15 +267,41 @@ class ReportGenerationPage(QWidget):
         # Get the selected report type text
         selected_report = self.report_buttons[selected_id].parent().findChild(QLabel).text()
         
+        # A new report replaces the one still running
+        if self._job is not None:
+            self._job.cancel()
+
         # Show loading state
         self.generate_btn.setEnabled(False)
         self.generate_btn.setText("Generating...")
-        
-        # Simulate report generation delay
-        from PyQt5.QtCore import QTimer
-        QTimer.singleShot(1500, lambda: self._show_report_preview(selected_report))
-    
-    def _show_inventory_report(self):
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setFormat("Running query...")
+        self.progress_bar.show()
+        self.cancel_btn.show()
+
+        # Unchanged data is answered from the cache before submit returns
+        self._job = self._reports.submit(
+            selected_report,
+            on_progress=self.report_progress.emit,
+            on_done=self.report_ready.emit,
+        )
+
+    def cancel_report(self):
+        """Cancel the running report; the preview keeps its current rows."""
+        if self._job is not None:
+            self._job.cancel()
+
+    def _show_progress(self, job):
+        if job is not self._job or job.finished:
+            return
+        if job.progress is None:
+            self.progress_bar.setRange(0, 0)
+        else:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(int(job.progress * 100))
+        self.progress_bar.setFormat(f"{job.rows:,} rows")
+
+    def _show_inventory_report(self, rows):
         """Show inventory status report"""
         # Clear existing data
         self.table.setRowCount(0)
@@ -279,19 +309,9 @@ class ReportGenerationPage(QWidget):
         # Set table headers
         self.table.setColumnCount(6)
         self.table.setHorizontalHeaderLabels(["Title", "Author", "ISBN", "Available", "Total", "Actions"])
+        self._set_actions_column(5)
         
         try:
-            # Fetch data from database
-            rows = database.execute_query(
-                """
-                SELECT title, author, isbn, stock as available, 
-                       (SELECT COUNT(*) FROM books b2 WHERE b2.isbn = b1.isbn) as total
-                FROM books b1
-                GROUP BY isbn
-                ORDER BY title
-                """
-            )
-            
             # Populate table with data
             self.table.setRowCount(len(rows))
             for row, book in enumerate(rows):
@@ -301,42 +321,12 @@ class ReportGenerationPage(QWidget):
                 self.table.setItem(row, 3, QTableWidgetItem(str(book['available'])))
                 self.table.setItem(row, 4, QTableWidgetItem(str(book['total'])))
 
-                # Add delete button
-                delete_btn = QPushButton("Delete")
-                delete_btn.setFixedSize(80, 32)  # Fixed size for consistency
-                delete_btn.setStyleSheet("""
-                    QPushButton {
-                        background: #ef4444;
-                        color: white;
-                        border: none;
-                        border-radius: 6px;
-                        padding: 6px 12px;
-                        font-size: 13px;
-                        font-weight: 500;
-                        min-width: 80px;
-                    }
-                    QPushButton:hover {
-                        background: #dc2626;
-                        box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
-                    }
-                    QPushButton:pressed {
-                        background: #b91c1c;
-                    }
-                """)
-                delete_btn.clicked.connect(lambda checked, r=row: self._on_delete_clicked(r))
-                # Create a container widget for proper centering
-                container = QWidget()
-                layout = QHBoxLayout(container)
-                layout.addWidget(delete_btn)
-                layout.setAlignment(Qt.AlignCenter)
-                layout.setContentsMargins(0, 0, 0, 0)
-                container.setLayout(layout)
-                self.table.setCellWidget(row, 5, container)
+                self.table.setItem(row, 5, action_item())
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load inventory report: {str(e)}")
 
-    def _show_borrowed_books_report(self):
+    def _show_borrowed_books_report(self, rows):
         """Show borrowed books report"""
         # Clear existing data
         self.table.setRowCount(0)
@@ -344,20 +334,9 @@ class ReportGenerationPage(QWidget):
         # Set table headers
         self.table.setColumnCount(7)
         self.table.setHorizontalHeaderLabels(["Title", "Borrower", "Borrow Date", "Due Date", "Days Left", "Status", "Actions"])
+        self._set_actions_column(6)
         
         try:
-            # Fetch data from database
-            rows = database.execute_query(
-                """
-                SELECT b.title, u.full_name as borrower, t.issue_date, t.due_date, t.status
-                FROM transactions t
-                JOIN books b ON t.book_id = b.id
-                JOIN users u ON t.user_id = u.id
-                WHERE t.status IN ('Borrowed', 'Overdue')
-                ORDER BY t.due_date
-                """
-            )
-            
             # Populate table with data
             self.table.setRowCount(len(rows))
             for row, record in enumerate(rows):
@@ -379,50 +358,49 @@ class ReportGenerationPage(QWidget):
                     self.table.setItem(row, 4, QTableWidgetItem("N/A"))
                     self.table.setItem(row, 5, QTableWidgetItem(record['status']))
                 
-                # Add delete button with consistent styling
-                delete_btn = QPushButton("Delete")
-                delete_btn.setFixedSize(80, 32)
-                delete_btn.setStyleSheet("""
-                    QPushButton {
-                        background: #ef4444;
-                        color: white;
-                        border: none;
-                        border-radius: 6px;
-                        padding: 6px 12px;
-                        font-size: 13px;
-                        font-weight: 500;
-                        min-width: 80px;
-                    }
-                    QPushButton:hover {
-                        background: #dc2626;
-                        box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
-                    }
-                    QPushButton:pressed {
-                        background: #b91c1c;
-                    }
-                """)
-                delete_btn.clicked.connect(lambda checked, r=row: self._on_delete_clicked(r))
-                
-                # Create a container widget for proper centering
-                container = QWidget()
-                layout = QHBoxLayout(container)
-                layout.addWidget(delete_btn)
-                layout.setAlignment(Qt.AlignCenter)
-                layout.setContentsMargins(0, 0, 0, 0)
-                container.setLayout(layout)
-                self.table.setCellWidget(row, 6, container)
+                self.table.setItem(row, 6, action_item())
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load borrowed books report: {str(e)}")
 
-    def _show_report_preview(self, report_type):
+    def _show_user_activity_report(self, rows):
+        """Show user activity report"""
+        self.table.setRowCount(0)
+        self.table.setColumnCount(6)
+        self.table.setHorizontalHeaderLabels(["Member", "Email", "Borrowed", "Returned", "Overdue", "Last Activity"])
+        # No actions on member rows
+        self._set_actions_column(-1)
+
+        self.table.setRowCount(len(rows))
+        for row, record in enumerate(rows):
+            self.table.setItem(row, 0, QTableWidgetItem(record['user_name'] or ''))
+            self.table.setItem(row, 1, QTableWidgetItem(record['user_email'] or ''))
+            self.table.setItem(row, 2, QTableWidgetItem(str(record['total_borrowed'])))
+            self.table.setItem(row, 3, QTableWidgetItem(str(record['books_returned'])))
+            self.table.setItem(row, 4, QTableWidgetItem(str(record['overdue_books'])))
+            self.table.setItem(row, 5, QTableWidgetItem(record['last_activity'] or ''))
+
+    def _show_report_preview(self, job):
+        if job is not self._job:
+            return  # superseded by a newer report
+        self._job = None
         # Reset button state
         self.generate_btn.setEnabled(True)
         self.generate_btn.setText("Generate Report")
-        
+        self.progress_bar.hide()
+        self.cancel_btn.hide()
+
+        if job.status == 'cancelled':
+            return
+        if job.status == 'failed':
+            QMessageBox.critical(self, "Error", f"Failed to load {job.report.lower()} report: {str(job.error)}")
+            return
+
         # Update the preview based on report type
-        if report_type == "Inventory Status":
-            self._show_inventory_report()
-        elif report_type == "Borrowed Books":
-            self._show_borrowed_books_report()
-        # No else needed as we want to keep the default table state with Delete in Actions column
\ No newline at end of file
+        rows = job.result.rows
+        if job.report == "Inventory Status":
+            self._show_inventory_report(rows)
+        elif job.report in ("Borrowed Books", "Overdue Books"):
+            self._show_borrowed_books_report(rows)
+        elif job.report == "User Activity":
+            self._show_user_activity_report(rows)
@@ -1,7 +1,10 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QSizePolicy, QComboBox, QDateEdit, QMessageBox
-from PyQt5.QtCore import Qt, QDate, pyqtSignal
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableView, QHeaderView, QSizePolicy, QComboBox, QDateEdit, QMessageBox
+from PyQt5.QtCore import Qt, QDate, QSize, pyqtSignal, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QTimer
 from PyQt5.QtGui import QFont, QIcon
 import database
+from data import reservation_list
+from data.reservation_list import ReservationList
+from table_delegates import ActionButton, ActionButtonsDelegate
 
 class CreateReservationScreen(QWidget):
     reservation_added = pyqtSignal()
@@ -166,6 +169,111 @@ class CreateReservationScreen(QWidget):
             # Re-enable UI
             self.setEnabled(True)
 
+class ReservationTableModel(QAbstractTableModel):
+    """
+    Every reservation, held once in a ``ReservationList``. Rows arrive a page
+    at a time: the first page is loaded at once, the rest in the background
+    of the event loop, so the table is usable while a large list loads.
+    """
+    HEADERS = ["ID", "Book Title", "User", "Reservation Date", "Actions"]
+    FIELDS = (reservation_list.ID, reservation_list.BOOK_TITLE,
+              reservation_list.USER_NAME, reservation_list.RESERVATION_DATE)
+    page_loaded = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.reservations = ReservationList()
+        self._generation = 0
+
+    def load(self):
+        """(Re)load the list from the database."""
+        self._generation += 1
+        self.beginResetModel()
+        self.reservations.clear()
+        self.reservations.load_page(database.get_all_reservations)
+        self.endResetModel()
+        self.page_loaded.emit()
+        self._load_next(self._generation)
+
+    def _load_next(self, generation):
+        if generation != self._generation or self.reservations.complete:
+            return
+        first = len(self.reservations)
+        page = database.get_all_reservations(limit=reservation_list.PAGE_SIZE,
+                                             after=self.reservations.cursor)
+        if page:
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self.reservations.extend(page)
+            self.endInsertRows()
+            self.page_loaded.emit()
+        if len(page) < reservation_list.PAGE_SIZE:
+            self.reservations.complete = True
+        else:
+            QTimer.singleShot(0, lambda: self._load_next(generation))
+
+    def remove(self, reservation_id):
+        row = self.reservations.index_of(reservation_id)
+        if row is not None:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.reservations.rows[row]
+            self.endRemoveRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.reservations)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.reservations.rows[index.row()]
+        column = index.column()
+        if role == Qt.UserRole:
+            return row[reservation_list.ID]
+        if role == Qt.DisplayRole and column < len(self.FIELDS):
+            value = row[self.FIELDS[column]]
+            return str(value) if column == 0 else value
+        return None
+
+
+class ReservationFilterProxy(QSortFilterProxyModel):
+    """
+    Filters by book title or member name. A search is resolved once per
+    keystroke against the distinct titles and names, so accepting a row is
+    a set lookup; sorting compares the stored values directly.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._search = ''
+        self._matched = None
+
+    def set_search(self, text):
+        self._search = text
+        self.refresh()
+
+    def refresh(self):
+        """Re-filter (after a keystroke, or when a page brought new titles or names)."""
+        matched = self.sourceModel().reservations.matching(self._search)
+        if matched != self._matched:
+            self._matched = matched
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.sourceModel().reservations.accepts(source_row, self._matched)
+
+    def lessThan(self, left, right):
+        rows = self.sourceModel().reservations.rows
+        field = ReservationTableModel.FIELDS[min(left.column(), len(ReservationTableModel.FIELDS) - 1)]
+        return rows[left.row()][field] < rows[right.row()][field]
+
+
 class ReservationManagementPage(QWidget):
     def __init__(self):
         super().__init__()
@@ -202,32 +310,45 @@ class ReservationManagementPage(QWidget):
         """)
         main_layout.addWidget(self.search_bar)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(5) # ID, Book Title, User, Reservation Date, Actions
-        self.all_reservations = []  # Store all reservations for filtering
-        self.table.setHorizontalHeaderLabels(["ID", "Book Title", "User", "Reservation Date", "Actions"])
+        self.table = QTableView()
+        # One source model holds the reservations; the proxy filters and sorts them
+        self.model = ReservationTableModel(self.table)
+        self.proxy = ReservationFilterProxy(self.table)
+        self.proxy.setSourceModel(self.model)
+        self.model.page_loaded.connect(self.proxy.refresh)
+        self.table.setModel(self.proxy)
+        self.actions_delegate = ActionButtonsDelegate(self.table, buttons=(
+            ActionButton('edit', "Edit", '#1976d2', '#ffffff', '#1976d2'),
+            ActionButton('delete', "Delete", '#d32f2f', '#ffffff', '#d32f2f'),
+        ), button_size=QSize(75, 32), radius=16)
+        self.actions_delegate.clicked.connect(self.on_action_clicked)
+        self.table.setItemDelegateForColumn(4, self.actions_delegate)
         
         # Set column resize modes - let first 3 columns stretch, last column fixed width
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)  # ID
+        header.setSectionResizeMode(0, QHeaderView.Fixed)  # ID
         header.setSectionResizeMode(1, QHeaderView.Stretch)  # Book Title
         header.setSectionResizeMode(2, QHeaderView.Stretch)  # User
-        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)  # Date
-        header.setSectionResizeMode(4, QHeaderView.ResizeToContents)  # Actions
+        header.setSectionResizeMode(3, QHeaderView.Fixed)  # Date
+        header.setSectionResizeMode(4, QHeaderView.Fixed)  # Actions
+        # Newest first as loaded; a header click sorts
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
         
         # Set minimum width for the actions column to prevent cutting off buttons
-        header.setMinimumSectionSize(240)  # Increased to accommodate better button spacing
-        self.table.setColumnWidth(4, 240)  # Increased fixed width for actions column
+        self.table.setColumnWidth(3, 180)
+        self.table.setColumnWidth(4, 240)
         self.table.verticalHeader().setVisible(False)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.setSelectionMode(QTableWidget.NoSelection)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        self.table.setSelectionMode(QTableView.NoSelection)
         self.table.setShowGrid(False)
         self.table.setAlternatingRowColors(True)
         self.table.setFocusPolicy(Qt.NoFocus)
         self.table.verticalHeader().setDefaultSectionSize(70)  # Increased row height to prevent button cut-off
         self.table.setColumnHidden(0, True) # Hide ID column
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background: #fff;
                 border-radius: 20px;
                 font-size: 16px;
@@ -236,7 +357,7 @@ class ReservationManagementPage(QWidget):
                 padding: 0px;
                 alternate-background-color: #f9fafb;
             }
-            QTableWidget::item {
+            QTableView::item {
                 border-bottom: 1px solid #e5e7eb;
                 padding: 6px 8px 8px 8px;
             }
@@ -250,24 +371,6 @@ class ReservationManagementPage(QWidget):
                 padding: 16px 8px;
                 font-family: 'Inter', 'Segoe UI', Arial, sans-serif;
             }
-            QTableWidget QPushButton {
-                border-radius: 16px;
-                min-width: 75px;
-                min-height: 32px;
-                padding: 4px 12px;
-                font-size: 13px;
-                font-weight: 600;
-                margin: 4px 6px;
-                border: none;
-                background-color: #1976d2;
-                color: white;
-            }
-            QTableWidget QPushButton:hover {
-                background-color: #1565c0;
-            }
-            QTableWidget QPushButton:pressed {
-                background-color: #0d47a1;
-            }
         """)
         main_layout.addWidget(self.table)
         self.load_reservations()
@@ -282,129 +385,27 @@ class ReservationManagementPage(QWidget):
         main_layout.addLayout(btn_row)
 
     def load_reservations(self):
-        self.all_reservations = database.get_all_reservations()
-        self.filter_reservations()
+        self.model.load()
 
     def filter_reservations(self):
         """Filter reservations based on search text in book title or username"""
-        search_text = self.search_bar.text().lower().strip()
-
-        def _normalize(res):
-            # Convert dict rows (from database.get_all_reservations) or tuples into a unified 4-tuple
-            try:
-                if isinstance(res, dict):
-                    return (
-                        res.get('reservation_id') or res.get('id'),
-                        res.get('book_title', ''),
-                        res.get('user_name', ''),
-                        str(res.get('reservation_date', ''))
-                    )
-                # tuple/list fallback: assume order (res_id, book_title, username, res_date, ...)
-                return (res[0], res[1], res[2], res[3])
-            except Exception:
-                return (None, '', '', '')
-
-        normalized = [_normalize(r) for r in (self.all_reservations or [])]
-
-        if not search_text:
-            filtered_reservations = normalized
-        else:
-            filtered_reservations = [
-                r for r in normalized
-                if (search_text in str(r[1]).lower() or  # Book title
-                    search_text in str(r[2]).lower())     # Username
-            ]
-
-        # Update the table with filtered results
-        self.table.setRowCount(len(filtered_reservations))
-        for row, res_data in enumerate(filtered_reservations):
-            res_id, book_title, username, res_date = res_data
-            self.table.setItem(row, 0, QTableWidgetItem(str(res_id)))
-            self.table.setItem(row, 1, QTableWidgetItem(book_title))
-            self.table.setItem(row, 2, QTableWidgetItem(username))
-            self.table.setItem(row, 3, QTableWidgetItem(res_date))
-
-            # Recreate actions widget for each row
-            self._add_action_buttons(row, res_id)
-
-    def _add_action_buttons(self, row, res_id):
-        """Helper method to add action buttons to a table row"""
-        actions_widget = QWidget()
-        actions_widget.setStyleSheet("""
-            QWidget {
-                background: transparent;
-                margin: 2px 0;
-                border: none;
-                border-radius: 0;
-            }
-        """)
-        actions_layout = QHBoxLayout(actions_widget)
-        actions_layout.setContentsMargins(4, 0, 4, 0)  # Reduced side margins
-        actions_layout.setSpacing(2)  # Minimal spacing between buttons
-
-        # Edit button
-        edit_btn = QPushButton("Edit")
-        edit_btn.setToolTip("Edit")
-        edit_btn.setCursor(Qt.PointingHandCursor)
-        edit_btn.setStyleSheet("""
-            QPushButton {
-                background: #1976d2;
-                color: white;
-                border: none;
-                border-radius: 16px;
-                padding: 6px 12px;
-                min-width: 75px;
-                min-height: 32px;
-                font-size: 13px;
-                font-weight: 600;
-                margin-right: 2px;
-            }
-            QPushButton:hover {
-                background: #1565c0;
-            }
-            QPushButton:pressed {
-                background: #0d47a1;
-            }
-        """)
-        edit_btn.clicked.connect(lambda checked, r=row: self.handle_edit_reservation(r))
+        self.proxy.set_search(self.search_bar.text())
 
-        # Delete button
-        delete_btn = QPushButton("Delete")
-        delete_btn.setToolTip("Delete")
-        delete_btn.setCursor(Qt.PointingHandCursor)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background: #d32f2f;
-                color: white;
-                border: none;
-                border-radius: 16px;
-                padding: 6px 12px;
-                min-width: 75px;
-                min-height: 32px;
-                font-size: 13px;
-                font-weight: 600;
-                margin-left: 2px;
-            }
-            QPushButton:hover {
-                background: #b71c1c;
-            }
-            QPushButton:pressed {
-                background: #7f0000;
-            }
-        """)
-        delete_btn.clicked.connect(lambda checked, r=row: self.handle_delete_reservation(r))
-
-        actions_layout.addWidget(edit_btn)
-        actions_layout.addWidget(delete_btn)
-        actions_widget.setLayout(actions_layout)
-        self.table.setCellWidget(row, 4, actions_widget)
+    def on_action_clicked(self, action, res_id):
+        row = self.model.reservations.index_of(res_id)
+        if row is None:
+            return
+        reservation = self.model.reservations.rows[row]
+        if action == 'edit':
+            self.handle_edit_reservation(reservation)
+        elif action == 'delete':
+            self.handle_delete_reservation(reservation)
 
-    def handle_edit_reservation(self, row):
+    def handle_edit_reservation(self, reservation):
         """Handle edit reservation button click by opening the CreateReservationScreen in edit mode"""
-        res_id = self.table.item(row, 0).text()
-        book_title = self.table.item(row, 1).text()
-        username = self.table.item(row, 2).text()
-        res_date = self.table.item(row, 3).text()
+        book_title = reservation[reservation_list.BOOK_TITLE]
+        username = reservation[reservation_list.USER_NAME]
+        res_date = reservation[reservation_list.RESERVATION_DATE]
         
         # Open the create reservation screen in edit mode
         self.create_reservation_screen = CreateReservationScreen()
@@ -437,9 +438,9 @@ class ReservationManagementPage(QWidget):
         # Show the screen
         self.create_reservation_screen.showMaximized()
 
-    def handle_delete_reservation(self, row):
-        res_id = self.table.item(row, 0).text()
-        book_title = self.table.item(row, 1).text()
+    def handle_delete_reservation(self, reservation):
+        res_id = reservation[reservation_list.ID]
+        book_title = reservation[reservation_list.BOOK_TITLE]
         
         reply = QMessageBox.question(
             self, 
@@ -452,7 +453,7 @@ class ReservationManagementPage(QWidget):
         if reply == QMessageBox.Yes:
             if database.delete_reservation(res_id):
                 QMessageBox.information(self, "Success", "Reservation deleted successfully.")
-                self.load_reservations()
+                self.model.remove(res_id)
             else:
                 QMessageBox.warning(self, "Error", "Failed to delete reservation.")
 
@@ -1,64 +1,293 @@
-from PyQt5 import QtCore, QtGui, QtWidgets
+# -*- coding: utf-8 -*-
 
-def get_icon(name):
-    """Get an icon from the icons directory by name (without .svg extension)"""
-    import os
-    from PyQt5.QtSvg import QSvgRenderer
-    from PyQt5.QtGui import QPixmap, QIcon, QPainter
-    from PyQt5.QtCore import Qt
-    
-    # Path to the icons directory
-    icons_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'icons')
-    icon_path = os.path.join(icons_dir, f"{name}.svg")
-    
-    if not os.path.exists(icon_path):
-        print(f"Warning: Icon not found: {icon_path}")
-        return QIcon()
-    
-    # Create a pixmap and render the SVG into it
-    pixmap = QPixmap(24, 24)
-    pixmap.fill(Qt.transparent)
-    
-    renderer = QSvgRenderer(icon_path)
-    painter = QPainter(pixmap)
-    renderer.render(painter)
-    painter.end()
-    
-    return QIcon(pixmap)
+# Resource object code
+#
+# Created by: The Resource Compiler for PyQt5 (Qt v5.15.14)
+#
+# WARNING! All changes made in this file will be lost!
 
-# Create shortcut functions for commonly used icons
-def get_book_icon():
-    return get_icon("book")
+from PyQt5 import QtCore
 
-def get_home_icon():
-    return get_icon("home")
+qt_resource_data = b"\
+\x00\x00\x03\x2b\
+\x3c\
+\x3f\x78\x6d\x6c\x20\x76\x65\x72\x73\x69\x6f\x6e\x3d\x22\x31\x2e\
+\x30\x22\x20\x65\x6e\x63\x6f\x64\x69\x6e\x67\x3d\x22\x55\x54\x46\
+\x2d\x38\x22\x20\x73\x74\x61\x6e\x64\x61\x6c\x6f\x6e\x65\x3d\x22\
+\x6e\x6f\x22\x3f\x3e\x0a\x3c\x73\x76\x67\x20\x77\x69\x64\x74\x68\
+\x3d\x22\x38\x2e\x34\x36\x36\x36\x37\x6d\x6d\x22\x20\x68\x65\x69\
+\x67\x68\x74\x3d\x22\x38\x2e\x34\x36\x36\x36\x37\x6d\x6d\x22\x0a\
+\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\x30\x20\x30\x20\x32\x34\
+\x20\x32\x34\x22\x0a\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\
+\x70\x3a\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\
+\x30\x30\x30\x2f\x73\x76\x67\x22\x20\x78\x6d\x6c\x6e\x73\x3a\x78\
+\x6c\x69\x6e\x6b\x3d\x22\x68\x74\x74\x70\x3a\x2f\x2f\x77\x77\x77\
+\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x31\x39\x39\x39\x2f\x78\x6c\x69\
+\x6e\x6b\x22\x20\x20\x76\x65\x72\x73\x69\x6f\x6e\x3d\x22\x31\x2e\
+\x32\x22\x20\x62\x61\x73\x65\x50\x72\x6f\x66\x69\x6c\x65\x3d\x22\
+\x74\x69\x6e\x79\x22\x3e\x0a\x3c\x74\x69\x74\x6c\x65\x3e\x51\x74\
+\x20\x53\x56\x47\x20\x44\x6f\x63\x75\x6d\x65\x6e\x74\x3c\x2f\x74\
+\x69\x74\x6c\x65\x3e\x0a\x3c\x64\x65\x73\x63\x3e\x47\x65\x6e\x65\
+\x72\x61\x74\x65\x64\x20\x77\x69\x74\x68\x20\x51\x74\x3c\x2f\x64\
+\x65\x73\x63\x3e\x0a\x3c\x64\x65\x66\x73\x3e\x0a\x3c\x2f\x64\x65\
+\x66\x73\x3e\x0a\x3c\x67\x20\x66\x69\x6c\x6c\x3d\x22\x6e\x6f\x6e\
+\x65\x22\x20\x73\x74\x72\x6f\x6b\x65\x3d\x22\x62\x6c\x61\x63\x6b\
+\x22\x20\x73\x74\x72\x6f\x6b\x65\x2d\x77\x69\x64\x74\x68\x3d\x22\
+\x31\x22\x20\x66\x69\x6c\x6c\x2d\x72\x75\x6c\x65\x3d\x22\x65\x76\
+\x65\x6e\x6f\x64\x64\x22\x20\x73\x74\x72\x6f\x6b\x65\x2d\x6c\x69\
+\x6e\x65\x63\x61\x70\x3d\x22\x73\x71\x75\x61\x72\x65\x22\x20\x73\
+\x74\x72\x6f\x6b\x65\x2d\x6c\x69\x6e\x65\x6a\x6f\x69\x6e\x3d\x22\
+\x62\x65\x76\x65\x6c\x22\x20\x3e\x0a\x0a\x3c\x67\x20\x66\x69\x6c\
+\x6c\x3d\x22\x6e\x6f\x6e\x65\x22\x20\x73\x74\x72\x6f\x6b\x65\x3d\
+\x22\x23\x33\x34\x39\x38\x64\x62\x22\x20\x73\x74\x72\x6f\x6b\x65\
+\x2d\x6f\x70\x61\x63\x69\x74\x79\x3d\x22\x31\x22\x20\x73\x74\x72\
+\x6f\x6b\x65\x2d\x77\x69\x64\x74\x68\x3d\x22\x32\x22\x20\x73\x74\
+\x72\x6f\x6b\x65\x2d\x6c\x69\x6e\x65\x63\x61\x70\x3d\x22\x72\x6f\
+\x75\x6e\x64\x22\x20\x73\x74\x72\x6f\x6b\x65\x2d\x6c\x69\x6e\x65\
+\x6a\x6f\x69\x6e\x3d\x22\x72\x6f\x75\x6e\x64\x22\x20\x74\x72\x61\
+\x6e\x73\x66\x6f\x72\x6d\x3d\x22\x6d\x61\x74\x72\x69\x78\x28\x31\
+\x2c\x30\x2c\x30\x2c\x31\x2c\x30\x2c\x30\x29\x22\x0a\x66\x6f\x6e\
+\x74\x2d\x66\x61\x6d\x69\x6c\x79\x3d\x22\x4d\x53\x20\x53\x68\x65\
+\x6c\x6c\x20\x44\x6c\x67\x20\x32\x22\x20\x66\x6f\x6e\x74\x2d\x73\
+\x69\x7a\x65\x3d\x22\x38\x2e\x32\x35\x22\x20\x66\x6f\x6e\x74\x2d\
+\x77\x65\x69\x67\x68\x74\x3d\x22\x34\x30\x30\x22\x20\x66\x6f\x6e\
+\x74\x2d\x73\x74\x79\x6c\x65\x3d\x22\x6e\x6f\x72\x6d\x61\x6c\x22\
+\x20\x0a\x3e\x0a\x3c\x70\x6f\x6c\x79\x6c\x69\x6e\x65\x20\x66\x69\
+\x6c\x6c\x3d\x22\x6e\x6f\x6e\x65\x22\x20\x76\x65\x63\x74\x6f\x72\
+\x2d\x65\x66\x66\x65\x63\x74\x3d\x22\x6e\x6f\x6e\x65\x22\x20\x70\
+\x6f\x69\x6e\x74\x73\x3d\x22\x31\x34\x2c\x37\x20\x37\x2c\x31\x32\
+\x20\x22\x20\x2f\x3e\x0a\x3c\x70\x6f\x6c\x79\x6c\x69\x6e\x65\x20\
+\x66\x69\x6c\x6c\x3d\x22\x6e\x6f\x6e\x65\x22\x20\x76\x65\x63\x74\
+\x6f\x72\x2d\x65\x66\x66\x65\x63\x74\x3d\x22\x6e\x6f\x6e\x65\x22\
+\x20\x70\x6f\x69\x6e\x74\x73\x3d\x22\x37\x2c\x31\x32\x20\x31\x34\
+\x2c\x31\x37\x20\x22\x20\x2f\x3e\x0a\x3c\x2f\x67\x3e\x0a\x3c\x2f\
+\x67\x3e\x0a\x3c\x2f\x73\x76\x67\x3e\x0a\
+\x00\x00\x01\x9c\
+\x3c\
+\x3f\x78\x6d\x6c\x20\x76\x65\x72\x73\x69\x6f\x6e\x3d\x22\x31\x2e\
+\x30\x22\x20\x65\x6e\x63\x6f\x64\x69\x6e\x67\x3d\x22\x55\x54\x46\
+\x2d\x38\x22\x3f\x3e\x0a\x3c\x73\x76\x67\x20\x77\x69\x64\x74\x68\
+\x3d\x22\x32\x34\x22\x20\x68\x65\x69\x67\x68\x74\x3d\x22\x32\x34\
+\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\x30\x20\x30\x20\x32\
+\x34\x20\x32\x34\x22\x20\x66\x69\x6c\x6c\x3d\x22\x6e\x6f\x6e\x65\
+\x22\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\x2f\x2f\
+\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\x30\x2f\
+\x73\x76\x67\x22\x3e\x0a\x20\x20\x3c\x70\x61\x74\x68\x20\x64\x3d\
+\x22\x4d\x31\x34\x2e\x30\x36\x20\x39\x2e\x30\x32\x4c\x31\x34\x2e\
+\x39\x38\x20\x39\x2e\x39\x34\x4c\x35\x2e\x39\x32\x20\x31\x39\x48\
+\x35\x56\x31\x38\x2e\x30\x38\x4c\x31\x34\x2e\x30\x36\x20\x39\x2e\
+\x30\x32\x5a\x4d\x31\x37\x2e\x36\x36\x20\x33\x43\x31\x37\x2e\x34\
+\x31\x20\x33\x20\x31\x37\x2e\x31\x35\x20\x33\x2e\x31\x20\x31\x36\
+\x2e\x39\x36\x20\x33\x2e\x32\x39\x4c\x31\x35\x2e\x31\x33\x20\x35\
+\x2e\x31\x32\x4c\x31\x38\x2e\x38\x38\x20\x38\x2e\x38\x37\x4c\x32\
+\x30\x2e\x37\x31\x20\x37\x2e\x30\x34\x43\x32\x31\x2e\x31\x20\x36\
+\x2e\x36\x35\x20\x32\x31\x2e\x31\x20\x36\x2e\x30\x32\x20\x32\x30\
+\x2e\x37\x31\x20\x35\x2e\x36\x33\x4c\x31\x38\x2e\x33\x37\x20\x33\
+\x2e\x32\x39\x43\x31\x38\x2e\x31\x37\x20\x33\x2e\x30\x39\x20\x31\
+\x37\x2e\x39\x32\x20\x33\x20\x31\x37\x2e\x36\x36\x20\x33\x5a\x4d\
+\x31\x34\x2e\x30\x36\x20\x36\x2e\x31\x39\x4c\x33\x20\x31\x37\x2e\
+\x32\x35\x56\x32\x31\x48\x36\x2e\x37\x35\x4c\x31\x37\x2e\x38\x31\
+\x20\x39\x2e\x39\x34\x4c\x31\x34\x2e\x30\x36\x20\x36\x2e\x31\x39\
+\x5a\x22\x20\x66\x69\x6c\x6c\x3d\x22\x23\x32\x31\x39\x36\x46\x33\
+\x22\x2f\x3e\x0a\x3c\x2f\x73\x76\x67\x3e\x0a\
+\x00\x00\x03\x57\
+\x3c\
+\x3f\x78\x6d\x6c\x20\x76\x65\x72\x73\x69\x6f\x6e\x3d\x22\x31\x2e\
+\x30\x22\x20\x65\x6e\x63\x6f\x64\x69\x6e\x67\x3d\x22\x55\x54\x46\
+\x2d\x38\x22\x20\x73\x74\x61\x6e\x64\x61\x6c\x6f\x6e\x65\x3d\x22\
+\x6e\x6f\x22\x3f\x3e\x0a\x3c\x73\x76\x67\x20\x77\x69\x64\x74\x68\
+\x3d\x22\x38\x2e\x34\x36\x36\x36\x37\x6d\x6d\x22\x20\x68\x65\x69\
+\x67\x68\x74\x3d\x22\x38\x2e\x34\x36\x36\x36\x37\x6d\x6d\x22\x0a\
+\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\x30\x20\x30\x20\x32\x34\
+\x20\x32\x34\x22\x0a\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\
+\x70\x3a\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\
+\x30\x30\x30\x2f\x73\x76\x67\x22\x20\x78\x6d\x6c\x6e\x73\x3a\x78\
+\x6c\x69\x6e\x6b\x3d\x22\x68\x74\x74\x70\x3a\x2f\x2f\x77\x77\x77\
+\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x31\x39\x39\x39\x2f\x78\x6c\x69\
+\x6e\x6b\x22\x20\x20\x76\x65\x72\x73\x69\x6f\x6e\x3d\x22\x31\x2e\
+\x32\x22\x20\x62\x61\x73\x65\x50\x72\x6f\x66\x69\x6c\x65\x3d\x22\
+\x74\x69\x6e\x79\x22\x3e\x0a\x3c\x74\x69\x74\x6c\x65\x3e\x51\x74\
+\x20\x53\x56\x47\x20\x44\x6f\x63\x75\x6d\x65\x6e\x74\x3c\x2f\x74\
+\x69\x74\x6c\x65\x3e\x0a\x3c\x64\x65\x73\x63\x3e\x47\x65\x6e\x65\
+\x72\x61\x74\x65\x64\x20\x77\x69\x74\x68\x20\x51\x74\x3c\x2f\x64\
+\x65\x73\x63\x3e\x0a\x3c\x64\x65\x66\x73\x3e\x0a\x3c\x2f\x64\x65\
+\x66\x73\x3e\x0a\x3c\x67\x20\x66\x69\x6c\x6c\x3d\x22\x6e\x6f\x6e\
+\x65\x22\x20\x73\x74\x72\x6f\x6b\x65\x3d\x22\x62\x6c\x61\x63\x6b\
+\x22\x20\x73\x74\x72\x6f\x6b\x65\x2d\x77\x69\x64\x74\x68\x3d\x22\
+\x31\x22\x20\x66\x69\x6c\x6c\x2d\x72\x75\x6c\x65\x3d\x22\x65\x76\
+\x65\x6e\x6f\x64\x64\x22\x20\x73\x74\x72\x6f\x6b\x65\x2d\x6c\x69\
+\x6e\x65\x63\x61\x70\x3d\x22\x73\x71\x75\x61\x72\x65\x22\x20\x73\
+\x74\x72\x6f\x6b\x65\x2d\x6c\x69\x6e\x65\x6a\x6f\x69\x6e\x3d\x22\
+\x62\x65\x76\x65\x6c\x22\x20\x3e\x0a\x0a\x3c\x67\x20\x66\x69\x6c\
+\x6c\x3d\x22\x6e\x6f\x6e\x65\x22\x20\x73\x74\x72\x6f\x6b\x65\x3d\
+\x22\x23\x65\x37\x34\x63\x33\x63\x22\x20\x73\x74\x72\x6f\x6b\x65\
+\x2d\x6f\x70\x61\x63\x69\x74\x79\x3d\x22\x31\x22\x20\x73\x74\x72\
+\x6f\x6b\x65\x2d\x77\x69\x64\x74\x68\x3d\x22\x32\x22\x20\x73\x74\
+\x72\x6f\x6b\x65\x2d\x6c\x69\x6e\x65\x63\x61\x70\x3d\x22\x72\x6f\
+\x75\x6e\x64\x22\x20\x73\x74\x72\x6f\x6b\x65\x2d\x6c\x69\x6e\x65\
+\x6a\x6f\x69\x6e\x3d\x22\x72\x6f\x75\x6e\x64\x22\x20\x74\x72\x61\
+\x6e\x73\x66\x6f\x72\x6d\x3d\x22\x6d\x61\x74\x72\x69\x78\x28\x31\
+\x2c\x30\x2c\x30\x2c\x31\x2c\x30\x2c\x30\x29\x22\x0a\x66\x6f\x6e\
+\x74\x2d\x66\x61\x6d\x69\x6c\x79\x3d\x22\x4d\x53\x20\x53\x68\x65\
+\x6c\x6c\x20\x44\x6c\x67\x20\x32\x22\x20\x66\x6f\x6e\x74\x2d\x73\
+\x69\x7a\x65\x3d\x22\x38\x2e\x32\x35\x22\x20\x66\x6f\x6e\x74\x2d\
+\x77\x65\x69\x67\x68\x74\x3d\x22\x34\x30\x30\x22\x20\x66\x6f\x6e\
+\x74\x2d\x73\x74\x79\x6c\x65\x3d\x22\x6e\x6f\x72\x6d\x61\x6c\x22\
+\x20\x0a\x3e\x0a\x3c\x70\x61\x74\x68\x20\x76\x65\x63\x74\x6f\x72\
+\x2d\x65\x66\x66\x65\x63\x74\x3d\x22\x6e\x6f\x6e\x65\x22\x20\x66\
+\x69\x6c\x6c\x2d\x72\x75\x6c\x65\x3d\x22\x65\x76\x65\x6e\x6f\x64\
+\x64\x22\x20\x64\x3d\x22\x4d\x31\x32\x2c\x34\x20\x4c\x32\x30\x2c\
+\x32\x30\x20\x4c\x34\x2c\x32\x30\x20\x4c\x31\x32\x2c\x34\x22\x2f\
+\x3e\x0a\x3c\x70\x6f\x6c\x79\x6c\x69\x6e\x65\x20\x66\x69\x6c\x6c\
+\x3d\x22\x6e\x6f\x6e\x65\x22\x20\x76\x65\x63\x74\x6f\x72\x2d\x65\
+\x66\x66\x65\x63\x74\x3d\x22\x6e\x6f\x6e\x65\x22\x20\x70\x6f\x69\
+\x6e\x74\x73\x3d\x22\x31\x32\x2c\x39\x20\x31\x32\x2c\x31\x35\x20\
+\x22\x20\x2f\x3e\x0a\x3c\x63\x69\x72\x63\x6c\x65\x20\x63\x78\x3d\
+\x22\x31\x32\x22\x20\x63\x79\x3d\x22\x31\x37\x22\x20\x72\x3d\x22\
+\x31\x22\x2f\x3e\x0a\x3c\x2f\x67\x3e\x0a\x3c\x2f\x67\x3e\x0a\x3c\
+\x2f\x73\x76\x67\x3e\x0a\
+\x00\x00\x01\x0a\
+\x3c\
+\x3f\x78\x6d\x6c\x20\x76\x65\x72\x73\x69\x6f\x6e\x3d\x22\x31\x2e\
+\x30\x22\x20\x65\x6e\x63\x6f\x64\x69\x6e\x67\x3d\x22\x55\x54\x46\
+\x2d\x38\x22\x3f\x3e\x0a\x3c\x73\x76\x67\x20\x77\x69\x64\x74\x68\
+\x3d\x22\x32\x34\x22\x20\x68\x65\x69\x67\x68\x74\x3d\x22\x32\x34\
+\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\x30\x20\x30\x20\x32\
+\x34\x20\x32\x34\x22\x20\x66\x69\x6c\x6c\x3d\x22\x6e\x6f\x6e\x65\
+\x22\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\x2f\x2f\
+\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\x30\x2f\
+\x73\x76\x67\x22\x3e\x0a\x20\x20\x3c\x70\x61\x74\x68\x20\x64\x3d\
+\x22\x4d\x36\x20\x31\x39\x43\x36\x20\x32\x30\x2e\x31\x20\x36\x2e\
+\x39\x20\x32\x31\x20\x38\x20\x32\x31\x48\x31\x36\x43\x31\x37\x2e\
+\x31\x20\x32\x31\x20\x31\x38\x20\x32\x30\x2e\x31\x20\x31\x38\x20\
+\x31\x39\x56\x37\x48\x36\x56\x31\x39\x5a\x4d\x31\x39\x20\x34\x48\
+\x31\x35\x2e\x35\x4c\x31\x34\x2e\x35\x20\x33\x48\x39\x2e\x35\x4c\
+\x38\x2e\x35\x20\x34\x48\x35\x56\x36\x48\x31\x39\x56\x34\x5a\x22\
+\x20\x66\x69\x6c\x6c\x3d\x22\x23\x46\x34\x34\x33\x33\x36\x22\x2f\
+\x3e\x0a\x3c\x2f\x73\x76\x67\x3e\x0a\
+\x00\x00\x03\x4c\
+\x3c\
+\x3f\x78\x6d\x6c\x20\x76\x65\x72\x73\x69\x6f\x6e\x3d\x22\x31\x2e\
+\x30\x22\x20\x65\x6e\x63\x6f\x64\x69\x6e\x67\x3d\x22\x55\x54\x46\
+\x2d\x38\x22\x20\x73\x74\x61\x6e\x64\x61\x6c\x6f\x6e\x65\x3d\x22\
+\x6e\x6f\x22\x3f\x3e\x0a\x3c\x73\x76\x67\x20\x77\x69\x64\x74\x68\
+\x3d\x22\x38\x2e\x34\x36\x36\x36\x37\x6d\x6d\x22\x20\x68\x65\x69\
+\x67\x68\x74\x3d\x22\x38\x2e\x34\x36\x36\x36\x37\x6d\x6d\x22\x0a\
+\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\x30\x20\x30\x20\x32\x34\
+\x20\x32\x34\x22\x0a\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\
+\x70\x3a\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\
+\x30\x30\x30\x2f\x73\x76\x67\x22\x20\x78\x6d\x6c\x6e\x73\x3a\x78\
+\x6c\x69\x6e\x6b\x3d\x22\x68\x74\x74\x70\x3a\x2f\x2f\x77\x77\x77\
+\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x31\x39\x39\x39\x2f\x78\x6c\x69\
+\x6e\x6b\x22\x20\x20\x76\x65\x72\x73\x69\x6f\x6e\x3d\x22\x31\x2e\
+\x32\x22\x20\x62\x61\x73\x65\x50\x72\x6f\x66\x69\x6c\x65\x3d\x22\
+\x74\x69\x6e\x79\x22\x3e\x0a\x3c\x74\x69\x74\x6c\x65\x3e\x51\x74\
+\x20\x53\x56\x47\x20\x44\x6f\x63\x75\x6d\x65\x6e\x74\x3c\x2f\x74\
+\x69\x74\x6c\x65\x3e\x0a\x3c\x64\x65\x73\x63\x3e\x47\x65\x6e\x65\
+\x72\x61\x74\x65\x64\x20\x77\x69\x74\x68\x20\x51\x74\x3c\x2f\x64\
+\x65\x73\x63\x3e\x0a\x3c\x64\x65\x66\x73\x3e\x0a\x3c\x2f\x64\x65\
+\x66\x73\x3e\x0a\x3c\x67\x20\x66\x69\x6c\x6c\x3d\x22\x6e\x6f\x6e\
+\x65\x22\x20\x73\x74\x72\x6f\x6b\x65\x3d\x22\x62\x6c\x61\x63\x6b\
+\x22\x20\x73\x74\x72\x6f\x6b\x65\x2d\x77\x69\x64\x74\x68\x3d\x22\
+\x31\x22\x20\x66\x69\x6c\x6c\x2d\x72\x75\x6c\x65\x3d\x22\x65\x76\
+\x65\x6e\x6f\x64\x64\x22\x20\x73\x74\x72\x6f\x6b\x65\x2d\x6c\x69\
+\x6e\x65\x63\x61\x70\x3d\x22\x73\x71\x75\x61\x72\x65\x22\x20\x73\
+\x74\x72\x6f\x6b\x65\x2d\x6c\x69\x6e\x65\x6a\x6f\x69\x6e\x3d\x22\
+\x62\x65\x76\x65\x6c\x22\x20\x3e\x0a\x0a\x3c\x67\x20\x66\x69\x6c\
+\x6c\x3d\x22\x6e\x6f\x6e\x65\x22\x20\x73\x74\x72\x6f\x6b\x65\x3d\
+\x22\x23\x32\x65\x63\x63\x37\x31\x22\x20\x73\x74\x72\x6f\x6b\x65\
+\x2d\x6f\x70\x61\x63\x69\x74\x79\x3d\x22\x31\x22\x20\x73\x74\x72\
+\x6f\x6b\x65\x2d\x77\x69\x64\x74\x68\x3d\x22\x32\x22\x20\x73\x74\
+\x72\x6f\x6b\x65\x2d\x6c\x69\x6e\x65\x63\x61\x70\x3d\x22\x72\x6f\
+\x75\x6e\x64\x22\x20\x73\x74\x72\x6f\x6b\x65\x2d\x6c\x69\x6e\x65\
+\x6a\x6f\x69\x6e\x3d\x22\x72\x6f\x75\x6e\x64\x22\x20\x74\x72\x61\
+\x6e\x73\x66\x6f\x72\x6d\x3d\x22\x6d\x61\x74\x72\x69\x78\x28\x31\
+\x2c\x30\x2c\x30\x2c\x31\x2c\x30\x2c\x30\x29\x22\x0a\x66\x6f\x6e\
+\x74\x2d\x66\x61\x6d\x69\x6c\x79\x3d\x22\x4d\x53\x20\x53\x68\x65\
+\x6c\x6c\x20\x44\x6c\x67\x20\x32\x22\x20\x66\x6f\x6e\x74\x2d\x73\
+\x69\x7a\x65\x3d\x22\x38\x2e\x32\x35\x22\x20\x66\x6f\x6e\x74\x2d\
+\x77\x65\x69\x67\x68\x74\x3d\x22\x34\x30\x30\x22\x20\x66\x6f\x6e\
+\x74\x2d\x73\x74\x79\x6c\x65\x3d\x22\x6e\x6f\x72\x6d\x61\x6c\x22\
+\x20\x0a\x3e\x0a\x3c\x63\x69\x72\x63\x6c\x65\x20\x63\x78\x3d\x22\
+\x31\x32\x22\x20\x63\x79\x3d\x22\x31\x32\x22\x20\x72\x3d\x22\x38\
+\x22\x2f\x3e\x0a\x3c\x70\x6f\x6c\x79\x6c\x69\x6e\x65\x20\x66\x69\
+\x6c\x6c\x3d\x22\x6e\x6f\x6e\x65\x22\x20\x76\x65\x63\x74\x6f\x72\
+\x2d\x65\x66\x66\x65\x63\x74\x3d\x22\x6e\x6f\x6e\x65\x22\x20\x70\
+\x6f\x69\x6e\x74\x73\x3d\x22\x37\x2c\x31\x32\x20\x31\x31\x2c\x31\
+\x36\x20\x22\x20\x2f\x3e\x0a\x3c\x70\x6f\x6c\x79\x6c\x69\x6e\x65\
+\x20\x66\x69\x6c\x6c\x3d\x22\x6e\x6f\x6e\x65\x22\x20\x76\x65\x63\
+\x74\x6f\x72\x2d\x65\x66\x66\x65\x63\x74\x3d\x22\x6e\x6f\x6e\x65\
+\x22\x20\x70\x6f\x69\x6e\x74\x73\x3d\x22\x31\x31\x2c\x31\x36\x20\
+\x31\x38\x2c\x37\x20\x22\x20\x2f\x3e\x0a\x3c\x2f\x67\x3e\x0a\x3c\
+\x2f\x67\x3e\x0a\x3c\x2f\x73\x76\x67\x3e\x0a\
+"
 
-def get_users_icon():
-    return get_icon("users")
+qt_resource_name = b"\
+\x00\x05\
+\x00\x6f\xa6\x53\
+\x00\x69\
+\x00\x63\x00\x6f\x00\x6e\x00\x73\
+\x00\x0e\
+\x06\x2c\xf1\xe7\
+\x00\x62\
+\x00\x61\x00\x63\x00\x6b\x00\x5f\x00\x61\x00\x72\x00\x72\x00\x6f\x00\x77\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x08\
+\x0b\x07\x57\xa7\
+\x00\x65\
+\x00\x64\x00\x69\x00\x74\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x09\
+\x0c\x97\x8a\x87\
+\x00\x61\
+\x00\x6c\x00\x65\x00\x72\x00\x74\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x0a\
+\x0c\xad\x02\x87\
+\x00\x64\
+\x00\x65\x00\x6c\x00\x65\x00\x74\x00\x65\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x10\
+\x0e\x19\xe1\x27\
+\x00\x63\
+\x00\x68\x00\x65\x00\x63\x00\x6b\x00\x5f\x00\x63\x00\x69\x00\x72\x00\x63\x00\x6c\x00\x65\x00\x2e\x00\x73\x00\x76\x00\x67\
+"
 
-def get_refresh_icon():
-    return get_icon("refresh-cw")
+qt_resource_struct_v1 = b"\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00\x01\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x05\x00\x00\x00\x02\
+\x00\x00\x00\x10\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\
+\x00\x00\x00\x32\x00\x00\x00\x00\x00\x01\x00\x00\x03\x2f\
+\x00\x00\x00\x48\x00\x00\x00\x00\x00\x01\x00\x00\x04\xcf\
+\x00\x00\x00\x60\x00\x00\x00\x00\x00\x01\x00\x00\x08\x2a\
+\x00\x00\x00\x7a\x00\x00\x00\x00\x00\x01\x00\x00\x09\x38\
+"
 
-def get_file_text_icon():
-    return get_icon("file-text")
+qt_resource_struct_v2 = b"\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00\x01\
+\x00\x00\x00\x00\x00\x00\x00\x00\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x05\x00\x00\x00\x02\
+\x00\x00\x00\x00\x00\x00\x00\x00\
+\x00\x00\x00\x10\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\
+\x00\x00\x01\x99\x55\xa1\x5a\xf0\
+\x00\x00\x00\x32\x00\x00\x00\x00\x00\x01\x00\x00\x03\x2f\
+\x00\x00\x01\x99\x55\xa1\x5a\xf0\
+\x00\x00\x00\x48\x00\x00\x00\x00\x00\x01\x00\x00\x04\xcf\
+\x00\x00\x01\x99\x55\xa1\x5a\xf0\
+\x00\x00\x00\x60\x00\x00\x00\x00\x00\x01\x00\x00\x08\x2a\
+\x00\x00\x01\x99\x55\xa1\x5a\xf0\
+\x00\x00\x00\x7a\x00\x00\x00\x00\x00\x01\x00\x00\x09\x38\
+\x00\x00\x01\x99\x55\xa1\x5a\xf0\
+"
 
-def get_dollar_icon():
-    return get_icon("dollar-sign")
+qt_version = [int(v) for v in QtCore.qVersion().split('.')]
+if qt_version < [5, 8, 0]:
+    rcc_version = 1
+    qt_resource_struct = qt_resource_struct_v1
+else:
+    rcc_version = 2
+    qt_resource_struct = qt_resource_struct_v2
 
-def get_bell_icon():
-    return get_icon("bell")
+def qInitResources():
+    QtCore.qRegisterResourceData(rcc_version, qt_resource_struct, qt_resource_name, qt_resource_data)
 
-def get_calendar_icon():
-    return get_icon("calendar")
+def qCleanupResources():
+    QtCore.qUnregisterResourceData(rcc_version, qt_resource_struct, qt_resource_name, qt_resource_data)
 
-def get_message_icon():
-    return get_icon("message-square")
-
-def get_user_icon():
-    return get_icon("user")
-
-def get_edit_icon():
-    return get_icon("edit")
-
-def get_trash_icon():
-    return get_icon("trash")
+qInitResources()
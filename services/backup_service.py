@@ -0,0 +1,513 @@
+"""
+Backup Service
+--------------
+Online backups of the library database with ``sqlite3``'s backup API.
+
+Backups used to be copies of the database file (``intelli_libraria.db.backup_*``),
+which can catch a live WAL database between a commit and its checkpoint.
+``BackupService.backup()`` instead copies the database page by page:
+
+* the pages are read inside one read transaction (``ReadOnlyDatabase.snapshot``),
+  so the copy is of a single committed state and is never restarted by
+  concurrent commits; in WAL mode that read transaction does not block
+  writers;
+* ``pages_per_step`` pages are copied per step, with a ``step_sleep`` pause
+  after each so checkouts and returns keep the disk and the interpreter;
+* the copy is checked (``PRAGMA quick_check``), gzip-compressed and written
+  next to a JSON manifest with the SHA-256 of the database and of the
+  compressed file;
+* the loan archive (``data.archive``, ``<database>_archive.db``), when
+  there is one, is copied in the same read transaction right after the
+  database and stored beside it, so a restore brings back the archived
+  loans too;
+* only the newest ``keep`` snapshots are kept.
+
+``verify()`` decompresses a snapshot, checks both checksums and runs a full
+``PRAGMA integrity_check``; ``restore()`` verifies and then copies the
+snapshot into the target database, again through the backup API, so a live
+database is replaced under SQLite's locks. ``BackupScheduler`` runs
+``backup()`` on a background thread at a fixed interval.
+
+Usage::
+
+    python -m services.backup_service backup
+    python -m services.backup_service list
+    python -m services.backup_service verify backups/intelli_libraria-20250829-175126.db.gz
+    python -m services.backup_service restore <snapshot> <target.db>
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add project root to path to allow absolute imports
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data import archive
+from data.readonly import ReadOnlyDatabase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKUP_DIR = os.path.join(PROJECT_ROOT, 'backups')
+SNAPSHOT_SUFFIX = '.db.gz'
+ARCHIVE_SUFFIX = '.archive.gz'
+MANIFEST_SUFFIX = '.json'
+CHUNK_SIZE = 1024 * 1024
+
+
+def _default_db_path() -> str:
+    # Imported lazily: importing data.database runs the migration check.
+    from data.database import DB_PATH
+    return DB_PATH
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _checked(path: str) -> Tuple[int, int]:
+    """``PRAGMA quick_check`` a copy; returns its page size and user_version."""
+    conn = sqlite3.connect(path)
+    try:
+        check = conn.execute('PRAGMA quick_check').fetchone()[0]
+        page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        user_version = conn.execute('PRAGMA user_version').fetchone()[0]
+    finally:
+        conn.close()
+    if check != 'ok':
+        raise sqlite3.DatabaseError(f"Backup copy failed its check: {check}")
+    return page_size, user_version
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """A compressed backup and its manifest."""
+    path: str
+    created: str
+    source: str
+    pages: int
+    page_size: int
+    user_version: int
+    db_bytes: int
+    db_sha256: str
+    compressed_bytes: int
+    compressed_sha256: str
+    copy_seconds: float
+    seconds: float
+    # Bytes and checksums of the loan archive copy, if the database had one
+    archive: Optional[Dict[str, Any]] = None
+
+    @property
+    def manifest_path(self) -> str:
+        return self.path[:-len(SNAPSHOT_SUFFIX)] + MANIFEST_SUFFIX
+
+    @property
+    def archive_path(self) -> str:
+        return self.path[:-len(SNAPSHOT_SUFFIX)] + ARCHIVE_SUFFIX
+
+    @classmethod
+    def load(cls, path: str) -> 'Snapshot':
+        """Read the manifest of the snapshot at ``path`` (the ``.db.gz`` file)."""
+        with open(path[:-len(SNAPSHOT_SUFFIX)] + MANIFEST_SUFFIX, 'r', encoding='utf-8') as f:
+            return cls(path=path, **json.load(f))
+
+
+class BackupService:
+    """
+    Takes, rotates, verifies and restores compressed database snapshots.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, backup_dir: Optional[str] = None,
+                 pages_per_step: int = 1024, step_sleep: float = 0.005, keep: int = 7,
+                 compress_level: int = 3):
+        """
+        Args:
+            db_path: Database to back up (defaults to the application database)
+            backup_dir: Where snapshots are written (``backups/`` in the project)
+            pages_per_step: Pages copied per backup step (-1 copies all at once)
+            step_sleep: Seconds to pause after each step
+            keep: Number of snapshots kept by rotation
+            compress_level: gzip level, 1 (fastest) to 9 (smallest); compression
+                takes most of a backup's time
+        """
+        self.db_path = str(db_path) if db_path else _default_db_path()
+        self.backup_dir = str(backup_dir) if backup_dir else DEFAULT_BACKUP_DIR
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.keep = keep
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+
+    def _snapshot_path(self, created: datetime) -> str:
+        stem = Path(self.db_path).stem
+        name = f"{stem}-{created.strftime('%Y%m%d-%H%M%S')}"
+        path = os.path.join(self.backup_dir, name + SNAPSHOT_SUFFIX)
+        counter = 1
+        while os.path.exists(path):
+            path = os.path.join(self.backup_dir, f"{name}-{counter}{SNAPSHOT_SUFFIX}")
+            counter += 1
+        return path
+
+    def _copy(self, target_path: str, archive_target_path: str) -> Dict[str, Any]:
+        """
+        Copy the database into ``target_path`` and its loan archive, if it
+        has one, into ``archive_target_path``, in steps and in one read
+        transaction; returns the page counts.
+
+        The archive is copied after the database: a loan moved while the
+        backup runs is then in both copies (which the next archive run
+        tidies up), never in neither.
+        """
+        progress = {'pages': 0, 'steps': 0, 'archive': False}
+
+        def on_step(status, remaining, total):
+            progress['steps'] += 1
+            if remaining and self.step_sleep > 0:
+                time.sleep(self.step_sleep)
+
+        source = ReadOnlyDatabase(self.db_path)
+        try:
+            # ATTACH cannot run inside the snapshot; a missing archive is skipped
+            progress['archive'] = archive.attach(source.connection)
+            with source.snapshot() as conn:
+                for name, path in (('main', target_path), (archive.ARCHIVE_SCHEMA, archive_target_path)):
+                    if name != 'main' and not progress['archive']:
+                        break
+                    target = sqlite3.connect(path)
+                    try:
+                        conn.backup(target, pages=self.pages_per_step, progress=on_step, name=name)
+                        if name == 'main':
+                            progress['pages'] = target.execute('PRAGMA page_count').fetchone()[0]
+                    finally:
+                        target.close()
+        finally:
+            source.close()
+        return progress
+
+    def _compress(self, copy_path: str, path: str) -> Dict[str, Any]:
+        """gzip ``copy_path`` into ``path`` (through a ``.partial`` file); returns its sizes and checksums."""
+        partial = path + '.partial'
+        digest = hashlib.sha256()
+        try:
+            with open(copy_path, 'rb') as src, \
+                    gzip.open(partial, 'wb', compresslevel=self.compress_level) as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    dst.write(chunk)
+            os.replace(partial, path)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+        return {
+            'db_bytes': os.path.getsize(copy_path),
+            'db_sha256': digest.hexdigest(),
+            'compressed_bytes': os.path.getsize(path),
+            'compressed_sha256': _sha256(path),
+        }
+
+    def backup(self) -> Snapshot:
+        """
+        Take a snapshot of the database, then rotate old ones.
+
+        Raises:
+            sqlite3.Error: If the database cannot be read or the copy fails its check
+        """
+        with self._lock:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            started = time.perf_counter()
+            created = datetime.now(timezone.utc)
+            path = self._snapshot_path(created)
+            copies = []
+            for _ in range(2):
+                fd, copy_path = tempfile.mkstemp(suffix='.db', dir=self.backup_dir)
+                os.close(fd)
+                copies.append(copy_path)
+            copy_path, archive_copy_path = copies
+            try:
+                progress = self._copy(copy_path, archive_copy_path)
+                copy_seconds = time.perf_counter() - started
+                page_size, user_version = _checked(copy_path)
+                archived = None
+                if progress['archive']:
+                    _checked(archive_copy_path)
+                    archived = self._compress(archive_copy_path, path[:-len(SNAPSHOT_SUFFIX)] + ARCHIVE_SUFFIX)
+                snapshot = Snapshot(
+                    path=path,
+                    created=created.isoformat(),
+                    source=os.path.abspath(self.db_path),
+                    pages=progress['pages'],
+                    page_size=page_size,
+                    user_version=user_version,
+                    **self._compress(copy_path, path),
+                    copy_seconds=round(copy_seconds, 3),
+                    seconds=round(time.perf_counter() - started, 3),
+                    archive=archived,
+                )
+                manifest = asdict(snapshot)
+                del manifest['path']
+                with open(snapshot.manifest_path, 'w', encoding='utf-8') as f:
+                    json.dump(manifest, f, indent=2)
+            finally:
+                for leftover in copies:
+                    if os.path.exists(leftover):
+                        os.remove(leftover)
+            logger.info(f"Backup {os.path.basename(path)}: {snapshot.db_bytes} bytes -> "
+                        f"{snapshot.compressed_bytes} in {snapshot.seconds:.2f}s "
+                        f"({progress['steps']} steps)")
+            self.rotate()
+            return snapshot
+
+    def snapshots(self) -> List[Snapshot]:
+        """Snapshots with a manifest, oldest first."""
+        if not os.path.isdir(self.backup_dir):
+            return []
+        found = []
+        for name in sorted(os.listdir(self.backup_dir)):
+            if not name.endswith(SNAPSHOT_SUFFIX):
+                continue
+            path = os.path.join(self.backup_dir, name)
+            try:
+                found.append(Snapshot.load(path))
+            except (OSError, ValueError, TypeError):
+                continue
+        return sorted(found, key=lambda snapshot: snapshot.created)
+
+    def rotate(self) -> List[str]:
+        """Delete all but the newest ``keep`` snapshots; returns the deleted paths."""
+        removed = []
+        snapshots = self.snapshots()
+        for snapshot in snapshots[:max(0, len(snapshots) - self.keep)]:
+            for path in (snapshot.path, snapshot.archive_path, snapshot.manifest_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            removed.append(snapshot.path)
+        return removed
+
+    def _decompress(self, path: str, target_path: str) -> str:
+        digest = hashlib.sha256()
+        with gzip.open(path, 'rb') as src, open(target_path, 'wb') as dst:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+                dst.write(chunk)
+        return digest.hexdigest()
+
+    def _check_copy(self, path: str, compressed_sha256: str, db_sha256: str,
+                    target_path: str) -> List[str]:
+        """Decompress one file of a snapshot into ``target_path``; returns its problems."""
+        if _sha256(path) != compressed_sha256:
+            return ['compressed file checksum mismatch']
+        try:
+            if self._decompress(path, target_path) != db_sha256:
+                return ['database checksum mismatch']
+        except (OSError, EOFError) as e:
+            return [f'cannot decompress: {e}']
+        conn = sqlite3.connect(target_path)
+        try:
+            integrity = [row[0] for row in conn.execute('PRAGMA integrity_check')]
+        finally:
+            conn.close()
+        return [] if integrity == ['ok'] else [f'integrity: {message}' for message in integrity]
+
+    def _verify_into(self, snapshot: Snapshot, target_path: str,
+                     archive_target_path: str) -> Dict[str, Any]:
+        problems = self._check_copy(snapshot.path, snapshot.compressed_sha256, snapshot.db_sha256,
+                                    target_path)
+        if not problems:
+            conn = sqlite3.connect(target_path)
+            try:
+                user_version = conn.execute('PRAGMA user_version').fetchone()[0]
+            finally:
+                conn.close()
+            if user_version != snapshot.user_version:
+                problems.append(f'user_version {user_version}, manifest says {snapshot.user_version}')
+        if snapshot.archive is not None:
+            if not os.path.exists(snapshot.archive_path):
+                problems.append('archive: file missing')
+            else:
+                problems.extend(f'archive: {problem}' for problem in self._check_copy(
+                    snapshot.archive_path, snapshot.archive['compressed_sha256'],
+                    snapshot.archive['db_sha256'], archive_target_path
+                ))
+        return {'snapshot': snapshot.path, 'ok': not problems, 'problems': problems}
+
+    def _scratch(self, directory: Optional[str] = None) -> List[str]:
+        """Two empty temporary files: for the database and the archive."""
+        paths = []
+        for _ in range(2):
+            fd, path = tempfile.mkstemp(suffix='.db', dir=directory)
+            os.close(fd)
+            paths.append(path)
+        return paths
+
+    def verify(self, path: str) -> Dict[str, Any]:
+        """
+        Check a snapshot: both checksums and ``PRAGMA integrity_check`` of the
+        decompressed database, and of the archive copy if it has one.
+
+        Returns:
+            ``{'snapshot': path, 'ok': bool, 'problems': [...]}``
+        """
+        snapshot = Snapshot.load(path)
+        scratch = self._scratch()
+        try:
+            return self._verify_into(snapshot, *scratch)
+        finally:
+            for leftover in scratch:
+                os.remove(leftover)
+
+    def _set_aside(self, archive_path: str) -> Optional[str]:
+        """Rename an archive (with its WAL and shared-memory files) out of the way."""
+        if not os.path.exists(archive_path):
+            return None
+        aside = f"{archive_path}.replaced-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}"
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(archive_path + suffix):
+                os.replace(archive_path + suffix, aside + suffix)
+        logger.warning(f"The snapshot has no loan archive; moved {archive_path} to {aside}")
+        return aside
+
+    def restore(self, path: str, target_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Verify a snapshot and copy it over ``target_path`` (the service's
+        database by default), and its archive copy over the target's archive
+        (``data.archive.archive_path_for``). Nothing is written if
+        verification fails.
+
+        A snapshot taken before anything was archived has no archive copy;
+        the target's own archive is then renamed aside
+        (``<archive>.replaced-<time>``), since its loans are back in the
+        restored database and reads through ``loan_source`` would see them
+        twice.
+
+        Returns:
+            The verification report
+        """
+        snapshot = Snapshot.load(path)
+        target_path = str(target_path) if target_path else self.db_path
+        scratch = self._scratch(os.path.dirname(os.path.abspath(target_path)))
+        try:
+            report = self._verify_into(snapshot, *scratch)
+            if not report['ok']:
+                return report
+            targets = [(scratch[0], target_path)]
+            if snapshot.archive is not None:
+                targets.append((scratch[1], archive.archive_path_for(target_path)))
+            for copy_path, restored_path in targets:
+                source = sqlite3.connect(copy_path)
+                target = sqlite3.connect(restored_path, timeout=30)
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                    source.close()
+            if snapshot.archive is None:
+                self._set_aside(archive.archive_path_for(target_path))
+            logger.info(f"Restored {os.path.basename(path)} into {target_path}")
+            return report
+        finally:
+            for leftover in scratch:
+                os.remove(leftover)
+
+
+class BackupScheduler:
+    """
+    Runs ``BackupService.backup()`` every ``interval`` seconds on a daemon thread.
+
+    The first backup is due ``interval`` after the newest existing snapshot
+    (but no sooner than ``initial_delay`` seconds after ``start()``, so it
+    does not compete with start-up).
+    """
+
+    def __init__(self, service: BackupService, interval: float = 24 * 3600,
+                 initial_delay: float = 300):
+        self.service = service
+        self.interval = interval
+        self.initial_delay = initial_delay
+        self.last_error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _first_delay(self) -> float:
+        snapshots = self.service.snapshots()
+        if not snapshots:
+            return self.initial_delay
+        newest = datetime.fromisoformat(snapshots[-1].created)
+        age = (datetime.now(timezone.utc) - newest).total_seconds()
+        return max(self.initial_delay, self.interval - age)
+
+    def _run(self):
+        delay = self._first_delay()
+        while not self._stop.wait(delay):
+            try:
+                self.service.backup()
+                self.last_error = None
+            except (OSError, sqlite3.Error) as e:
+                self.last_error = e
+                logger.error(f"Scheduled backup failed: {e}")
+            delay = self.interval
+
+    def start(self) -> 'BackupScheduler':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='backup-scheduler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+if __name__ == "__main__":
+    import argparse
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Back up, verify and restore the library database')
+    parser.add_argument('--db', help='Database path (defaults to the application database)')
+    parser.add_argument('--dir', help='Backup directory (defaults to backups/ in the project)')
+    parser.add_argument('--keep', type=int, default=7, help='Snapshots kept by rotation')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('backup', help='Take a snapshot now')
+    commands.add_parser('list', help='List snapshots')
+    verify_parser = commands.add_parser('verify', help='Check a snapshot')
+    verify_parser.add_argument('snapshot')
+    restore_parser = commands.add_parser('restore', help='Verify a snapshot and restore it')
+    restore_parser.add_argument('snapshot')
+    restore_parser.add_argument('target', nargs='?', help='Database to overwrite (defaults to --db)')
+    schedule_parser = commands.add_parser('schedule', help='Back up at an interval until interrupted')
+    schedule_parser.add_argument('--hours', type=float, default=24)
+    args = parser.parse_args()
+
+    service = BackupService(args.db, args.dir, keep=args.keep)
+    if args.command == 'backup':
+        print(service.backup().path)
+    elif args.command == 'list':
+        for snapshot in service.snapshots():
+            print(f"{snapshot.created}  {snapshot.db_bytes:>12}  {snapshot.compressed_bytes:>12}  {snapshot.path}")
+    elif args.command in ('verify', 'restore'):
+        report = service.verify(args.snapshot) if args.command == 'verify' \
+            else service.restore(args.snapshot, args.target)
+        print(json.dumps(report, indent=2))
+        sys.exit(0 if report['ok'] else 1)
+    else:
+        scheduler = BackupScheduler(service, interval=args.hours * 3600, initial_delay=0).start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            scheduler.stop()
@@ -4,7 +4,6 @@ Borrow Service
 Handles book borrowing operations with proper validation and database interactions.
 """
 import os
-import traceback
 from datetime import datetime, timedelta
 from typing import Tuple, Optional, Dict, Any
 import logging
@@ -19,6 +18,7 @@ if str(PROJECT_ROOT) not in sys.path:
 
 # Import database utilities
 from utils.database_utils import get_connection, ensure_database, require_database, DB_PATH
+from data import eligibility
 
 # Configure logging
 logging.basicConfig(
@@ -40,7 +40,6 @@ class BorrowService:
     # Define valid status values according to the database schema
     VALID_STATUSES = ['borrowed', 'returned', 'overdue', 'lost']
     DEFAULT_STATUS = 'borrowed'
-    MAX_BOOKS_PER_USER = 5  # Maximum number of books a user can borrow at once
     
     def __init__(self, db_path: Optional[str] = None):
         """
@@ -120,25 +119,8 @@ class BorrowService:
         Returns:
             Tuple[bool, str]: (success, message) with detailed error message on failure
         """
-        def log_error(context: str, error: Exception, details: dict = None):
-            """Helper function to log errors with context and details"""
-            error_details = {
-                'context': context,
-                'error_type': type(error).__name__,
-                'error_message': str(error),
-                'user_id': user_id,
-                'book_id': book_id,
-                'timestamp': datetime.now().isoformat(),
-                **(details or {})
-            }
-            logger.error(f"Error in borrow_book: {error_details}", exc_info=True)
-            return error_details
-
         logger.info(f"Processing borrow request - User: {user_id}, Book: {book_id}")
         
-        # Store the original error for detailed reporting
-        original_error = None
-        
         # Input validation
         try:
             logger.info(f"Starting borrow process - User: {user_id}, Book: {book_id}")
@@ -158,215 +140,74 @@ class BorrowService:
             conn = get_connection(self.db_path)
             conn.execute("PRAGMA foreign_keys = ON")
             cursor = conn.cursor()
-            
-            # 1. Verify user exists and is active
-            try:
-                logger.info(f"Checking user {user_id} status...")
-                cursor.execute("SELECT id, status, full_name, username FROM users WHERE id = ?", (user_id,))
-                user = cursor.fetchone()
-                
-                if not user:
-                    error_msg = f"User {user_id} not found in database"
-                    logger.warning(error_msg)
-                    return False, f"Error: User ID {user_id} not found"
-                    
-                # Convert row to dictionary for easier access
-                user_dict = {
-                    'id': user[0],
-                    'status': user[1],
-                    'full_name': user[2],
-                    'username': user[3]
-                }
-                logger.info(f"Found user: ID={user_dict['id']}, Name={user_dict.get('full_name', 'N/A')}, Username={user_dict.get('username', 'N/A')}, Status={user_dict['status']}")
-                
-                if user_dict['status'].lower() != 'active':
-                    error_msg = f"User {user_id} is not active. Status: {user_dict['status']}"
-                    logger.warning(error_msg)
-                    return False, f"Error: Your account is {user_dict['status'].lower()}. Please contact the administrator."
-                    
-            except Exception as e:
-                error_type = type(e).__name__
-                error_msg = str(e)
-                error_details = f"{error_type}: {error_msg}"
-                if hasattr(e, 'sqlite_errorcode'):
-                    error_details += f" (SQLite error {e.sqlite_errorcode}: {e.sqlite_errorname})"
-                if hasattr(cursor, '_last_executed'):
-                    error_details += f"\nSQL Query: {cursor._last_executed}"
-                logger.error(f"Error in borrow_book: {error_details}", exc_info=True)
-                return False, f"Error: {error_details}"
-            
-            # 2. Verify book exists and is available
+            # The checks and the insert see the same state
+            cursor.execute("BEGIN IMMEDIATE")
+
+            # 1. Every borrowing rule in one query (see data.eligibility)
             try:
-                logger.info(f"Checking book {book_id} availability...")
-                cursor.execute("""
-                    SELECT id, title, stock 
-                    FROM books 
-                    WHERE id = ?
-                """, (book_id,))
-                book = cursor.fetchone()
-                
-                if not book:
-                    error_msg = f"Book with ID {book_id} not found"
-                    logger.warning(error_msg)
-                    return False, error_msg
-                    
-                if book['stock'] <= 0:
-                    error_msg = f"No available copies of book {book_id}"
-                    logger.warning(error_msg)
-                    return False, error_msg
-                
+                logger.info(f"Checking eligibility of user {user_id} for book {book_id}...")
+                verdict = eligibility.check(conn, user_id, book_id)
             except sqlite3.Error as e:
-                error_info = self.log_database_error(
+                conn.rollback()
+                self.log_database_error(
                     "Database error in borrow_book",
                     e,
-                    cursor if 'cursor' in locals() else None,
+                    cursor,
                     user_id=user_id,
                     book_id=book_id
                 )
                 return False, f"Database error: {str(e)}"
-            
-            # 3. Check if user has already borrowed this book
+
+            if not verdict.eligible:
+                conn.rollback()
+                logger.warning(f"User {user_id} cannot borrow book {book_id}: {', '.join(verdict.failed)}")
+                return False, f"Error: {verdict.message}"
+
+            # 2. Record the loan
+            issue_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            due_date = (datetime.now() + timedelta(days=14)).strftime('%Y-%m-%d %H:%M:%S')
+            logger.info(f"Issue date: {issue_date}, Due date: {due_date}")
             try:
-                logger.info("Checking for existing loans...")
+                logger.info("Executing transaction insert...")
+                # The availability triggers decrement books.available (data.inventory)
                 cursor.execute("""
-                    SELECT t.id, b.title, t.issue_date, t.due_date
-                    FROM transactions t
-                    JOIN books b ON t.book_id = b.id
-                    WHERE t.user_id = ? 
-                    AND t.book_id = ? 
-                    AND t.return_date IS NULL
-                """, (user_id, book_id))
-                
-                existing_loan = cursor.fetchone()
-                if existing_loan:
-                    error_msg = f"User {user_id} has already borrowed book {book_id}"
-                    logger.warning(error_msg)
-                    try:
-                        due_date = datetime.strptime(existing_loan['due_date'], '%Y-%m-%d %H:%M:%S').strftime('%b %d, %Y')
-                    except (ValueError, TypeError):
-                        due_date = str(existing_loan['due_date'])
-                    return False, f"You have already borrowed '{existing_loan['title']}'. Due date: {due_date}"
-                logger.info("No existing active loans found for this book and user")
-                    
-                # 4. Begin transaction
-                logger.info("Starting database transaction...")
-                issue_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                due_date = (datetime.now() + timedelta(days=14)).strftime('%Y-%m-%d %H:%M:%S')
-                logger.info(f"Issue date: {issue_date}, Due date: {due_date}")
-                
-                # Create transaction record
-                try:
-                    logger.info("Creating transaction record...")
-                    # Verify the user is still active (in case status changed)
-                    cursor.execute("SELECT id, status FROM users WHERE id = ?", (user_id,))
-                    user = cursor.fetchone()
-                    if not user or user['status'].lower() != 'active':
-                        error_msg = f"User {user_id} is no longer active or does not exist"
-                        logger.error(error_msg)
-                        return False, "Error: Your account is no longer active. Please contact the administrator."
+                    INSERT INTO transactions (
+                        user_id, 
+                        book_id, 
+                        issue_date, 
+                        due_date, 
+                        return_date,
+                        status,
+                        created_at,
+                        updated_at
+                    ) VALUES (?, ?, ?, ?, NULL, 'Issued', datetime('now'), datetime('now'))
+                """, (user_id, book_id, issue_date, due_date))
+                conn.commit()
+                logger.info(f"Transaction committed successfully. Book {book_id} borrowed by user {user_id}")
+            except sqlite3.Error as e:
+                conn.rollback()
+                self.log_database_error(
+                    "Failed to record the loan",
+                    e,
+                    cursor,
+                    book_id=book_id
+                )
+                return False, f"Database error: {str(e)}"
+
+            # Format the due date for display
+            try:
+                display_due_date = datetime.strptime(due_date, '%Y-%m-%d %H:%M:%S').strftime('%B %d, %Y')
+            except ValueError:
+                display_due_date = due_date
+
+            return True, f"Book successfully borrowed. Due date: {display_due_date}"
 
-                    # Verify the book is still available
-                    cursor.execute("SELECT id, title, stock FROM books WHERE id = ?", (book_id,))
-                    book = cursor.fetchone()
-                    if not book:
-                        error_msg = f"Book {book_id} no longer exists in the database"
-                        logger.error(error_msg)
-                        return False, "Error: The requested book is no longer available."
-                        
-                    if book['stock'] <= 0:
-                        error_msg = f"Book '{book['title']}' (ID: {book_id}) is no longer available. Current stock: {book['stock']}"
-                        logger.warning(error_msg)
-                        return False, f"Error: '{book['title']}' is no longer available for borrowing."
-                    
-                    # Insert the transaction
-                    try:
-                        logger.info("Executing transaction insert...")
-                        # First insert the transaction
-                        cursor.execute("""
-                            INSERT INTO transactions (
-                                user_id, 
-                                book_id, 
-                                issue_date, 
-                                due_date, 
-                                return_date,
-                                status,
-                                created_at,
-                                updated_at
-                            ) VALUES (?, ?, ?, ?, NULL, 'Issued', datetime('now'), datetime('now'))
-                        """, (user_id, book_id, issue_date, due_date))
-                        
-                        # Then update the book stock
-                        cursor.execute("""
-                            UPDATE books 
-                            SET stock = stock - 1 
-                            WHERE id = ? AND stock > 0
-                        """, (book_id,))
-                        if cursor.rowcount == 0:
-                            error_msg = f"Failed to update available copies for book {book_id}"
-                            logger.error(error_msg)
-                            return False, "Error: Could not update book availability. Please try again."
-                            
-                        logger.info(f"Updated available copies for book {book_id}")
-                        
-                    except sqlite3.Error as e:
-                        error_info = self.log_database_error(
-                            "Failed to update book quantity",
-                            e,
-                            cursor,
-                            book_id=book_id
-                        )
-                        return False, f"Database error: {str(e)}"
-                        
-                    # Commit the transaction
-                    try:
-                        conn.commit()
-                        logger.info(f"Transaction committed successfully. Book {book_id} borrowed by user {user_id}")
-                        
-                        # Format the due date for display
-                        try:
-                            display_due_date = datetime.strptime(due_date, '%Y-%m-%d %H:%M:%S').strftime('%B %d, %Y')
-                        except:
-                            display_due_date = due_date
-                            
-                        return True, f"Book successfully borrowed. Due date: {display_due_date}"
-                        
-                    except sqlite3.Error as e:
-                        error_info = self.log_database_error(
-                            "Failed to commit transaction",
-                            e,
-                            cursor
-                        )
-                        return False, f"Error finalizing the transaction: {str(e)}"
-                        
-                except Exception as e:
-                    error_info = {
-                        'context': 'Unexpected error in borrow_book',
-                        'error_type': type(e).__name__,
-                        'error_message': str(e),
-                        'traceback': traceback.format_exc(),
-                        'python_version': sys.version,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    logger.error(f"Unexpected error: {error_info}", exc_info=True)
-                    return False, f"An unexpected error occurred: {str(e)}"
-                    
-            except Exception as e:
-                if conn:
-                    try:
-                        conn.rollback()
-                        logger.info("Transaction rolled back due to error")
-                    except Exception as rollback_error:
-                        logger.error(f"Error during rollback: {str(rollback_error)}")
-                error_msg = f"Unexpected error in transaction processing: {str(e)}"
-                logger.error(error_msg, exc_info=True)
-                return False, f"An unexpected error occurred: {str(e)}"
-                
         except Exception as e:
-            if conn:
+            if conn and conn.in_transaction:
                 conn.rollback()
             logger.error(f"Unexpected error in borrow_book: {e}", exc_info=True)
             return False, f"An unexpected error occurred: {str(e)}"
-            
+
         finally:
             if conn:
                 conn.close()
@@ -0,0 +1,210 @@
+"""
+Circulation Operations
+----------------------
+The circulation operations shared by the desktop pages and the circulation
+service: search, borrow, return, reserve and counts.
+
+Each function takes an open connection and follows the rules of the
+desktop code paths (``database.borrow_book``, the return page,
+``database.add_reservation``) and their ``(success, message)`` results, so
+callers can switch between direct database access and the service without
+changing how results are shown. Writes run in one ``BEGIN IMMEDIATE``
+transaction so the checks and the updates see the same state, or join the
+transaction the caller already has open (a ``data.write_queue`` batch).
+``books.available`` is maintained by triggers (``data.inventory``), so
+loans and returns only touch ``transactions``.
+"""
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from data import branches, eligibility
+
+Result = Tuple[bool, str]
+
+
+@contextmanager
+def _immediate(conn: sqlite3.Connection) -> Iterator[sqlite3.Cursor]:
+    """Run the block in a write transaction; roll back on any exception."""
+    cursor = conn.cursor()
+    if conn.in_transaction:
+        # The caller owns the transaction (and its rollback)
+        yield cursor
+        return
+    cursor.execute('BEGIN IMMEDIATE')
+    try:
+        yield cursor
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        if conn.in_transaction:
+            conn.commit()
+
+
+def search_books(conn: sqlite3.Connection, query: Optional[str] = None,
+                 limit: int = 50, offset: int = 0,
+                 branch_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Search books by title, author or ISBN; with ``branch_id``, that branch's holdings only."""
+    if branch_id is not None:
+        return branches.search(conn, branch_id, query, limit=limit, offset=offset)
+    sql = "SELECT id, title, author, isbn, edition, stock, available FROM books"
+    params: Tuple[Any, ...] = ()
+    if query:
+        pattern = f"%{query}%"
+        sql += " WHERE title LIKE ? OR author LIKE ? OR isbn LIKE ?"
+        params = (pattern, pattern, pattern)
+    sql += " ORDER BY title LIMIT ? OFFSET ?"
+    cursor = conn.execute(sql, params + (limit, offset))
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def user_loans(conn: sqlite3.Connection, user_id: int) -> List[Dict[str, Any]]:
+    """Open loans of one user, oldest due date first."""
+    cursor = conn.execute(
+        """
+        SELECT t.id, t.book_id, b.title, t.issue_date, t.due_date
+        FROM transactions t
+        JOIN books b ON b.id = t.book_id
+        WHERE t.user_id = ? AND t.return_date IS NULL
+        ORDER BY t.due_date
+        """,
+        (user_id,)
+    )
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Dashboard totals."""
+    row = conn.execute(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM books) AS books,
+            (SELECT COUNT(*) FROM users) AS users,
+            (SELECT COUNT(*) FROM transactions WHERE return_date IS NULL) AS active_loans,
+            (SELECT COUNT(*) FROM transactions
+             WHERE return_date IS NULL AND due_date < ?) AS overdue_loans,
+            (SELECT COUNT(*) FROM reservations WHERE status = 'Active') AS active_reservations
+        """,
+        (date.today().isoformat(),)
+    ).fetchone()
+    return dict(zip(('books', 'users', 'active_loans', 'overdue_loans', 'active_reservations'), row))
+
+
+def checkout(conn: sqlite3.Connection, user_id: int, book_id: int, days: int = 14,
+             branch_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Issue a book if ``data.eligibility`` finds every borrowing rule met.
+
+    With ``branch_id`` the copy is issued from that branch's holding.
+
+    Returns:
+        ``success`` and ``message`` as ``borrow_book`` has them, and on
+        success the loan's ``loan_id``, ``title`` and ``due_date``
+    """
+    with _immediate(conn) as cursor:
+        verdict = eligibility.check(conn, user_id, book_id, branch_id)
+        if not verdict.eligible:
+            return {'success': False, 'message': verdict.message}
+
+        now = datetime.now()
+        issue_date = now.strftime('%Y-%m-%d %H:%M:%S')
+        due_date = (now + timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+        if branch_id is None:
+            cursor.execute(
+                """
+                INSERT INTO transactions (user_id, book_id, issue_date, due_date, status)
+                VALUES (?, ?, ?, ?, 'Borrowed')
+                """,
+                (user_id, book_id, issue_date, due_date)
+            )
+        else:
+            cursor.execute(
+                """
+                INSERT INTO transactions (user_id, book_id, branch_id, issue_date, due_date, status)
+                VALUES (?, ?, ?, ?, ?, 'Borrowed')
+                """,
+                (user_id, book_id, branch_id, issue_date, due_date)
+            )
+        return {
+            'success': True,
+            'message': f"Successfully borrowed '{verdict.title}'. Due date: {due_date}",
+            'loan_id': cursor.lastrowid,
+            'title': verdict.title,
+            'due_date': due_date,
+        }
+
+
+def borrow_book(conn: sqlite3.Connection, user_id: int, book_id: int, days: int = 14,
+                branch_id: Optional[int] = None) -> Result:
+    """``checkout`` as a ``(success, message)`` pair."""
+    outcome = checkout(conn, user_id, book_id, days, branch_id)
+    return outcome['success'], outcome['message']
+
+
+def checkin(conn: sqlite3.Connection, user_id: int, book_id: int) -> Dict[str, Any]:
+    """
+    Return the open loan of ``book_id`` held by ``user_id``.
+
+    Returns:
+        ``success`` and ``message`` as ``return_book`` has them, and on
+        success the loan's ``loan_id`` and ``title``
+    """
+    with _immediate(conn) as cursor:
+        cursor.execute(
+            """
+            SELECT t.id, b.title FROM transactions t
+            JOIN books b ON t.book_id = b.id
+            WHERE t.user_id = ? AND t.book_id = ? AND t.return_date IS NULL
+            LIMIT 1
+            """,
+            (user_id, book_id)
+        )
+        loan = cursor.fetchone()
+        if not loan:
+            return {'success': False,
+                    'message': "No active borrowing record found for this user and book"}
+        cursor.execute(
+            """
+            UPDATE transactions
+            SET return_date = DATE('now'), status = 'Returned', updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            """,
+            (loan[0],)
+        )
+        return {
+            'success': True,
+            'message': f"The book '{loan[1]}' has been successfully returned",
+            'loan_id': loan[0],
+            'title': loan[1],
+        }
+
+
+def return_book(conn: sqlite3.Connection, user_id: int, book_id: int) -> Result:
+    """``checkin`` as a ``(success, message)`` pair."""
+    outcome = checkin(conn, user_id, book_id)
+    return outcome['success'], outcome['message']
+
+
+def reserve_book(conn: sqlite3.Connection, user_id: int, book_id: int,
+                 reservation_date: Optional[str] = None) -> Result:
+    """Reserve a copy; same rules as ``database.add_reservation`` for a known user id."""
+    reservation_date = reservation_date or date.today().isoformat()
+    with _immediate(conn) as cursor:
+        cursor.execute("SELECT id FROM users WHERE id = ?", (user_id,))
+        if not cursor.fetchone():
+            return False, f"Error: User not found for input '{user_id}'"
+        cursor.execute("SELECT id, title, available FROM books WHERE id = ?", (book_id,))
+        book = cursor.fetchone()
+        if not book:
+            return False, f"Error: Book with ID {book_id} not found"
+        if book[2] <= 0:
+            return False, f"Error: '{book[1]}' is currently out of stock"
+        cursor.execute(
+            "INSERT INTO reservations (book_id, user_id, reservation_date, status) VALUES (?, ?, ?, 'Active')",
+            (book_id, user_id, reservation_date)
+        )
+        return True, "Reservation created successfully"
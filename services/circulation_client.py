@@ -0,0 +1,155 @@
+"""
+Circulation Client
+------------------
+Thin client for the circulation service (``services/circulation_server.py``).
+
+Methods mirror the ``services.circulation`` functions and return the same
+shapes, so a desk can switch between direct database access and the shared
+service without changing how results are shown. One HTTP/1.1 connection is
+kept alive per client; a client is not thread-safe, use one per thread.
+"""
+import http.client
+import json
+import os
+import select
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+SERVICE_URL_ENV = 'INTELLI_LIBRARIA_SERVICE_URL'
+
+# Safe to send again when the connection fails after the request went out
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD'})
+
+
+class CirculationServiceError(Exception):
+    """The service could not be reached or answered with an error status."""
+
+
+def _dropped(conn: http.client.HTTPConnection) -> bool:
+    """True if an idle kept-alive connection was closed (or written to) by the server."""
+    if conn.sock is None:
+        return True
+    readable, _, _ = select.select([conn.sock], [], [], 0)
+    return bool(readable)
+
+
+class CirculationClient:
+    """Keep-alive JSON client for one circulation service."""
+
+    def __init__(self, base_url: str, timeout: float = 10.0):
+        url = urlsplit(base_url)
+        if url.scheme != 'http' or not url.hostname:
+            raise ValueError(f"Unsupported circulation service URL: {base_url!r}")
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.timeout = timeout
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+        # A kept-alive connection the server has since closed is replaced before
+        # sending. Once a request has gone out, only reads are retried: a loan,
+        # return or reservation may already have been written. Timeouts are
+        # never retried.
+        if self._conn is not None and _dropped(self._conn):
+            self.close()
+        while True:
+            reused = self._conn is not None
+            if not reused:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            sent = False
+            try:
+                self._conn.request(method, path, body=payload, headers=headers)
+                sent = True
+                response = self._conn.getresponse()
+                data = response.read()
+                break
+            except TimeoutError as e:
+                self.close()
+                raise CirculationServiceError(f"Circulation service timed out: {e}") from e
+            except (ConnectionError, http.client.HTTPException, OSError) as e:
+                self.close()
+                if not reused or (sent and method not in IDEMPOTENT_METHODS):
+                    raise CirculationServiceError(f"Circulation service unavailable: {e}") from e
+        result = json.loads(data) if data else None
+        if response.status != 200:
+            message = result.get('error') if isinstance(result, dict) else None
+            raise CirculationServiceError(message or f"HTTP {response.status}")
+        return result
+
+    def _write(self, path: str, body: Dict[str, Any]) -> Tuple[bool, str]:
+        result = self._request('POST', path, body)
+        return result['success'], result['message']
+
+    def health(self) -> bool:
+        try:
+            return self._request('GET', '/health').get('status') == 'ok'
+        except CirculationServiceError:
+            return False
+
+    def counts(self) -> Dict[str, int]:
+        return self._request('GET', '/counts')
+
+    def search_books(self, query: Optional[str] = None, limit: int = 50,
+                     offset: int = 0, branch_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        params = {'limit': limit, 'offset': offset}
+        if query:
+            params['q'] = query
+        if branch_id is not None:
+            params['branch'] = branch_id
+        return self._request('GET', f"/books?{urlencode(params)}")
+
+    def title_availability(self, book_id: int) -> Dict[str, Any]:
+        return self._request('GET', f"/books/{int(book_id)}/availability")
+
+    def branches(self) -> List[Dict[str, Any]]:
+        return self._request('GET', '/branches')
+
+    def branch_counts(self, branch_id: int) -> Dict[str, int]:
+        return self._request('GET', f"/branches/{int(branch_id)}/counts")
+
+    def user_loans(self, user_id: int) -> List[Dict[str, Any]]:
+        return self._request('GET', f"/users/{int(user_id)}/loans")
+
+    def checkout(self, user_id: int, book_id: int, days: int = 14,
+                 branch_id: Optional[int] = None) -> Dict[str, Any]:
+        body = {'user_id': user_id, 'book_id': book_id, 'days': days}
+        if branch_id is not None:
+            body['branch_id'] = branch_id
+        return self._request('POST', '/loans', body)
+
+    def borrow_book(self, user_id: int, book_id: int, days: int = 14,
+                    branch_id: Optional[int] = None) -> Tuple[bool, str]:
+        result = self.checkout(user_id, book_id, days, branch_id)
+        return result['success'], result['message']
+
+    def checkin(self, user_id: int, book_id: int) -> Dict[str, Any]:
+        return self._request('POST', '/returns', {'user_id': user_id, 'book_id': book_id})
+
+    def return_book(self, user_id: int, book_id: int) -> Tuple[bool, str]:
+        result = self.checkin(user_id, book_id)
+        return result['success'], result['message']
+
+    def reserve_book(self, user_id: int, book_id: int,
+                     reservation_date: Optional[str] = None) -> Tuple[bool, str]:
+        body = {'user_id': user_id, 'book_id': book_id}
+        if reservation_date:
+            body['reservation_date'] = reservation_date
+        return self._write('/reservations', body)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def get_circulation_client() -> Optional[CirculationClient]:
+    """
+    Client for the service named by ``INTELLI_LIBRARIA_SERVICE_URL``.
+
+    Returns None when the variable is unset, in which case callers use the
+    database directly.
+    """
+    url = os.environ.get(SERVICE_URL_ENV)
+    return CirculationClient(url) if url else None
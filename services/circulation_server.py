@@ -0,0 +1,334 @@
+"""
+Circulation Server
+------------------
+Headless asyncio HTTP/JSON service that owns the library database so that
+several circulation desks share one database process.
+
+All writes go through one ``data.write_queue.WriteQueue`` (a single writer
+connection that group-commits concurrent requests), so desks never contend
+for the SQLite write lock; reads are spread over a small pool of reader
+connections. Pending migrations run once at startup
+instead of in every desktop instance.
+
+Endpoints (JSON in and out)::
+
+    GET  /health
+    GET  /counts
+    GET  /books?q=<text>&limit=50&offset=0[&branch=<id>]
+    GET  /books/<id>/availability
+    GET  /branches
+    GET  /branches/<id>/counts
+    GET  /users/<id>/loans
+    POST /loans          {"user_id": 1, "book_id": 2, "days": 14, "branch_id": 3}
+    POST /returns        {"user_id": 1, "book_id": 2}
+    POST /reservations   {"user_id": 1, "book_id": 2}
+
+Write endpoints answer ``{"success": bool, "message": str}``; a successful
+loan or return also carries the loan's ``loan_id`` and ``title`` (and, for
+loans, ``due_date``), so clients never parse the message.
+
+Run with ``python -m services.circulation_server --port 8765``.
+"""
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# Add project root to path to allow absolute imports
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data import branches
+from data.errors import NotFoundError
+from data.write_queue import WriteQueue
+from services import circulation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024
+
+
+class HTTPError(Exception):
+    """Raised by handlers to answer with an error status."""
+    def __init__(self, status: int, message: str):
+        self.status = status
+        self.message = message
+        super().__init__(message)
+
+
+class ConnectionPool:
+    """
+    A write queue plus ``readers`` reader connections.
+
+    Reader connections are created lazily on their worker threads and live
+    for the lifetime of the pool.
+    """
+
+    def __init__(self, db_path: str, readers: int = 4, busy_timeout_ms: int = 5000):
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._writer: Optional[WriteQueue] = None
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix='db-reader')
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Only ever used on this worker thread; close() runs after the workers stop
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000,
+                                   check_same_thread=False)
+            conn.execute(f'PRAGMA busy_timeout = {int(self.busy_timeout_ms)}')
+            conn.execute('PRAGMA query_only = ON')
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _call(self, func: Callable, args: Tuple[Any, ...]):
+        return func(self._connection(), *args)
+
+    async def read(self, func: Callable, *args):
+        """Run ``func(conn, *args)`` on a reader connection."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, self._call, func, args)
+
+    async def write(self, func: Callable, *args):
+        """Run ``func(conn, *args)`` as a write-queue job."""
+        return await asyncio.wrap_future(self._writer.submit(func, *args))
+
+    def prepare(self):
+        """Apply pending migrations once, then start the write queue."""
+        from data.migrator import migrate
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000)
+        try:
+            for applied in migrate(conn):
+                logger.info(f"Applied migration {applied.name} in {applied.seconds * 1000:.1f}ms")
+        finally:
+            conn.close()
+        self._writer = WriteQueue(self.db_path, busy_timeout_ms=self.busy_timeout_ms)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._readers.shutdown(wait=True)
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+
+def _int(body: Dict[str, Any], name: str) -> int:
+    try:
+        value = int(body[name])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPError(400, f"'{name}' must be an integer")
+    if value <= 0:
+        raise HTTPError(400, f"'{name}' must be positive")
+    return value
+
+
+def _result(result: circulation.Result) -> Dict[str, Any]:
+    success, message = result
+    return {'success': success, 'message': message}
+
+
+class CirculationServer:
+    """HTTP/1.1 front end (keep-alive, JSON bodies) over a ``ConnectionPool``."""
+
+    def __init__(self, db_path: Optional[str] = None, host: str = '127.0.0.1',
+                 port: int = DEFAULT_PORT, readers: int = 4):
+        if db_path is None:
+            from data.database import DB_PATH
+            db_path = DB_PATH
+        self.pool = ConnectionPool(db_path, readers)
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.routes = [
+            ('GET', re.compile(r'/health'), self.health),
+            ('GET', re.compile(r'/counts'), self.counts),
+            ('GET', re.compile(r'/books'), self.books),
+            ('GET', re.compile(r'/books/(\d+)/availability'), self.availability),
+            ('GET', re.compile(r'/branches'), self.branch_list),
+            ('GET', re.compile(r'/branches/(\d+)/counts'), self.branch_counts),
+            ('GET', re.compile(r'/users/(\d+)/loans'), self.loans_of_user),
+            ('POST', re.compile(r'/loans'), self.borrow),
+            ('POST', re.compile(r'/returns'), self.return_book),
+            ('POST', re.compile(r'/reservations'), self.reserve),
+        ]
+
+    # -- handlers ----------------------------------------------------------
+
+    async def health(self, query, body):
+        return {'status': 'ok'}
+
+    async def counts(self, query, body):
+        return await self.pool.read(circulation.counts)
+
+    async def books(self, query, body):
+        try:
+            limit = min(int(query.get('limit', 50)), 500)
+            offset = max(int(query.get('offset', 0)), 0)
+        except ValueError:
+            raise HTTPError(400, "'limit' and 'offset' must be integers")
+        branch_id = _int(query, 'branch') if 'branch' in query else None
+        return await self.pool.read(circulation.search_books, query.get('q'), limit, offset, branch_id)
+
+    async def availability(self, query, body, book_id):
+        return await self.pool.read(branches.title_availability, int(book_id))
+
+    async def branch_list(self, query, body):
+        return await self.pool.read(branches.list_branches)
+
+    async def branch_counts(self, query, body, branch_id):
+        return await self.pool.read(branches.branch_counts, int(branch_id))
+
+    async def loans_of_user(self, query, body, user_id):
+        return await self.pool.read(circulation.user_loans, int(user_id))
+
+    async def borrow(self, query, body):
+        days = _int(body, 'days') if 'days' in body else 14
+        branch_id = _int(body, 'branch_id') if body.get('branch_id') is not None else None
+        return await self.pool.write(
+            circulation.checkout, _int(body, 'user_id'), _int(body, 'book_id'), days, branch_id
+        )
+
+    async def return_book(self, query, body):
+        return await self.pool.write(
+            circulation.checkin, _int(body, 'user_id'), _int(body, 'book_id')
+        )
+
+    async def reserve(self, query, body):
+        return _result(await self.pool.write(
+            circulation.reserve_book, _int(body, 'user_id'), _int(body, 'book_id'),
+            body.get('reservation_date')
+        ))
+
+    # -- HTTP plumbing -----------------------------------------------------
+
+    async def _dispatch(self, method: str, target: str, payload: bytes) -> Tuple[int, Any]:
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.fullmatch(url.path)
+            if not match:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            body = {}
+            if payload:
+                try:
+                    body = json.loads(payload)
+                except ValueError:
+                    raise HTTPError(400, 'Request body must be JSON')
+                if not isinstance(body, dict):
+                    raise HTTPError(400, 'Request body must be a JSON object')
+            try:
+                return 200, await handler(query, body, *match.groups())
+            except NotFoundError as e:
+                raise HTTPError(404, str(e))
+        if allowed:
+            raise HTTPError(405, 'Method not allowed')
+        raise HTTPError(404, 'Not found')
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                try:
+                    if length < 0:
+                        raise HTTPError(400, 'Invalid Content-Length')
+                    if length > MAX_BODY_BYTES:
+                        raise HTTPError(413, 'Request body too large')
+                    payload = await reader.readexactly(length) if length else b''
+                    status, result = await self._dispatch(method.upper(), target, payload)
+                except HTTPError as e:
+                    status, result = e.status, {'error': e.message}
+                except Exception as e:
+                    logger.exception(f"Error handling {method} {target}")
+                    status, result = 500, {'error': str(e)}
+
+                # A body that was not read (unframed or too large) ends the connection
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1' and 0 <= length <= MAX_BODY_BYTES)
+                data = json.dumps(result, default=str).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+                    + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        """Prepare the schema and start listening (``port=0`` picks a free port)."""
+        await asyncio.get_running_loop().run_in_executor(None, self.pool.prepare)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Circulation service listening on http://{self.host}:{self.port}")
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.pool.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Intelli-Libraria circulation service')
+    parser.add_argument('--db', help='Database path (defaults to the application database)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--readers', type=int, default=4)
+    args = parser.parse_args()
+
+    server = CirculationServer(args.db, args.host, args.port, args.readers)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,213 @@
+"""
+Mailer
+------
+Minimal asyncio SMTP client used to deliver notification batches.
+
+Each ``AsyncSMTPClient`` keeps one connection open and sends any number of
+messages over it (EHLO once, then MAIL/RCPT/DATA per message), so a batch
+costs one TCP handshake per connection rather than one per message. When
+the server advertises PIPELINING the envelope commands of a message are
+sent in a single write.
+``MailerPool`` spreads batches over a small set of such connections.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from email.header import Header
+from email.utils import formatdate
+from typing import Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPError(Exception):
+    """Raised when the server rejects a command."""
+    def __init__(self, code: int, message: str):
+        self.code = code
+        self.message = message
+        super().__init__(f"SMTP {code}: {message}")
+
+
+@dataclass
+class OutgoingMessage:
+    """A message to deliver; ``ref`` is returned with the delivery result."""
+    ref: int
+    sender: str
+    recipient: str
+    subject: str
+    body: str
+
+    def as_bytes(self) -> bytes:
+        # Notices are short plain text, so the message is assembled directly;
+        # building an EmailMessage costs more than the SMTP exchange itself.
+        subject = self.subject if self.subject.isascii() else Header(self.subject, 'utf-8').encode()
+        headers = (
+            f"From: {self.sender}\r\n"
+            f"To: {self.recipient}\r\n"
+            f"Subject: {subject}\r\n"
+            f"Date: {formatdate(localtime=True)}\r\n"
+            "MIME-Version: 1.0\r\n"
+            'Content-Type: text/plain; charset="utf-8"\r\n'
+            "Content-Transfer-Encoding: 8bit\r\n"
+        )
+        body = '\r\n'.join(self.body.splitlines())
+        return f"{headers}\r\n{body}\r\n".encode('utf-8')
+
+
+class AsyncSMTPClient:
+    """A single reusable SMTP connection."""
+
+    def __init__(self, host: str = 'localhost', port: int = 25,
+                 local_hostname: str = 'intelli-libraria', timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.local_hostname = local_hostname
+        self.timeout = timeout
+        self.extensions = set()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def _reply(self) -> Tuple[int, str]:
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self._reader.readline(), self.timeout)
+            if not line:
+                raise ConnectionError('SMTP server closed the connection')
+            text = line.decode('utf-8', 'replace').rstrip('\r\n')
+            lines.append(text[4:])
+            if len(text) < 4 or text[3] != '-':
+                return int(text[:3]), '\n'.join(lines)
+
+    async def _command(self, line: str, expect: Tuple[int, ...]) -> str:
+        self._writer.write(line.encode('utf-8') + b'\r\n')
+        await self._writer.drain()
+        code, message = await self._reply()
+        if code not in expect:
+            raise SMTPError(code, message)
+        return message
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        code, message = await self._reply()
+        if code != 220:
+            raise SMTPError(code, message)
+        reply = await self._command(f'EHLO {self.local_hostname}', (250,))
+        self.extensions = {line.split()[0].upper() for line in reply.splitlines()[1:] if line}
+
+    async def send(self, message: OutgoingMessage):
+        """Send one message, reconnecting first if the connection was dropped."""
+        if not self.connected:
+            await self.connect()
+        body = ' BODY=8BITMIME' if '8BITMIME' in self.extensions else ''
+        envelope = (
+            (f'MAIL FROM:<{message.sender}>{body}', (250,)),
+            (f'RCPT TO:<{message.recipient}>', (250, 251)),
+            ('DATA', (354,)),
+        )
+        try:
+            if 'PIPELINING' in self.extensions:
+                # Send the envelope in one write and collect the replies after
+                self._writer.write(''.join(f'{line}\r\n' for line, _ in envelope).encode('utf-8'))
+                await self._writer.drain()
+                replies = [await self._reply() for _ in envelope]
+                for (code, reply), (_, expect) in zip(replies, envelope):
+                    if code not in expect:
+                        raise SMTPError(code, reply)
+            else:
+                for line, expect in envelope:
+                    await self._command(line, expect)
+            # Dot-stuff lines that start with '.' and terminate with <CRLF>.<CRLF>
+            data = message.as_bytes().replace(b'\r\n.', b'\r\n..')
+            if data.startswith(b'.'):
+                data = b'.' + data
+            if not data.endswith(b'\r\n'):
+                data += b'\r\n'
+            self._writer.write(data + b'.\r\n')
+            await self._writer.drain()
+            code, reply = await self._reply()
+            if code != 250:
+                raise SMTPError(code, reply)
+        except SMTPError:
+            # Leave the connection usable for the next message
+            await self._command('RSET', (250,))
+            raise
+
+    def abort(self):
+        """Drop the connection without QUIT (after a network error)."""
+        if self._writer is not None:
+            self._writer.close()
+        self._writer = None
+        self._reader = None
+
+    async def quit(self):
+        if not self.connected:
+            return
+        try:
+            await self._command('QUIT', (221,))
+        except (SMTPError, ConnectionError, asyncio.TimeoutError):
+            pass
+        finally:
+            self.abort()
+
+
+class MailerPool:
+    """
+    A pool of reusable SMTP connections shared by successive batches.
+
+    Connections are opened lazily and kept until ``close()``, so a delivery
+    run that sends many batches performs one handshake per connection.
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = 25, connections: int = 4):
+        self.clients = [AsyncSMTPClient(host, port) for _ in range(max(1, connections))]
+
+    async def send_batch(self, messages: Iterable[OutgoingMessage]) -> List[Tuple[int, Optional[str]]]:
+        """
+        Send a batch, spreading it over the pooled connections.
+
+        Returns:
+            ``(ref, error)`` per message; ``error`` is None when the message was accepted
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for message in messages:
+            queue.put_nowait(message)
+        results: List[Tuple[int, Optional[str]]] = []
+
+        async def worker(client: AsyncSMTPClient):
+            while not queue.empty():
+                message = queue.get_nowait()
+                try:
+                    await client.send(message)
+                    results.append((message.ref, None))
+                except SMTPError as e:
+                    results.append((message.ref, str(e)))
+                except (ConnectionError, OSError, asyncio.TimeoutError) as e:
+                    # Drop the connection; the next message reconnects
+                    logger.warning(f"SMTP connection error: {e}")
+                    results.append((message.ref, f"connection error: {e}"))
+                    client.abort()
+
+        await asyncio.gather(*(worker(client) for client in self.clients[:max(1, queue.qsize())]))
+        return results
+
+    async def close(self):
+        await asyncio.gather(*(client.quit() for client in self.clients))
+
+    async def __aenter__(self) -> 'MailerPool':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+async def deliver(messages: Iterable[OutgoingMessage], host: str = 'localhost', port: int = 25,
+                  connections: int = 4) -> List[Tuple[int, Optional[str]]]:
+    """Deliver one batch over a temporary ``MailerPool``."""
+    async with MailerPool(host, port, connections) as pool:
+        return await pool.send_batch(messages)
@@ -0,0 +1,352 @@
+"""
+Maintenance Service
+-------------------
+Database upkeep run while the library is idle.
+
+Nothing used to refresh the planner's statistics, checkpoint the WAL or give
+free pages back, so query plans were chosen without statistics, the WAL
+only shrank when the last connection closed and deleted rows left the file
+as large as it ever was. ``MaintenanceService.run()`` does, within one time
+budget and in this order:
+
+* ``optimize``: ``ANALYZE`` under ``PRAGMA analysis_limit`` (each index is
+  sampled instead of read in full), then ``PRAGMA optimize``. ``optimize``
+  alone only looks at tables the running connection has queried, which for
+  a maintenance connection is none of them;
+* ``vacuum``: ``PRAGMA incremental_vacuum`` in steps of ``vacuum_step``
+  pages until the freelist is empty or the budget is spent. Databases that
+  are not in ``auto_vacuum = INCREMENTAL`` mode yet (migration 016) are
+  switched with a full ``VACUUM`` if they are smaller than ``max_vacuum_bytes``;
+* ``checkpoint``: ``PRAGMA wal_checkpoint(TRUNCATE)``, which copies the WAL
+  (including the pages the vacuum just moved) into the database and
+  truncates it if no reader is in the way.
+
+A statement still running when the budget is spent is interrupted (through
+the progress handler) and rolled back; the remaining tasks are skipped.
+Each run is recorded in ``maintenance_log`` (migration 015) with the WAL
+size and freelist before and after and the fragmentation before, measured
+within ``FRAGMENTATION_SHARE`` of the budget.
+
+``MaintenanceScheduler`` watches ``PRAGMA data_version`` and calls ``run()``
+once no other connection has committed for ``idle_seconds``, at most every
+``min_interval`` seconds.
+"""
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add project root to path to allow absolute imports
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data.migrator import require
+from data.readonly import ReadOnlyDatabase
+
+logger = logging.getLogger(__name__)
+
+# Migration that adds maintenance_log
+MAINTENANCE_VERSION = 15
+
+TASKS = ('optimize', 'vacuum', 'checkpoint')
+INCREMENTAL = 2
+# Share of a run's budget the fragmentation figure (a dbstat scan) may take
+FRAGMENTATION_SHARE = 0.25
+
+
+def _default_db_path() -> str:
+    # Imported lazily: importing data.database runs the migration check.
+    from data.database import DB_PATH
+    return DB_PATH
+
+
+class _Deadline:
+    """Interrupts statements on a connection once ``seconds`` have passed."""
+
+    def __init__(self, conn: sqlite3.Connection, seconds: float):
+        self.conn = conn
+        self.ends = time.perf_counter() + seconds
+        self.expired = False
+
+    def remaining(self) -> float:
+        return self.ends - time.perf_counter()
+
+    def _check(self) -> int:
+        if time.perf_counter() >= self.ends:
+            self.expired = True
+            return 1
+        return 0
+
+    def __enter__(self) -> '_Deadline':
+        self.conn.set_progress_handler(self._check, 1000)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.set_progress_handler(None, 0)
+
+
+class MaintenanceService:
+    """
+    Runs ANALYZE/optimize, WAL checkpoints and incremental vacuum within a time budget.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, budget: float = 5.0,
+                 analysis_limit: int = 400, vacuum_step: int = 256,
+                 max_vacuum_bytes: int = 64 * 1024 * 1024, busy_timeout_ms: int = 1000):
+        """
+        Args:
+            db_path: Database path (defaults to the application database)
+            budget: Seconds one run may take
+            analysis_limit: Rows ANALYZE samples per index (``PRAGMA analysis_limit``)
+            vacuum_step: Pages freed per ``incremental_vacuum`` statement
+            max_vacuum_bytes: Largest database switched to incremental
+                auto-vacuum by a full ``VACUUM`` during a run
+            busy_timeout_ms: How long to wait for a lock before giving up on a task
+        """
+        self.db_path = str(db_path) if db_path else _default_db_path()
+        self.budget = budget
+        self.analysis_limit = analysis_limit
+        self.vacuum_step = vacuum_step
+        self.max_vacuum_bytes = max_vacuum_bytes
+        self.busy_timeout_ms = busy_timeout_ms
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000,
+                               isolation_level=None)
+        conn.execute(f'PRAGMA busy_timeout = {int(self.busy_timeout_ms)}')
+        return conn
+
+    def _wal_bytes(self) -> int:
+        try:
+            return os.path.getsize(self.db_path + '-wal')
+        except OSError:
+            return 0
+
+    def stats(self, conn: Optional[sqlite3.Connection] = None,
+              fragmentation: bool = True) -> Dict[str, Any]:
+        """
+        Size figures of the database: page size and count, free pages, WAL
+        bytes, auto-vacuum mode and (if ``dbstat`` is available) the share
+        of b-tree pages not stored right after their predecessor.
+        """
+        own = conn is None
+        conn = conn or self._connect()
+        try:
+            result = {
+                'page_size': conn.execute('PRAGMA page_size').fetchone()[0],
+                'page_count': conn.execute('PRAGMA page_count').fetchone()[0],
+                'freelist_pages': conn.execute('PRAGMA freelist_count').fetchone()[0],
+                'wal_bytes': self._wal_bytes(),
+                'auto_vacuum': conn.execute('PRAGMA auto_vacuum').fetchone()[0],
+                'fragmentation': None,
+            }
+            if fragmentation:
+                result['fragmentation'] = self._fragmentation(conn)
+            return result
+        finally:
+            if own:
+                conn.close()
+
+    @staticmethod
+    def _fragmentation(conn: sqlite3.Connection) -> Optional[float]:
+        try:
+            rows = conn.execute("SELECT name, pageno FROM dbstat ORDER BY name, path").fetchall()
+        except sqlite3.OperationalError:
+            # SQLite built without SQLITE_ENABLE_DBSTAT_VTAB
+            return None
+        if len(rows) < 2:
+            return 0.0
+        scattered = sum(
+            1 for (name, page), (previous_name, previous_page) in zip(rows[1:], rows)
+            if name == previous_name and page != previous_page + 1
+        )
+        return round(scattered / len(rows), 4)
+
+    def _optimize(self, conn: sqlite3.Connection) -> Dict[str, Any]:
+        conn.execute(f'PRAGMA analysis_limit = {int(self.analysis_limit)}')
+        conn.execute('ANALYZE')
+        conn.execute('PRAGMA optimize')
+        tables = conn.execute("SELECT COUNT(DISTINCT tbl) FROM sqlite_stat1").fetchone()[0]
+        return {'tables': tables}
+
+    def _checkpoint(self, conn: sqlite3.Connection) -> Dict[str, Any]:
+        busy, wal_frames, checkpointed = conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()
+        return {'busy': bool(busy), 'wal_frames': wal_frames, 'checkpointed': checkpointed}
+
+    def _vacuum(self, conn: sqlite3.Connection, deadline: _Deadline) -> Dict[str, Any]:
+        if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != INCREMENTAL:
+            size = os.path.getsize(self.db_path)
+            if size > self.max_vacuum_bytes:
+                return {'switched': False, 'freed': 0}
+            # The switch migration 016 could not make: rebuild once
+            conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            conn.execute('VACUUM')
+            return {'switched': True, 'freed': 0}
+        freed = 0
+        free = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        while free and deadline.remaining() > 0:
+            conn.execute(f'PRAGMA incremental_vacuum({int(self.vacuum_step)})').fetchall()
+            now_free = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            freed += free - now_free
+            if now_free >= free:
+                break
+            free = now_free
+        return {'switched': False, 'freed': freed}
+
+    def run(self, budget: Optional[float] = None, tasks=TASKS) -> Dict[str, Any]:
+        """
+        Run the maintenance tasks within ``budget`` seconds and record the run.
+
+        Returns:
+            ``{'seconds', 'tasks': {name: result or 'interrupted'/'skipped'/error},
+            'before': stats, 'after': stats}``
+        """
+        budget = self.budget if budget is None else budget
+        started = time.perf_counter()
+        conn = self._connect()
+        try:
+            require(conn, MAINTENANCE_VERSION, 'Maintenance')
+            before = self.stats(conn, fragmentation=False)
+            # dbstat reads every page of the database: the scan gets a share
+            # of the budget and the figure is left out if it is interrupted
+            with _Deadline(conn, budget * FRAGMENTATION_SHARE):
+                before['fragmentation'] = self._fragmentation(conn)
+            results: Dict[str, Any] = {}
+            with _Deadline(conn, budget - (time.perf_counter() - started)) as deadline:
+                for name in tasks:
+                    if deadline.remaining() <= 0:
+                        results[name] = 'skipped'
+                        continue
+                    task_started = time.perf_counter()
+                    try:
+                        if name == 'vacuum':
+                            result = self._vacuum(conn, deadline)
+                        else:
+                            result = getattr(self, f'_{name}')(conn)
+                    except sqlite3.OperationalError as e:
+                        if conn.in_transaction:
+                            conn.execute('ROLLBACK')
+                        results[name] = 'interrupted' if deadline.expired else f'error: {e}'
+                        continue
+                    result['seconds'] = round(time.perf_counter() - task_started, 4)
+                    results[name] = result
+            after = self.stats(conn, fragmentation=False)
+            seconds = time.perf_counter() - started
+            conn.execute(
+                """
+                INSERT INTO maintenance_log (seconds, tasks, page_size, page_count, freelist_pages,
+                                             freelist_after, wal_bytes, wal_bytes_after, fragmentation)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (seconds, json.dumps(results), before['page_size'], before['page_count'],
+                 before['freelist_pages'], after['freelist_pages'], before['wal_bytes'],
+                 after['wal_bytes'], before['fragmentation'])
+            )
+        finally:
+            conn.close()
+        logger.info(f"Maintenance in {seconds * 1000:.0f}ms: {results}")
+        return {'seconds': seconds, 'tasks': results, 'before': before, 'after': after}
+
+    def history(self, limit: int = 30) -> List[Dict[str, Any]]:
+        """The most recent runs, newest first."""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            require(conn, MAINTENANCE_VERSION, 'Maintenance history')
+            rows = conn.execute(
+                "SELECT * FROM maintenance_log ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [dict(row, tasks=json.loads(row['tasks'])) for row in rows]
+
+
+class MaintenanceScheduler:
+    """
+    Calls ``MaintenanceService.run()`` on a daemon thread when the database is idle.
+
+    Every ``poll`` seconds ``PRAGMA data_version`` is read; once it has not
+    changed for ``idle_seconds`` (no other connection committed) and the
+    last run is ``min_interval`` seconds ago, a run starts.
+    """
+
+    def __init__(self, service: MaintenanceService, idle_seconds: float = 120,
+                 min_interval: float = 3600, poll: float = 10):
+        self.service = service
+        self.idle_seconds = idle_seconds
+        self.min_interval = min_interval
+        self.poll = poll
+        self.runs = 0
+        self.last_error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        readonly = ReadOnlyDatabase(self.service.db_path)
+        version, quiet_since, last_run = None, time.monotonic(), None
+        try:
+            while not self._stop.wait(self.poll):
+                try:
+                    current = readonly.data_version()
+                except sqlite3.Error as e:
+                    self.last_error = e
+                    continue
+                now = time.monotonic()
+                if current != version:
+                    version, quiet_since = current, now
+                    continue
+                if now - quiet_since < self.idle_seconds:
+                    continue
+                if last_run is not None and now - last_run < self.min_interval:
+                    continue
+                try:
+                    self.service.run()
+                    self.last_error = None
+                except (OSError, sqlite3.Error) as e:
+                    self.last_error = e
+                    logger.error(f"Maintenance failed: {e}")
+                last_run = time.monotonic()
+                self.runs += 1
+                # The run's own commits are not activity
+                version = readonly.data_version()
+        finally:
+            readonly.close()
+
+    def start(self) -> 'MaintenanceScheduler':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='maintenance-scheduler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+if __name__ == "__main__":
+    import argparse
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Database maintenance: optimize, checkpoint, vacuum')
+    parser.add_argument('--db', help='Database path (defaults to the application database)')
+    parser.add_argument('--budget', type=float, default=5.0, help='Seconds the run may take')
+    parser.add_argument('--stats', action='store_true', help='Show size figures only')
+    parser.add_argument('--history', type=int, metavar='N', help='Show the last N runs')
+    args = parser.parse_args()
+
+    service = MaintenanceService(args.db, budget=args.budget)
+    if args.stats:
+        print(json.dumps(service.stats(), indent=2))
+    elif args.history:
+        for run in service.history(args.history):
+            print(f"{run['started_at']}  {run['seconds'] * 1000:8.0f}ms  free {run['freelist_pages']:>6} -> "
+                  f"{run['freelist_after']:<6}  wal {run['wal_bytes']:>10} -> {run['wal_bytes_after']:<10}  "
+                  f"fragmentation {run['fragmentation']}")
+    else:
+        print(json.dumps(service.run(), indent=2))
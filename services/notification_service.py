@@ -0,0 +1,302 @@
+"""
+Notification Service
+--------------------
+Finds loans that are due soon or overdue and holds that are ready for
+pickup, queues one notice per event in the ``notifications`` table and
+delivers the queue in batches over reused SMTP connections.
+
+Scans are single ``INSERT OR IGNORE ... SELECT`` statements driven by
+indexed range queries (open loans by due date, active reservations by
+book); the ``UNIQUE (kind, ref_id, notice_key)`` constraint de-duplicates
+notices, so running the scan repeatedly is safe.
+"""
+import asyncio
+import logging
+import sqlite3
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+# Add project root to path to allow absolute imports
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data.migrator import require
+from services.mailer import MailerPool, OutgoingMessage
+
+logger = logging.getLogger(__name__)
+
+# Migration that adds the notifications table and the scan indexes
+NOTIFICATIONS_VERSION = 8
+
+# Titles and page categories per notice kind
+NOTICE_TITLES = {
+    'due_soon': 'Due Date Reminder',
+    'overdue': 'Overdue Notice',
+    'hold_ready': 'Reservation Update',
+}
+NOTICE_CATEGORIES = {
+    'due_soon': 'Due Date',
+    'overdue': 'Due Date',
+    'hold_ready': 'Reservation',
+}
+
+_DUE_SOON_SQL = """
+    INSERT OR IGNORE INTO notifications (user_id, kind, ref_id, notice_key, recipient, subject, body)
+    SELECT t.user_id, 'due_soon', t.id, substr(t.due_date, 1, 10), u.email,
+           'Due Date Reminder',
+           'The book ''' || b.title || ''' is due on ' || substr(t.due_date, 1, 10) || '.'
+    FROM transactions t
+    JOIN users u ON u.id = t.user_id
+    JOIN books b ON b.id = t.book_id
+    WHERE t.return_date IS NULL
+      AND t.due_date >= :today AND t.due_date < :horizon
+      AND COALESCE(t.status, '') NOT IN ('lost', 'Lost')
+      AND COALESCE(u.email, '') <> ''
+"""
+
+# One notice per ``repeat_days`` while the loan stays overdue
+_OVERDUE_SQL = """
+    INSERT OR IGNORE INTO notifications (user_id, kind, ref_id, notice_key, recipient, subject, body)
+    SELECT t.user_id, 'overdue', t.id,
+           'overdue-' || CAST((julianday(:today) - julianday(date(t.due_date)) - 1) / :repeat_days AS INTEGER),
+           u.email,
+           'Overdue Notice',
+           'The book ''' || b.title || ''' is overdue by '
+               || CAST(julianday(:today) - julianday(date(t.due_date)) AS INTEGER) || ' day(s).'
+    FROM transactions t
+    JOIN users u ON u.id = t.user_id
+    JOIN books b ON b.id = t.book_id
+    WHERE t.return_date IS NULL
+      AND t.due_date < :today
+      AND COALESCE(t.status, '') NOT IN ('lost', 'Lost')
+      AND COALESCE(u.email, '') <> ''
+"""
+
+# The oldest active reservation for a title with a copy on the shelf
+_HOLD_READY_SQL = """
+    INSERT OR IGNORE INTO notifications (user_id, kind, ref_id, notice_key, recipient, subject, body)
+    SELECT r.user_id, 'hold_ready', r.id, 'ready', u.email,
+           'Reservation Update',
+           'Your reservation for ''' || b.title || ''' is now available for pickup.'
+    FROM books b
+    JOIN reservations r ON r.book_id = b.id AND r.status = 'Active'
+    JOIN users u ON u.id = r.user_id
+    WHERE b.available > 0
+      AND r.id = (SELECT MIN(r2.id) FROM reservations r2
+                  WHERE r2.book_id = b.id AND r2.status = 'Active')
+      AND COALESCE(u.email, '') <> ''
+"""
+
+
+def _default_db_path() -> str:
+    # Imported lazily: importing data.database runs the migration check.
+    from data.database import DB_PATH
+    return DB_PATH
+
+
+class NotificationService:
+    """
+    Generates and delivers circulation notices.
+
+    ``scan()`` queues new notices, ``deliver_pending()`` sends the queue and
+    ``run_once()`` does both; schedule ``run_once`` daily (or more often).
+    """
+
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, db_path: Optional[str] = None, smtp_host: str = 'localhost',
+                 smtp_port: int = 25, sender: str = 'library@intelli-libraria.local',
+                 due_soon_days: int = 2, overdue_repeat_days: int = 7,
+                 batch_size: int = 500, connections: int = 4):
+        """
+        Args:
+            db_path: Database path (defaults to the application database)
+            smtp_host, smtp_port: Mail server to deliver through
+            sender: Envelope and From address
+            due_soon_days: Notify when a loan is due within this many days
+            overdue_repeat_days: Repeat overdue notices this often
+            batch_size: Notices claimed from the queue per batch
+            connections: Concurrent SMTP connections
+        """
+        self.db_path = str(db_path) if db_path else _default_db_path()
+        self.smtp_host = smtp_host
+        self.smtp_port = smtp_port
+        self.sender = sender
+        self.due_soon_days = due_soon_days
+        self.overdue_repeat_days = overdue_repeat_days
+        self.batch_size = batch_size
+        self.connections = connections
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def scan(self, today: Union[str, date, None] = None) -> Dict[str, int]:
+        """
+        Queue notices for due-soon loans, overdue loans and ready holds.
+
+        Args:
+            today: Reference day (defaults to today)
+
+        Returns:
+            Number of new notices queued per kind
+        """
+        today = date.fromisoformat(today) if isinstance(today, str) else (today or date.today())
+        params = {
+            'today': today.isoformat(),
+            'horizon': (today + timedelta(days=self.due_soon_days + 1)).isoformat(),
+            'repeat_days': self.overdue_repeat_days,
+        }
+        conn = self._connect()
+        try:
+            require(conn, NOTIFICATIONS_VERSION, 'The notification scan')
+            with conn:
+                queued = {
+                    'due_soon': conn.execute(_DUE_SOON_SQL, params).rowcount,
+                    'overdue': conn.execute(_OVERDUE_SQL, params).rowcount,
+                    'hold_ready': conn.execute(_HOLD_READY_SQL).rowcount,
+                }
+            logger.info(f"Queued notifications: {queued}")
+            return queued
+        finally:
+            conn.close()
+
+    def pending_count(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT COUNT(*) FROM notifications WHERE status = 'pending'"
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+    def _claim(self, conn: sqlite3.Connection, after_id: int, limit: int) -> List[OutgoingMessage]:
+        rows = conn.execute(
+            """
+            SELECT id, recipient, subject, body FROM notifications
+            WHERE status = 'pending' AND id > ?
+            ORDER BY id
+            LIMIT ?
+            """,
+            (after_id, limit)
+        ).fetchall()
+        return [
+            OutgoingMessage(row['id'], self.sender, row['recipient'], row['subject'], row['body'])
+            for row in rows
+        ]
+
+    def _record(self, conn: sqlite3.Connection, results) -> None:
+        with conn:
+            conn.executemany(
+                """
+                UPDATE notifications
+                SET status = 'sent', attempts = attempts + 1,
+                    sent_at = CURRENT_TIMESTAMP, last_error = NULL
+                WHERE id = ?
+                """,
+                [(ref,) for ref, error in results if error is None]
+            )
+            conn.executemany(
+                """
+                UPDATE notifications
+                SET attempts = attempts + 1, last_error = ?,
+                    status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END
+                WHERE id = ?
+                """,
+                [(error, self.MAX_ATTEMPTS, ref) for ref, error in results if error is not None]
+            )
+
+    async def _deliver(self, limit: Optional[int]) -> Dict[str, int]:
+        totals = {'sent': 0, 'failed': 0, 'batches': 0}
+        conn = self._connect()
+        last_id = 0
+        try:
+            async with MailerPool(self.smtp_host, self.smtp_port, self.connections) as pool:
+                while limit is None or totals['sent'] + totals['failed'] < limit:
+                    size = self.batch_size
+                    if limit is not None:
+                        size = min(size, limit - totals['sent'] - totals['failed'])
+                    batch = self._claim(conn, last_id, size)
+                    if not batch:
+                        break
+                    last_id = batch[-1].ref
+                    results = await pool.send_batch(batch)
+                    self._record(conn, results)
+                    failed = sum(1 for _, error in results if error is not None)
+                    totals['sent'] += len(results) - failed
+                    totals['failed'] += failed
+                    totals['batches'] += 1
+        finally:
+            conn.close()
+        return totals
+
+    def deliver_pending(self, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Deliver queued notices in batches.
+
+        Notices that fail stay pending until they have failed
+        ``MAX_ATTEMPTS`` times; each is tried at most once per call.
+
+        Returns:
+            Counts of sent and failed notices and of batches
+        """
+        totals = asyncio.run(self._deliver(limit))
+        logger.info(f"Delivered notifications: {totals}")
+        return totals
+
+    def run_once(self, today: Union[str, date, None] = None) -> Dict[str, Any]:
+        """Scan for new notices, then deliver everything pending."""
+        return {'queued': self.scan(today), 'delivery': self.deliver_pending()}
+
+    def recent(self, user_id: Optional[int] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Most recent notices, shaped for the notifications page.
+
+        A plain read: the table comes from migration 008, which the migrator
+        applies at start-up, so this never runs DDL on the caller's thread.
+
+        Returns:
+            Dicts with title, description, date and category
+        """
+        conn = self._connect()
+        try:
+            where, params = ('WHERE user_id = ?', (user_id, limit)) if user_id else ('', (limit,))
+            rows = conn.execute(
+                f"""
+                SELECT kind, body, date(created_at) as created, status
+                FROM notifications {where}
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                params
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            {
+                'title': NOTICE_TITLES[row['kind']],
+                'description': row['body'],
+                'date': row['created'],
+                'category': NOTICE_CATEGORIES[row['kind']],
+                'status': row['status'],
+            }
+            for row in rows
+        ]
+
+
+if __name__ == "__main__":
+    import argparse
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Generate and deliver circulation notices')
+    parser.add_argument('--db', help='Database path (defaults to the application database)')
+    parser.add_argument('--smtp-host', default='localhost')
+    parser.add_argument('--smtp-port', type=int, default=25)
+    parser.add_argument('--scan-only', action='store_true', help='Queue notices without sending them')
+    args = parser.parse_args()
+
+    service = NotificationService(args.db, args.smtp_host, args.smtp_port)
+    print(service.scan() if args.scan_only else service.run_once())
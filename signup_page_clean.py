@@ -4,8 +4,9 @@ import sqlite3
 from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QVBoxLayout, 
                             QHBoxLayout, QLineEdit, QPushButton, QMessageBox,
                             QGraphicsBlurEffect, QMainWindow)
-from PyQt5.QtGui import QPixmap, QColor, QPainter, QPainterPath, QFont, QPalette, QBrush
+from PyQt5.QtGui import QColor, QPainter, QPainterPath, QFont, QPalette, QBrush
 from PyQt5.QtCore import Qt, QRectF
+from pixmap_cache import background_pixmap
 
 # Styling
 PRIMARY = "#4A6CF7"
@@ -297,12 +298,7 @@ class SignupPage(QMainWindow):
         self.bg_label = QLabel(central_widget)
         
         if os.path.exists(self.bg_image):
-            pixmap = QPixmap(self.bg_image)
-            self.bg_label.setPixmap(pixmap.scaled(
-                self.size(), 
-                Qt.KeepAspectRatioByExpanding, 
-                Qt.SmoothTransformation
-            ))
+            self.bg_label.setPixmap(background_pixmap(self.bg_image, self.size(), self.devicePixelRatioF()))
         else:
             self.bg_label.setStyleSheet("background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #4a6cf7, stop:1 #3b5bdb);")
         
@@ -331,12 +327,8 @@ class SignupPage(QMainWindow):
             
             # Update background image if it exists
             if hasattr(self, 'bg_image') and os.path.exists(self.bg_image):
-                pixmap = QPixmap(self.bg_image)
-                self.bg_label.setPixmap(pixmap.scaled(
-                    self.size(), 
-                    Qt.KeepAspectRatioByExpanding, 
-                    Qt.SmoothTransformation
-                ))
+                # Scaled from the screen-sized copy in the pixmap cache
+                self.bg_label.setPixmap(background_pixmap(self.bg_image, self.size(), self.devicePixelRatioF()))
             
             # Keep background at the bottom of the stack
             self.bg_label.lower()
@@ -2,12 +2,22 @@ import sys
 import os
 from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QGraphicsDropShadowEffect
 from PyQt5.QtGui import QPixmap, QPalette, QBrush, QColor, QFont, QLinearGradient
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt
+
+from classic_splash import WarmUp
 
 class SplashScreen(QWidget):
-    def __init__(self):
+    def __init__(self, tasks=None):
         super().__init__()
+        self.results = {}
+        self.warmup = WarmUp(tasks, self)
+        self.warmup.finished.connect(self.finish)
         self.initUI()
+        self.warmup.start()
+
+    def finish(self, results):
+        self.results = results
+        self.close()
 
     def initUI(self):
         self.setWindowFlags(Qt.FramelessWindowHint)
@@ -48,9 +58,6 @@ class SplashScreen(QWidget):
         layout.addStretch(1)
         self.setLayout(layout)
 
-        # QTimer to close after 5 seconds
-        QTimer.singleShot(5000, self.close)
-
     def set_dark_blue_background(self):
         palette = QPalette()
         palette.setColor(QPalette.Window, QColor("#0a3d62"))
@@ -0,0 +1,166 @@
+"""
+Painted cells shared by the management tables.
+
+Tables used to put a ``QWidget`` with a layout and styled ``QPushButton``s
+in every row (``setCellWidget``); thousands of live widgets then dominated
+memory, start-up and scrolling. These delegates paint the same cells and
+hit-test clicks themselves, so a row costs nothing beyond its data:
+
+* ``ActionButtonsDelegate`` paints a row of buttons and emits
+  ``clicked(action, row_id)``. The row id is the cell's ``Qt.UserRole``
+  data (the row number when there is none). A cell can narrow or disable
+  its buttons through ``ACTIONS_ROLE`` and ``DISABLED_ACTIONS_ROLE``.
+* ``PillDelegate`` paints the cell text as a coloured pill.
+
+Both work with models and with ``QTableWidget`` (``action_item`` builds
+the item an actions cell needs).
+"""
+from typing import NamedTuple
+
+from PyQt5.QtCore import QEvent, QPoint, QRect, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter
+from PyQt5.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem, QTableWidgetItem
+
+# Action names shown in a cell (default: every button of the delegate)
+ACTIONS_ROLE = Qt.UserRole + 1
+# Action names painted greyed out and not clickable
+DISABLED_ACTIONS_ROLE = Qt.UserRole + 2
+
+
+class ActionButton(NamedTuple):
+    action: str
+    label: str
+    background: str
+    foreground: str
+    border: str
+
+
+EDIT = ActionButton('edit', "Edit", '#dbeafe', '#1e40af', '#93c5fd')
+DELETE = ActionButton('delete', "Delete", '#fee2e2', '#991b1b', '#fecaca')
+DISABLED_COLORS = ('#f3f4f6', '#9ca3af', '#e5e7eb')
+
+
+def action_item(row_id=None, actions=None, disabled=None):
+    """A ``QTableWidgetItem`` for an actions cell of a ``QTableWidget``."""
+    item = QTableWidgetItem()
+    item.setFlags(Qt.ItemIsEnabled)
+    if row_id is not None:
+        item.setData(Qt.UserRole, row_id)
+    if actions is not None:
+        item.setData(ACTIONS_ROLE, list(actions))
+    if disabled:
+        item.setData(DISABLED_ACTIONS_ROLE, list(disabled))
+    return item
+
+
+def _paint_background(painter, option):
+    """The cell background as the view would paint it (alternate rows, selection)."""
+    background = QStyleOptionViewItem(option)
+    background.text = ''
+    background.features &= ~QStyleOptionViewItem.HasDisplay
+    style = option.widget.style() if option.widget else None
+    if style is not None:
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, background, painter, option.widget)
+    elif option.state & QStyle.State_Selected:
+        painter.fillRect(option.rect, option.palette.highlight())
+
+
+class ActionButtonsDelegate(QStyledItemDelegate):
+    """Paints action buttons in a column and reports clicks on them."""
+    clicked = pyqtSignal(str, int)  # action, row id
+
+    SPACING = 6
+
+    def __init__(self, parent=None, buttons=(EDIT, DELETE), button_size=QSize(70, 28),
+                 radius=12):
+        super().__init__(parent)
+        self.buttons = {button.action: button for button in buttons}
+        self.order = tuple(button.action for button in buttons)
+        self.button_size = button_size
+        self.radius = radius
+        self.font = QFont("Arial", 10, QFont.Medium)
+
+    def _actions(self, index):
+        actions = index.data(ACTIONS_ROLE)
+        return self.order if actions is None else [a for a in actions if a in self.buttons]
+
+    def _button_rects(self, rect, actions):
+        size = self.button_size
+        width = len(actions) * size.width() + max(0, len(actions) - 1) * self.SPACING
+        left = rect.left() + (rect.width() - width) // 2
+        top = rect.top() + (rect.height() - size.height()) // 2
+        rects = []
+        for action in actions:
+            rects.append((action, QRect(QPoint(left, top), size)))
+            left += size.width() + self.SPACING
+        return rects
+
+    def paint(self, painter, option, index):
+        painter.save()
+        _paint_background(painter, option)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(self.font)
+        disabled = index.data(DISABLED_ACTIONS_ROLE) or ()
+        for action, rect in self._button_rects(option.rect, self._actions(index)):
+            button = self.buttons[action]
+            background, foreground, border = (
+                DISABLED_COLORS if action in disabled
+                else (button.background, button.foreground, button.border)
+            )
+            painter.setPen(QColor(border))
+            painter.setBrush(QColor(background))
+            painter.drawRoundedRect(rect, self.radius, self.radius)
+            painter.setPen(QColor(foreground))
+            painter.drawText(rect, Qt.AlignCenter, button.label)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        actions = self._actions(index)
+        width = len(actions) * self.button_size.width() + (len(actions) + 1) * self.SPACING
+        return QSize(width, self.button_size.height() + 2 * self.SPACING)
+
+    def action_at(self, rect, pos, index):
+        """The enabled action under ``pos`` in a cell drawn in ``rect``, or None."""
+        disabled = index.data(DISABLED_ACTIONS_ROLE) or ()
+        for action, button_rect in self._button_rects(rect, self._actions(index)):
+            if button_rect.contains(pos):
+                return None if action in disabled else action
+        return None
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            action = self.action_at(option.rect, event.pos(), index)
+            if action is not None:
+                row_id = index.data(Qt.UserRole)
+                self.clicked.emit(action, index.row() if row_id is None else int(row_id))
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class PillDelegate(QStyledItemDelegate):
+    """Paints the cell text as a coloured pill (role and status columns)."""
+
+    def __init__(self, colors, default, parent=None):
+        super().__init__(parent)
+        self.colors = colors  # lower-case value -> (background, text, border)
+        self.default = default
+        self.font = QFont("Inter", 10, QFont.Medium)
+
+    def paint(self, painter, option, index):
+        text = str(index.data(Qt.DisplayRole) or '')
+        background, foreground, border = self.colors.get(text.lower(), self.default)
+        painter.save()
+        _paint_background(painter, option)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(self.font)
+        metrics = QFontMetrics(self.font)
+        width = min(metrics.horizontalAdvance(text.title()) + 24, option.rect.width() - 8)
+        height = metrics.height() + 8
+        pill = QRect(0, 0, width, height)
+        pill.moveCenter(option.rect.center())
+        painter.setPen(QColor(border))
+        painter.setBrush(QColor(background))
+        painter.drawRoundedRect(pill, 6, 6)
+        painter.setPen(QColor(foreground))
+        painter.drawText(pill, Qt.AlignCenter, text.title())
+        painter.restore()
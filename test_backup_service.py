@@ -0,0 +1,151 @@
+import glob
+import gzip
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from data.archive import archive_path_for
+from data.migrator import SCHEMA_VERSION
+from services.backup_service import BackupScheduler, BackupService
+
+
+@pytest.fixture
+def db_path(library_db, add_titles):
+    conn = sqlite3.connect(library_db)
+    add_titles(conn, [(i, f'Title {i}' * 20, 1) for i in range(1, 2001)])
+    conn.commit()
+    conn.close()
+    return library_db
+
+
+@pytest.fixture
+def service(db_path, tmp_path):
+    return BackupService(db_path, str(tmp_path / 'backups'), pages_per_step=16, step_sleep=0, keep=2)
+
+
+def _count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_backup_writes_a_verified_compressed_snapshot(service):
+    snapshot = service.backup()
+    assert snapshot.user_version == SCHEMA_VERSION
+    assert snapshot.compressed_bytes < snapshot.db_bytes
+    assert service.verify(snapshot.path) == {'snapshot': snapshot.path, 'ok': True, 'problems': []}
+
+
+def test_rotation_keeps_the_newest_snapshots(service):
+    taken = [service.backup().path for _ in range(4)]
+    assert [snapshot.path for snapshot in service.snapshots()] == taken[-2:]
+
+
+def test_verify_reports_a_damaged_snapshot(service):
+    snapshot = service.backup()
+    with open(snapshot.path, 'r+b') as f:
+        f.seek(snapshot.compressed_bytes // 2)
+        f.write(b'\x00' * 64)
+    report = service.verify(snapshot.path)
+    assert not report['ok']
+    assert report['problems'] == ['compressed file checksum mismatch']
+
+
+def test_restore_replaces_the_database(service, db_path):
+    snapshot = service.backup()
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("DELETE FROM books")
+    conn.close()
+    assert service.restore(snapshot.path)['ok']
+    assert _count(db_path) == 2000
+
+
+def test_loan_archive_is_backed_up_and_restored(service, db_path):
+    assert service.backup().archive is None
+    archive_path = archive_path_for(db_path)
+    conn = sqlite3.connect(archive_path)
+    with conn:
+        conn.execute("CREATE TABLE transactions (id INTEGER PRIMARY KEY, book_id INTEGER)")
+        conn.executemany("INSERT INTO transactions (book_id) VALUES (?)", [(i,) for i in range(300)])
+    snapshot = service.backup()
+    assert snapshot.archive is not None and service.verify(snapshot.path)['ok']
+
+    with conn:
+        conn.execute("DELETE FROM transactions")
+    conn.close()
+    restored = str(service.backup_dir) + '/restored.db'
+    assert service.restore(snapshot.path, restored)['ok']
+    conn = sqlite3.connect(archive_path_for(restored))
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 300
+    finally:
+        conn.close()
+
+    with open(snapshot.archive_path, 'r+b') as f:
+        f.write(b'\x00' * 16)
+    assert service.verify(snapshot.path)['problems'] == ['archive: compressed file checksum mismatch']
+
+
+def test_restoring_a_snapshot_without_an_archive_sets_the_archive_aside(service, db_path):
+    snapshot = service.backup()
+    assert snapshot.archive is None
+    archive_path = archive_path_for(db_path)
+    conn = sqlite3.connect(archive_path)
+    with conn:
+        conn.execute("CREATE TABLE transactions (id INTEGER PRIMARY KEY, book_id INTEGER)")
+        conn.execute("INSERT INTO transactions (book_id) VALUES (1)")
+    conn.close()
+
+    assert service.restore(snapshot.path)['ok']
+    assert not os.path.exists(archive_path)
+    aside = glob.glob(archive_path + '.replaced-*')
+    assert len(aside) == 1
+    conn = sqlite3.connect(aside[0])
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+def test_backup_copies_one_committed_state_during_writes(service, db_path):
+    stop = threading.Event()
+
+    def writer():
+        conn = sqlite3.connect(db_path, timeout=30)
+        while not stop.is_set():
+            with conn:
+                # Each commit keeps the row count a multiple of 10
+                conn.executemany("INSERT INTO books (title, author, isbn, stock) VALUES (?, 'A. Author', '', 1)",
+                                 [('new',)] * 10)
+        conn.close()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        snapshot = service.backup()
+    finally:
+        stop.set()
+        thread.join()
+    restored = str(service.backup_dir) + '/restored.db'
+    assert service.restore(snapshot.path, restored)['ok']
+    assert _count(restored) % 10 == 0
+    with gzip.open(snapshot.path, 'rb') as f:
+        assert f.read(16) == b'SQLite format 3\x00'
+
+
+def test_scheduler_backs_up_at_the_interval(service):
+    scheduler = BackupScheduler(service, interval=0.05, initial_delay=0).start()
+    try:
+        for _ in range(200):
+            if len(service.snapshots()) >= 2:
+                break
+            threading.Event().wait(0.02)
+    finally:
+        scheduler.stop(timeout=5)
+    assert len(service.snapshots()) == 2
+    assert scheduler.last_error is None
@@ -0,0 +1,93 @@
+import sqlite3
+
+import pytest
+
+from data import branches
+from data.errors import BusinessRuleError
+from data.inventory import reconcile
+from data.migrator import migrate
+from services import circulation
+
+
+@pytest.fixture
+def conn(legacy_db, add_members, add_titles):
+    conn = sqlite3.connect(legacy_db, isolation_level=None)
+    add_members(conn, [(1, 'Ada'), (2, 'Grace'), (3, 'Linus')])
+    add_titles(conn, [(1, 'Dune', 2, 'Frank Herbert', '1'), (2, 'Emma', 1, 'Jane Austen', '2')])
+    conn.execute("UPDATE books SET available = 1 WHERE id = 1")
+    conn.execute("INSERT INTO transactions (user_id, book_id, due_date) VALUES (1, 1, '2024-01-15')")
+    migrate(conn)
+    yield conn
+    conn.close()
+
+
+def test_existing_copies_belong_to_the_main_branch(conn):
+    assert branches.list_branches(conn) == [
+        {'id': 1, 'name': 'Main Library', 'code': 'MAIN', 'titles': 2, 'copies': 3, 'available': 2}
+    ]
+    assert conn.execute("SELECT branch_id FROM transactions").fetchone() == (1,)
+    assert [(b['title'], b['stock'], b['available']) for b in branches.search(conn, 1)] == [
+        ('Dune', 2, 1), ('Emma', 1, 1)
+    ]
+
+
+def test_branch_checkout_moves_every_level_of_counters(conn):
+    east = branches.add_branch(conn, 'East', 'E')
+    assert branches.set_holding(conn, 2, east, 2) == (2, 2)
+    assert conn.execute("SELECT stock, available FROM books WHERE id = 2").fetchone() == (3, 3)
+
+    assert circulation.borrow_book(conn, 1, 2, branch_id=east)[0] is True
+    assert circulation.borrow_book(conn, 2, 2, branch_id=east)[0] is True
+    assert circulation.borrow_book(conn, 3, 2, branch_id=east) == (False, "Book is not available for borrowing")
+    assert circulation.borrow_book(conn, 3, 1, branch_id=east) == (False, "Book is not held by this branch")
+    # Another branch still has a copy
+    assert circulation.borrow_book(conn, 3, 2, branch_id=1)[0] is True
+
+    assert branches.branch_counts(conn, east) == {'titles': 1, 'copies': 2, 'available': 0, 'on_loan': 2}
+    assert branches.title_availability(conn, 2)['available'] == 0
+    assert branches.network_counts(conn) == {'branches': 2, 'copies': 5, 'available': 1, 'on_loan': 4}
+
+    assert circulation.return_book(conn, 1, 2)[0] is True
+    assert branches.branch_counts(conn, east)['available'] == 1
+    assert [b['title'] for b in branches.search(conn, east, 'aust', available_only=True)] == ['Emma']
+    with pytest.raises(sqlite3.IntegrityError, match='No copies available at this branch'):
+        conn.execute("INSERT INTO transactions (user_id, book_id, due_date, branch_id) "
+                     "VALUES (3, 1, '2024-02-15', ?)", (east,))
+    assert branches.verify(conn) == [] and reconcile(conn).ok
+
+
+def test_holding_changes_keep_totals_in_step(conn):
+    east = branches.add_branch(conn, 'East')
+    branches.set_holding(conn, 1, east, 3)
+    with pytest.raises(BusinessRuleError, match='on loan'):
+        branches.set_holding(conn, 1, 1, 0)
+    assert branches.set_holding(conn, 1, east, 1) == (1, 1)
+    branches.set_holding(conn, 2, 1, 0)
+    assert conn.execute("SELECT stock, available FROM books ORDER BY id").fetchall() == [(3, 2), (0, 0)]
+    assert branches.network_counts(conn)['copies'] == 3
+
+    with pytest.raises(BusinessRuleError, match='several branches'):
+        branches.set_title_stock(conn, 1, 5)
+    branches.set_title_stock(conn, 2, 4)
+    assert branches.title_availability(conn, 2)['branches'] == [
+        {'branch_id': 1, 'branch': 'Main Library', 'total': 4, 'available': 4}
+    ]
+    assert branches.verify(conn) == [] and reconcile(conn).ok
+
+
+def test_checkout_without_a_branch_takes_a_held_copy(conn):
+    east = branches.add_branch(conn, 'East')
+    branches.set_holding(conn, 2, east, 1)
+    # The desktop checkout names no branch: the main library lends first, then East
+    assert circulation.borrow_book(conn, 2, 2)[0] is True
+    assert circulation.borrow_book(conn, 3, 2)[0] is True
+    assert conn.execute(
+        "SELECT branch_id FROM transactions WHERE book_id = 2 ORDER BY id"
+    ).fetchall() == [(1,), (east,)]
+    assert branches.network_counts(conn)['available'] == 1
+    assert branches.verify(conn) == [] and reconcile(conn).ok
+
+    # A loan the holdings never saw shows up against the title
+    conn.execute("DROP TRIGGER holdings_loan_default_branch")
+    conn.execute("INSERT INTO transactions (user_id, book_id, due_date) VALUES (2, 1, '2024-02-15')")
+    assert branches.verify(conn) == [(None, 'title 1', 0, 1)]
@@ -0,0 +1,93 @@
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from data import aggregates
+from data.migrator import migrate
+
+
+def _snapshot(conn):
+    return {
+        table: conn.execute(f"SELECT * FROM {table} ORDER BY 1, 2").fetchall()
+        for table in aggregates.AGGREGATE_TABLES
+    }
+
+
+@pytest.fixture
+def conn(legacy_db, add_members, add_titles):
+    conn = sqlite3.connect(legacy_db, isolation_level=None)
+    add_members(conn, [(1, 'Sara Khan'), (2, 'John Smith')])
+    add_titles(conn, [(1, 'Dune', 2), (2, 'Emma', 2)])
+    conn.execute(
+        "INSERT INTO transactions (user_id, book_id, issue_date, due_date, return_date, status) "
+        "VALUES (1, 1, '2024-01-01', '2024-01-15', '2024-01-20', 'Returned')"
+    )
+    migrate(conn)
+    yield conn
+    conn.close()
+
+
+def test_install_backfills_history(conn):
+    assert conn.execute("SELECT * FROM circulation_daily ORDER BY day").fetchall() == [
+        ('2024-01-01', 1, 0, 0, 0, 0.0),
+        ('2024-01-20', 0, 1, 1, 0, 19.0),
+    ]
+
+
+def test_triggers_match_a_full_rebuild(conn):
+    today = date.today()
+    conn.execute(
+        "INSERT INTO transactions (user_id, book_id, issue_date, due_date, status) VALUES (2, 2, ?, ?, 'Issued')",
+        (f'{today} 10:15:00', (today + timedelta(days=14)).isoformat())
+    )
+    conn.execute("UPDATE transactions SET return_date = ?, status = 'Returned' WHERE id = 2", (today.isoformat(),))
+    conn.execute("UPDATE transactions SET issue_date = '2024-01-02', user_id = 2 WHERE id = 1")
+    conn.execute("INSERT INTO reservations (user_id, book_id, reservation_date, status) VALUES (1, 2, ?, 'Active')",
+                 (today.isoformat(),))
+    conn.execute("INSERT INTO reservations (user_id, book_id, reservation_date, status) VALUES (2, 1, '2024-02-01', 'Active')")
+    conn.execute("DELETE FROM reservations WHERE id = 2")
+    conn.execute("INSERT INTO transactions (user_id, book_id, issue_date, due_date, status) VALUES (1, 2, '2024-03-01', '2024-03-15', 'Issued')")
+    conn.execute("DELETE FROM transactions WHERE id = 3")
+
+    incremental = _snapshot(conn)
+    aggregates.rebuild(conn)
+    rebuilt = _snapshot(conn)
+    for table, (keys, _) in aggregates.AGGREGATE_TABLES.items():
+        # Triggers leave all-zero rows behind where a rebuild writes none
+        non_zero = lambda rows: [r for r in rows if any(r[len(keys):])]
+        assert non_zero(incremental[table]) == non_zero(rebuilt[table])
+
+
+def test_unparseable_dates_are_not_counted(conn):
+    before = _snapshot(conn)
+    conn.execute(
+        "INSERT INTO transactions (user_id, book_id, issue_date, due_date, status) "
+        "VALUES (2, 2, '01/03/2024', 'soon', 'Issued')"
+    )
+    conn.execute("UPDATE transactions SET return_date = '2024-03-05', status = 'Returned' WHERE id = 2")
+    conn.execute("UPDATE transactions SET return_date = 'today' WHERE id = 2")
+    conn.execute("INSERT INTO reservations (user_id, book_id, reservation_date, status) "
+                 "VALUES (1, 2, 'next week', 'Active')")
+    conn.execute("UPDATE reservations SET reservation_date = '2024-03-06' WHERE id = 1")
+    conn.execute("UPDATE reservations SET reservation_date = 'later' WHERE id = 1")
+    conn.execute("DELETE FROM reservations WHERE id = 1")
+    conn.execute("DELETE FROM transactions WHERE id = 2")
+    after = _snapshot(conn)
+    for table, (keys, _) in aggregates.AGGREGATE_TABLES.items():
+        non_zero = lambda rows: [r for r in rows if any(r[len(keys):])]
+        assert non_zero(after[table]) == non_zero(before[table])
+
+
+def test_user_activity_reads_the_window(conn):
+    today = date.today().isoformat()
+    conn.execute("INSERT INTO transactions (user_id, book_id, issue_date, due_date, status) VALUES (2, 1, ?, ?, 'Issued')",
+                 (today, today))
+    conn.execute("INSERT INTO reservations (user_id, book_id, reservation_date, status) VALUES (2, 2, ?, 'Active')",
+                 (today,))
+    rows = aggregates.user_activity(conn, days=30)
+    assert len(rows) == 1
+    assert rows[0]['user_id'] == 2
+    assert rows[0]['total_borrowed'] == 1
+    assert rows[0]['total_reservations'] == 1
+    assert rows[0]['last_activity'] == today
@@ -0,0 +1,93 @@
+import sqlite3
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from data import analytics
+
+
+@pytest.fixture
+def db_path(library_db, add_members, add_titles):
+    conn = sqlite3.connect(library_db)
+    add_members(conn, [(1, 'Ada'), (2, 'Grace'), (3, 'Linus')])
+    add_titles(conn, [(1, 'Dune', 2), (2, 'Emma', 1), (3, 'Ulysses', 1)])
+    conn.executescript("""
+        INSERT INTO transactions (user_id, book_id, issue_date, due_date, return_date, status) VALUES
+            (1, 1, '2024-01-01 10:00:00', '2024-01-15', '2024-01-11', 'Returned'),
+            (2, 1, '2024-01-03', '2024-01-17', '2024-01-23', 'Returned'),
+            (1, 2, '2024-02-05', '2024-02-19', '2024-02-10', 'Returned'),
+            (3, 1, '2024-02-06', '2024-02-20', NULL, 'Issued');
+    """)
+    conn.commit()
+    conn.close()
+    return library_db
+
+
+@pytest.fixture
+def service(db_path, tmp_path):
+    service = analytics.CirculationAnalytics(db_path, str(tmp_path / 'cache'))
+    yield service
+    service.close()
+
+
+def test_extract_is_columnar(service):
+    arrays = service.arrays()
+    assert arrays.book_id.dtype == np.int32
+    assert arrays.issue_date.dtype == np.dtype('datetime64[D]')
+    assert str(arrays.issue_date[0]) == '2024-01-01'
+    assert np.isnat(arrays.return_date[3])
+    assert isinstance(arrays.id, np.memmap)
+
+
+def test_statistics(service):
+    arrays = service.arrays()
+
+    durations = analytics.loan_duration_distribution(arrays)
+    assert durations['count'] == 3
+    assert durations['percentiles']['p50'] == 10.0
+
+    top = analytics.title_turnover(arrays)
+    assert top[0] == {'book_id': 1, 'loans': 3, 'copies': 2, 'turnover': 1.5}
+    assert [t['book_id'] for t in top] == [1, 2]
+
+    cohorts = analytics.overdue_rate_by_cohort(arrays, as_of='2024-03-01')
+    assert cohorts == [
+        {'cohort': '2024-01', 'loans': 2, 'overdue': 1, 'overdue_rate': 0.5},
+        {'cohort': '2024-02', 'loans': 2, 'overdue': 1, 'overdue_rate': 0.5},
+    ]
+
+    weeks = analytics.weekly_trends(arrays, weeks=6, as_of='2024-02-07')
+    assert weeks[0]['week_start'] == '2024-01-01'
+    assert weeks[0]['issues'] == 2
+    assert sum(w['returns'] for w in weeks) == 3
+
+
+def test_cache_follows_data_version(service, db_path):
+    service.arrays()
+    service.arrays()
+    assert service.extracts == 1
+
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute(
+            "INSERT INTO transactions (user_id, book_id, issue_date, due_date, status) "
+            "VALUES (2, 3, '2024-02-08', '2024-02-22', 'Issued')"
+        )
+    conn.close()
+
+    assert len(service.arrays()) == 5
+    assert service.extracts == 2
+
+
+def test_extract_includes_archived_loans(service, db_path):
+    from datetime import date
+    from data import archive
+
+    conn = sqlite3.connect(db_path)
+    assert archive.archive_returned(conn, horizon_days=30, today=date(2024, 3, 1))['moved'] == 2
+    conn.close()
+
+    arrays = service.arrays()
+    assert sorted(arrays.id.tolist()) == [1, 2, 3, 4]
+    assert int(arrays.returned.sum()) == 3
@@ -0,0 +1,155 @@
+import asyncio
+import socket
+import sqlite3
+import threading
+
+import pytest
+
+from services.circulation_client import CirculationClient, CirculationServiceError
+from services.circulation_server import CirculationServer
+
+
+@pytest.fixture
+def db_path(legacy_db, add_members, add_titles):
+    # The server applies the pending migrations when it starts
+    conn = sqlite3.connect(legacy_db)
+    add_members(conn, [(1, 'Sara Khan'), (2, 'Omar Ali')])
+    add_titles(conn, [(1, 'Dune', 1, 'Frank Herbert', '9780441013593'),
+                      (2, 'Emma', 3, 'Jane Austen', '9780141439587')])
+    conn.commit()
+    conn.close()
+    return legacy_db
+
+
+@pytest.fixture
+def service(db_path):
+    loop = asyncio.new_event_loop()
+    server = CirculationServer(db_path, port=0)
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    client = CirculationClient(f"http://127.0.0.1:{server.port}")
+    yield client
+    client.close()
+    asyncio.run_coroutine_threadsafe(server.stop(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+def test_borrow_return_round_trip(service, db_path):
+    assert service.health()
+    success, message = service.borrow_book(1, 1)
+    assert success and message.startswith("Successfully borrowed 'Dune'. Due date: ")
+
+    # The only copy is out now
+    assert service.borrow_book(2, 1) == (False, "Book is not available for borrowing")
+    assert [loan['title'] for loan in service.user_loans(1)] == ['Dune']
+    assert service.counts()['active_loans'] == 1
+
+    returned = service.checkin(1, 1)
+    assert (returned['success'], returned['title']) == (True, 'Dune')
+    assert returned['message'] == "The book 'Dune' has been successfully returned"
+    assert service.return_book(1, 1)[0] is False
+    assert service.user_loans(1) == []
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT stock, available FROM books WHERE id = 1").fetchone() == (1, 1)
+    conn.close()
+
+
+def test_search_and_reservations(service):
+    assert [b['title'] for b in service.search_books('austen')] == ['Emma']
+    assert len(service.search_books(limit=1)) == 1
+    assert service.reserve_book(2, 2, '2024-05-01') == (True, "Reservation created successfully")
+    assert service.reserve_book(9, 2)[0] is False
+    assert service.counts()['active_reservations'] == 1
+
+
+def test_bad_requests_are_reported(service):
+    with pytest.raises(CirculationServiceError, match="'book_id' must be an integer"):
+        service._request('POST', '/loans', {'user_id': 1})
+    with pytest.raises(CirculationServiceError, match='Not found'):
+        service._request('GET', '/nowhere')
+    with pytest.raises(CirculationServiceError, match='Method not allowed'):
+        service._request('GET', '/loans')
+    # The connection is still usable after errors
+    assert service.health()
+
+    with socket.create_connection((service.host, service.port)) as raw:
+        raw.sendall(b"POST /loans HTTP/1.1\r\nContent-Length: lots\r\n\r\n")
+        answer = raw.makefile('rb').read()
+    assert answer.startswith(b"HTTP/1.1 400") and b'Invalid Content-Length' in answer
+
+
+class _FlakyConnection:
+    """Stands in for a kept-alive connection that fails once the request is out."""
+    sock = None
+
+    def __init__(self, error):
+        self.error = error
+        self.sent = []
+
+    def request(self, method, path, body=None, headers=None):
+        self.sent.append((method, path))
+
+    def getresponse(self):
+        raise self.error
+
+    def close(self):
+        pass
+
+
+def test_writes_are_not_resent_after_the_request_went_out(service, db_path, monkeypatch):
+    monkeypatch.setattr('services.circulation_client._dropped', lambda conn: False)
+    for error in (ConnectionResetError('reset'), socket.timeout('timed out')):
+        service._conn = flaky = _FlakyConnection(error)
+        with pytest.raises(CirculationServiceError):
+            service.borrow_book(1, 2)
+        assert flaky.sent == [('POST', '/loans')]
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 0
+    conn.close()
+
+    # Reads are retried on a fresh connection, but not after a timeout
+    service._conn = _FlakyConnection(ConnectionResetError('reset'))
+    assert service.counts()['active_loans'] == 0
+    service._conn = _FlakyConnection(socket.timeout('timed out'))
+    with pytest.raises(CirculationServiceError, match='timed out'):
+        service.counts()
+
+
+def test_connections_closed_by_the_server_are_replaced_before_sending(service):
+    assert service.health()
+    service._conn.sock.shutdown(socket.SHUT_RD)
+    # The idle socket now reads as closed, so the write goes out on a new connection
+    assert service.borrow_book(1, 2)[0] is True
+
+
+def test_concurrent_desks_share_one_writer(service):
+    port = service.port
+    results = []
+
+    def desk(user_id):
+        client = CirculationClient(f"http://127.0.0.1:{port}")
+        results.append(client.borrow_book(user_id, 2))
+        client.close()
+
+    threads = [threading.Thread(target=desk, args=(user_id,)) for user_id in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(success for success, _ in results)
+    assert service.search_books('Emma')[0]['available'] == 1
+
+
+def test_branch_scoped_routes(service):
+    assert [b['name'] for b in service.branches()] == ['Main Library']
+    assert [b['title'] for b in service.search_books(branch_id=1)] == ['Dune', 'Emma']
+    assert service.borrow_book(1, 2, branch_id=1)[0] is True
+    assert service.branch_counts(1) == {'titles': 2, 'copies': 4, 'available': 3, 'on_loan': 1}
+    availability = service.title_availability(2)
+    assert (availability['available'], availability['branches'][0]['available']) == (2, 2)
+    with pytest.raises(CirculationServiceError, match='branch not found'):
+        service.branch_counts(9)
@@ -0,0 +1,92 @@
+import sqlite3
+
+import pytest
+
+from data import eligibility
+from data.errors import ValidationError
+from services import circulation
+
+
+@pytest.fixture
+def conn(library_conn, add_members, add_titles):
+    add_members(library_conn, [(1, 'Ada'), (2, 'Grace', 'Admin'), (3, 'Linus', 'member', 'Inactive'), (4, 'Ken')])
+    add_titles(library_conn, [(1, 'Dune', 3), (2, 'Emma', 1), (3, 'Atlas', 1), (4, 'Ulysses', 5)])
+    library_conn.executescript("""
+        -- Ken returned Dune 10 days late (fined by the ledger); Ada has Emma out
+        INSERT INTO transactions (user_id, book_id, issue_date, due_date, status) VALUES
+            (4, 1, '2024-01-01', '2024-01-15', 'Borrowed'),
+            (1, 2, date('now'), date('now', '+14 days'), 'Borrowed');
+        UPDATE transactions SET return_date = '2024-01-25', status = 'Returned' WHERE id = 1;
+    """)
+    return library_conn
+
+
+def _messages(verdicts):
+    return {verdict.user_id: verdict.message for verdict in verdicts}
+
+
+def test_default_rules_match_the_old_checks(conn):
+    assert _messages(eligibility.check_patrons(conn, [1, 2, 3, 4, 99], 1)) == {
+        1: None, 2: None, 3: "User account is not active", 4: None, 99: "User not found",
+    }
+    verdict = eligibility.check(conn, 1, 2)
+    assert verdict.failed == ['book_available', 'title_limit']
+    assert verdict.message == "Book is not available for borrowing"
+    assert eligibility.check(conn, 1, 42).message == "Book not found"
+    assert eligibility.check_many(conn, []) == []
+
+
+def test_rules_per_role_title_and_fines(conn):
+    eligibility.set_rule(conn, 'max_loans', 1, role='Member')
+    eligibility.set_rule(conn, 'max_title_loans', 0, book_id=3)
+    verdicts = eligibility.check_many(conn, [(1, 1), (2, 1), (2, 3)])
+    # The role rule beats the default limit of 5; Grace is an admin
+    assert verdicts[0].message == "Maximum borrow limit reached (1 books)" and verdicts[0].loan_limit == 1
+    assert verdicts[1].eligible and verdicts[1].loan_limit == 5
+    assert verdicts[2].message == "This book is for reference only and cannot be borrowed"
+
+    # Ken owes $5.00; the seeded fine rule is off until switched on
+    assert eligibility.check(conn, 4, 4).eligible
+    eligibility.set_rule(conn, 'max_fine_balance', 400)
+    verdict = eligibility.check(conn, 4, 4)
+    assert verdict.failed == ['fine_limit'] and verdict.balance_cents == 500
+    assert verdict.message == "Outstanding fines of $5.00 exceed the $4.00 limit"
+    eligibility.set_rule(conn, 'max_fine_balance', 400, active=False)
+    assert eligibility.check(conn, 4, 4).eligible
+
+    with pytest.raises(ValidationError):
+        eligibility.set_rule(conn, 'max_loans', 2, book_id=1)
+    with pytest.raises(ValidationError):
+        eligibility.set_rule(conn, 'no_such_rule', 1)
+
+
+def test_rule_changes_from_another_connection_are_seen(conn, library_db):
+    assert eligibility.check(conn, 4, 1).eligible
+    other = sqlite3.connect(library_db)
+    eligibility.set_rule(other, 'max_loans', 0)
+    other.close()
+    assert eligibility.check(conn, 4, 1).message == "Maximum borrow limit reached (0 books)"
+
+
+def test_checkout_uses_the_rules(conn):
+    eligibility.set_rule(conn, 'max_loans', 2)
+    assert circulation.borrow_book(conn, 4, 1)[0]
+    assert circulation.borrow_book(conn, 4, 1) == (False, "You have already borrowed this book")
+    assert circulation.borrow_book(conn, 4, 3)[0]
+    assert circulation.borrow_book(conn, 4, 4) == (False, "Maximum borrow limit reached (2 books)")
+
+
+def test_databases_without_the_rules_table_use_the_defaults(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'legacy.db'))
+    conn.executescript("""
+        CREATE TABLE users (id INTEGER PRIMARY KEY, status TEXT);
+        CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT, available INTEGER);
+        CREATE TABLE transactions (id INTEGER PRIMARY KEY, user_id INTEGER, book_id INTEGER,
+                                   return_date TEXT);
+        INSERT INTO users VALUES (1, 'Active');
+        INSERT INTO books VALUES (1, 'Dune', 9);
+    """)
+    conn.executemany("INSERT INTO transactions (user_id, book_id) VALUES (1, ?)", [(i,) for i in range(2, 7)])
+    verdict = eligibility.check(conn, 1, 1)
+    assert verdict.failed == ['loan_limit'] and verdict.fine_limit is None
+    conn.close()
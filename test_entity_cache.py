@@ -0,0 +1,125 @@
+import sqlite3
+
+import pytest
+
+from data.entity_cache import EntityCache
+
+
+@pytest.fixture
+def db_path(library_db, add_members, add_titles):
+    conn = sqlite3.connect(library_db)
+    add_members(conn, [(1, 'Sara Khan')])
+    add_titles(conn, [(1, 'Dune', 2, 'Frank Herbert', '9780441013593'),
+                      (2, 'Emma', 1, 'Jane Austen', '9780141439587'),
+                      (3, 'Ulysses', 1, 'James Joyce', '9780199535675')])
+    conn.commit()
+    conn.close()
+    return library_db
+
+
+def _write(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute(sql, params)
+    conn.close()
+
+
+def _loader(db_path, sql, params, calls):
+    def load():
+        calls.append(params)
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        row = conn.execute(sql, params).fetchone()
+        conn.close()
+        return dict(row) if row else None
+    return load
+
+
+def _book(cache, db_path, book_id, calls):
+    return cache.get('book', 'id', book_id,
+                     _loader(db_path, "SELECT * FROM books WHERE id = ?", (book_id,), calls))
+
+
+def test_hits_misses_and_lru_eviction(db_path):
+    cache = EntityCache(db_path, maxsize=2)
+    calls = []
+    assert _book(cache, db_path, 1, calls)['title'] == 'Dune'
+    assert _book(cache, db_path, 1, calls)['title'] == 'Dune'
+    assert _book(cache, db_path, 2, calls)['title'] == 'Emma'
+    _book(cache, db_path, 1, calls)             # 1 is now most recently used
+    _book(cache, db_path, 3, calls)             # evicts 2
+    _book(cache, db_path, 2, calls)
+    assert calls == [(1,), (2,), (3,), (2,)]
+    assert cache.get('book', 'id', 99, lambda: None) is None
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (2, 5, 2)
+    assert stats['hit_rate'] == pytest.approx(2 / 7)
+    cache.close()
+
+
+def test_returned_rows_are_copies(db_path):
+    cache = EntityCache(db_path)
+    calls = []
+    _book(cache, db_path, 1, calls)['title'] = 'changed by caller'
+    assert _book(cache, db_path, 1, calls)['title'] == 'Dune'
+    cache.close()
+
+
+def test_other_connection_writes_evict_only_changed_entities(db_path):
+    cache = EntityCache(db_path)
+    calls = []
+    by_isbn = _loader(db_path, "SELECT * FROM books WHERE isbn = ?", ('9780441013593',), calls)
+    cache.get('book', 'isbn', '9780441013593', by_isbn)
+    _book(cache, db_path, 1, calls)
+    _book(cache, db_path, 2, calls)
+
+    _write(db_path, "UPDATE books SET stock = 0 WHERE id = 1")
+
+    # Both keys of book 1 were dropped; book 2 is still cached
+    assert _book(cache, db_path, 1, calls)['stock'] == 0
+    assert cache.get('book', 'isbn', '9780441013593', by_isbn)['stock'] == 0
+    _book(cache, db_path, 2, calls)
+    assert len(calls) == 5
+    assert cache.stats()['invalidations'] == 2
+    cache.close()
+
+
+def test_write_through_invalidation_and_ttl(db_path):
+    cache = EntityCache(db_path, ttl=0)
+    calls = []
+    _book(cache, db_path, 1, calls)
+    _book(cache, db_path, 1, calls)
+    assert cache.stats()['expirations'] == 1
+
+    cache.ttl = 60
+    _book(cache, db_path, 2, calls)
+    assert cache.invalidate('book', 2) == 1
+    _book(cache, db_path, 2, calls)
+    assert len(calls) == 4
+    cache.close()
+
+
+def test_shapes_of_one_entity_are_cached_apart(db_path):
+    cache = EntityCache(db_path)
+    calls = []
+    row = _book(cache, db_path, 1, calls)
+    as_tuple = cache.get('book', 'id', 1, lambda: tuple(row.values()), shape='tuple')
+    assert as_tuple == tuple(row.values())
+    assert _book(cache, db_path, 1, calls) == row
+    # One invalidation drops every shape
+    assert cache.invalidate('book', 1) == 2
+    cache.close()
+
+
+def test_database_without_change_log_flushes_on_write(tmp_path):
+    path = str(tmp_path / 'plain.db')
+    _write(path, "CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT)")
+    _write(path, "INSERT INTO books VALUES (1, 'Dune'), (2, 'Emma')")
+    cache = EntityCache(path)
+    calls = []
+    _book(cache, path, 1, calls)
+    _write(path, "UPDATE books SET title = 'Emma (2nd ed.)' WHERE id = 2")
+    _book(cache, path, 1, calls)
+    assert len(calls) == 2
+    cache.close()
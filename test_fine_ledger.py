@@ -0,0 +1,192 @@
+import sqlite3
+
+import pytest
+
+from data import archive, fines, integrity
+from data.errors import ValidationError
+from data.fines import Payment
+from data.migrator import migrate
+
+
+@pytest.fixture
+def unmigrated(legacy_db, add_members, add_titles):
+    conn = sqlite3.connect(legacy_db)
+    add_members(conn, [(1, 'Ada'), (2, 'Grace'), (3, 'Linus')])
+    add_titles(conn, [(1, 'Dune', 2), (2, 'Emma', 2)])
+    conn.executescript("""
+        -- Returned 4 and 10 days late, one on time, one paid fine, one still out
+        INSERT INTO transactions (user_id, book_id, issue_date, due_date, return_date, status) VALUES
+            (1, 1, '2024-01-01', '2024-01-15', '2024-01-19', 'Returned'),
+            (1, 2, '2024-02-01', '2024-02-15', '2024-02-25 10:00:00', 'Returned'),
+            (2, 1, '2024-03-01', '2024-03-15', '2024-03-10', 'Returned'),
+            (2, 2, '2024-04-01', '2024-04-15', '2024-04-17', 'Returned'),
+            (3, 2, '2024-05-01', '2024-05-15', NULL, 'Overdue');
+        INSERT INTO fines (transaction_id, amount, reason, paid) VALUES (4, 1.0, 'Overdue', 1);
+    """)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def conn(unmigrated):
+    # The ledger (018) is assessed from these rows as the database is migrated
+    migrate(unmigrated)
+    return unmigrated
+
+
+def test_migration_backfills_fines_payments_and_balances(conn):
+    # Late returns without a fine were assessed; the paid fine became a payment
+    assert fines.patron_fines(conn, 1) == [
+        {'id': 2, 'transaction_id': 1, 'amount': 2.0, 'paid': False, 'created_at': '2024-01-19 00:00:00'},
+        {'id': 3, 'transaction_id': 2, 'amount': 5.0, 'paid': False, 'created_at': '2024-02-25 10:00:00'},
+    ]
+    assert fines.patron_balance(conn, 1) == {'fined': 7.0, 'paid': 0.0, 'balance': 7.0}
+    assert fines.patron_balance(conn, 2) == {'fined': 1.0, 'paid': 1.0, 'balance': 0.0}
+    assert fines.patron_balance(conn, 99) == {'fined': 0.0, 'paid': 0.0, 'balance': 0.0}
+    assert fines.top_debtors(conn) == [{'user_id': 1, 'name': 'Ada', 'balance': 7.0}]
+
+
+def test_returning_a_late_loan_assesses_a_fine(conn):
+    conn.execute("UPDATE transactions SET return_date = '2024-05-21', status = 'Returned' WHERE id = 5")
+    # Setting the return date again does not fine twice
+    conn.execute("UPDATE transactions SET return_date = '2024-05-22' WHERE id = 5")
+    assert [(f['transaction_id'], f['amount']) for f in fines.patron_fines(conn, 3)] == [(5, 3.0)]
+    assert fines.top_debtors(conn, limit=1) == [{'user_id': 1, 'name': 'Ada', 'balance': 7.0}]
+    assert fines.top_debtors(conn)[1] == {'user_id': 3, 'name': 'Linus', 'balance': 3.0}
+
+
+def test_payments_settle_the_oldest_fines_first(conn):
+    report = fines.post_payments(conn, [(1, 1.5, 'cash', 'r-1'), Payment(1, 0.5, 'card', 'r-2')])
+    assert (report.posted, report.duplicates, report.cents) == (2, 0, 200)
+    assert [f['paid'] for f in fines.patron_fines(conn, 1)] == [True, False]
+    assert fines.patron_fines(conn, 1, unpaid_only=True)[0]['transaction_id'] == 2
+
+    # Re-posting the batch is a no-op; a partial payment leaves the fine unpaid
+    again = fines.post_payments(conn, [(1, 1.5, 'cash', 'r-1'), Payment(1, 0.5, 'card', 'r-2'),
+                                       (1, 4.99, 'cash', 'r-3')])
+    assert (again.posted, again.duplicates) == (1, 2)
+    assert fines.patron_balance(conn, 1)['balance'] == 0.01
+    assert fines.patron_fines(conn, 1, unpaid_only=True)[0]['amount'] == 5.0
+    fines.post_payments(conn, [(1, 0.01)])
+    assert fines.patron_fines(conn, 1, unpaid_only=True) == []
+    assert fines.top_debtors(conn) == []
+
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("UPDATE payments SET amount = 100 WHERE reference = 'r-1'")
+    conn.execute("DELETE FROM payments WHERE reference = 'r-3'")
+    assert fines.patron_balance(conn, 1) == {'fined': 7.0, 'paid': 2.01, 'balance': 4.99}
+    # The newest fine is no longer covered
+    assert [f['paid'] for f in fines.patron_fines(conn, 1)] == [True, False]
+
+
+def test_payment_reversal_migration_unsettles_uncovered_fines(unmigrated):
+    conn = unmigrated
+    migrate(conn, target=21)
+    # Left marked paid by a payment deleted before 022
+    conn.execute("UPDATE fines SET paid = 1 WHERE transaction_id = 2")
+    migrate(conn, target=22)
+    assert [f['paid'] for f in fines.patron_fines(conn, 1)] == [False, False]
+    assert [f['paid'] for f in fines.patron_fines(conn, 2)] == [True]
+
+
+def test_credit_settles_fines_assessed_after_an_overpayment(conn):
+    fines.post_payments(conn, [(3, 5.0, 'cash', 'r-1')])
+    assert fines.patron_balance(conn, 3)['balance'] == -5.0
+    # 6 days late: 3.00, covered by the credit as it is assessed
+    conn.execute("UPDATE transactions SET return_date = '2024-05-21', status = 'Returned' WHERE id = 5")
+    assert [(f['amount'], f['paid']) for f in fines.patron_fines(conn, 3)] == [(3.0, True)]
+    # The 2.00 left does not cover a 4.00 fine (given its patron by fine_ledger_fill_user)
+    conn.execute("INSERT INTO fines (transaction_id, amount, reason) VALUES (5, 4.0, 'Damage')")
+    assert [f['paid'] for f in fines.patron_fines(conn, 3)] == [True, False]
+    assert fines.patron_balance(conn, 3) == {'fined': 7.0, 'paid': 5.0, 'balance': 2.0}
+
+    conn.execute("DELETE FROM payments WHERE reference = 'r-1'")
+    assert [f['paid'] for f in fines.patron_fines(conn, 3)] == [False, False]
+    fines.post_payments(conn, [(3, 8.0, 'cash', 'r-2')])
+    assert [f['paid'] for f in fines.patron_fines(conn, 3)] == [True, True]
+    # The 1.00 left covers the next fine
+    conn.execute("INSERT INTO fines (transaction_id, amount, reason) VALUES (5, 1.0, 'Damage')")
+    assert [f['paid'] for f in fines.patron_fines(conn, 3)] == [True, True, True]
+
+
+def test_credit_allocation_migration_settles_fines_left_unpaid(unmigrated):
+    conn = unmigrated
+    migrate(conn, target=23)
+    fines.post_payments(conn, [(3, 5.0, 'cash', 'r-1')])
+    conn.execute("UPDATE transactions SET return_date = '2024-05-21', status = 'Returned' WHERE id = 5")
+    assert [f['paid'] for f in fines.patron_fines(conn, 3)] == [False]
+    migrate(conn, target=24)
+    assert [f['paid'] for f in fines.patron_fines(conn, 3)] == [True]
+    assert [f['paid'] for f in fines.patron_fines(conn, 1)] == [False, False]
+
+
+def test_an_invalid_line_rejects_the_whole_batch(conn):
+    with pytest.raises(ValidationError):
+        fines.post_payments(conn, [(1, 2.0), (2, -1.0)])
+    with pytest.raises(ValidationError) as error:
+        fines.post_payments(conn, [(1, 2.0), (42, 1.0)])
+    assert error.value.value == 42
+    assert conn.execute("SELECT COUNT(*) FROM payments WHERE method != 'legacy'").fetchone()[0] == 0
+    assert fines.patron_balance(conn, 1)['balance'] == 7.0
+
+
+def test_posting_inside_a_transaction_leaves_it_to_the_caller(conn):
+    conn.commit()
+    conn.execute("UPDATE users SET full_name = 'Ada L.' WHERE id = 1")
+    fines.post_payments(conn, [(1, 2.0, 'cash', 'r-1')])
+    with pytest.raises(ValidationError):
+        fines.post_payments(conn, [(1, 1.0), (42, 1.0)])
+    assert fines.rebuild_balances(conn) == 2
+    assert conn.in_transaction
+    conn.rollback()
+    assert fines.patron_balance(conn, 1)['paid'] == 0.0
+    assert conn.execute("SELECT full_name FROM users WHERE id = 1").fetchone()[0] == 'Ada'
+
+    # A failing batch rolls back only its own rows
+    conn.execute("UPDATE users SET full_name = 'Ada L.' WHERE id = 1")
+    conn.execute("CREATE TEMP TRIGGER refuse BEFORE INSERT ON payments WHEN NEW.amount > 3 "
+                 "BEGIN SELECT RAISE(ABORT, 'refused'); END")
+    with pytest.raises(sqlite3.IntegrityError):
+        fines.post_payments(conn, [(1, 2.0), (1, 4.0)])
+    assert conn.in_transaction
+    conn.commit()
+    assert fines.patron_balance(conn, 1)['paid'] == 0.0
+    assert conn.execute("SELECT full_name FROM users WHERE id = 1").fetchone()[0] == 'Ada L.'
+
+
+def test_integrity_check_repairs_balance_drift(conn):
+    conn.execute("UPDATE patron_balances SET balance_cents = 1 WHERE user_id = 1")
+    conn.execute("INSERT INTO patron_balances (user_id, fined_cents, balance_cents) VALUES (3, 50, 50)")
+    conn.commit()
+    result = integrity.run_checks(conn, only=['fine_balance_drift'])['checks'][0]
+    assert result['count'] == 2 and result['sample'][0]['expected_cents'] == 700
+
+    report = integrity.run_checks(conn, repair=True, only=['fine_balance_drift'])
+    assert report['ok'] and report['checks'][0]['status'] == 'repaired'
+    assert fines.patron_balance(conn, 3)['balance'] == 0.0
+    assert fines.rebuild_balances(conn) == 2
+
+
+def test_fine_rows_filter_in_sql(conn):
+    rows = fines.fine_rows(conn)
+    assert [row[6] for row in rows].count('Accruing') == 1
+    assert {row[6] for row in fines.fine_rows(conn, 'paid')} == {'Paid', 'Unpaid'}
+    assert [row for row in fines.fine_rows(conn, 'Emma') if row[6] != 'Accruing'] == [
+        (2, 'Emma', '2024-04-01', '2024-04-17', 2, 1.0, 'Paid', 4),
+        (1, 'Emma', '2024-02-01', '2024-02-25', 10, 5.0, 'Unpaid', 2),
+    ]
+    assert [row[7] for row in fines.fine_rows(conn, ' 3 ')] == [5]
+
+
+def test_fine_rows_read_archived_loans(conn):
+    assert archive.archive_returned(conn, horizon_days=30)['moved'] == 1
+    # Archives written before fined loans were kept back hold fined loans too
+    columns = "id, user_id, book_id, issue_date, due_date, return_date, status"
+    conn.execute(f"INSERT INTO archive.transactions ({columns}) SELECT {columns} FROM main.transactions WHERE id = 4")
+    conn.execute("DELETE FROM main.transactions WHERE id = 4")
+    conn.commit()
+    conn.execute("DETACH DATABASE archive")
+
+    assert [row for row in fines.fine_rows(conn) if row[7] == 4] == [
+        (2, 'Emma', '2024-04-01', '2024-04-17', 2, 1.0, 'Paid', 4)
+    ]
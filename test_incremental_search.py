@@ -0,0 +1,147 @@
+import sqlite3
+import threading
+
+import pytest
+
+from data import incremental_search
+from data.incremental_search import SearchController, extends, words
+
+
+@pytest.fixture
+def db_path(library_db, add_titles):
+    conn = sqlite3.connect(library_db)
+    add_titles(conn, [
+        (1, 'Dune', 1, 'Frank Herbert', '978-0441013593'),
+        (2, 'Dune Messiah', 1, 'Frank Herbert', '978-0593098233'),
+        (3, 'Frankenstein', 1, 'Mary Shelley', '978-0486282114'),
+        (4, 'Emma', 1, 'Jane Austen', '978-0141439587'),
+        (5, '1984', 1, 'George Orwell', '978-0451524935'),
+    ])
+    conn.commit()
+    conn.close()
+    return library_db
+
+
+class Collector:
+    def __init__(self):
+        self.results = []
+        self.ready = threading.Event()
+
+    def __call__(self, result):
+        self.results.append(result)
+        self.ready.set()
+
+    def wait(self):
+        assert self.ready.wait(5)
+        self.ready.clear()
+        return self.results[-1]
+
+
+def _titles(result):
+    return [row['title'] for row in result.rows]
+
+
+def test_extends_is_word_prefix_containment():
+    assert extends(words('frank herb'), words('fra'))
+    assert extends(words('dune fr'), words('fr'))
+    assert not extends(words('fra'), words('frank'))
+    assert not extends(words('herb'), words('fra'))
+
+
+def test_extended_queries_are_narrowed_in_memory(db_path):
+    collect = Collector()
+    controller = SearchController(collect, db_path=db_path, delay=0.01)
+    try:
+        controller.text_changed('fr')
+        result = collect.wait()
+        assert result.source == 'index'
+        assert sorted(_titles(result)) == ['Dune', 'Dune Messiah', 'Frankenstein']
+
+        controller.text_changed('fr herb')
+        result = collect.wait()
+        assert result.source == 'cache' and _titles(result) == ['Dune', 'Dune Messiah']
+        controller.text_changed('fr herb mes')
+        assert _titles(collect.wait()) == ['Dune Messiah']
+        # Back to a query the cache holds
+        controller.text_changed('fr')
+        assert collect.wait().source == 'cache'
+
+        # Nothing starts with the misspelling: the trigram search takes over
+        controller.text_changed('frankenstien')
+        result = collect.wait()
+        assert result.source == 'fuzzy' and _titles(result)[0] == 'Frankenstein'
+        assert controller.stats['index'] == 1 and controller.stats['cache'] == 3
+    finally:
+        controller.close()
+
+
+def test_isbn_prefixes_are_searched_in_the_database(db_path):
+    collect = Collector()
+    controller = SearchController(collect, db_path=db_path, delay=0.01)
+    try:
+        result = controller.search_now('978-04').result(5)
+        assert result.source == 'isbn'
+        assert _titles(result) == ['Dune', '1984', 'Frankenstein']
+        # A title starting with digits is listed after the ISBN matches
+        controller.search_now('1984').result(5)
+        result = controller.search_now('19').result(5)
+        assert result.source == 'index' and _titles(result) == ['1984']
+        result = controller.search_now('978-0441013593').result(5)
+        assert _titles(result) == ['Dune'] and controller.stats['cache'] == 0
+    finally:
+        controller.close()
+
+
+def test_typing_bursts_are_debounced(db_path):
+    collect = Collector()
+    controller = SearchController(collect, db_path=db_path, delay=0.2, max_wait=0.5)
+    try:
+        # Only the first keystroke of the burst is searched straight away
+        for prefix in ('q', 'qu', 'qui', 'quie'):
+            controller.text_changed(prefix)
+        result = collect.wait()
+        while result.text != 'quie':
+            result = collect.wait()
+        assert result.source == 'fuzzy' and result.rows == []
+        assert controller.stats['index'] + controller.stats['fuzzy'] <= 2
+    finally:
+        controller.close()
+
+
+def test_cache_is_dropped_when_another_connection_commits(db_path):
+    collect = Collector()
+    controller = SearchController(collect, db_path=db_path, delay=0.01)
+    try:
+        controller.search_now('dune').result(5)
+        conn = sqlite3.connect(db_path)
+        conn.execute("INSERT INTO books (title, author, isbn, stock) VALUES ('Dune Road', 'A. Driver', '', 1)")
+        conn.commit()
+        conn.close()
+        result = controller.search_now('dune r').result(5)
+        assert result.source == 'index' and _titles(result) == ['Dune Road']
+    finally:
+        controller.close()
+
+
+def test_stale_query_is_interrupted(db_path, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    real_search = incremental_search.trigram_search.search
+
+    def slow_search(conn, *args, **kwargs):
+        started.set()
+        release.wait(5)
+        return real_search(conn, *args, **kwargs)
+
+    monkeypatch.setattr(incremental_search.trigram_search, 'search', slow_search)
+    collect = Collector()
+    controller = SearchController(collect, db_path=db_path, delay=0.01)
+    try:
+        future = controller.search_now('zzz')
+        assert started.wait(5)
+        controller.text_changed('emma')
+        release.set()
+        assert future.result(5) is None
+        assert collect.wait().text == 'emma'
+        assert controller.stats['cancelled'] == 1
+    finally:
+        controller.close()
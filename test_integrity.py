@@ -0,0 +1,140 @@
+import json
+import sqlite3
+
+import pytest
+
+from data import archive, integrity
+
+
+@pytest.fixture
+def db_path(library_db, add_members, add_titles):
+    conn = sqlite3.connect(library_db)
+    add_members(conn, [(i, f'Member {i}') for i in range(1, 6)])
+    add_titles(conn, [(i, f'Title {i}', 3) for i in range(1, 6)])
+    conn.executemany(
+        "INSERT INTO transactions (user_id, book_id, issue_date, due_date, return_date, status) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [(i % 5 + 1, i % 5 + 1, '2024-03-01', '2024-03-15', '2024-03-10', 'Returned') for i in range(20)]
+    )
+    conn.execute("INSERT INTO fines (transaction_id, amount, paid) VALUES (1, 2.5, 0)")
+    conn.execute("INSERT INTO reservations (user_id, book_id, reservation_date, status) "
+                 "VALUES (1, 2, '2024-03-01', 'Active')")
+    conn.commit()
+    conn.close()
+    return library_db
+
+
+def _by_name(report):
+    return {result['name']: result for result in report['checks']}
+
+
+def test_clean_database_passes(db_path):
+    conn = sqlite3.connect(db_path)
+    report = integrity.run_checks(conn)
+    conn.close()
+
+    assert report['ok']
+    results = _by_name(report)
+    assert results['availability_drift']['status'] == 'ok'
+    assert results['holdings_drift']['status'] == 'ok'
+    assert all(result['status'] != 'skipped' for result in report['checks'])
+    json.dumps(report)
+
+
+def test_checks_of_missing_tables_are_skipped(legacy_db):
+    conn = sqlite3.connect(legacy_db)
+    result = integrity.run_checks(conn, only=['holdings_drift'])['checks'][0]
+    conn.close()
+    assert result['status'] == 'skipped' and 'holdings' in result['error']
+
+
+def test_problems_are_found_and_repaired(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        INSERT INTO transactions (user_id, book_id, issue_date, due_date, return_date, status)
+        VALUES (1, 1, '2024-04-01', '2024-04-15', NULL, 'borrowed'),
+               (2, 1, '2024-04-01', '2024-04-15', '2024-04-05', 'Issued'),
+               (3, 2, '2024-04-10', '2024-04-01', NULL, 'Borrowed'),
+               (99, 3, '2024-04-01', '2024-04-15', '2024-04-02', 'Returned');
+        -- Rows older releases could write: counters reset by hand, statuses from before the CHECK
+        UPDATE books SET available = stock WHERE id IN (1, 2);
+        PRAGMA ignore_check_constraints = ON;
+        INSERT INTO reservations (user_id, book_id, reservation_date, status)
+        VALUES (1, 2, '2024-03-02', 'active'), (1, 2, '2024-03-03', NULL), (2, 77, '2024-03-03', 'Active');
+        PRAGMA ignore_check_constraints = OFF;
+        INSERT INTO fines (transaction_id, amount, paid) VALUES (12345, 1.0, 0);
+        UPDATE books SET isbn = '9780000000001' WHERE id = 2;
+        UPDATE users SET status = 'inactive' WHERE id = 5;
+    """)
+    conn.commit()
+
+    results = _by_name(integrity.run_checks(conn))
+    assert results['invalid_loan_status']['count'] == 1
+    assert results['loan_status_mismatch']['sample'][0]['status'] == 'Issued'
+    assert results['impossible_loan_dates']['sample'][0]['problem'] == 'due before issue'
+    assert results['orphaned_loans']['sample'] == [{'id': 24, 'missing': 'user', 'missing_id': 99}]
+    assert results['orphaned_reservations']['count'] == 1
+    assert results['orphaned_fines']['count'] == 1
+    assert results['availability_drift']['count'] == 2
+    assert results['duplicate_isbns']['status'] == 'failed'
+    assert results['invalid_reservation_status']['count'] == 2
+    assert results['invalid_user_status']['count'] == 1
+
+    report = integrity.run_checks(conn, repair=True)
+    results = _by_name(report)
+    for name in ('invalid_loan_status', 'loan_status_mismatch', 'availability_drift',
+                 'invalid_reservation_status', 'invalid_user_status'):
+        assert results[name]['status'] == 'repaired', name
+    # The normalized reservations repeat the first one and are cancelled in the same run
+    assert results['duplicate_active_reservations']['status'] == 'repaired'
+    assert conn.execute("SELECT id, status FROM reservations WHERE user_id = 1 ORDER BY id").fetchall() == [
+        (1, 'Active'), (2, 'Cancelled'), (3, 'Cancelled')
+    ]
+    assert conn.execute("SELECT status FROM transactions WHERE id IN (21, 22) ORDER BY id").fetchall() == [
+        ('Borrowed',), ('Returned',)
+    ]
+    assert conn.execute("SELECT available FROM books WHERE id IN (1, 2) ORDER BY id").fetchall() == [(2,), (2,)]
+
+    # Orphans and impossible dates are left for a person; duplicate ISBNs are a warning
+    assert not report['ok']
+    for name in ('orphaned_loans', 'orphaned_reservations', 'orphaned_fines'):
+        assert results[name]['status'] == 'failed' and 'repaired' not in results[name], name
+    assert conn.execute("SELECT COUNT(*) FROM fines").fetchone()[0] == 2
+    assert results['impossible_loan_dates']['count'] == 1
+    assert integrity.run_checks(conn, only=['duplicate_isbns'])['ok']
+    conn.close()
+
+
+def test_fines_of_archived_loans_are_not_orphans(db_path):
+    conn = sqlite3.connect(db_path)
+    archive.archive_returned(conn, horizon_days=30)
+    assert conn.execute("SELECT id FROM transactions").fetchall() == [(1,)]
+    # Archives written before fined loans were kept back hold the fined loan too
+    columns = "id, user_id, book_id, issue_date, due_date, return_date, status"
+    conn.execute(f"INSERT INTO archive.transactions ({columns}) SELECT {columns} FROM main.transactions")
+    conn.execute("DELETE FROM main.transactions")
+    conn.commit()
+    conn.close()
+
+    conn = sqlite3.connect(db_path)
+    results = _by_name(integrity.run_checks(conn, workers=2))
+    assert results['orphaned_fines']['status'] == 'ok'
+    assert results['availability_drift']['status'] == 'ok'
+    conn.close()
+
+
+def test_parallel_run_matches_serial_run(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE books SET available = 0 WHERE id = 4")
+    conn.execute("UPDATE transactions SET status = 'RETURNED' WHERE id = 3")
+    conn.commit()
+
+    serial = integrity.run_checks(conn)
+    parallel = integrity.run_checks(conn, workers=4)
+    strip = lambda report: [{k: v for k, v in r.items() if k != 'seconds'} for r in report['checks']]
+    assert strip(serial) == strip(parallel)
+    assert not parallel['ok']
+
+    with pytest.raises(ValueError):
+        integrity.run_checks(conn, only=['no_such_check'])
+    conn.close()
@@ -0,0 +1,78 @@
+import sqlite3
+
+import pytest
+
+from data.inventory import reconcile
+from data.migrator import migrate
+
+
+@pytest.fixture
+def conn(legacy_db, add_titles):
+    conn = sqlite3.connect(legacy_db, isolation_level=None)
+    # Dune: old lockstep counters (stock and available both lowered by the open loan)
+    add_titles(conn, [(1, 'Dune', 1), (2, 'Emma', 3), (3, 'Ulysses', 2)])
+    conn.execute("UPDATE books SET available = 1 WHERE id = 2")
+    conn.executescript("""
+        INSERT INTO transactions (user_id, book_id, due_date, return_date) VALUES
+            (1, 1, '2024-01-15', NULL), (1, 2, '2024-01-15', NULL), (2, 2, '2024-01-15', '2024-01-02'),
+            (3, 2, '2024-01-15', NULL);
+    """)
+    # 010 converts and reconciles the counters as the database is migrated
+    migrate(conn)
+    yield conn
+    conn.close()
+
+
+def _counters(conn, book_id):
+    return conn.execute("SELECT stock, available FROM books WHERE id = ?", (book_id,)).fetchone()
+
+
+def test_migration_converts_and_reconciles_counters(conn):
+    assert _counters(conn, 1) == (2, 1)
+    assert _counters(conn, 2) == (3, 1)
+    assert _counters(conn, 3) == (2, 2)
+    assert reconcile(conn).ok
+
+
+def test_triggers_follow_loans_and_stock(conn):
+    conn.execute("INSERT INTO transactions (user_id, book_id, due_date) VALUES (4, 3, '2024-02-15')")
+    assert _counters(conn, 3) == (2, 1)
+    conn.execute("UPDATE transactions SET book_id = 1 WHERE user_id = 4")
+    assert _counters(conn, 3) == (2, 2) and _counters(conn, 1) == (2, 0)
+    conn.execute("UPDATE transactions SET return_date = '2024-02-01' WHERE user_id = 4")
+    assert _counters(conn, 1) == (2, 1)
+    conn.execute("DELETE FROM transactions WHERE book_id = 2 AND return_date IS NULL")
+    assert _counters(conn, 2) == (3, 3)
+    conn.execute("UPDATE books SET stock = 5 WHERE id = 2")
+    assert _counters(conn, 2) == (5, 5)
+    assert reconcile(conn).ok
+
+
+def test_checkout_without_a_free_copy_is_refused(conn):
+    conn.execute("INSERT INTO transactions (user_id, book_id, due_date) VALUES (4, 2, '2024-02-15')")
+    with pytest.raises(sqlite3.IntegrityError, match='No copies available'):
+        conn.execute("INSERT INTO transactions (user_id, book_id, due_date) VALUES (5, 2, '2024-02-15')")
+    # Historical (already returned) loans can still be imported
+    conn.execute("INSERT INTO transactions (user_id, book_id, due_date, return_date) "
+                 "VALUES (5, 2, '2024-01-15', '2024-01-01')")
+    assert _counters(conn, 2) == (3, 0)
+
+
+def test_reconcile_reports_and_repairs_drift(conn):
+    conn.execute("UPDATE books SET available = 7 WHERE id = 3")
+    conn.execute("UPDATE books SET available = 0 WHERE id = 1")
+    conn.execute("DROP TRIGGER availability_loan_insert")
+    conn.execute("DROP TRIGGER availability_loan_check")
+    conn.executemany("INSERT INTO transactions (user_id, book_id, due_date) VALUES (?, 2, '2024-02-15')",
+                     [(6,), (7,)])
+
+    report = reconcile(conn)
+    assert report.titles == 3 and report.repaired == 0
+    assert [(d.book_id, d.available, d.expected) for d in report.drifted] == [(1, 0, 1), (2, 1, -1), (3, 7, 2)]
+    assert [d.book_id for d in report.overcommitted] == [2]
+    assert _counters(conn, 3) == (2, 7)
+
+    report = reconcile(conn, repair=True)
+    assert report.repaired == 3
+    assert _counters(conn, 1) == (2, 1) and _counters(conn, 2) == (3, -1) and _counters(conn, 3) == (2, 2)
+    assert reconcile(conn).ok
@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from data.migrator import migrate
+from services import maintenance_service
+from services.maintenance_service import INCREMENTAL, MaintenanceScheduler, MaintenanceService
+
+
+@pytest.fixture
+def db_path(library_db, add_titles):
+    conn = sqlite3.connect(library_db)
+    add_titles(conn, [(i, f'Title {i} ' * 30, 1) for i in range(1, 3001)])
+    conn.commit()
+    # As if the database had been too large for migration 016 to rebuild
+    conn.execute("PRAGMA auto_vacuum = NONE")
+    conn.execute("VACUUM")
+    conn.close()
+    return library_db
+
+
+def test_migration_switches_to_incremental_auto_vacuum(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'new.db'))
+    conn.execute("CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT)")
+    conn.execute("PRAGMA user_version = 14")
+    assert [m.version for m in migrate(conn, target=16)] == [15, 16]
+    assert conn.execute('PRAGMA auto_vacuum').fetchone()[0] == INCREMENTAL
+    assert conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'maintenance_log'"
+    ).fetchone()
+    conn.close()
+
+
+def test_run_analyzes_checkpoints_and_frees_pages(db_path):
+    service = MaintenanceService(db_path, vacuum_step=16)
+    # Not yet incremental: the first run switches the database over
+    assert service.run()['tasks']['vacuum']['switched']
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("DELETE FROM books WHERE id > 500")
+    conn.close()
+
+    report = service.run()
+    assert report['tasks']['optimize']['tables'] >= 1
+    assert report['tasks']['checkpoint']['busy'] is False
+    assert report['before']['freelist_pages'] > 0
+    assert report['after']['freelist_pages'] == 0
+    assert report['tasks']['vacuum']['freed'] == report['before']['freelist_pages']
+    assert report['after']['wal_bytes'] == 0
+    assert report['after']['page_count'] < report['before']['page_count']
+
+    history = service.history()
+    assert len(history) == 2
+    assert history[0]['freelist_pages'] == report['before']['freelist_pages']
+    assert history[0]['tasks']['vacuum']['freed'] > 0
+
+
+def test_spent_budget_interrupts_and_skips(db_path):
+    report = MaintenanceService(db_path).run(budget=0)
+    assert set(report['tasks'].values()) == {'skipped'}
+    report = MaintenanceService(db_path).run(budget=0.0005)
+    assert report['tasks']['vacuum'] in ('interrupted', 'skipped')
+
+
+def test_fragmentation_scan_only_gets_its_share_of_the_budget(db_path, monkeypatch):
+    assert MaintenanceService(db_path).run()['before']['fragmentation'] is not None
+    monkeypatch.setattr(maintenance_service, 'FRAGMENTATION_SHARE', 0)
+    report = MaintenanceService(db_path).run(budget=5)
+    assert report['before']['fragmentation'] is None
+    assert 'tables' in report['tasks']['optimize']
+
+
+def test_scheduler_waits_for_idle(db_path):
+    runs = []
+    service = MaintenanceService(db_path)
+    service.run = lambda: runs.append(time.monotonic())
+    scheduler = MaintenanceScheduler(service, idle_seconds=0.3, min_interval=60, poll=0.02)
+    stop = threading.Event()
+
+    def writer():
+        conn = sqlite3.connect(db_path, timeout=10)
+        while not stop.is_set():
+            with conn:
+                conn.execute("INSERT INTO books (title, author, isbn, stock) VALUES ('busy', 'A. Author', '', 1)")
+            time.sleep(0.01)
+        conn.close()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    scheduler.start()
+    try:
+        time.sleep(0.6)
+        assert runs == []
+        stop.set()
+        thread.join()
+        quiet = time.monotonic()
+        for _ in range(100):
+            if runs:
+                break
+            time.sleep(0.02)
+        time.sleep(0.2)
+    finally:
+        scheduler.stop(timeout=5)
+    assert len(runs) == 1
+    assert runs[0] - quiet >= 0.25
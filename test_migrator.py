@@ -0,0 +1,192 @@
+import sqlite3
+
+import pytest
+
+from data import migrator
+from data.migrator import (MigrationError, SCHEMA_VERSION, SchemaVersionError, discover, migrate,
+                           split_statements)
+
+
+def _connect(tmp_path, name='library.db'):
+    return sqlite3.connect(str(tmp_path / name))
+
+
+def _tables(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def test_schema_version_matches_newest_migration():
+    assert discover()[-1].version == SCHEMA_VERSION
+
+
+def test_legacy_database_is_adopted_without_replaying_old_migrations(tmp_path):
+    conn = _connect(tmp_path)
+    conn.executescript("""
+        CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, email TEXT);
+        CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT, author TEXT,
+                            isbn TEXT NOT NULL UNIQUE, edition TEXT, stock INTEGER);
+        CREATE TABLE transactions (id INTEGER PRIMARY KEY, user_id INTEGER, book_id INTEGER,
+                                   borrowed_date TEXT, due_date TEXT, return_date TEXT,
+                                   status TEXT, created_at TEXT, updated_at TEXT);
+        CREATE TABLE reservations (id INTEGER PRIMARY KEY, user_id INTEGER, book_id INTEGER,
+                                   reservation_date TEXT);
+        INSERT INTO users VALUES (7, 'sara', 'sara@example.com');
+        INSERT INTO books VALUES (1, 'Dune', 'Herbert', '9780441013593', NULL, 3);
+    """)
+    applied = migrate(conn)
+    assert [m.version for m in applied] == list(range(migrator.LEGACY_BASELINE + 1, SCHEMA_VERSION + 1))
+    assert conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION
+    durations = conn.execute("SELECT duration_ms FROM schema_migrations").fetchall()
+    assert len(durations) == len(applied) and all(d[0] is not None for d in durations)
+    assert migrate(conn) == []
+
+    # No sample data from 003, columns fixed up by 006
+    assert conn.execute("SELECT full_name, user_code FROM users").fetchall() == [('sara', 'USR-000007')]
+    assert conn.execute("SELECT stock, available FROM books").fetchone() == (3, 3)
+    assert 'issue_date' in {row[1] for row in conn.execute("PRAGMA table_info(transactions)")}
+
+    # The UNIQUE isbn is gone; the entity change-log triggers survived the rebuild
+    conn.execute("INSERT INTO books (title, author, isbn, stock) VALUES ('Dune', 'Herbert', '9780441013593', 1)")
+    seen = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM entity_changes").fetchone()[0]
+    conn.execute("UPDATE books SET stock = 4 WHERE id = 1")
+    assert conn.execute("SELECT DISTINCT entity, entity_id FROM entity_changes WHERE seq > ?",
+                        (seen,)).fetchall() == [('book', 1)]
+    # ... and the availability triggers of 010 moved available with the stock
+    assert conn.execute("SELECT stock, available FROM books WHERE id = 1").fetchone() == (4, 4)
+    conn.close()
+
+
+def test_database_recorded_by_the_old_runner_is_adopted_from_its_tables(tmp_path):
+    # Shaped like the committed intelli_libraria.db: the full legacy schema and its
+    # triggers, but schema_migrations only records 001 and 002
+    conn = _connect(tmp_path)
+    conn.executescript("""
+        CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE NOT NULL,
+                            email TEXT UNIQUE NOT NULL, password_hash TEXT NOT NULL,
+                            full_name TEXT NOT NULL, role TEXT DEFAULT 'member', status TEXT DEFAULT 'active',
+                            user_code TEXT, phone TEXT, contact TEXT, address TEXT,
+                            created_at TIMESTAMP, updated_at TIMESTAMP);
+        CREATE TABLE books (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, author TEXT NOT NULL,
+                            isbn TEXT NOT NULL, edition TEXT, stock INTEGER NOT NULL,
+                            available INTEGER NOT NULL DEFAULT 0);
+        CREATE TABLE transactions (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL,
+                                   book_id INTEGER NOT NULL, issue_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                                   due_date TIMESTAMP NOT NULL, return_date TIMESTAMP,
+                                   status TEXT DEFAULT 'borrowed', created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                                   updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, available INTEGER DEFAULT 1);
+        CREATE TABLE reservations (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL,
+                                   book_id INTEGER NOT NULL, reservation_date TEXT NOT NULL,
+                                   status TEXT DEFAULT 'Active');
+        CREATE TABLE fines (id INTEGER PRIMARY KEY AUTOINCREMENT, transaction_id INTEGER NOT NULL,
+                            amount REAL NOT NULL, reason TEXT, paid INTEGER DEFAULT 0,
+                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TRIGGER check_unique_active_reservation BEFORE INSERT ON reservations
+        WHEN NEW.status = 'Active'
+        BEGIN
+            SELECT RAISE(ABORT, 'User already has an active reservation for this book')
+            FROM reservations WHERE book_id = NEW.book_id AND user_id = NEW.user_id AND status = 'Active';
+        END;
+        CREATE TRIGGER update_reservations_timestamp AFTER UPDATE ON reservations
+        BEGIN
+            UPDATE reservations SET updated_at = CURRENT_TIMESTAMP WHERE id = OLD.id;
+        END;
+        CREATE TABLE schema_migrations (id INTEGER PRIMARY KEY, name TEXT NOT NULL,
+                                        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        INSERT INTO schema_migrations (id, name) VALUES (1, '001_init.sql'), (2, '002_indexes.sql');
+        INSERT INTO users (id, username, email, password_hash, full_name)
+        VALUES (3, 'emmaw', 'emma@example.com', 'x', 'Emma Watson');
+        INSERT INTO books (id, title, author, isbn, stock, available)
+        VALUES (1, 'The Great Gatsby', 'F. Scott Fitzgerald', '9780141439518', 2, 2);
+        -- The active hold 003's sample data would place again
+        INSERT INTO reservations (user_id, book_id, reservation_date, status) VALUES (3, 1, '2025-08-10', 'Active');
+    """)
+    applied = migrate(conn)
+    assert [m.version for m in applied] == list(range(migrator.LEGACY_BASELINE + 1, SCHEMA_VERSION + 1))
+    assert conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION
+    # No sample data was replayed
+    assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM books").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM reservations").fetchone()[0] == 1
+    assert 'trigram_frequencies' in _tables(conn)
+    # 001's timestamp trigger has the column it writes (023)
+    assert conn.execute("SELECT created_at FROM reservations").fetchone() == ('2025-08-10 00:00:00',)
+    conn.execute("UPDATE reservations SET status = 'Cancelled'")
+    assert conn.execute("SELECT updated_at IS NOT NULL FROM reservations").fetchone() == (1,)
+    conn.close()
+
+
+def test_schema_migrations_rows_are_matched_by_name(tmp_path):
+    conn = _connect(tmp_path)
+    conn.executescript("""
+        CREATE TABLE schema_migrations (id INTEGER PRIMARY KEY, name TEXT NOT NULL,
+                                        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        INSERT INTO schema_migrations (id, name) VALUES (1, '001_a.sql'), (2, '002_c.sql');
+    """)
+    migrations = tmp_path / 'migrations'
+    migrations.mkdir()
+    (migrations / '001_a.sql').write_text("CREATE TABLE a (id INTEGER);")
+    (migrations / '002_b.sql').write_text("CREATE TABLE b (id INTEGER);")
+    (migrations / '003_c.sql').write_text("CREATE TABLE c (id INTEGER);")   # was 002
+    applied = migrate(conn, target=3, directory=str(migrations))
+    assert [m.name for m in applied] == ['002_b.sql']
+    assert _tables(conn) == {'schema_migrations', 'b'}
+    assert conn.execute('PRAGMA user_version').fetchone()[0] == 3
+    conn.close()
+
+
+def test_failed_migration_rolls_back_and_keeps_version(tmp_path):
+    migrations = tmp_path / 'migrations'
+    migrations.mkdir()
+    (migrations / '001_ok.sql').write_text("""
+        -- explicit transaction statements are left to the engine
+        BEGIN TRANSACTION;
+        CREATE TABLE loans (id INTEGER PRIMARY KEY, note TEXT);
+        CREATE TRIGGER loans_note AFTER INSERT ON loans BEGIN
+            UPDATE loans SET note = 'a;b' WHERE id = NEW.id;
+        END;
+        COMMIT;
+    """)
+    (migrations / '002_python.py').write_text(
+        "def upgrade(conn):\n"
+        "    conn.execute(\"INSERT INTO loans (id) VALUES (1)\")\n"
+    )
+    (migrations / '003_broken.sql').write_text(
+        "INSERT INTO loans (id) VALUES (2); INSERT INTO missing_table VALUES (1);"
+    )
+    conn = _connect(tmp_path)
+    with pytest.raises(MigrationError, match='003_broken.sql'):
+        migrate(conn, target=3, directory=str(migrations))
+    assert conn.execute('PRAGMA user_version').fetchone()[0] == 2
+    assert conn.execute("SELECT id, note FROM loans").fetchall() == [(1, 'a;b')]
+    conn.close()
+
+
+def test_split_statements_keeps_trigger_bodies_whole():
+    script = """
+        CREATE TABLE t (x); /* comment; with semicolon */
+        CREATE TRIGGER tr AFTER INSERT ON t BEGIN SELECT 1; SELECT 2; END;
+        INSERT INTO t VALUES ('x;y');
+    """
+    statements = list(split_statements(script))
+    assert len(statements) == 3
+    assert statements[1].endswith('END;')
+
+
+def test_features_refuse_a_database_that_was_not_migrated(legacy_db):
+    from data import archive
+    from services.maintenance_service import MaintenanceService
+
+    conn = sqlite3.connect(legacy_db)
+    with pytest.raises(SchemaVersionError, match='needs schema version 17 but the database is at 0'):
+        archive.archive_returned(conn)
+    with pytest.raises(SchemaVersionError, match='Maintenance'):
+        MaintenanceService(legacy_db).run()
+    # Nothing was created on the side
+    assert not conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name IN ('transaction_archive_state', 'maintenance_log')"
+    ).fetchall()
+
+    migrate(conn)
+    assert archive.archive_returned(conn)['moved'] == 0
+    conn.close()
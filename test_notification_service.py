@@ -0,0 +1,103 @@
+import socket
+import sqlite3
+
+import pytest
+
+from data.migrator import migrate
+from services.notification_service import NotificationService
+
+
+@pytest.fixture
+def db_path(legacy_db, add_members, add_titles):
+    conn = sqlite3.connect(legacy_db)
+    add_members(conn, [(1, 'Sara Khan'), (2, 'John Smith'), (3, 'No Mail')])
+    conn.executescript("""
+        UPDATE users SET email = 'sara@example.com' WHERE id = 1;
+        UPDATE users SET email = 'john@example.com' WHERE id = 2;
+        UPDATE users SET email = '' WHERE id = 3;
+    """)
+    add_titles(conn, [(1, 'Dune', 2), (2, 'Emma', 1)])
+    conn.executescript("""
+        UPDATE books SET available = 0 WHERE id = 1;
+        INSERT INTO transactions (user_id, book_id, issue_date, due_date, return_date, status) VALUES
+            (1, 1, '2024-03-01', '2024-03-16 12:00:00', NULL, 'Issued'),   -- due soon
+            (2, 1, '2024-02-24', '2024-03-10', NULL, 'Issued'),            -- overdue
+            (1, 2, '2024-02-01', '2024-02-15', '2024-02-14', 'Returned'),  -- closed
+            (3, 2, '2024-03-01', '2024-03-15', NULL, 'Issued'),            -- no email
+            (2, 2, '2024-03-01', '2024-04-15', NULL, 'Issued');            -- not yet
+        INSERT INTO reservations (user_id, book_id, reservation_date, status) VALUES
+            (2, 2, '2024-03-01', 'Active'),
+            (1, 2, '2024-03-02', 'Active'),
+            (1, 1, '2024-03-02', 'Active');
+    """)
+    migrate(conn)
+    conn.close()
+    return legacy_db
+
+
+def _queued(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT kind, ref_id, notice_key, recipient FROM notifications ORDER BY kind, ref_id"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def test_scan_queues_each_notice_once(db_path):
+    service = NotificationService(db_path)
+    assert service.scan('2024-03-14') == {'due_soon': 1, 'overdue': 1, 'hold_ready': 1}
+    assert service.scan('2024-03-14') == {'due_soon': 0, 'overdue': 0, 'hold_ready': 0}
+    assert _queued(db_path) == [
+        ('due_soon', 1, '2024-03-16', 'sara@example.com'),
+        ('hold_ready', 1, 'ready', 'john@example.com'),
+        ('overdue', 2, 'overdue-0', 'john@example.com'),
+    ]
+
+    # Later the due-soon loan is overdue too and the first one gets a follow-up
+    assert service.scan('2024-03-20')['overdue'] == 2
+    assert service.recent(user_id=2)[0]['description'] == "The book 'Dune' is overdue by 10 day(s)."
+
+
+def test_batched_delivery_through_local_smtp(db_path):
+    controller_module = pytest.importorskip('aiosmtpd.controller')
+    from aiosmtpd.handlers import Sink
+
+    class Recorder(Sink):
+        def __init__(self):
+            self.envelopes = []
+
+        async def handle_DATA(self, server, session, envelope):
+            self.envelopes.append(envelope)
+            return '250 OK'
+
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    handler = Recorder()
+    controller = controller_module.Controller(handler, hostname='127.0.0.1', port=port)
+    controller.start()
+    try:
+        service = NotificationService(db_path, smtp_host='127.0.0.1', smtp_port=port,
+                                      batch_size=2, connections=2)
+        result = service.run_once('2024-03-14')
+    finally:
+        controller.stop()
+
+    assert result['delivery'] == {'sent': 3, 'failed': 0, 'batches': 2}
+    assert sorted(e.rcpt_tos[0] for e in handler.envelopes) == [
+        'john@example.com', 'john@example.com', 'sara@example.com'
+    ]
+    assert b"Subject: Overdue Notice" in next(
+        e.content for e in handler.envelopes if b'overdue' in e.content
+    )
+    assert service.pending_count() == 0
+
+
+def test_failed_delivery_is_retried_then_given_up(db_path):
+    service = NotificationService(db_path, smtp_host='127.0.0.1', smtp_port=1)
+    service.scan('2024-03-14')
+    for _ in range(NotificationService.MAX_ATTEMPTS):
+        assert service.deliver_pending()['failed'] == 3
+    assert service.pending_count() == 0
+    assert service.deliver_pending() == {'sent': 0, 'failed': 0, 'batches': 0}
@@ -0,0 +1,48 @@
+import sqlite3
+import threading
+
+import pytest
+
+from data.readonly import ReadOnlyDatabase, ReportExecutor
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'library.db')
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT)")
+    conn.execute("INSERT INTO books (title) VALUES ('Dune')")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_readonly_connection_rejects_writes(db_path):
+    with ReadOnlyDatabase(db_path) as ro:
+        assert ro.query("SELECT title FROM books") == [{'title': 'Dune'}]
+        with pytest.raises(sqlite3.OperationalError):
+            ro.connection.execute("INSERT INTO books (title) VALUES ('Emma')")
+
+
+def test_snapshot_is_isolated_from_concurrent_writes(db_path):
+    writer = sqlite3.connect(db_path)
+    with ReadOnlyDatabase(db_path) as ro:
+        with ro.snapshot():
+            writer.execute("INSERT INTO books (title) VALUES ('Emma')")
+            writer.commit()
+            # The write committed, but the snapshot keeps its view
+            assert ro.query("SELECT COUNT(*) AS n FROM books")[0]['n'] == 1
+        assert ro.query("SELECT COUNT(*) AS n FROM books")[0]['n'] == 2
+    writer.close()
+
+
+def test_report_executor_runs_off_the_calling_thread(db_path):
+    executor = ReportExecutor(db_path)
+    try:
+        thread_name = executor.submit(lambda ro: threading.current_thread().name).result()
+        assert thread_name != threading.current_thread().name
+        rows = executor.submit_query("SELECT title FROM books WHERE id = ?", (1,)).result()
+        assert rows == [{'title': 'Dune'}]
+    finally:
+        executor.shutdown()
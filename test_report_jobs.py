@@ -0,0 +1,142 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from data import report_jobs
+from data.readonly import ReportExecutor
+from data.report_jobs import ReportJobs, ReportResult, ResultCache
+
+SLOW_REPORT = """
+    WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :limit)
+    SELECT i FROM n WHERE i % 1000 = 0
+"""
+
+
+@pytest.fixture
+def db_path(library_db, add_titles):
+    conn = sqlite3.connect(library_db)
+    add_titles(conn, [(i + 1, f'Title {i:04d}', 2) for i in range(1200)])
+    conn.commit()
+    conn.close()
+    return library_db
+
+
+@pytest.fixture
+def jobs(db_path):
+    executor = ReportExecutor(db_path)
+    jobs = ReportJobs(executor=executor)
+    yield jobs
+    jobs.close()
+    executor.shutdown()
+
+
+def test_unchanged_report_comes_from_the_cache(jobs, db_path):
+    progress = []
+    first = jobs.submit('Inventory Status', on_progress=lambda job: progress.append(job.rows)).wait(5)
+    assert first.status == 'done' and not first.cached
+    assert len(first.result.rows) == 1200 and first.result.rows[0]['title'] == 'Title 0000'
+    assert progress == [500, 1000, 1200]
+    assert first.expected is None  # never ran before
+
+    done = []
+    second = jobs.submit('Inventory Status', on_done=done.append)
+    # Finished inside submit, without going through the report thread
+    assert second.finished and second.cached and done == [second]
+    assert second.result is first.result
+
+    writer = sqlite3.connect(db_path)
+    writer.execute("INSERT INTO books (title, author, isbn, stock) VALUES ('Zebra', 'B', 'x', 1)")
+    writer.commit()
+    writer.close()
+
+    third = jobs.submit('Inventory Status')
+    assert not third.cached and third.expected == 1200
+    third.wait(5)
+    assert len(third.result.rows) == 1201
+    # The entry for the old data version was replaced, not kept alongside
+    assert len(jobs.cache) == 1
+
+
+def test_running_and_queued_jobs_can_be_cancelled(jobs, monkeypatch):
+    monkeypatch.setitem(report_jobs.REPORTS, 'Slow', (SLOW_REPORT, {'limit': 10 ** 9}))
+    started = threading.Event()
+    running = jobs.submit('Slow', on_progress=lambda job: started.set())
+    queued = jobs.submit('Inventory Status')
+    assert started.wait(5)
+
+    assert queued.cancel()
+    assert queued.status == 'cancelled' and queued.finished
+    assert running.cancel()
+    running.wait(5)
+    assert running.status == 'cancelled' and running.result is None
+    assert not running.cancel()
+
+    # The report thread is free again and nothing cancelled was cached
+    assert jobs.submit('Inventory Status').wait(5).status == 'done'
+    assert len(jobs.cache) == 1
+
+
+def test_cancel_interrupts_a_statement_that_returns_nothing_yet(jobs, monkeypatch):
+    monkeypatch.setitem(report_jobs.REPORTS, 'Count', (f"SELECT COUNT(*) FROM ({SLOW_REPORT})",
+                                                       {'limit': 10 ** 10}))
+    job = jobs.submit('Count')
+    deadline = time.monotonic() + 5
+    while job.status != 'running' and time.monotonic() < deadline:
+        time.sleep(0.01)
+    job.cancel()
+    # Stopped by the SQLite progress handler, long before the count could finish
+    assert job.wait(5).status == 'cancelled'
+
+
+def test_parameters_are_part_of_the_key(jobs, monkeypatch):
+    monkeypatch.setitem(report_jobs.REPORTS, 'Slow', (SLOW_REPORT, {'limit': 10000}))
+    small = jobs.submit('Slow').wait(5)
+    large = jobs.submit('Slow', {'limit': 20000}).wait(5)
+    assert (len(small.result.rows), len(large.result.rows)) == (10, 20)
+    assert jobs.submit('Slow').cached and jobs.submit('Slow', {'limit': 20000}).cached
+
+    monkeypatch.setitem(report_jobs.REPORTS, 'Broken', ("SELECT * FROM no_such_table", {}))
+    failed = jobs.submit('Broken').wait(5)
+    assert failed.status == 'failed' and 'no_such_table' in str(failed.error)
+    assert len(jobs.cache) == 2
+    with pytest.raises(ValueError):
+        jobs.submit('No Such Report')
+
+
+def test_dated_reports_are_run_again_the_next_day(jobs, monkeypatch):
+    from datetime import date, timedelta
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.today() + timedelta(days=1)
+
+    assert jobs.submit('Overdue Books').wait(5).status == 'done'
+    assert jobs.submit('Overdue Books').cached and jobs.submit('Inventory Status').wait(5).status == 'done'
+    monkeypatch.setattr(report_jobs, 'date', Tomorrow)
+    # No write happened, but loans due today are overdue tomorrow
+    assert not jobs.submit('Overdue Books').wait(5).cached
+    assert jobs.submit('Inventory Status').cached
+
+
+def test_cache_evicts_stale_entries_first():
+    cache = ResultCache(budget_bytes=300)
+
+    def result(name, version):
+        return ReportResult(name, (), ['n'], [{'n': 1}], version, 0.0, nbytes=100)
+
+    cache.put(result('old', 1), current_version=1)
+    cache.put(result('a', 2), current_version=2)
+    cache.put(result('b', 2), current_version=2)
+    assert cache.get('a', (), 2)  # a is now the most recently used
+    cache.put(result('c', 2), current_version=2)
+    # The stale entry went first, even though 'b' was used less recently
+    assert cache.get('old', (), 1) is None
+    assert cache.get('b', (), 2) and cache.get('a', (), 2)
+
+    cache.put(result('d', 2), current_version=2)
+    assert cache.get('c', (), 2) is None and cache.nbytes == 300
+    assert cache.stats['evicted'] == 2
+    assert cache.expected_rows('old', ()) == 1
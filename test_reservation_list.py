@@ -0,0 +1,84 @@
+from data import reservation_list
+from data.reservation_list import ReservationList, fetch_reservations
+
+
+def _reservations(count):
+    return [
+        {'reservation_id': i, 'book_title': f'Book {i % 7}', 'user_name': f'Member {i % 5}',
+         'reservation_date': f'2024-01-{i % 28 + 1:02d}', 'status': 'Active'}
+        for i in range(count)
+    ]
+
+
+def _pager(reservations):
+    """A fetch(limit=, after=) over ``reservations`` sorted newest first."""
+    ordered = sorted(reservations, key=lambda r: (r['reservation_date'], r['reservation_id']),
+                     reverse=True)
+    calls = []
+
+    def fetch(limit, after):
+        calls.append(after)
+        rows = [r for r in ordered
+                if after is None or (r['reservation_date'], r['reservation_id']) < after]
+        return rows[:limit]
+    return fetch, ordered, calls
+
+
+def test_pages_are_loaded_after_the_last_row():
+    fetch, ordered, calls = _pager(_reservations(45))
+    reservations = ReservationList()
+    while reservations.load_page(fetch, page_size=10):
+        pass
+    assert reservations.complete and len(calls) == 5
+    assert [row[reservation_list.ID] for row in reservations.rows] == [r['reservation_id'] for r in ordered]
+    assert reservations.load_page(fetch, page_size=10) == 0 and len(calls) == 5
+
+
+def test_repeated_titles_and_names_are_stored_once():
+    reservations = ReservationList()
+    reservations.extend(_reservations(100))
+    titles = {id(row[reservation_list.BOOK_TITLE]) for row in reservations.rows}
+    names = {id(row[reservation_list.USER_NAME]) for row in reservations.rows}
+    assert len(titles) == 7 and len(names) == 5
+
+
+def test_search_matches_titles_or_names():
+    reservations = ReservationList()
+    reservations.extend(_reservations(70))
+    reservations.extend([{'reservation_id': 70, 'book_title': 'Dune', 'user_name': 'Sara Khan',
+                          'reservation_date': '2023-12-31', 'status': 'Active'}])
+
+    def shown(text):
+        matched = reservations.matching(text)
+        return [row[0] for i, row in enumerate(reservations.rows) if reservations.accepts(i, matched)]
+
+    assert shown('') == list(range(71))
+    assert shown('BOOK 3') == [i for i in range(70) if i % 7 == 3]
+    assert shown('k') == list(range(71))
+    assert shown('kh') == [70]
+    # Narrowed from the last search, and reset when new rows arrive
+    assert reservations.matching('khan') == {'Sara Khan'}
+    reservations.extend([{'reservation_id': 71, 'book_title': 'Khan Noonien', 'user_name': 'Ali',
+                          'reservation_date': '2023-12-30', 'status': 'Active'}])
+    assert shown('khan') == [70, 71]
+    assert reservations.index_of(71) == 71 and reservations.index_of(99) is None
+
+
+def test_database_pages_use_the_date_index(library_conn, add_members, add_titles):
+    conn = library_conn
+    add_members(conn, [(i, f'Member {i}') for i in range(1, 51)])
+    add_titles(conn, [(1, 'Dune', 1, 'Herbert', '9780441013593')])
+    conn.executemany("INSERT INTO reservations (user_id, book_id, reservation_date, status) "
+                     "VALUES (?, 1, ?, 'Active')", [(i + 1, f'2024-02-{i % 9 + 1:02d}') for i in range(50)])
+    everything = fetch_reservations(conn)
+    reservations = ReservationList()
+    while reservations.load_page(lambda limit, after: fetch_reservations(conn, limit, after), 8):
+        pass
+    assert [row[0] for row in reservations.rows] == [r['reservation_id'] for r in everything]
+    assert everything[0]['book_title'] == 'Dune' and len(everything) == 50
+
+    conn.execute("ANALYZE")
+    plan = ' '.join(row[3] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM reservations WHERE (reservation_date, id) < (?, ?) "
+        "ORDER BY reservation_date DESC, id DESC LIMIT 10", ('2024-02-05', 20)))
+    assert 'idx_reservations_date_id' in plan and 'TEMP B-TREE' not in plan
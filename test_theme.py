@@ -0,0 +1,44 @@
+import re
+
+from theme import BADGES, TOKENS, VARIANTS, build_stylesheet
+
+
+def test_every_token_is_substituted():
+    stylesheet = build_stylesheet()
+    assert '$' not in stylesheet
+    assert stylesheet.count('{') == stylesheet.count('}')
+    # Every rule body resolves to concrete values
+    for body in re.findall(r'\{([^}]*)\}', stylesheet):
+        for declaration in filter(None, (line.strip() for line in body.split(';'))):
+            name, value = declaration.split(':', 1)
+            assert name.strip() and value.strip()
+
+
+def test_variants_and_badges_have_rules():
+    stylesheet = build_stylesheet()
+    for name in VARIANTS:
+        assert f'QPushButton[variant="{name}"] {{' in stylesheet
+        assert f'QPushButton[variant="{name}"][chip="true"] {{' in stylesheet
+        assert TOKENS[f'{name}_hover'] in stylesheet
+    for name in BADGES:
+        assert f'QLabel[badge="{name}"] {{' in stylesheet
+    for object_name in ('sidebarButton', 'statCard', 'resultDialog', 'notificationRow'):
+        assert f'#{object_name}' in stylesheet
+
+
+def test_secondary_variant_is_neutral():
+    stylesheet = build_stylesheet()
+    rule = stylesheet[stylesheet.index('QPushButton[variant="secondary"] {'):]
+    rule = rule[:rule.index('}')]
+    assert f"color: {TOKENS['secondary_text']};" in rule
+    assert f"border: 1px solid {TOKENS['secondary_border']};" in rule
+    primary = stylesheet[stylesheet.index('QPushButton[variant="primary"] {'):]
+    assert 'border: none;' in primary[:primary.index('}')]
+
+
+def test_overrides_replace_tokens():
+    stylesheet = build_stylesheet({'primary': '#123456'})
+    assert '#123456' in stylesheet
+    assert TOKENS['primary'] not in build_stylesheet({'primary': '#123456', 'primary_hover': '#654321'})
+    # The defaults are left alone
+    assert TOKENS['primary'] == '#3b82f6'
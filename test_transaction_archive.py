@@ -0,0 +1,134 @@
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from data import aggregates, archive
+from data.readonly import ReadOnlyDatabase
+
+TODAY = date(2025, 6, 1)
+
+
+def _day(days_ago):
+    return (TODAY - timedelta(days=days_ago)).isoformat()
+
+
+@pytest.fixture
+def db_path(library_db, add_members, add_titles):
+    conn = sqlite3.connect(library_db)
+    add_members(conn, [(i, f'Member {i}') for i in range(1, 8)])
+    add_titles(conn, [(i, f'Title {i}', 5) for i in range(1, 12)])
+    rows = []
+    for i in range(1000):
+        issued = 5 + i * 3  # one loan every three days, going back about eight years
+        returned = None if i % 50 == 0 else _day(issued - 10)
+        rows.append((i % 7 + 1, i % 11 + 1, _day(issued), _day(issued - 14), returned,
+                     'Issued' if returned is None else 'Returned'))
+    conn.executemany(
+        "INSERT INTO transactions (user_id, book_id, issue_date, due_date, return_date, status) "
+        "VALUES (?, ?, ?, ?, ?, ?)", rows
+    )
+    conn.commit()
+    conn.close()
+    return library_db
+
+
+def _aggregates(conn):
+    return {table: conn.execute(f"SELECT * FROM {table} ORDER BY 1, 2").fetchall()
+            for table in aggregates.AGGREGATE_TABLES}
+
+
+def test_archive_moves_old_returned_loans_in_batches(db_path):
+    conn = sqlite3.connect(db_path)
+    before = _aggregates(conn)
+    history = archive.loan_history(conn)
+
+    result = archive.archive_returned(conn, horizon_days=365, batch_size=100, today=TODAY)
+    cutoff = _day(365)
+    assert result['watermark'] == cutoff
+    assert result['moved'] > 700 and result['batches'] == -(-result['moved'] // 100)
+
+    # Open loans and recent returns stay; every archived date is before the cutoff
+    assert conn.execute("SELECT COUNT(*) FROM transactions WHERE MAX(issue_date, due_date, return_date) < ?",
+                        (cutoff,)).fetchone()[0] == 0
+    assert conn.execute("SELECT MAX(MAX(issue_date), MAX(due_date), MAX(return_date)) "
+                        "FROM archive.transactions").fetchone()[0] < cutoff
+    assert conn.execute("SELECT COUNT(*) FROM transactions WHERE return_date IS NULL").fetchone()[0] == 20
+
+    # The aggregates still count the archived loans, and a full rebuild keeps them
+    assert _aggregates(conn) == before
+    aggregates.rebuild(conn)
+    assert _aggregates(conn) == before
+
+    assert [row['id'] for row in archive.loan_history(conn)] == [row['id'] for row in history]
+    assert archive.archive_returned(conn, 365, today=TODAY)['moved'] == 0
+    conn.close()
+
+
+def test_fined_loans_stay_with_their_fines(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    fined = conn.execute("SELECT id FROM transactions WHERE return_date < ? ORDER BY id DESC LIMIT 2",
+                         (_day(700),)).fetchall()
+    conn.executemany("INSERT INTO fines (transaction_id, amount) VALUES (?, 2.5)", fined)
+    conn.commit()
+
+    result = archive.archive_returned(conn, horizon_days=365, today=TODAY)
+    assert result['moved'] > 700
+    assert conn.execute("SELECT COUNT(*) FROM fines JOIN main.transactions t ON t.id = fines.transaction_id "
+                        "WHERE fines.amount = 2.5").fetchone()[0] == 2
+    assert not conn.execute(f"SELECT 1 FROM archive.transactions WHERE id IN ({fined[0][0]}, {fined[1][0]})"
+                            ).fetchall()
+    conn.close()
+
+
+def test_recent_ranges_do_not_attach_the_archive(db_path):
+    conn = sqlite3.connect(db_path)
+    archive.archive_returned(conn, horizon_days=365, today=TODAY)
+    conn.close()
+
+    conn = sqlite3.connect(db_path)
+    recent = archive.loan_history(conn, start=_day(90), column='return_date')
+    assert recent and not any(row['archived'] for row in recent)
+    assert not archive.is_attached(conn)
+    assert archive.loan_source(conn, _day(30)) == 'main.transactions'
+
+    old = archive.loan_history(conn, start=_day(800), end=_day(700), user_id=3)
+    assert archive.is_attached(conn)
+    assert old and all(row['archived'] and row['user_id'] == 3 for row in old)
+    assert all(_day(800) <= row['issue_date'] <= _day(700) for row in old)
+    conn.close()
+
+
+def test_interrupted_batch_is_reconciled(db_path):
+    conn = sqlite3.connect(db_path)
+    archive.archive_returned(conn, horizon_days=365, today=TODAY)
+    # A batch that was copied but whose delete never committed
+    loan = conn.execute("SELECT id, user_id, book_id, issue_date, due_date, return_date, status "
+                        "FROM transactions WHERE return_date < ? ORDER BY id LIMIT 1", (_day(100),)).fetchone()
+    conn.execute("INSERT INTO archive.transactions (id, user_id, book_id, issue_date, due_date, "
+                 "return_date, status) VALUES (?, ?, ?, ?, ?, ?, ?)", loan)
+    conn.commit()
+
+    result = archive.archive_returned(conn, horizon_days=365, today=TODAY)
+    assert result['reconciled'] == 1 and result['moved'] == 0
+    ids = [row['id'] for row in archive.loan_history(conn)]
+    assert len(ids) == len(set(ids)) == 1000
+    conn.close()
+
+
+def test_read_only_snapshots_read_the_archive(db_path):
+    conn = sqlite3.connect(db_path)
+    archive.archive_returned(conn, horizon_days=365, today=TODAY)
+    conn.close()
+
+    readonly = ReadOnlyDatabase(db_path)
+    try:
+        assert archive.attach_if_needed(readonly.connection)
+        with readonly.snapshot() as snapshot:
+            total, archived = snapshot.execute(
+                f"SELECT COUNT(*), SUM(archived) FROM {archive.loan_source(snapshot)}"
+            ).fetchone()
+        assert total == 1000 and archived > 700
+    finally:
+        readonly.close()
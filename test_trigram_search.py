@@ -0,0 +1,88 @@
+import sqlite3
+
+import pytest
+
+from data import trigram_search
+from data.migrator import migrate
+from data.trigram_search import search_books, search_users
+
+
+@pytest.fixture
+def conn(legacy_db, add_members, add_titles):
+    conn = sqlite3.connect(legacy_db)
+    add_titles(conn, [
+        (1, 'Dune', 1, 'Frank Herbert', '978-0441013593'),
+        (2, 'The Great Gatsby', 1, 'F. Scott Fitzgerald', '978-0743273565'),
+        (3, 'Pride and Prejudice', 1, 'Jane Austen', '978-0141439518'),
+        (4, 'Emma', 1, 'Jane Austen', '978-0141439587'),
+    ])
+    migrate(conn)
+    # Rows written after the index exists are picked up by the triggers
+    add_members(conn, [(1, 'Muhammad Abdullah'), (2, 'Sara Khan')])
+    yield conn
+    conn.close()
+
+
+def _ids(matches):
+    return [match.id for match in matches]
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('frank herbrt', [1]),
+    ('grate gatsby', [2]),
+    ('prejudise', [3]),
+    ('austin', [3, 4]),
+    ('em', [4]),
+])
+def test_misspelt_books_are_found(conn, query, expected):
+    assert _ids(search_books(conn, query)) == expected
+
+
+def test_misspelt_patrons_are_found(conn):
+    assert _ids(search_users(conn, 'mohammad abdulah')) == [1]
+    assert _ids(search_users(conn, 'Sarah  Kahn')) == [2]
+    assert search_users(conn, 'zzzz') == []
+
+
+def test_exact_title_ranks_first(conn):
+    conn.execute("INSERT INTO books (title, author, isbn, stock) "
+                 "VALUES ('Emma and the Great Storm', 'A. Writer', '', 1)")
+    matches = search_books(conn, 'emma')
+    assert _ids(matches)[:2] == [4, 5] and matches[0].score > matches[1].score
+    assert matches[0].values == ('Emma', 'Jane Austen')
+
+
+def test_index_follows_edits_and_deletes(conn):
+    conn.execute("UPDATE books SET title = 'Dune Messiah' WHERE id = 1")
+    assert _ids(search_books(conn, 'mesiah')) == [1]
+    conn.execute("UPDATE users SET email = 'sara.k@example.org' WHERE id = 2")
+    assert _ids(search_users(conn, 'sara.k@example.org'))[0] == 2
+    conn.execute("DELETE FROM books WHERE id = 1")
+    assert search_books(conn, 'messiah') == []
+
+
+def test_probes_stay_within_the_postings_budget(conn, monkeypatch):
+    conn.executemany("INSERT INTO books (title, author, isbn, stock) VALUES (?, 'Anon', '', 1)",
+                     [(f'The Book {i}',) for i in range(50)])
+    monkeypatch.setattr(trigram_search, 'MAX_POSTINGS', 10)
+    grams = trigram_search.trigrams('the book 7')
+    trigram_search.refresh_frequencies(conn)
+    probes = trigram_search._probes(conn, 'books', grams)
+    # Trigrams shared by all the generated titles are too common to probe
+    assert probes and 'the' not in probes and ' bo' not in probes
+
+
+def test_isbn_prefixes_are_found_before_titles(conn):
+    assert _ids(search_books(conn, '978-0141439')) == [3, 4]
+    assert _ids(search_books(conn, '978-0743273565')) == [2]
+    assert trigram_search.isbn_matches(conn, 'emma') == []
+
+
+def test_tabs_and_repeated_spaces_are_indexed_like_queries(conn):
+    conn.execute("INSERT INTO books (title, author, isbn, stock) "
+                 "VALUES ('The\tSilent   Sea', 'A  Writer', '', 1)")
+    matches = search_books(conn, 'silent sea')
+    assert _ids(matches)[0] == 5 and matches[0].score > 0.5
+    expression = trigram_search.prefix_expression('sil  sea')
+    assert conn.execute("SELECT rowid FROM books_trigrams WHERE books_trigrams MATCH ?",
+                        (expression,)).fetchall() == [(5,)]
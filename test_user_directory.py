@@ -0,0 +1,63 @@
+import pytest
+
+from data import user_directory
+from data.user_directory import DirectoryQuery, count, fetch_page
+
+
+@pytest.fixture
+def conn(library_conn, add_members):
+    add_members(library_conn, [
+        (i, f'Member {i}', 'Admin' if i % 10 == 0 else 'Member', 'Inactive' if i % 3 == 0 else 'Active')
+        for i in range(1, 501)
+    ] + [(501, 'Sara Khan', 'member', 'active')])
+    library_conn.executescript("""
+        UPDATE users SET user_code = printf('USR-%06d', id) WHERE id <= 500;
+        UPDATE users SET user_code = 'USR-900001', email = 'sara@example.com' WHERE id = 501;
+    """)
+    return library_conn
+
+
+def _ids(page):
+    return [row[0] for row in page.rows]
+
+
+def test_pages_follow_each_other_in_id_order(conn):
+    query = DirectoryQuery(role='Admin', status='Active')
+    seen, after = [], 0
+    while True:
+        page = fetch_page(conn, query, after, limit=7)
+        seen += _ids(page)
+        if page.next_after is None:
+            break
+        after = page.next_after
+    expected = [i for i in range(1, 501) if i % 10 == 0 and i % 3 != 0]
+    assert seen == expected and count(conn, query) == len(expected)
+
+
+def test_search_matches_word_prefixes_codes_and_ids(conn):
+    # Last name, e-mail and filters, case-insensitively
+    assert _ids(fetch_page(conn, DirectoryQuery('kha'))) == [501]
+    assert _ids(fetch_page(conn, DirectoryQuery('SARA@', role='MEMBER', status='Active'))) == [501]
+    assert _ids(fetch_page(conn, DirectoryQuery('usr-00001'))) == list(range(10, 20))
+    # The id itself, and the names with a word starting with 42
+    assert _ids(fetch_page(conn, DirectoryQuery('42'))) == [42] + list(range(420, 430))
+    expected = [i for i in range(1, 501) if str(i).startswith('4') and i % 3 == 0]
+    assert count(conn, DirectoryQuery('member 4', status='inactive')) == len(expected)
+
+
+def test_misspelt_names_fall_back_to_the_trigram_search(conn):
+    page = fetch_page(conn, DirectoryQuery('sarah kahn'))
+    assert page.fuzzy and _ids(page) == [501] and page.next_after is None
+    assert fetch_page(conn, DirectoryQuery('sarah kahn', status='Inactive')).rows == []
+
+
+def test_pages_are_read_through_indexes(conn):
+    conn.execute("ANALYZE")
+    for query in (DirectoryQuery(), DirectoryQuery(role='Admin'), DirectoryQuery(status='Active'),
+                  DirectoryQuery(role='Member', status='Active')):
+        conditions, params = user_directory._filters(query)
+        plan = ' '.join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN " + user_directory._select(conditions + ["id > ?"])
+            + " ORDER BY id LIMIT ?", params + [0, 10]))
+        assert 'SCAN users' not in plan.replace('SCAN users USING INTEGER PRIMARY KEY', '')
+        assert 'TEMP B-TREE' not in plan
@@ -0,0 +1,98 @@
+import sqlite3
+import threading
+
+import pytest
+
+from warmup import CounterSnapshot, Task, run_tasks
+
+
+def test_tasks_run_after_their_dependencies():
+    order = []
+    lock = threading.Lock()
+
+    def step(name):
+        def run():
+            with lock:
+                order.append(name)
+            return name
+        return run
+
+    results = run_tasks([
+        Task('pages', step('pages'), after=('schema',)),
+        Task('schema', step('schema')),
+        Task('counters', step('counters'), after=('schema', 'pool')),
+        Task('pool', step('pool'), after=('schema',)),
+    ])
+    assert order[0] == 'schema'
+    assert order.index('counters') > order.index('pool')
+    assert all(result.ok for result in results.values())
+    assert results['pool'].value == 'pool'
+
+
+def test_independent_tasks_run_in_parallel():
+    # Each task waits for the other; run one after the other they would time out
+    barrier = threading.Barrier(2, timeout=5)
+    results = run_tasks([Task('a', barrier.wait), Task('b', barrier.wait)], max_workers=2)
+    assert results['a'].ok and results['b'].ok
+
+
+def test_failure_skips_dependents_only():
+    def fail():
+        raise RuntimeError('no database')
+
+    done = []
+    results = run_tasks([
+        Task('schema', fail),
+        Task('counters', lambda: 1, after=('schema',)),
+        Task('totals', lambda: 2, after=('counters',)),
+        Task('login_page', lambda: 3),
+    ], on_done=lambda result: done.append(result.name))
+    assert isinstance(results['schema'].error, RuntimeError)
+    assert results['counters'].skipped and results['totals'].skipped
+    assert results['login_page'].ok
+    assert sorted(done) == ['counters', 'login_page', 'schema', 'totals']
+
+
+@pytest.mark.parametrize('tasks', [
+    [Task('a', int), Task('a', int)],
+    [Task('a', int, after=('missing',))],
+    [Task('a', int, after=('b',)), Task('b', int, after=('a',))],
+])
+def test_invalid_graphs_are_rejected(tasks):
+    with pytest.raises(ValueError):
+        run_tasks(tasks)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'library.db')
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT)")
+    conn.execute("INSERT INTO books (title) VALUES ('Dune')")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _count_books(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {'books': conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]}
+    finally:
+        conn.close()
+
+
+def test_counter_snapshot_is_handed_out_once(db_path):
+    snapshot = CounterSnapshot(db_path, lambda: _count_books(db_path))
+    assert snapshot.take() == {'books': 1}
+    assert snapshot.take() is None
+
+
+def test_counter_snapshot_is_dropped_after_another_commit(db_path):
+    snapshot = CounterSnapshot(db_path, lambda: _count_books(db_path))
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("INSERT INTO books (title) VALUES ('Emma')")
+    conn.close()
+    assert snapshot.take() is None
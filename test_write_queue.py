@@ -0,0 +1,106 @@
+import sqlite3
+import threading
+
+import pytest
+
+from data.write_queue import WriteQueue, get_write_queue
+from services import circulation
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'library.db')
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL CHECK (value >= 0));
+        INSERT INTO counters VALUES ('loans', 0);
+    """)
+    conn.close()
+    return path
+
+
+def _bump(conn, amount):
+    conn.execute("UPDATE counters SET value = value + ? WHERE name = 'loans'", (amount,))
+    return conn.execute("SELECT value FROM counters WHERE name = 'loans'").fetchone()[0]
+
+
+def _value(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT value FROM counters WHERE name = 'loans'").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_concurrent_jobs_are_group_committed(db_path):
+    queue = WriteQueue(db_path, max_delay=0.02)
+    barrier = threading.Barrier(16)
+    results = []
+
+    def producer():
+        barrier.wait()
+        results.append(queue.call(_bump, 1))
+
+    threads = [threading.Thread(target=producer) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    queue.close()
+
+    assert sorted(results) == list(range(1, 17))
+    assert _value(db_path) == 16
+    stats = queue.stats()
+    assert stats['jobs'] == 16 and stats['batches'] < 16
+
+
+def test_failed_job_is_rolled_back_alone(db_path):
+    queue = WriteQueue(db_path, max_delay=0.05)
+    ok_before = queue.submit(_bump, 5)
+    failing = queue.submit(_bump, -100)      # violates the CHECK constraint
+    ok_after = queue.submit(_bump, 2)
+
+    assert ok_before.result() == 5
+    with pytest.raises(sqlite3.IntegrityError):
+        failing.result()
+    assert ok_after.result() == 7
+    queue.close()
+    assert _value(db_path) == 7
+    assert queue.stats()['failed'] == 1
+
+
+def test_close_drains_queue_and_rejects_new_jobs(db_path):
+    queue = WriteQueue(db_path)
+    futures = [queue.submit(_bump, 1) for _ in range(50)]
+    queue.close()
+    assert all(f.done() for f in futures)
+    assert _value(db_path) == 50
+    with pytest.raises(RuntimeError):
+        queue.submit(_bump, 1)
+
+
+def test_shared_queue_runs_its_setup_once(db_path):
+    setups = []
+    queue = get_write_queue(db_path, setup=setups.append)
+    assert get_write_queue(db_path, setup=setups.append) is queue
+    for _ in range(3):
+        queue.call(_bump, 1)
+    queue.close()
+    assert len(setups) == 1 and _value(db_path) == 3
+
+
+def test_circulation_writes_join_the_batch(library_db, add_members, add_titles):
+    conn = sqlite3.connect(library_db)
+    add_members(conn, [(1, 'Ada'), (2, 'Grace')])
+    add_titles(conn, [(1, 'Dune', 1)])
+    conn.commit()
+    conn.close()
+
+    queue = WriteQueue(library_db, max_delay=0.05)
+    first = queue.submit(circulation.borrow_book, 1, 1)
+    second = queue.submit(circulation.borrow_book, 2, 1)
+    assert first.result()[0] is True
+    assert second.result() == (False, "Book is not available for borrowing")
+    assert queue.call(circulation.return_book, 1, 1)[0] is True
+    queue.close()
+    assert queue.stats()['batches'] == 2
@@ -0,0 +1,402 @@
+"""
+Application theme compiled from design tokens.
+
+The look of the application is described once, as ``TOKENS`` (colours,
+radii, fonts), and compiled into a single application style sheet that
+``main.py`` installs at start-up with ``apply_theme``. Widgets no longer
+carry their own ``setStyleSheet`` strings; they opt into a rule by object
+name or by a dynamic property the rules select on:
+
+* ``variant`` on a ``QPushButton``: ``primary``, ``danger``, ``success``
+  or ``confirm`` buttons, or a neutral ``secondary`` one (Cancel);
+  ``chip`` makes it a rounded filter chip;
+* ``badge`` on a ``QLabel``: ``borrowed``, ``available``, ``overdue``;
+* ``active`` on a page tab label;
+* object names for one-off pieces such as ``sidebarButton``, ``statCard``
+  or ``resultDialog``.
+
+Qt parses a widget's own style sheet every time it is set and resolves it
+for the widget and all its children, so per-row and per-render
+``setStyleSheet`` calls made building and re-rendering pages slow. A
+property change only re-polishes the one widget (``set_variant``).
+
+Compiling the tokens does not need Qt; only ``apply_theme`` and
+``set_variant`` touch widgets.
+"""
+from string import Template
+from typing import Dict, Mapping, Optional
+
+TOKENS: Dict[str, str] = {
+    # Fonts
+    'font_ui': "'Segoe UI', Arial, sans-serif",
+    'font_content': "'Inter', 'Segoe UI', Arial, sans-serif",
+    # Surfaces and lines
+    'window': '#f8f9fa',
+    'page': '#f4f5f7',
+    'surface': '#ffffff',
+    'surface_muted': '#f3f4f6',
+    'sidebar': '#f8fafc',
+    'sidebar_hover': '#f1f5f9',
+    'border': '#e5e7eb',
+    'border_sidebar': '#e2e8f0',
+    'scrollbar': '#f1f1f1',
+    'scrollbar_handle': '#c1c1c1',
+    'stat_card': '#F0D2DA',
+    # Text
+    'text': '#232b36',
+    'text_strong': '#111827',
+    'text_sidebar': '#1e293b',
+    'text_dialog': '#2c3e50',
+    'text_muted': '#6b7280',
+    'text_subtle': '#64748b',
+    'text_disabled': '#9ca3af',
+    'text_on_accent': '#ffffff',
+    # Accents and their hover shades
+    'primary': '#3b82f6',
+    'primary_hover': '#2563eb',
+    'danger': '#ef4444',
+    'danger_hover': '#dc2626',
+    'success': '#10b981',
+    'success_hover': '#059669',
+    'confirm': '#28a745',
+    'confirm_hover': '#218838',
+    # Neutral buttons: a surface with dark text and a border instead of an accent
+    'secondary': '#ffffff',
+    'secondary_hover': '#f5f5f5',
+    'secondary_text': '#232b36',
+    'secondary_border': '#e5e7eb',
+    'selected': '#4f46e5',
+    'selected_hover': '#4338ca',
+    # Status badges (background, text)
+    'badge_borrowed': '#f3f4f6',
+    'badge_borrowed_text': '#232b36',
+    'badge_available': '#e6f4ea',
+    'badge_available_text': '#388e3c',
+    'badge_overdue': '#fff4e5',
+    'badge_overdue_text': '#f57c00',
+    # Shape
+    'radius_sm': '4px',
+    'radius': '8px',
+    'radius_md': '10px',
+    'radius_lg': '12px',
+    'radius_xl': '16px',
+}
+
+# Variants of QPushButton[variant=...] and chips; a variant with a ``<name>_text``
+# or ``<name>_border`` token uses it instead of text_on_accent and no border
+VARIANTS = ('primary', 'danger', 'success', 'confirm', 'secondary')
+BADGES = ('borrowed', 'available', 'overdue')
+
+_BASE = """
+/* Dashboard window */
+QMainWindow#dashboardWindow {
+    background-color: $window;
+}
+QMainWindow#dashboardWindow QLabel, QMainWindow#dashboardWindow QPushButton,
+QMainWindow#dashboardWindow QLineEdit, QMainWindow#dashboardWindow QTableWidget {
+    font-family: $font_ui;
+}
+
+/* Sidebar */
+QWidget#sidebar {
+    background: $sidebar;
+    border-right: 1px solid $border_sidebar;
+}
+QLabel#sidebarLogo {
+    color: $text_sidebar;
+    padding: 12px 0;
+    margin: 0;
+    letter-spacing: 0.5px;
+}
+QPushButton#sidebarButton {
+    text-align: left;
+    padding: 10px 16px;
+    margin: 0;
+    font-size: 15px;
+    color: $text_sidebar;
+    border: none;
+    background: $sidebar;
+    border-radius: $radius_md;
+    font-family: $font_ui;
+    font-weight: 600;
+    letter-spacing: 0.3px;
+    min-width: 200px;
+    min-height: 40px;
+}
+QPushButton#sidebarButton:hover {
+    background: $sidebar_hover;
+}
+QPushButton#sidebarButton:checked {
+    background: $selected;
+    color: $text_on_accent;
+    font-weight: 700;
+    letter-spacing: 0.4px;
+    border-left: 3px solid $text_on_accent;
+}
+QPushButton#sidebarButton:checked:hover {
+    background: $selected_hover;
+}
+
+/* Dashboard statistics */
+QFrame#statCard {
+    background-color: $stat_card;
+    border-radius: $radius_md;
+    border: 1px solid $border;
+    padding: 12px 10px;
+    margin: 0 4px;
+}
+QFrame#statCard QLabel {
+    background: transparent;
+    border: none;
+    color: $text_strong;
+    font-weight: 800;
+    padding: 2px 0;
+    margin: 0 4px;
+}
+QFrame#statCard[variant="danger"] {
+    background-color: $badge_overdue;
+    border-color: $danger;
+}
+QLabel#statTitle {
+    letter-spacing: 0.5px;
+}
+
+/* Page headings and tabs */
+QLabel#pageTitle {
+    font-size: 28px;
+    font-family: $font_content;
+    font-weight: 800;
+    color: $text;
+    margin-bottom: 6px;
+    margin-top: 0px;
+}
+QLabel#pageTab {
+    font-size: 18px;
+    color: $text_disabled;
+    margin-right: 16px;
+    padding-bottom: 2px;
+    background: none;
+    font-weight: normal;
+    border-bottom: none;
+}
+QLabel#pageTab[active="true"] {
+    color: $text;
+    border-bottom: 2px solid $primary;
+    font-weight: bold;
+}
+
+/* Search fields */
+QLineEdit#searchInput {
+    background: $surface;
+    border: 1.5px solid $border;
+    border-radius: $radius_md;
+    padding: 16px 20px;
+    font-size: 16px;
+    font-family: $font_content;
+    color: $text;
+    margin: 8px 0 12px 0;
+}
+QLineEdit#searchInput[compact="true"] {
+    border-radius: $radius;
+    padding: 10px 16px;
+    font-size: 14px;
+    margin: 0 0 16px 0;
+}
+QLineEdit#searchInput:focus {
+    border: 1.5px solid $primary;
+}
+
+/* Notification list */
+QWidget#notificationPage {
+    background: $page;
+}
+QScrollArea#notificationList {
+    border: none;
+    background: transparent;
+}
+QScrollArea#notificationList QScrollBar:vertical {
+    border: none;
+    background: $scrollbar;
+    width: 8px;
+    margin: 0px;
+}
+QScrollArea#notificationList QScrollBar::handle:vertical {
+    background: $scrollbar_handle;
+    min-height: 20px;
+    border-radius: $radius_sm;
+}
+QScrollArea#notificationList QScrollBar::add-line:vertical,
+QScrollArea#notificationList QScrollBar::sub-line:vertical {
+    height: 0px;
+}
+QWidget#notificationItems {
+    background: $page;
+}
+QWidget#notificationRow {
+    background: transparent;
+    border: none;
+    border-radius: 0px;
+}
+QLabel#notificationIcon {
+    background: $surface_muted;
+    border: none;
+    border-radius: $radius;
+}
+QLabel#notificationTitle {
+    font-size: 15px;
+    font-weight: 700;
+    color: $text_strong;
+    background: transparent;
+}
+QLabel#notificationText {
+    font-size: 13px;
+    color: $text_muted;
+    background: transparent;
+}
+QLabel#notificationDate {
+    font-size: 14px;
+    font-weight: 700;
+    color: $text_subtle;
+    background: transparent;
+}
+QLabel#emptyState {
+    color: $text_muted;
+    font-style: italic;
+    padding: 20px;
+}
+
+/* Content tables */
+QTableWidget#contentTable {
+    background: $surface;
+    border-radius: $radius_xl;
+    font-size: 16px;
+    font-family: $font_content;
+    border: 1.5px solid $border;
+    padding: 0px;
+}
+QTableWidget#contentTable::item {
+    border-bottom: 1px solid $border;
+    padding: 0px 0px;
+}
+QTableWidget#contentTable QHeaderView::section {
+    background: $surface;
+    color: $text;
+    font-weight: 700;
+    font-size: 16px;
+    border: none;
+    padding: 16px 8px;
+    font-family: $font_content;
+}
+
+/* Borrow and return windows, and their result dialogs */
+QWidget#circulationScreen {
+    background-color: $surface;
+}
+QMessageBox#resultDialog {
+    background-color: $window;
+    min-width: 400px;
+    font-family: Arial;
+}
+QMessageBox#resultDialog QLabel {
+    color: $text_dialog;
+    font-size: 14px;
+}
+QMessageBox#resultDialog QPushButton {
+    background-color: $confirm;
+    color: $text_on_accent;
+    border: none;
+    padding: 8px 16px;
+    border-radius: $radius_sm;
+    font-weight: bold;
+    min-width: 100px;
+}
+QMessageBox#resultDialog QPushButton:hover {
+    background-color: $confirm_hover;
+}
+"""
+
+_VARIANT = """
+QPushButton[variant="$name"] {
+    background: $color;
+    color: $text_color;
+    font-size: 15px;
+    font-weight: 600;
+    border-radius: $radius_lg;
+    padding: 10px 28px;
+    border: $border;
+    margin: 0px;
+}
+QPushButton[variant="$name"]:hover {
+    background: $hover;
+}
+QPushButton[variant="$name"][chip="true"] {
+    border: 1px solid $outline;
+    border-radius: $radius_xl;
+    padding: 8px 20px;
+    font-size: 13px;
+    min-width: 100px;
+    margin: 2px 1px;
+}
+QPushButton[variant="$name"][chip="true"]:hover {
+    border-color: $hover;
+}
+"""
+
+_BADGE = """
+QLabel[badge="$name"] {
+    background: $background;
+    color: $color;
+    border-radius: $radius;
+    font-weight: bold;
+    padding: 2px 16px;
+}
+"""
+
+
+def build_stylesheet(overrides: Optional[Mapping[str, str]] = None) -> str:
+    """
+    Compile the application style sheet from ``TOKENS``.
+
+    Args:
+        overrides: Tokens replacing the defaults (for example another accent)
+
+    Returns:
+        The style sheet text
+
+    Raises:
+        KeyError: If a rule refers to a token that is not defined
+    """
+    tokens = dict(TOKENS, **(overrides or {}))
+    parts = [Template(_BASE).substitute(tokens)]
+    for name in VARIANTS:
+        outline = tokens.get(f'{name}_border', tokens[name])
+        parts.append(Template(_VARIANT).substitute(
+            tokens, name=name, color=tokens[name], hover=tokens[f'{name}_hover'],
+            text_color=tokens.get(f'{name}_text', tokens['text_on_accent']), outline=outline,
+            border=f'1px solid {outline}' if f'{name}_border' in tokens else 'none'))
+    for name in BADGES:
+        parts.append(Template(_BADGE).substitute(
+            tokens, name=name, background=tokens[f'badge_{name}'], color=tokens[f'badge_{name}_text']))
+    return ''.join(parts)
+
+
+def apply_theme(app, overrides: Optional[Mapping[str, str]] = None) -> str:
+    """Install the compiled style sheet on the ``QApplication``; returns it."""
+    stylesheet = build_stylesheet(overrides)
+    app.setStyleSheet(stylesheet)
+    return stylesheet
+
+
+def set_variant(widget, name: str, value) -> None:
+    """
+    Set the dynamic property ``name`` the theme selects on and re-polish
+    ``widget`` so the matching rule applies; nothing happens if the value
+    is unchanged.
+    """
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
@@ -1,10 +1,16 @@
+import sqlite3
+
 import database
-from PyQt5.QtCore import Qt, pyqtSignal
+from data import user_directory
+from data.readonly import ReadOnlyDatabase
+from data.user_directory import DirectoryQuery
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import (QComboBox, QDialog, QFormLayout, QFrame, QHBoxLayout, 
                             QHeaderView, QLabel, QLineEdit, QMessageBox, QPushButton, 
-                            QScrollArea, QTableWidget, QTableWidgetItem, QTextEdit, 
+                            QScrollArea, QTableView, QTextEdit, 
                             QVBoxLayout, QWidget)
+from table_delegates import ActionButtonsDelegate, PillDelegate
 
 
 class UserDialog(QDialog):
@@ -242,6 +248,76 @@ class UserDialog(QDialog):
             QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
 
 
+class UserDirectoryModel(QAbstractTableModel):
+    """
+    Members one page at a time (``data.user_directory``): the view asks for
+    the next page through ``canFetchMore``/``fetchMore`` as it scrolls, and
+    search, role and status are applied by the database.
+    """
+    HEADERS = ["User ID", "Full Name", "Email", "Role", "Status", "Actions"]
+    # Columns of a data.user_directory row shown in the first five columns
+    FIELDS = (0, 2, 3, 4, 5)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._readonly = ReadOnlyDatabase(database.DB_FILE)
+        self._query = DirectoryQuery()
+        self._rows = []
+        self._next_after = None
+        self.total = 0
+        self.fuzzy = False
+
+    def set_query(self, query):
+        """Show the first page for ``query`` (also used to refresh)."""
+        self.beginResetModel()
+        self._query = query
+        conn = self._readonly.connection
+        page = user_directory.fetch_page(conn, query)
+        self._rows = page.rows
+        self._next_after = page.next_after
+        self.fuzzy = page.fuzzy
+        self.total = len(page.rows) if page.fuzzy else user_directory.count(conn, query)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.UserRole:
+            return row[0]
+        if role == Qt.DisplayRole and column < len(self.FIELDS):
+            value = row[self.FIELDS[column]]
+            return str(value) if column == 0 else value
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignVCenter | Qt.AlignLeft)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._next_after is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._next_after is None:
+            return
+        page = user_directory.fetch_page(self._readonly.connection, self._query, self._next_after)
+        if page.rows:
+            self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(page.rows) - 1)
+            self._rows.extend(page.rows)
+            self.endInsertRows()
+        self._next_after = page.next_after
+
+
 class UserManagementPage(QWidget):
     def __init__(self, main_window=None):
         super().__init__()
@@ -315,18 +391,50 @@ class UserManagementPage(QWidget):
         search_frame_layout.setContentsMargins(10, 5, 10, 5)
 
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Search by Name, User ID, Email, Role")
+        self.search_input.setPlaceholderText("Search by Name, User ID, Email")
         self.search_input.setFont(QFont("Arial", 12))
         self.search_input.setStyleSheet("border: none; background-color: transparent;")
-        self.search_input.textChanged.connect(self.load_users)
+        # Query once typing pauses instead of on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.load_users)
+        self.search_input.textChanged.connect(self.search_timer.start)
         search_frame_layout.addWidget(self.search_input)
         search_layout.addWidget(search_frame)
+
+        # Role and status are filtered by the database
+        self.role_filter = QComboBox()
+        self.role_filter.addItems(["All Roles", "Admin", "Librarian", "Member"])
+        self.status_filter = QComboBox()
+        self.status_filter.addItems(["All Statuses", "Active", "Inactive"])
+        for combo in (self.role_filter, self.status_filter):
+            combo.setFont(QFont("Arial", 11))
+            combo.currentIndexChanged.connect(self.load_users)
+            search_layout.addWidget(combo)
+
+        self.count_label = QLabel()
+        self.count_label.setFont(QFont("Arial", 11))
+        self.count_label.setStyleSheet("color: #64748b;")
+        search_layout.addWidget(self.count_label)
         return search_layout
 
     def create_table(self):
-        table = QTableWidget()
-        table.setColumnCount(6)
-        table.setHorizontalHeaderLabels(["User ID", "Full Name", "Email", "Role", "Status", "Actions"])
+        table = QTableView()
+        self.model = UserDirectoryModel(table)
+        table.setModel(self.model)
+
+        # Role, status and actions are painted by delegates, not per-row widgets
+        table.setItemDelegateForColumn(3, PillDelegate({
+            'admin': ('#e0f2fe', '#0369a1', '#bae6fd'),
+        }, ('#f1f5f9', '#475569', '#e2e8f0'), table))
+        table.setItemDelegateForColumn(4, PillDelegate({
+            'active': ('#dcfce7', '#166534', '#86efac'),
+        }, ('#fee2e2', '#991b1b', '#fca5a5'), table))
+        self.actions_delegate = ActionButtonsDelegate(table)
+        self.actions_delegate.clicked.connect(self.on_action_clicked)
+        table.setItemDelegateForColumn(5, self.actions_delegate)
+
         # Configure table properties
         table.setColumnWidth(0, 100)  # User ID
         table.setColumnWidth(1, 200)  # Full Name
@@ -336,12 +444,14 @@ class UserManagementPage(QWidget):
         table.setColumnWidth(5, 200)  # Increased width for Actions column
         
         # Set row height and other table properties
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         table.verticalHeader().setDefaultSectionSize(60)  # Increased row height
         table.verticalHeader().setVisible(False)
         table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)  # Only make name column stretchable
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
-        table.setSelectionBehavior(QTableWidget.SelectRows)
+        table.setEditTriggers(QTableView.NoEditTriggers)
+        table.setSelectionBehavior(QTableView.SelectRows)
         table.setShowGrid(False)
+        table.setAlternatingRowColors(True)
         table.setFont(QFont("Inter", 10))
         
         # Make header text bold
@@ -352,11 +462,14 @@ class UserManagementPage(QWidget):
         header.setFont(header_font)
         
         table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: none;
                 outline: none;
                 gridline-color: #f0f2f5;
                 background-color: #ffffff;
+                alternate-background-color: #f8fafc;
+                selection-background-color: #e0f2fe;
+                selection-color: #0369a1;
             }
             QHeaderView::section {
                 background-color: #f8fafc;
@@ -374,18 +487,13 @@ class UserManagementPage(QWidget):
             QHeaderView::section:first {
                 padding-left: 20px;  /* Add more left padding to first column */
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 16px 20px;
                 border-bottom: 1px solid #f1f5f9;
                 color: #334155;
-                min-height: 60px;
                 margin: 0 8px;  /* Add horizontal margin */
             }
-            QTableWidget::item:selected {
-                background-color: #f1f5ff;
-                color: #1e40af;
-            }
-            QTableWidget::item:hover {
+            QTableView::item:hover {
                 background-color: #f8fafc;
             }
             QScrollBar:vertical {
@@ -405,193 +513,29 @@ class UserManagementPage(QWidget):
         """)
         return table
 
+    def current_query(self):
+        role = self.role_filter.currentText() if self.role_filter.currentIndex() > 0 else None
+        status = self.status_filter.currentText() if self.status_filter.currentIndex() > 0 else None
+        return DirectoryQuery(self.search_input.text().strip(), role, status)
+
     def load_users(self):
-        search_term = self.search_input.text().lower()
-        users = database.get_all_users()
-        
-        if search_term:
-            filtered_users = [
-                u for u in users if (search_term in str(u[0]).lower() or 
-                                    search_term in u[1].lower() or 
-                                    search_term in u[2].lower() or 
-                                    search_term in u[3].lower())
-            ]
+        """Show the first page of members matching the search box and filters."""
+        try:
+            self.model.set_query(self.current_query())
+        except sqlite3.Error as e:
+            print(f"Error loading users: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to load users: {str(e)}")
+            return
+        if self.model.fuzzy:
+            self.count_label.setText(f"{self.model.total} close matches")
         else:
-            filtered_users = users
+            self.count_label.setText(f"{self.model.total:,} members")
 
-        # Set alternating row colors
-        self.table.setAlternatingRowColors(True)
-        self.table.setStyleSheet("""
-            QTableWidget {
-                alternate-background-color: #f8fafc;
-                selection-background-color: #e0f2fe;
-                selection-color: #0369a1;
-                gridline-color: #f1f5f9;
-            }
-        """)
-        
-        # Disable sorting while updating
-        self.table.setSortingEnabled(False)
-        self.table.setRowCount(len(filtered_users))
-        
-        # Populate table with user data
-        for i, user in enumerate(filtered_users):
-            self.populate_table_row(i, user)
-            
-        # Re-enable sorting
-        self.table.setSortingEnabled(True)
-        
-        # Sort by first column (User ID) by default
-        self.table.sortByColumn(0, Qt.AscendingOrder)
-
-    def populate_table_row(self, row, user):
-        user_id, name, email, role, status, contact, address = user
-        
-        # Set row height
-        self.table.setRowHeight(row, 60)  # Explicitly set row height
-        
-        # Create and set items with proper alignment and margins
-        for col, (text, alignment) in enumerate([
-            (str(user_id), Qt.AlignVCenter | Qt.AlignLeft),  # User ID
-            (name, Qt.AlignVCenter | Qt.AlignLeft),          # Name
-            (email, Qt.AlignVCenter | Qt.AlignLeft)          # Email
-        ]):
-            item = QTableWidgetItem(text)
-            item.setTextAlignment(alignment)
-            item.setData(Qt.UserRole, text)  # Store original text for sorting
-            self.table.setItem(row, col, item)
-            
-        # Add widgets to cells
-        self.table.setCellWidget(row, 3, self.create_role_widget(role))
-        self.table.setCellWidget(row, 4, self.create_status_widget(status))
-        self.table.setCellWidget(row, 5, self.create_actions_widget(user_id))
-
-    def create_role_widget(self, role):
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(10, 6, 10, 6)
-        layout.setAlignment(Qt.AlignCenter)
-        
-        role_label = QLabel(role.title())
-        role_label.setFont(QFont("Inter", 10, QFont.Medium))
-        
-        # Enhanced role styling with better visual hierarchy
-        if role.lower() == 'admin':
-            style = """
-                background-color: #e0f2fe;
-                color: #0369a1;
-                border-radius: 6px;
-                padding: 4px 12px;
-                font-weight: 500;
-                border: 1px solid #bae6fd;
-            """
-        else:  # member
-            style = """
-                background-color: #f1f5f9;
-                color: #475569;
-                border-radius: 6px;
-                padding: 4px 12px;
-                font-weight: 500;
-                border: 1px solid #e2e8f0;
-            """
-            
-        role_label.setStyleSheet(style)
-        layout.addWidget(role_label)
-        return widget
-
-    def create_status_widget(self, status):
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(10, 6, 10, 6)
-        layout.setAlignment(Qt.AlignCenter)
-        
-        status_label = QLabel(status)
-        status_label.setFont(QFont("Inter", 10, QFont.Medium))
-        
-        # Enhanced status styling with better visual indicators
-        if status.lower() == 'active':
-            bg_color = '#dcfce7'
-            text_color = '#166534'
-            border_color = '#86efac'
-        else:
-            bg_color = '#fee2e2'
-            text_color = '#991b1b'
-            border_color = '#fca5a5'
-            
-        style = f"""
-            background-color: {bg_color};
-            color: {text_color};
-            border-radius: 6px;
-            padding: 4px 12px;
-            font-weight: 500;
-            border: 1px solid {border_color};
-        """
-        status_label.setStyleSheet(style)
-        layout.addWidget(status_label)
-        return widget
-
-    def create_actions_widget(self, user_id):
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(5, 5, 5, 5)  # Reduced margins
-        layout.setSpacing(6)  # Reduced spacing between buttons
-        layout.setAlignment(Qt.AlignCenter)
-        
-        # Edit button with hover effect - enhanced visibility
-        edit_btn = QPushButton("Edit")
-        edit_btn.setCursor(Qt.PointingHandCursor)
-        edit_btn.setStyleSheet("""
-            QPushButton {
-                color: #1e40af;
-                background-color: #dbeafe;
-                border: 1px solid #93c5fd;
-                border-radius: 12px;
-                padding: 6px 12px;
-                font-weight: 500;
-                font-size: 13px;
-                min-width: 70px;
-                max-width: 70px;
-                margin: 0 2px;
-            }
-            QPushButton:hover {
-                background-color: #bfdbfe;
-                border-color: #60a5fa;
-            }
-            QPushButton:pressed {
-                background-color: #93c5fd;
-            }
-        """)
-        edit_btn.clicked.connect(lambda: self.open_edit_user_dialog(user_id))
-        
-        # Delete button with hover effect - enhanced visibility
-        delete_btn = QPushButton("Delete")
-        delete_btn.setCursor(Qt.PointingHandCursor)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                color: #991b1b;
-                background-color: #fee2e2;
-                border: 1px solid #fecaca;
-                border-radius: 12px;
-                padding: 6px 12px;
-                font-weight: 500;
-                font-size: 13px;
-                min-width: 70px;
-                max-width: 70px;
-                margin: 0 2px;
-            }
-            QPushButton:hover {
-                background-color: #fecaca;
-                border-color: #fca5a5;
-            }
-            QPushButton:pressed {
-                background-color: #fca5a5;
-            }
-        """)
-        delete_btn.clicked.connect(lambda: self.delete_user(user_id))
-        
-        layout.addWidget(edit_btn)
-        layout.addWidget(delete_btn)
-        return widget
+    def on_action_clicked(self, action, user_id):
+        if action == 'edit':
+            self.open_edit_user_dialog(user_id)
+        elif action == 'delete':
+            self.delete_user(user_id)
 
     def open_add_user_dialog(self):
         self.user_dialog = UserDialog(parent=self)
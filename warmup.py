@@ -0,0 +1,254 @@
+"""
+Start-up warm-up run while the splash screen is shown.
+
+The splash used to advance a progress bar on a timer for five seconds, and
+the work the application actually needs before its first screens (opening
+the database and checking its schema, importing the page modules, the
+first dashboard queries) was all done afterwards, on the GUI thread, after
+login. Here that work is a small graph of tasks run on worker threads;
+each task starts as soon as the tasks it depends on are done and the splash
+closes when the last one finishes:
+
+* ``schema``: imports ``database``, which brings the schema up to date,
+  and checks the resulting version;
+* ``write_queue``: starts the single writer (``data.write_queue``) and
+  opens its connection;
+* ``counters``: reads the dashboard card counts (``CounterSnapshot``);
+* ``search_indexes``: makes sure the trigram indexes exist and their
+  frequency snapshot is filled;
+* ``login_page`` / ``pages``: imports the login window and the dashboard
+  with all its pages (which loads OpenCV and ZBar for the barcode scanner).
+
+A failing task is logged and the tasks depending on it are skipped; the
+application then does that work where it did before. ``run_tasks`` does
+not need Qt; ``classic_splash`` reports its progress on the GUI thread.
+"""
+import logging
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from data.readonly import ReadOnlyDatabase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class Task:
+    """``func()`` to run once every task named in ``after`` has succeeded."""
+    name: str
+    func: Callable[[], Any]
+    after: Tuple[str, ...] = ()
+
+
+@dataclass
+class TaskResult:
+    name: str
+    seconds: float = 0.0
+    value: Any = None
+    error: Optional[BaseException] = None
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+
+def _check_graph(tasks: Sequence[Task]) -> Dict[str, Task]:
+    by_name: Dict[str, Task] = {}
+    for task in tasks:
+        if task.name in by_name:
+            raise ValueError(f"Duplicate task: {task.name}")
+        by_name[task.name] = task
+    for task in tasks:
+        for name in task.after:
+            if name not in by_name:
+                raise ValueError(f"Task {task.name} depends on unknown task {name}")
+    # Every task must be reachable in dependency order
+    done: set = set()
+    pending = list(tasks)
+    while pending:
+        ready = [task for task in pending if set(task.after) <= done]
+        if not ready:
+            raise ValueError(f"Dependency cycle between: {', '.join(t.name for t in pending)}")
+        done.update(task.name for task in ready)
+        pending = [task for task in pending if task.name not in done]
+    return by_name
+
+
+def _timed(func: Callable[[], Any]) -> Tuple[float, Any, Optional[BaseException]]:
+    started = time.perf_counter()
+    try:
+        value = func()
+    except Exception as e:
+        return time.perf_counter() - started, None, e
+    return time.perf_counter() - started, value, None
+
+
+def run_tasks(tasks: Sequence[Task], max_workers: int = DEFAULT_WORKERS,
+              on_done: Optional[Callable[[TaskResult], None]] = None) -> Dict[str, TaskResult]:
+    """
+    Run a task graph on a thread pool, each task as soon as its dependencies
+    have succeeded.
+
+    Args:
+        tasks: The tasks; dependencies refer to them by name
+        max_workers: Worker threads
+        on_done: Called (on the calling thread) with each result as it comes in,
+            including tasks skipped because a dependency failed
+
+    Returns:
+        Results by task name, in completion order
+
+    Raises:
+        ValueError: On duplicate names, unknown dependencies or a cycle
+    """
+    by_name = _check_graph(tasks)
+    results: Dict[str, TaskResult] = {}
+    waiting = {task.name: task for task in tasks}
+    started = time.perf_counter()
+
+    def finish(result: TaskResult):
+        results[result.name] = result
+        if result.skipped:
+            logger.info(f"Warm-up {result.name}: skipped")
+        elif result.error is not None:
+            logger.warning(f"Warm-up {result.name} failed after {result.seconds * 1000:.1f}ms: {result.error}")
+        else:
+            logger.info(f"Warm-up {result.name}: {result.seconds * 1000:.1f}ms")
+        if on_done is not None:
+            on_done(result)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='warmup') as executor:
+        running = {}
+
+        def start_ready():
+            changed = True
+            while changed:
+                changed = False
+                for name, task in list(waiting.items()):
+                    if any(dep in results and not results[dep].ok for dep in task.after):
+                        del waiting[name]
+                        finish(TaskResult(name, skipped=True))
+                        changed = True
+                    elif all(dep in results for dep in task.after):
+                        del waiting[name]
+                        running[executor.submit(_timed, task.func)] = name
+
+        start_ready()
+        while running:
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                seconds, value, error = future.result()
+                finish(TaskResult(name, seconds, value, error))
+            start_ready()
+
+    logger.info(f"Warm-up finished in {(time.perf_counter() - started) * 1000:.1f}ms "
+                f"({sum(result.ok for result in results.values())}/{len(by_name)} tasks)")
+    return results
+
+
+class CounterSnapshot:
+    """
+    Counts read ahead of time, handed out while they are still exact.
+
+    ``PRAGMA data_version`` is read before counting on a connection kept
+    open for the purpose; ``take()`` returns the counts only if no other
+    connection has committed since, and only once (later reads should query
+    afresh).
+    """
+
+    def __init__(self, db_path: str, fetch: Callable[[], Dict[str, int]]):
+        self._readonly = ReadOnlyDatabase(db_path)
+        self._version = self._readonly.data_version()
+        self.values = fetch()
+
+    def take(self) -> Optional[Dict[str, int]]:
+        if self._readonly is None:
+            return None
+        try:
+            current = self._readonly.data_version() == self._version
+        except sqlite3.Error:
+            current = False
+        self._readonly.close()
+        self._readonly = None
+        return dict(self.values) if current else None
+
+
+# -- the application's start-up graph ---------------------------------------
+
+def _schema():
+    import database
+    from data.migrator import SCHEMA_VERSION, MigrationError, current_version
+    conn = database.create_connection()
+    try:
+        version = current_version(conn)
+    finally:
+        conn.close()
+    if version < SCHEMA_VERSION:
+        raise MigrationError(f"Schema is at version {version}, expected {SCHEMA_VERSION}")
+    return version
+
+
+def _ping(conn: sqlite3.Connection):
+    return conn.execute('PRAGMA journal_mode').fetchone()[0]
+
+
+def _write_queue():
+    import database
+    return database.get_writer().call(_ping)
+
+
+def _dashboard_counts() -> Dict[str, int]:
+    import database
+    return {
+        'books': database.get_books_count(),
+        'members': database.get_members_count(),
+        'borrowed': database.get_borrowed_count(),
+        'overdue': database.get_overdue_count(),
+    }
+
+
+def _counters():
+    import database
+    return CounterSnapshot(database.DB_FILE, _dashboard_counts)
+
+
+def _search_indexes():
+    import database
+    from data import trigram_search
+    conn = sqlite3.connect(database.DB_FILE)
+    try:
+        recorded = conn.execute("SELECT COUNT(*) FROM trigram_frequencies").fetchone()[0]
+        if not recorded:
+            recorded = trigram_search.refresh_frequencies(conn)
+            conn.commit()
+        return recorded
+    finally:
+        conn.close()
+
+
+def _login_page():
+    import login_window  # noqa: F401
+
+
+def _pages():
+    import dashboard_window  # noqa: F401
+
+
+def startup_tasks() -> List[Task]:
+    """The warm-up graph for ``main.py``."""
+    return [
+        Task('schema', _schema),
+        Task('write_queue', _write_queue, after=('schema',)),
+        Task('counters', _counters, after=('schema',)),
+        Task('search_indexes', _search_indexes, after=('schema',)),
+        Task('login_page', _login_page),
+        # Page modules import ``database``, whose import runs the schema check
+        Task('pages', _pages, after=('schema',)),
+    ]